@@ -1,13 +1,26 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, stream_with_context
 import psycopg
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
 import os
 from dotenv import load_dotenv
 import csv
-import requests
 import xml.etree.ElementTree as ET
 import sys
 import io
+import threading
+import time
+import re
+import json
+import base64
+import binascii
+import hashlib
+from collections import defaultdict, OrderedDict
+from contextlib import nullcontext
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from vworld_client import VWorldClient, VWorldError, VWorldConnectionError
 
 # Windows 콘솔 인코딩 문제 해결
 if sys.platform == 'win32':
@@ -43,26 +56,224 @@ DB_CONFIG = {
     'connect_timeout': 30
 }
 
-# 간단한 DB 연결 풀 (서버리스 환경 최적화)
-_db_connection = None
+# DB 연결 풀 설정 (환경 변수로 운영 트래픽에 맞게 조정)
+DB_POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),  # 유지할 최소 연결 수
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),  # 워커당 최대 연결 수 (상한)
+    'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),  # 연결 최대 수명 (초)
+    'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),  # 유휴 연결 회수 기준 (초)
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),  # 연결 대여 대기 한도 (초)
+}
+
+# 서버 측 prepared statement 설정
+# - 검색/모달 쿼리는 고정된 템플릿(= ANY(%s) 배열 파라미터)으로 만들어 연결별로 prepare 후 재사용 (parse/plan 생략)
+# - PgBouncer transaction 모드처럼 prepared statement를 쓸 수 없는 환경에서는 DB_PREPARE_STATEMENTS=0
+DB_PREPARE_STATEMENTS = os.getenv('DB_PREPARE_STATEMENTS', '1') != '0'
+DB_PREPARED_MAX = int(os.getenv('DB_PREPARED_MAX', '200'))  # 연결당 보관할 prepared statement 수 (LRU)
+
+# 워커(프로세스)별 연결 풀 - fork 이후 각 워커에서 지연 생성
+_db_pool = None
+_db_pool_pid = None
+_db_pool_lock = threading.Lock()
+
+def configure_db_connection(conn):
+    """풀에 새 연결이 추가될 때 prepared statement 설정 적용"""
+    if DB_PREPARE_STATEMENTS:
+        conn.prepared_max = DB_PREPARED_MAX
+    else:
+        conn.prepare_threshold = None  # 자동 prepare도 끔
+
+def get_db_pool():
+    """현재 워커의 DB 연결 풀 반환 (없거나 fork된 프로세스면 새로 생성)"""
+    global _db_pool, _db_pool_pid
+    if _db_pool is not None and _db_pool_pid == os.getpid():
+        return _db_pool
+
+    with _db_pool_lock:
+        if _db_pool is None or _db_pool_pid != os.getpid():
+            # 대여 시 헬스 체크, 수명/유휴 시간 초과 연결은 풀이 백그라운드에서 교체
+            _db_pool = ConnectionPool(
+                kwargs={**DB_CONFIG, 'row_factory': dict_row},
+                check=ConnectionPool.check_connection,
+                configure=configure_db_connection,
+                name=f'rent-db-{os.getpid()}',
+                open=True,
+                **DB_POOL_CONFIG
+            )
+            _db_pool_pid = os.getpid()
+    return _db_pool
 
 def get_db_connection():
-    """DB 연결 재사용 (서버리스 환경에서 성능 개선)"""
-    global _db_connection
+    """풀에서 DB 연결 대여 (with 블록 종료 시 커밋/롤백 후 자동 반납)
+
+    사용 예:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(...)
+    """
+    return get_db_pool().connection()
+
+def execute_prepared(cursor, query, params=None):
+    """쿼리 템플릿을 첫 실행부터 prepared statement로 실행 (같은 연결에서 같은 SQL이면 parse/plan 재사용)
+
+    SQL 문자열이 요청마다 달라지면 prepare 효과가 없으므로 가변 길이 목록은 IN (...) 대신 = ANY(%s) 사용
+    """
+    return cursor.execute(query, params, prepare=DB_PREPARE_STATEMENTS)
+
+def get_db_pool_stats():
+    """연결 풀 통계 (풀 크기 산정용)"""
+    prepare_config = {'prepare_statements': DB_PREPARE_STATEMENTS, 'prepared_max': DB_PREPARED_MAX}
+    if _db_pool is None or _db_pool_pid != os.getpid():
+        return {'initialized': False, **DB_POOL_CONFIG, **prepare_config}
+    stats = _db_pool.get_stats()
+    return {'initialized': True, **DB_POOL_CONFIG, **prepare_config, **stats}
+
+# LH 매칭 인메모리 인덱스 (워커별)
+# - lh_rent_transactions를 (시군구코드, 면적, 년, 월, 일, 보증금) 정규 키로 메모리에 올려 SQL 없이 LH 태깅
+# - 주택 유형별로 분리 (house_subtype이 유형의 lh_house_types에 있거나 NULL인 행만 포함)
+# - 첫 사용 시 로드, 이후 백그라운드 스레드가 LH_INDEX_CHECK_INTERVAL마다 워터마크(행 수 + 변경 건수)를 확인해 바뀌면 다시 로드
+# - 로드 실패 시 기존 SQL 일괄 조회로 처리
+LH_INDEX_ENABLED = os.getenv('LH_INDEX_ENABLED', '1') == '1'
+LH_INDEX_CHECK_INTERVAL = float(os.getenv('LH_INDEX_CHECK_INTERVAL', '300'))  # 워터마크 확인 주기 (초)
+LH_INDEX_RETRY_INTERVAL = 60  # 로드 실패 후 재시도 간격 (초)
+_lh_index_state = {'index': None, 'watermark': None, 'rows': 0, 'loaded_at': 0.0, 'failed_at': 0.0, 'pid': None}
+_lh_index_lock = threading.Lock()
+
+
+def lh_match_key(sggcd, area, year, month, day, deposit):
+    """LH 매칭 정규 키 (면적은 소수 4자리, 년/월/일/보증금(원)은 정수) - 변환 실패 시 None"""
     try:
-        # 기존 연결이 있고 유효하면 재사용
-        if _db_connection is not None and not _db_connection.closed:
-            # 간단한 연결 테스트
-            cursor = _db_connection.cursor()
-            cursor.execute('SELECT 1')
-            cursor.close()
-            return _db_connection
-    except:
-        pass
+        return (str(sggcd), round(float(area), 4), int(year), int(month), int(day), int(deposit))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_lh_watermark(cursor):
+    """LH 테이블 워터마크 (행 수, 누적 INSERT/UPDATE/DELETE 건수)"""
+    cursor.execute("""
+        SELECT
+            (SELECT count(*) FROM lh_rent_transactions) as row_count,
+            COALESCE((
+                SELECT n_tup_ins + n_tup_upd + n_tup_del
+                FROM pg_stat_user_tables
+                WHERE relname = 'lh_rent_transactions'
+            ), 0) as changes
+    """)
+    row = cursor.fetchone()
+    return (row['row_count'], row['changes'])
+
+
+def load_lh_index():
+    """LH 테이블 전체를 읽어 유형별 {정규 키: (방 수, 지원금, 입주자 유형)} 인덱스 생성
+
+    반환: (인덱스, 워터마크, 행 수)
+    """
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        watermark = get_lh_watermark(cursor)
+        cursor.execute("""
+            SELECT
+                sggcd::text as sggcd,
+                exclusive_area,
+                dealyear,
+                dealmonth,
+                dealday,
+                ROUND(jeonse_amount)::bigint as deposit,
+                house_subtype,
+                room_count,
+                jeonse_support_amount,
+                housing_type
+            FROM lh_rent_transactions
+        """)
+        rows = cursor.fetchall()
+
+    type_sets = {t: frozenset(spec['lh_house_types']) for t, spec in SEARCH_TYPE_SPECS.items()}
+    index = {t: {} for t in SEARCH_TYPE_SPECS}
+    for r in rows:
+        key = lh_match_key(r['sggcd'], r['exclusive_area'], r['dealyear'], r['dealmonth'], r['dealday'], r['deposit'])
+        if key is None:
+            continue
+        value = (r['room_count'], r['jeonse_support_amount'], r['housing_type'])
+        subtype = r['house_subtype']
+        for source_type, house_types in type_sets.items():
+            if subtype is None or subtype in house_types:
+                index[source_type][key] = value
+    return index, watermark, len(rows)
+
+
+def lh_index_refresh_loop():
+    """백그라운드 갱신: 워터마크가 바뀌면 새 인덱스를 만든 뒤 통째로 교체 (조회 중인 요청은 이전 인덱스 사용)"""
+    while True:
+        time.sleep(LH_INDEX_CHECK_INTERVAL)
+        try:
+            with get_db_connection() as conn, conn.cursor() as cursor:
+                watermark = get_lh_watermark(cursor)
+            if watermark == _lh_index_state['watermark']:
+                continue
+            index, watermark, row_count = load_lh_index()
+            _lh_index_state.update(watermark=watermark, rows=row_count, loaded_at=time.time())
+            _lh_index_state['index'] = index
+            print(f"[INFO] LH 인덱스 갱신: {row_count}건 (워터마크 {watermark})")
+        except Exception as e:
+            print(f"[WARNING] LH 인덱스 갱신 실패: {str(e)}")
+
+
+def get_lh_index():
+    """현재 워커의 LH 인덱스 (첫 호출 시 로드 + 갱신 스레드 시작, 사용 불가면 None → SQL 조회)"""
+    if not LH_INDEX_ENABLED:
+        return None
+    if _lh_index_state['index'] is not None and _lh_index_state['pid'] == os.getpid():
+        return _lh_index_state['index']
+
+    with _lh_index_lock:
+        if _lh_index_state['index'] is not None and _lh_index_state['pid'] == os.getpid():
+            return _lh_index_state['index']
+        if time.time() - _lh_index_state['failed_at'] < LH_INDEX_RETRY_INTERVAL:
+            return None
+        try:
+            load_start = time.time()
+            index, watermark, row_count = load_lh_index()
+        except Exception as e:
+            print(f"[WARNING] LH 인덱스 로드 실패 (SQL 조회로 처리): {str(e)}")
+            _lh_index_state['failed_at'] = time.time()
+            return None
+
+        _lh_index_state.update(
+            index=index, watermark=watermark, rows=row_count, loaded_at=time.time(), pid=os.getpid()
+        )
+        threading.Thread(target=lh_index_refresh_loop, name='lh-index-refresh', daemon=True).start()
+        print(f"[INFO] LH 인덱스 로드: {row_count}건, {time.time() - load_start:.2f}초")
+        return index
+
+
+def get_lh_index_stats():
+    """LH 인덱스 통계"""
+    index = _lh_index_state['index'] if _lh_index_state['pid'] == os.getpid() else None
+    return {
+        'enabled': LH_INDEX_ENABLED,
+        'loaded': index is not None,
+        'rows': _lh_index_state['rows'] if index is not None else 0,
+        'keys': {t: len(keys) for t, keys in index.items()} if index is not None else {},
+        'watermark': list(_lh_index_state['watermark']) if index is not None else None,
+        'loaded_at': _lh_index_state['loaded_at'] if index is not None else None,
+    }
+
+def unnest_keys_sql(columns, alias='k'):
+    """일괄 조회용 probe 키 파생 테이블 SQL (컬럼별 배열 파라미터를 unnest)
+
+    columns: [(컬럼명, PostgreSQL 타입)] - 행 수와 관계없이 SQL 문자열이 같아 prepare/인덱스 조인 가능
+    예: unnest_keys_sql([('sggcd', 'text'), ('area', 'numeric')])
+        → (SELECT DISTINCT * FROM unnest(%s::text[], %s::numeric[]) AS u(sggcd, area)) k
+    """
+    arrays = ', '.join(f'%s::{pg_type}[]' for _, pg_type in columns)
+    names = ', '.join(name for name, _ in columns)
+    return f"(SELECT DISTINCT * FROM unnest({arrays}) AS u({names})) {alias}"
+
+
+def unnest_keys_params(keys, column_count):
+    """키 튜플 목록 → unnest_keys_sql 컬럼 순서의 배열 파라미터 목록"""
+    if not keys:
+        return [[] for _ in range(column_count)]
+    return [list(values) for values in zip(*keys)]
 
-    # 새 연결 생성
-    _db_connection = psycopg.connect(**DB_CONFIG, row_factory=dict_row)
-    return _db_connection
 
 def add_lh_info_to_results(results, cursor):
     """실거래가 결과에 LH 정보 추가 (배치 조회로 최적화)"""
@@ -134,43 +345,65 @@ def add_lh_info_to_results(results, cursor):
             'deposit': deposit_num
         })
 
-    # 주택 유형별 배치 조회
-    print(f"[DEBUG LH] grouped_results 키: {list(grouped_results.keys())}", flush=True)
+    # 주택 유형별 배치 조회 (인메모리 인덱스가 있으면 SQL 없이 매칭)
+    lh_index = get_lh_index()
+    print(f"[DEBUG LH] grouped_results 키: {list(grouped_results.keys())}, 인메모리 인덱스: {lh_index is not None}", flush=True)
     for source_type, items in grouped_results.items():
         print(f"[DEBUG LH] source_type={source_type}, items 개수={len(items)}", flush=True)
         if not items:
             print(f"[DEBUG LH] items가 비어있음, 스킵", flush=True)
             continue
 
+        if lh_index is not None:
+            type_index = lh_index[source_type]
+            matched_count = 0
+            for item in items:
+                key = lh_match_key(item['sggcd'], item['area'], item['year'], item['month'], item['day'], item['deposit'])
+                lh_data = type_index.get(key) if key is not None else None
+                row = results[item['idx']]
+                if lh_data:
+                    row['lh_room_count'], row['lh_support_amount'], row['lh_housing_type'] = lh_data
+                    row['is_lh'] = True
+                    matched_count += 1
+                else:
+                    row['is_lh'] = False
+            print(f"[DEBUG LH] 인메모리 매칭 결과: {matched_count}/{len(items)}건", flush=True)
+            continue
+
         # type_mapping에서 house_types와 쿼리 형식 가져오기
         _, house_types, is_dagagu_format = type_mapping[{v[0]: k for k, v in type_mapping.items()}[source_type]]
         print(f"[DEBUG LH] house_types={house_types}, is_dagagu_format={is_dagagu_format}", flush=True)
 
         if is_dagagu_format:
-            # 단독다가구 형식 (dealyear || LPAD(dealmonth))
-            conditions = []
-            params = []
-            for item in items:
-                conditions.append("(sggcd = %s AND exclusive_area::numeric = %s AND dealyear || LPAD(dealmonth::text, 2, '0') = %s AND dealday::text = %s AND ROUND(jeonse_amount) = %s)")
-                params.extend([item['sggcd'], item['area'], item['contract_ym'], item['day'], item['deposit']])
-
-            if conditions:
-                house_types_str = "', '".join(house_types)
+            # 단독다가구 형식 (dealyear || LPAD(dealmonth)) - 키 배열을 unnest 해 LH 테이블과 조인
+            keys = [
+                (item['sggcd'], str(item['area']), item['contract_ym'], str(item['day']), item['deposit'])
+                for item in items
+            ]
+            if keys:
+                key_table = unnest_keys_sql([
+                    ('sggcd', 'text'), ('area', 'numeric'), ('contract_ym', 'text'), ('day', 'text'), ('deposit', 'bigint')
+                ])
                 lh_query = f"""
                     SELECT
-                        sggcd,
-                        exclusive_area::text as area,
-                        dealyear || LPAD(dealmonth::text, 2, '0') as contract_ym,
-                        dealday::text as day,
-                        ROUND(jeonse_amount) as deposit,
-                        room_count,
-                        jeonse_support_amount,
-                        housing_type
-                    FROM lh_rent_transactions
-                    WHERE (house_subtype IN ('{house_types_str}') OR house_subtype IS NULL)
-                        AND ({' OR '.join(conditions)})
+                        lh.sggcd,
+                        lh.exclusive_area::text as area,
+                        lh.dealyear || LPAD(lh.dealmonth::text, 2, '0') as contract_ym,
+                        lh.dealday::text as day,
+                        ROUND(lh.jeonse_amount) as deposit,
+                        lh.room_count,
+                        lh.jeonse_support_amount,
+                        lh.housing_type
+                    FROM {key_table}
+                    JOIN lh_rent_transactions lh ON
+                        lh.sggcd = k.sggcd
+                        AND lh.exclusive_area::numeric = k.area
+                        AND lh.dealyear || LPAD(lh.dealmonth::text, 2, '0') = k.contract_ym
+                        AND lh.dealday::text = k.day
+                        AND ROUND(lh.jeonse_amount) = k.deposit
+                    WHERE (lh.house_subtype = ANY(%s) OR lh.house_subtype IS NULL)
                 """
-                cursor.execute(lh_query, params)
+                execute_prepared(cursor, lh_query, unnest_keys_params(keys, 5) + [house_types])
                 lh_results = cursor.fetchall()
 
                 # 결과 매칭 (area는 float로, deposit은 int로 변환하여 키 생성)
@@ -196,33 +429,39 @@ def add_lh_info_to_results(results, cursor):
                     else:
                         results[item['idx']]['is_lh'] = False
         else:
-            # 일반 형식 (아파트, 오피스텔, 연립다세대)
-            conditions = []
-            params = []
-            for item in items:
-                conditions.append("(sggcd = %s AND exclusive_area::numeric = %s AND dealyear::text = %s AND dealmonth::text = %s AND dealday::text = %s AND ROUND(jeonse_amount) = %s)")
-                params.extend([item['sggcd'], item['area'], item['year'], item['month'], item['day'], item['deposit']])
-
-            if conditions:
-                print(f"[DEBUG LH] conditions 개수: {len(conditions)}", flush=True)
-                house_types_str = "', '".join(house_types)
+            # 일반 형식 (아파트, 오피스텔, 연립다세대) - 키 배열을 unnest 해 LH 테이블과 조인
+            keys = [
+                (item['sggcd'], str(item['area']), item['year'], item['month'], str(item['day']), item['deposit'])
+                for item in items
+            ]
+            if keys:
+                print(f"[DEBUG LH] 조회 키 개수: {len(keys)}", flush=True)
+                key_table = unnest_keys_sql([
+                    ('sggcd', 'text'), ('area', 'numeric'), ('year', 'text'), ('month', 'text'), ('day', 'text'), ('deposit', 'bigint')
+                ])
                 lh_query = f"""
                     SELECT
-                        sggcd,
-                        exclusive_area::text as area,
-                        dealyear::text as year,
-                        dealmonth::text as month,
-                        dealday::text as day,
-                        ROUND(jeonse_amount) as deposit,
-                        room_count,
-                        jeonse_support_amount,
-                        housing_type
-                    FROM lh_rent_transactions
-                    WHERE (house_subtype IN ('{house_types_str}') OR house_subtype IS NULL)
-                        AND ({' OR '.join(conditions)})
+                        lh.sggcd,
+                        lh.exclusive_area::text as area,
+                        lh.dealyear::text as year,
+                        lh.dealmonth::text as month,
+                        lh.dealday::text as day,
+                        ROUND(lh.jeonse_amount) as deposit,
+                        lh.room_count,
+                        lh.jeonse_support_amount,
+                        lh.housing_type
+                    FROM {key_table}
+                    JOIN lh_rent_transactions lh ON
+                        lh.sggcd = k.sggcd
+                        AND lh.exclusive_area::numeric = k.area
+                        AND lh.dealyear::text = k.year
+                        AND lh.dealmonth::text = k.month
+                        AND lh.dealday::text = k.day
+                        AND ROUND(lh.jeonse_amount) = k.deposit
+                    WHERE (lh.house_subtype = ANY(%s) OR lh.house_subtype IS NULL)
                 """
-                print(f"[DEBUG LH] LH 쿼리 실행 중... house_types: {house_types_str}", flush=True)
-                cursor.execute(lh_query, params)
+                print(f"[DEBUG LH] LH 쿼리 실행 중... house_types: {house_types}", flush=True)
+                execute_prepared(cursor, lh_query, unnest_keys_params(keys, 6) + [house_types])
                 lh_results = cursor.fetchall()
                 print(f"[DEBUG LH] LH 쿼리 결과: {len(lh_results)}건", flush=True)
                 if lh_results:
@@ -287,7 +526,8 @@ def load_region_codes():
     regions = {
         'sido': {},  # 시도
         'sigungu': {},  # 시군구
-        'umd': {}  # 읍면동
+        'umd': {},  # 읍면동
+        'umd_by_name': {}  # (시군구코드, 읍면동명) → 법정동코드 10자리 역인덱스 (같은 이름이 여러 개면 파일 순서상 첫 코드)
     }
 
     with open('./files/lawd_code.csv', 'r', encoding='utf-8-sig') as f:
@@ -329,12 +569,205 @@ def load_region_codes():
                     'sido': sido_name,
                     'sgg_code': sgg_code
                 }
+                regions['umd_by_name'].setdefault((sgg_code, umd_name), code)
 
     return regions
 
 # 지역 코드 로드
 REGIONS = load_region_codes()
 
+# 전월세 테이블 스키마 레지스트리
+# 논리 필드 → 물리 컬럼 매핑 (유형별로 컬럼명/순서가 다르므로 SQL 작성 시 반드시 이 매핑 사용)
+# 각 필드: (후보 컬럼명 목록, 위치 인덱스) - 후보명이 없으면 위치 인덱스로 대체 (단독다가구 한글 컬럼 대비)
+RENT_TABLE_SCHEMAS = {
+    'apt': {
+        'table': 'apt_rent_transactions',
+        'fields': {
+            'key': (['unique_key'], None),
+            'sggcd': (['sggcd'], None),
+            'umdnm': (['umdnm'], None),
+            'jibun': (['jibun'], None),
+            'building_name': (['aptnm'], None),
+            'area': (['excluusear'], None),
+            'floor': (['floor'], None),
+            'build_year': (['buildyear'], None),
+            'deal_year': (['dealyear'], None),
+            'deal_month': (['dealmonth'], None),
+            'deal_day': (['dealday'], None),
+            'deposit': (['deposit'], None),
+            'monthly_rent': (['monthlyrent'], None),
+            'contract_term': (['contractterm'], None),
+            'contract_type': (['contracttype'], None),
+            'renewal_right': (['userrright'], None),
+            'pre_deposit': (['predeposit'], None),
+            'pre_monthly_rent': (['premonthlyrent'], None),
+        },
+    },
+    'villa': {
+        'table': 'villa_rent_transactions',
+        'fields': {
+            'key': (['unique_key'], None),
+            'sggcd': (['sggcd'], None),
+            'umdnm': (['umdnm'], None),
+            'jibun': (['jibun'], None),
+            'building_name': (['mhousenm', 'mhousename'], None),
+            'area': (['excluusear'], None),
+            'floor': (['floor'], None),
+            'build_year': (['buildyear'], None),
+            'deal_year': (['dealyear'], None),
+            'deal_month': (['dealmonth'], None),
+            'deal_day': (['dealday'], None),
+            'deposit': (['deposit'], None),
+            'monthly_rent': (['monthlyrent'], None),
+            'contract_term': (['contractterm'], None),
+            'contract_type': (['contracttype'], None),
+            'renewal_right': (['userrright'], None),
+            'pre_deposit': (['predeposit'], None),
+            'pre_monthly_rent': (['premonthlyrent'], None),
+        },
+    },
+    'officetel': {
+        'table': 'officetel_rent_transactions',
+        'fields': {
+            'key': (['unique_key'], None),
+            'sggcd': (['sggcd'], None),
+            'umdnm': (['umdnm'], None),
+            'jibun': (['jibun'], None),
+            'building_name': (['offinm'], None),
+            'area': (['excluusear'], None),
+            'floor': (['floor'], None),
+            'build_year': (['buildyear'], None),
+            'deal_year': (['dealyear'], None),
+            'deal_month': (['dealmonth'], None),
+            'deal_day': (['dealday'], None),
+            'deposit': (['deposit'], None),
+            'monthly_rent': (['monthlyrent'], None),
+            'contract_term': (['contractterm'], None),
+            'contract_type': (['contracttype'], None),
+            'renewal_right': (['userrright'], None),
+            'pre_deposit': (['predeposit'], None),
+            'pre_monthly_rent': (['premonthlyrent'], None),
+        },
+    },
+    'dagagu': {
+        'table': 'dagagu_rent_transactions',
+        'fields': {
+            'key': (['id'], 0),
+            'sggcd': (['sggcd'], 1),
+            'umdnm': (['umdnm'], 3),
+            'jibun': (['jibun'], 4),
+            'area': (['전용면적', '계약면적'], 8),
+            'deal_ym': (['계약년월'], 10),  # YYYYMM
+            'deal_day': (['계약일'], 11),
+            'deposit': (['보증금'], 12),
+            'monthly_rent': (['월세', '월세금'], 13),
+            'build_year': (['건축년도'], 14),  # 소수점 포함 - CASE 문으로 정제
+            'building_name': (['건물명', '도로명'], 15),
+            'contract_term': (['계약기간'], 16),  # YYYYMM~YYYYMM
+            'contract_type': (['계약구분'], 17),
+            'renewal_right': (['갱신요구권사용'], 18),
+            'pre_deposit': (['종전계약보증금'], 19),
+            'pre_monthly_rent': (['종전계약월세'], 20),
+        },
+    },
+}
+
+# 해석된 물리 컬럼명 {유형: {논리 필드: 물리 컬럼명}} - 프로세스당 1회, 첫 사용 시 로드
+_schema_registry = None
+_schema_column_types = None  # {유형: {논리 필드: 컬럼 타입 (information_schema udt_name, 예: int8, text)}}
+_schema_registry_lock = threading.Lock()
+
+# (선택) 시작 시 스키마 검증 - 기본은 하지 않음 (import 시 DB 연결을 기다리면 콜드 스타트가 DB 연결 대기만큼 늦어짐)
+# 1이면 풀을 만들지 않고 짧은 connect_timeout의 단독 연결로 검증 (fork 전 부모 프로세스에 풀이 생기지 않음)
+SCHEMA_VALIDATE_ON_STARTUP = os.getenv('SCHEMA_VALIDATE_ON_STARTUP', '0') == '1'
+SCHEMA_VALIDATE_CONNECT_TIMEOUT = int(os.getenv('SCHEMA_VALIDATE_CONNECT_TIMEOUT', '3'))
+
+def load_schema_registry(conn=None):
+    """information_schema에서 4개 전월세 테이블 컬럼을 읽어 레지스트리 구성 및 검증 (쿼리 1회)
+
+    conn을 주면 그 연결로 조회 (시작 시 검증용 단독 연결), 없으면 풀에서 대여
+    반환: (레지스트리 {유형: {논리 필드: 물리 컬럼명}}, 컬럼 타입 {유형: {논리 필드: udt_name}})
+    """
+    table_names = [schema['table'] for schema in RENT_TABLE_SCHEMAS.values()]
+    with (nullcontext(conn) if conn is not None else get_db_connection()) as conn, conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT table_name, column_name, udt_name
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ANY(%s)
+            ORDER BY table_name, ordinal_position
+        """, (table_names,))
+        rows = cursor.fetchall()
+
+    table_columns = defaultdict(list)
+    table_types = defaultdict(dict)
+    for row in rows:
+        table_columns[row['table_name']].append(row['column_name'])
+        table_types[row['table_name']][row['column_name']] = row['udt_name']
+
+    registry = {}
+    column_types = {}
+    errors = []
+    for source_type, schema in RENT_TABLE_SCHEMAS.items():
+        columns = table_columns.get(schema['table'], [])
+        if not columns:
+            errors.append(f"{schema['table']} 테이블 없음")
+            continue
+
+        resolved = {}
+        for field, (candidates, position) in schema['fields'].items():
+            physical = next((name for name in candidates if name in columns), None)
+            if physical is None and position is not None and position < len(columns):
+                physical = columns[position]
+                print(f"[WARNING] 스키마: {schema['table']}.{field} 컬럼명 {candidates} 없음 → 위치 {position} '{physical}' 사용")
+            if physical is None:
+                errors.append(f"{schema['table']}.{field} ({', '.join(candidates)})")
+                continue
+            resolved[field] = physical
+        registry[source_type] = resolved
+        column_types[source_type] = {field: table_types[schema['table']][name] for field, name in resolved.items()}
+
+    if errors:
+        raise RuntimeError(f"전월세 테이블 스키마 검증 실패: {'; '.join(errors)}")
+
+    print(f"[INFO] 스키마 레지스트리 로드 완료: {', '.join(f'{t}({len(c)}개 필드)' for t, c in registry.items())}")
+    return registry, column_types
+
+
+def ensure_schema_registry():
+    """레지스트리가 없으면 로드 (최초 호출 시 1회)"""
+    global _schema_registry, _schema_column_types
+    if _schema_registry is None:
+        with _schema_registry_lock:
+            if _schema_registry is None:
+                _schema_registry, _schema_column_types = load_schema_registry()
+
+
+def get_rent_columns(source_type):
+    """유형별 {논리 필드: 물리 컬럼명} 반환 (최초 호출 시 레지스트리 로드)"""
+    ensure_schema_registry()
+    return _schema_registry[source_type]
+
+
+def get_rent_column_type(source_type, field):
+    """유형별 논리 필드의 컬럼 타입 (udt_name, 예: int8, text) - 파라미터를 컬럼 타입으로 캐스팅할 때 사용"""
+    ensure_schema_registry()
+    return _schema_column_types[source_type][field]
+
+
+def rent_column_refs(source_type, alias=None):
+    """유형별 {논리 필드: SQL 컬럼 참조} (예: d."보증금") - SQL 작성용"""
+    prefix = f"{alias}." if alias else ''
+    return {field: f'{prefix}"{name}"' for field, name in get_rent_columns(source_type).items()}
+
+
+# 시작 시 스키마 검증 (SCHEMA_VALIDATE_ON_STARTUP=1일 때만, 실패하면 첫 요청에서 다시 시도)
+if SCHEMA_VALIDATE_ON_STARTUP:
+    try:
+        with psycopg.connect(**{**DB_CONFIG, 'connect_timeout': SCHEMA_VALIDATE_CONNECT_TIMEOUT}, row_factory=dict_row) as startup_conn:
+            _schema_registry, _schema_column_types = load_schema_registry(startup_conn)
+    except Exception as e:
+        print(f"[WARNING] 스키마 레지스트리 로드 실패 (첫 요청 시 재시도): {str(e)}")
+
 # 건물명 캐시 로드 (자동완성 성능 최적화)
 def load_building_cache():
     """건물명 목록을 메모리에 캐싱 (자동완성 성능 향상)"""
@@ -343,44 +776,41 @@ def load_building_cache():
 
     try:
         print("  [1/4] 데이터베이스 연결 중...")
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        print("  [OK] 데이터베이스 연결 성공")
-
-        tables = [
-            ('apt_rent_transactions', 'aptnm', '아파트'),
-            ('villa_rent_transactions', 'mhousenm', '연립다세대'),
-            ('officetel_rent_transactions', 'offinm', '오피스텔'),
-            ('dagagu_rent_transactions', 'NULL', '단독다가구')
-        ]
-
-        for idx, (table_name, building_col, property_type) in enumerate(tables, start=2):
-            print(f"  [{idx}/4] {property_type} 테이블 로딩 중...")
-            query = f"""
-                SELECT DISTINCT sggcd, umdnm, jibun, {building_col} as building_name
-                FROM {table_name}
-                WHERE umdnm IS NOT NULL AND jibun IS NOT NULL
-                LIMIT 100000
-            """
-            cursor.execute(query)
-
-            row_count = 0
-            for row in cursor.fetchall():
-                umd_name = row['umdnm']
-                if umd_name not in cache:
-                    cache[umd_name] = []
-
-                cache[umd_name].append({
-                    'sgg_code': row['sggcd'],
-                    'jibun': row['jibun'],
-                    'building_name': row['building_name'],
-                    'property_type': property_type
-                })
-                row_count += 1
-
-            print(f"  [OK] {property_type} 완료: {row_count}건")
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            print("  [OK] 데이터베이스 연결 성공")
+
+            tables = [
+                ('apt_rent_transactions', 'aptnm', '아파트'),
+                ('villa_rent_transactions', 'mhousenm', '연립다세대'),
+                ('officetel_rent_transactions', 'offinm', '오피스텔'),
+                ('dagagu_rent_transactions', 'NULL', '단독다가구')
+            ]
+
+            for idx, (table_name, building_col, property_type) in enumerate(tables, start=2):
+                print(f"  [{idx}/4] {property_type} 테이블 로딩 중...")
+                query = f"""
+                    SELECT DISTINCT sggcd, umdnm, jibun, {building_col} as building_name
+                    FROM {table_name}
+                    WHERE umdnm IS NOT NULL AND jibun IS NOT NULL
+                    LIMIT 100000
+                """
+                cursor.execute(query)
+
+                row_count = 0
+                for row in cursor.fetchall():
+                    umd_name = row['umdnm']
+                    if umd_name not in cache:
+                        cache[umd_name] = []
+
+                    cache[umd_name].append({
+                        'sgg_code': row['sggcd'],
+                        'jibun': row['jibun'],
+                        'building_name': row['building_name'],
+                        'property_type': property_type
+                    })
+                    row_count += 1
 
-        cursor.close()
+                print(f"  [OK] {property_type} 완료: {row_count}건")
 
         # 각 읍면동별로 지번 순으로 정렬
         print("  [정리] 데이터 정렬 중...")
@@ -465,13 +895,10 @@ def get_sido_list():
 @app.route('/api/regions/sigungu/<sido_code>')
 def get_sigungu_list(sido_code):
     """시군구 목록 조회 (DB에서 직접)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     # 4가지 테이블에서 시군구 코드 수집
     sigungu_set = set()
 
-    try:
+    with get_db_connection() as conn, conn.cursor() as cursor:
         # 아파트
         cursor.execute(f"SELECT DISTINCT sggcd FROM apt_rent_transactions WHERE sggcd LIKE '{sido_code}%'")
         sigungu_set.update([row['sggcd'] for row in cursor.fetchall()])
@@ -488,10 +915,6 @@ def get_sigungu_list(sido_code):
         cursor.execute(f"SELECT DISTINCT sggcd FROM dagagu_rent_transactions WHERE sggcd LIKE '{sido_code}%'")
         sigungu_set.update([row['sggcd'] for row in cursor.fetchall()])
 
-    finally:
-        cursor.close()
-        conn.close()
-
     # lawd_code.csv에서 시군구 이름 매핑 (없으면 코드만 사용)
     sigungu_list = []
     for code in sorted(sigungu_set):
@@ -503,13 +926,10 @@ def get_sigungu_list(sido_code):
 @app.route('/api/regions/umd/<sgg_code>')
 def get_umd_list(sgg_code):
     """읍면동 목록 조회 (DB에서 직접, 중복 제거)"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     # 4가지 테이블에서 읍면동명 수집
     umd_set = set()
 
-    try:
+    with get_db_connection() as conn, conn.cursor() as cursor:
         # 아파트
         cursor.execute(f"SELECT DISTINCT umdnm FROM apt_rent_transactions WHERE sggcd = '{sgg_code}'")
         umd_set.update([row['umdnm'] for row in cursor.fetchall() if row['umdnm']])
@@ -526,10 +946,6 @@ def get_umd_list(sgg_code):
         cursor.execute(f"SELECT DISTINCT umdnm FROM dagagu_rent_transactions WHERE sggcd = '{sgg_code}'")
         umd_set.update([row['umdnm'] for row in cursor.fetchall() if row['umdnm']])
 
-    finally:
-        cursor.close()
-        conn.close()
-
     # 읍면동명 리스트 생성
     umd_list = [{'code': umd_name, 'name': umd_name} for umd_name in sorted(umd_set) if umd_name]
     return jsonify(umd_list)
@@ -563,406 +979,417 @@ def get_transactions():
         page_size = filters.get('page_size', 20)  # 기본 20개
         offset = (page - 1) * page_size
 
+        # 계약만기 생성 컬럼(contract_end_ym)이 있는 테이블은 LIKE 대신 인덱스 조건 사용
+        contract_end_ym = parse_contract_end_ym(contract_end) if contract_end else None
+        contract_end_tables = get_contract_end_tables() if contract_end_ym is not None else frozenset()
+
         all_results = []
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            # 아파트 조회
+            if include_apt:
+                apt_query = """
+                    SELECT
+                        sggcd,
+                        umdnm,
+                        jibun,
+                        aptnm,
+                        excluusear as 계약면적,
+                        dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
+                        dealday as 계약일,
+                        deposit as 보증금,
+                        monthlyrent as 월세금,
+                        floor as 층,
+                        buildyear as 건축년도,
+                        contracttype as 계약구분,
+                        contractterm as 계약기간,
+                        predeposit as 종전계약보증금,
+                        premonthlyrent as 종전계약월세,
+                        userrright as 갱신요구권사용
+                    FROM apt_rent_transactions
+                    WHERE 1=1
+                """
+                apt_params = []
 
-        # 아파트 조회
-        if include_apt:
-            apt_query = """
-                SELECT
-                    sggcd,
-                    umdnm,
-                    jibun,
-                    aptnm,
-                    excluusear as 계약면적,
-                    dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
-                    dealday as 계약일,
-                    deposit as 보증금,
-                    monthlyrent as 월세금,
-                    floor as 층,
-                    buildyear as 건축년도,
-                    contracttype as 계약구분,
-                    contractterm as 계약기간,
-                    predeposit as 종전계약보증금,
-                    premonthlyrent as 종전계약월세,
-                    userrright as 갱신요구권사용
-                FROM apt_rent_transactions
-                WHERE 1=1
-            """
-            apt_params = []
-
-            # 계약만기시기 필터
-            if contract_end:
-                # YYYYMM 형식을 YY.MM 형식으로 변환 (예: 202709 -> 27.09)
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 27.09
-                    apt_query += " AND contractterm LIKE %s"
-                    apt_params.append(f'%{short_format}')
-                else:
-                    apt_query += " AND contractterm LIKE %s"
-                    apt_params.append(f'%{contract_end}')
-
-            # 지역 필터
-            if umd_codes and len(umd_codes) > 0:
-                # 읍면동 선택 시 - 선택된 읍면동들의 시군구와 읍면동 패턴으로 필터링
-                sgg_umd_conditions = []
-                for umd_code in umd_codes:
-                    umd_data = REGIONS['umd'].get(umd_code, {})
-                    sgg_code = umd_data.get('sgg_code', '')
-                    umd_name = umd_data.get('umd_name', '')
-                    if sgg_code and umd_name:
-                        # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
-                        sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
-                        apt_params.extend([sgg_code, f'{umd_name}%'])
-
-                if sgg_umd_conditions:
-                    apt_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
-            elif sgg_codes and len(sgg_codes) > 0:
-                # 여러 시군구 선택 시
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                apt_query += f" AND sggcd IN ({placeholders})"
-                apt_params.extend(sgg_codes)
-            elif sido_code:
-                # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
-                sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
-                if sido_sgg_codes:
-                    placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                # 계약만기시기 필터 (contract_end_ym 생성 컬럼이 있으면 인덱스 사용)
+                if contract_end:
+                    if 'apt_rent_transactions' in contract_end_tables:
+                        apt_query += " AND contract_end_ym = %s"
+                        apt_params.append(contract_end_ym)
+                    # YYYYMM 형식을 YY.MM 형식으로 변환 (예: 202709 -> 27.09)
+                    elif len(contract_end) == 6:  # YYYYMM 형식
+                        short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 27.09
+                        apt_query += " AND contractterm LIKE %s"
+                        apt_params.append(f'%{short_format}')
+                    else:
+                        apt_query += " AND contractterm LIKE %s"
+                        apt_params.append(f'%{contract_end}')
+
+                # 지역 필터
+                if umd_codes and len(umd_codes) > 0:
+                    # 읍면동 선택 시 - 선택된 읍면동들의 시군구와 읍면동 패턴으로 필터링
+                    sgg_umd_conditions = []
+                    for umd_code in umd_codes:
+                        umd_data = REGIONS['umd'].get(umd_code, {})
+                        sgg_code = umd_data.get('sgg_code', '')
+                        umd_name = umd_data.get('umd_name', '')
+                        if sgg_code and umd_name:
+                            # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
+                            sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
+                            apt_params.extend([sgg_code, f'{umd_name}%'])
+
+                    if sgg_umd_conditions:
+                        apt_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
+                elif sgg_codes and len(sgg_codes) > 0:
+                    # 여러 시군구 선택 시
+                    placeholders = ','.join(['%s'] * len(sgg_codes))
                     apt_query += f" AND sggcd IN ({placeholders})"
-                    apt_params.extend(sido_sgg_codes)
-
-            # 보증금 필터
-            if deposit_min is not None:
-                apt_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) >= %s"
-                apt_params.append(deposit_min)
-            if deposit_max is not None:
-                apt_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) <= %s"
-                apt_params.append(deposit_max)
-
-            # 월세 필터
-            if monthly_min is not None:
-                apt_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) >= %s"
-                apt_params.append(monthly_min)
-            if monthly_max is not None:
-                apt_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) <= %s"
-                apt_params.append(monthly_max)
-
-            # 건축년도 필터
-            if build_year_min is not None:
-                apt_query += " AND CAST(buildyear AS INTEGER) >= %s"
-                apt_params.append(build_year_min)
-            if build_year_max is not None:
-                apt_query += " AND CAST(buildyear AS INTEGER) <= %s"
-                apt_params.append(build_year_max)
-
-            apt_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
-            apt_params.extend([page_size, offset])
-
-            cursor.execute(apt_query, apt_params)
-            apt_results = cursor.fetchall()
-            for result in apt_results:
-                result['source_type'] = 'apt'
-            all_results.extend(apt_results)
+                    apt_params.extend(sgg_codes)
+                elif sido_code:
+                    # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
+                    sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
+                    if sido_sgg_codes:
+                        placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                        apt_query += f" AND sggcd IN ({placeholders})"
+                        apt_params.extend(sido_sgg_codes)
+
+                # 보증금 필터
+                if deposit_min is not None:
+                    apt_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) >= %s"
+                    apt_params.append(deposit_min)
+                if deposit_max is not None:
+                    apt_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) <= %s"
+                    apt_params.append(deposit_max)
+
+                # 월세 필터
+                if monthly_min is not None:
+                    apt_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) >= %s"
+                    apt_params.append(monthly_min)
+                if monthly_max is not None:
+                    apt_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) <= %s"
+                    apt_params.append(monthly_max)
+
+                # 건축년도 필터
+                if build_year_min is not None:
+                    apt_query += " AND CAST(buildyear AS INTEGER) >= %s"
+                    apt_params.append(build_year_min)
+                if build_year_max is not None:
+                    apt_query += " AND CAST(buildyear AS INTEGER) <= %s"
+                    apt_params.append(build_year_max)
+
+                apt_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
+                apt_params.extend([page_size, offset])
+
+                cursor.execute(apt_query, apt_params)
+                apt_results = cursor.fetchall()
+                for result in apt_results:
+                    result['source_type'] = 'apt'
+                all_results.extend(apt_results)
+
+            # 연립다세대 조회
+            if include_villa:
+                villa_query = """
+                    SELECT
+                        sggcd,
+                        umdnm,
+                        jibun,
+                        mhousenm as aptnm,
+                        excluusear as 계약면적,
+                        dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
+                        dealday as 계약일,
+                        deposit as 보증금,
+                        monthlyrent as 월세금,
+                        floor as 층,
+                        buildyear as 건축년도,
+                        contracttype as 계약구분,
+                        contractterm as 계약기간,
+                        predeposit as 종전계약보증금,
+                        premonthlyrent as 종전계약월세,
+                        userrright as 갱신요구권사용
+                    FROM villa_rent_transactions
+                    WHERE 1=1
+                """
+                villa_params = []
 
-        # 연립다세대 조회
-        if include_villa:
-            villa_query = """
-                SELECT
-                    sggcd,
-                    umdnm,
-                    jibun,
-                    mhousenm as aptnm,
-                    excluusear as 계약면적,
-                    dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
-                    dealday as 계약일,
-                    deposit as 보증금,
-                    monthlyrent as 월세금,
-                    floor as 층,
-                    buildyear as 건축년도,
-                    contracttype as 계약구분,
-                    contractterm as 계약기간,
-                    predeposit as 종전계약보증금,
-                    premonthlyrent as 종전계약월세,
-                    userrright as 갱신요구권사용
-                FROM villa_rent_transactions
-                WHERE 1=1
-            """
-            villa_params = []
-
-            # 계약만기시기 필터
-            if contract_end:
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 27.09
-                    villa_query += " AND contractterm LIKE %s"
-                    villa_params.append(f'%{short_format}')
-                else:
-                    villa_query += " AND contractterm LIKE %s"
-                    villa_params.append(f'%{contract_end}')
-
-            # 지역 필터
-            if umd_codes and len(umd_codes) > 0:
-                # 읍면동 선택 시 - 선택된 읍면동들의 시군구와 읍면동 패턴으로 필터링
-                sgg_umd_conditions = []
-                for umd_code in umd_codes:
-                    umd_data = REGIONS['umd'].get(umd_code, {})
-                    sgg_code = umd_data.get('sgg_code', '')
-                    umd_name = umd_data.get('umd_name', '')
-                    if sgg_code and umd_name:
-                        # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
-                        sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
-                        villa_params.extend([sgg_code, f'{umd_name}%'])
-
-                if sgg_umd_conditions:
-                    villa_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
-            elif sgg_codes and len(sgg_codes) > 0:
-                # 여러 시군구 선택 시
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                villa_query += f" AND sggcd IN ({placeholders})"
-                villa_params.extend(sgg_codes)
-            elif sido_code:
-                # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
-                sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
-                if sido_sgg_codes:
-                    placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                # 계약만기시기 필터 (contract_end_ym 생성 컬럼이 있으면 인덱스 사용)
+                if contract_end:
+                    if 'villa_rent_transactions' in contract_end_tables:
+                        villa_query += " AND contract_end_ym = %s"
+                        villa_params.append(contract_end_ym)
+                    elif len(contract_end) == 6:  # YYYYMM 형식
+                        short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 27.09
+                        villa_query += " AND contractterm LIKE %s"
+                        villa_params.append(f'%{short_format}')
+                    else:
+                        villa_query += " AND contractterm LIKE %s"
+                        villa_params.append(f'%{contract_end}')
+
+                # 지역 필터
+                if umd_codes and len(umd_codes) > 0:
+                    # 읍면동 선택 시 - 선택된 읍면동들의 시군구와 읍면동 패턴으로 필터링
+                    sgg_umd_conditions = []
+                    for umd_code in umd_codes:
+                        umd_data = REGIONS['umd'].get(umd_code, {})
+                        sgg_code = umd_data.get('sgg_code', '')
+                        umd_name = umd_data.get('umd_name', '')
+                        if sgg_code and umd_name:
+                            # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
+                            sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
+                            villa_params.extend([sgg_code, f'{umd_name}%'])
+
+                    if sgg_umd_conditions:
+                        villa_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
+                elif sgg_codes and len(sgg_codes) > 0:
+                    # 여러 시군구 선택 시
+                    placeholders = ','.join(['%s'] * len(sgg_codes))
                     villa_query += f" AND sggcd IN ({placeholders})"
-                    villa_params.extend(sido_sgg_codes)
-
-            # 보증금 필터
-            if deposit_min is not None:
-                villa_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) >= %s"
-                villa_params.append(deposit_min)
-            if deposit_max is not None:
-                villa_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) <= %s"
-                villa_params.append(deposit_max)
-
-            # 월세 필터
-            if monthly_min is not None:
-                villa_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) >= %s"
-                villa_params.append(monthly_min)
-            if monthly_max is not None:
-                villa_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) <= %s"
-                villa_params.append(monthly_max)
-
-            # 건축년도 필터
-            if build_year_min is not None:
-                villa_query += " AND CAST(buildyear AS INTEGER) >= %s"
-                villa_params.append(build_year_min)
-            if build_year_max is not None:
-                villa_query += " AND CAST(buildyear AS INTEGER) <= %s"
-                villa_params.append(build_year_max)
-
-            villa_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
-            villa_params.extend([page_size, offset])
-
-            cursor.execute(villa_query, villa_params)
-            villa_results = cursor.fetchall()
-            for result in villa_results:
-                result['source_type'] = 'villa'
-            all_results.extend(villa_results)
+                    villa_params.extend(sgg_codes)
+                elif sido_code:
+                    # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
+                    sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
+                    if sido_sgg_codes:
+                        placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                        villa_query += f" AND sggcd IN ({placeholders})"
+                        villa_params.extend(sido_sgg_codes)
+
+                # 보증금 필터
+                if deposit_min is not None:
+                    villa_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) >= %s"
+                    villa_params.append(deposit_min)
+                if deposit_max is not None:
+                    villa_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) <= %s"
+                    villa_params.append(deposit_max)
+
+                # 월세 필터
+                if monthly_min is not None:
+                    villa_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) >= %s"
+                    villa_params.append(monthly_min)
+                if monthly_max is not None:
+                    villa_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) <= %s"
+                    villa_params.append(monthly_max)
+
+                # 건축년도 필터
+                if build_year_min is not None:
+                    villa_query += " AND CAST(buildyear AS INTEGER) >= %s"
+                    villa_params.append(build_year_min)
+                if build_year_max is not None:
+                    villa_query += " AND CAST(buildyear AS INTEGER) <= %s"
+                    villa_params.append(build_year_max)
+
+                villa_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
+                villa_params.extend([page_size, offset])
+
+                cursor.execute(villa_query, villa_params)
+                villa_results = cursor.fetchall()
+                for result in villa_results:
+                    result['source_type'] = 'villa'
+                all_results.extend(villa_results)
+
+            # 단독다가구 조회
+            if include_dagagu:
+                dagagu_query = """
+                    SELECT
+                        sggcd,
+                        umdnm,
+                        jibun,
+                        NULL as aptnm,
+                        계약면적,
+                        계약년월,
+                        계약일,
+                        보증금,
+                        월세금,
+                        NULL as 층,
+                        건축년도,
+                        계약구분,
+                        계약기간,
+                        종전계약보증금,
+                        종전계약월세,
+                        갱신요구권사용
+                    FROM dagagu_rent_transactions
+                    WHERE 1=1
+                """
+                dagagu_params = []
 
-        # 단독다가구 조회
-        if include_dagagu:
-            dagagu_query = """
-                SELECT
-                    sggcd,
-                    umdnm,
-                    jibun,
-                    NULL as aptnm,
-                    계약면적,
-                    계약년월,
-                    계약일,
-                    보증금,
-                    월세금,
-                    NULL as 층,
-                    건축년도,
-                    계약구분,
-                    계약기간,
-                    종전계약보증금,
-                    종전계약월세,
-                    갱신요구권사용
-                FROM dagagu_rent_transactions
-                WHERE 1=1
-            """
-            dagagu_params = []
-
-            # 계약만기시기 필터 (단독다가구는 YYYYMM 형식 사용)
-            if contract_end:
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    # 단독다가구는 YYYYMM 형식을 그대로 사용
-                    dagagu_query += " AND 계약기간 LIKE %s"
-                    dagagu_params.append(f'%{contract_end}%')
-                else:
-                    dagagu_query += " AND 계약기간 LIKE %s"
-                    dagagu_params.append(f'%{contract_end}%')
-
-            # 지역 필터
-            if umd_codes and len(umd_codes) > 0:
-                # 읍면동 선택 시 - 선택된 읍면동들의 시군구와 읍면동 패턴으로 필터링
-                sgg_umd_conditions = []
-                for umd_code in umd_codes:
-                    umd_data = REGIONS['umd'].get(umd_code, {})
-                    sgg_code = umd_data.get('sgg_code', '')
-                    umd_name = umd_data.get('umd_name', '')
-                    if sgg_code and umd_name:
-                        # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
-                        sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
-                        dagagu_params.extend([sgg_code, f'{umd_name}%'])
-
-                if sgg_umd_conditions:
-                    dagagu_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
-            elif sgg_codes and len(sgg_codes) > 0:
-                # 여러 시군구 선택 시
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                dagagu_query += f" AND sggcd IN ({placeholders})"
-                dagagu_params.extend(sgg_codes)
-            elif sido_code:
-                # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
-                sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
-                if sido_sgg_codes:
-                    placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                # 계약만기시기 필터 (단독다가구는 YYYYMM 형식 사용, contract_end_ym 생성 컬럼 우선)
+                if contract_end:
+                    if 'dagagu_rent_transactions' in contract_end_tables:
+                        dagagu_query += " AND contract_end_ym = %s"
+                        dagagu_params.append(contract_end_ym)
+                    elif len(contract_end) == 6:  # YYYYMM 형식
+                        # 단독다가구는 YYYYMM 형식을 그대로 사용
+                        dagagu_query += " AND 계약기간 LIKE %s"
+                        dagagu_params.append(f'%{contract_end}%')
+                    else:
+                        dagagu_query += " AND 계약기간 LIKE %s"
+                        dagagu_params.append(f'%{contract_end}%')
+
+                # 지역 필터
+                if umd_codes and len(umd_codes) > 0:
+                    # 읍면동 선택 시 - 선택된 읍면동들의 시군구와 읍면동 패턴으로 필터링
+                    sgg_umd_conditions = []
+                    for umd_code in umd_codes:
+                        umd_data = REGIONS['umd'].get(umd_code, {})
+                        sgg_code = umd_data.get('sgg_code', '')
+                        umd_name = umd_data.get('umd_name', '')
+                        if sgg_code and umd_name:
+                            # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
+                            sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
+                            dagagu_params.extend([sgg_code, f'{umd_name}%'])
+
+                    if sgg_umd_conditions:
+                        dagagu_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
+                elif sgg_codes and len(sgg_codes) > 0:
+                    # 여러 시군구 선택 시
+                    placeholders = ','.join(['%s'] * len(sgg_codes))
                     dagagu_query += f" AND sggcd IN ({placeholders})"
-                    dagagu_params.extend(sido_sgg_codes)
-
-            # 보증금 필터
-            if deposit_min is not None:
-                dagagu_query += " AND CAST(REPLACE(보증금, ',', '') AS INTEGER) >= %s"
-                dagagu_params.append(deposit_min)
-            if deposit_max is not None:
-                dagagu_query += " AND CAST(REPLACE(보증금, ',', '') AS INTEGER) <= %s"
-                dagagu_params.append(deposit_max)
-
-            # 월세 필터
-            if monthly_min is not None:
-                dagagu_query += " AND CAST(REPLACE(월세금, ',', '') AS INTEGER) >= %s"
-                dagagu_params.append(monthly_min)
-            if monthly_max is not None:
-                dagagu_query += " AND CAST(REPLACE(월세금, ',', '') AS INTEGER) <= %s"
-                dagagu_params.append(monthly_max)
-
-            # 건축년도 필터
-            if build_year_min is not None:
-                dagagu_query += " AND CAST(건축년도 AS INTEGER) >= %s"
-                dagagu_params.append(build_year_min)
-            if build_year_max is not None:
-                dagagu_query += " AND CAST(건축년도 AS INTEGER) <= %s"
-                dagagu_params.append(build_year_max)
-
-            dagagu_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
-            dagagu_params.extend([page_size, offset])
-
-            print(f"=== 단독다가구 쿼리 디버깅 ===")
-            print(f"dagagu_query: {dagagu_query}")
-            print(f"dagagu_params: {dagagu_params}")
-
-            cursor.execute(dagagu_query, dagagu_params)
-            dagagu_results = cursor.fetchall()
-            print(f"단독다가구 결과 개수: {len(dagagu_results)}")
-
-            for result in dagagu_results:
-                result['source_type'] = 'dagagu'
-            all_results.extend(dagagu_results)
-
-        # 오피스텔 조회
-        if include_officetel:
-            officetel_query = """
-                SELECT
-                    sggcd,
-                    umdnm,
-                    jibun,
-                    offinm,
-                    offinm as aptnm,
-                    offinm as mhousenm,
-                    excluusear as 계약면적,
-                    dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
-                    dealday as 계약일,
-                    deposit as 보증금,
-                    monthlyrent as 월세금,
-                    floor as 층,
-                    buildyear as 건축년도,
-                    contracttype as 계약구분,
-                    contractterm as 계약기간,
-                    predeposit as 종전계약보증금,
-                    premonthlyrent as 종전계약월세,
-                    userrright as 갱신요구권사용
-                FROM officetel_rent_transactions
-                WHERE 1=1
-            """
-            officetel_params = []
-
-            # 계약만기시기 필터
-            if contract_end:
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 27.09
-                    officetel_query += " AND contractterm LIKE %s"
-                    officetel_params.append(f'%{short_format}')
-                else:
-                    officetel_query += " AND contractterm LIKE %s"
-                    officetel_params.append(f'%{contract_end}')
-
-            # 지역 필터 (단순한 IN 절 사용 - 빠름)
-            if umd_codes and len(umd_codes) > 0:
-                # 읍면동 선택 시 - 시군구 + 읍면동 조합으로 정확한 필터링
-                sgg_umd_conditions = []
-                for umd_code in umd_codes:
-                    umd_data = REGIONS['umd'].get(umd_code, {})
-                    sgg_code = umd_data.get('sgg_code', '')
-                    umd_name = umd_data.get('umd_name', '')
-                    if sgg_code and umd_name:
-                        # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
-                        sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
-                        officetel_params.extend([sgg_code, f'{umd_name}%'])
-
-                if sgg_umd_conditions:
-                    officetel_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
-            elif sgg_codes and len(sgg_codes) > 0:
-                # 여러 시군구 선택 시
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                officetel_query += f" AND sggcd IN ({placeholders})"
-                officetel_params.extend(sgg_codes)
-            elif sido_code:
-                # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
-                sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
-                if sido_sgg_codes:
-                    placeholders = ','.join(['%s'] * len(sido_sgg_codes))
-                    officetel_query += f" AND sggcd IN ({placeholders})"
-                    officetel_params.extend(sido_sgg_codes)
-
-            # 보증금 필터
-            if deposit_min is not None:
-                officetel_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) >= %s"
-                officetel_params.append(deposit_min)
-            if deposit_max is not None:
-                officetel_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) <= %s"
-                officetel_params.append(deposit_max)
-
-            # 월세 필터
-            if monthly_min is not None:
-                officetel_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) >= %s"
-                officetel_params.append(monthly_min)
-            if monthly_max is not None:
-                officetel_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) <= %s"
-                officetel_params.append(monthly_max)
-
-            # 건축년도 필터
-            if build_year_min is not None:
-                officetel_query += " AND CAST(buildyear AS INTEGER) >= %s"
-                officetel_params.append(build_year_min)
-            if build_year_max is not None:
-                officetel_query += " AND CAST(buildyear AS INTEGER) <= %s"
-                officetel_params.append(build_year_max)
-
-            officetel_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
-            officetel_params.extend([page_size, offset])
-
-            cursor.execute(officetel_query, officetel_params)
-            officetel_results = cursor.fetchall()
-            for result in officetel_results:
-                result['source_type'] = 'officetel'
-            all_results.extend(officetel_results)
+                    dagagu_params.extend(sgg_codes)
+                elif sido_code:
+                    # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
+                    sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
+                    if sido_sgg_codes:
+                        placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                        dagagu_query += f" AND sggcd IN ({placeholders})"
+                        dagagu_params.extend(sido_sgg_codes)
+
+                # 보증금 필터
+                if deposit_min is not None:
+                    dagagu_query += " AND CAST(REPLACE(보증금, ',', '') AS INTEGER) >= %s"
+                    dagagu_params.append(deposit_min)
+                if deposit_max is not None:
+                    dagagu_query += " AND CAST(REPLACE(보증금, ',', '') AS INTEGER) <= %s"
+                    dagagu_params.append(deposit_max)
+
+                # 월세 필터
+                if monthly_min is not None:
+                    dagagu_query += " AND CAST(REPLACE(월세금, ',', '') AS INTEGER) >= %s"
+                    dagagu_params.append(monthly_min)
+                if monthly_max is not None:
+                    dagagu_query += " AND CAST(REPLACE(월세금, ',', '') AS INTEGER) <= %s"
+                    dagagu_params.append(monthly_max)
+
+                # 건축년도 필터
+                if build_year_min is not None:
+                    dagagu_query += " AND CAST(건축년도 AS INTEGER) >= %s"
+                    dagagu_params.append(build_year_min)
+                if build_year_max is not None:
+                    dagagu_query += " AND CAST(건축년도 AS INTEGER) <= %s"
+                    dagagu_params.append(build_year_max)
+
+                dagagu_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
+                dagagu_params.extend([page_size, offset])
+
+                print(f"=== 단독다가구 쿼리 디버깅 ===")
+                print(f"dagagu_query: {dagagu_query}")
+                print(f"dagagu_params: {dagagu_params}")
+
+                cursor.execute(dagagu_query, dagagu_params)
+                dagagu_results = cursor.fetchall()
+                print(f"단독다가구 결과 개수: {len(dagagu_results)}")
+
+                for result in dagagu_results:
+                    result['source_type'] = 'dagagu'
+                all_results.extend(dagagu_results)
+
+            # 오피스텔 조회
+            if include_officetel:
+                officetel_query = """
+                    SELECT
+                        sggcd,
+                        umdnm,
+                        jibun,
+                        offinm,
+                        offinm as aptnm,
+                        offinm as mhousenm,
+                        excluusear as 계약면적,
+                        dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
+                        dealday as 계약일,
+                        deposit as 보증금,
+                        monthlyrent as 월세금,
+                        floor as 층,
+                        buildyear as 건축년도,
+                        contracttype as 계약구분,
+                        contractterm as 계약기간,
+                        predeposit as 종전계약보증금,
+                        premonthlyrent as 종전계약월세,
+                        userrright as 갱신요구권사용
+                    FROM officetel_rent_transactions
+                    WHERE 1=1
+                """
+                officetel_params = []
 
-        cursor.close()
-        conn.close()
+                # 계약만기시기 필터 (contract_end_ym 생성 컬럼이 있으면 인덱스 사용)
+                if contract_end:
+                    if 'officetel_rent_transactions' in contract_end_tables:
+                        officetel_query += " AND contract_end_ym = %s"
+                        officetel_params.append(contract_end_ym)
+                    elif len(contract_end) == 6:  # YYYYMM 형식
+                        short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 27.09
+                        officetel_query += " AND contractterm LIKE %s"
+                        officetel_params.append(f'%{short_format}')
+                    else:
+                        officetel_query += " AND contractterm LIKE %s"
+                        officetel_params.append(f'%{contract_end}')
+
+                # 지역 필터 (단순한 IN 절 사용 - 빠름)
+                if umd_codes and len(umd_codes) > 0:
+                    # 읍면동 선택 시 - 시군구 + 읍면동 조합으로 정확한 필터링
+                    sgg_umd_conditions = []
+                    for umd_code in umd_codes:
+                        umd_data = REGIONS['umd'].get(umd_code, {})
+                        sgg_code = umd_data.get('sgg_code', '')
+                        umd_name = umd_data.get('umd_name', '')
+                        if sgg_code and umd_name:
+                            # LIKE 패턴으로 해당 읍면동의 모든 리를 포함
+                            sgg_umd_conditions.append(f"(sggcd = %s AND umdnm LIKE %s)")
+                            officetel_params.extend([sgg_code, f'{umd_name}%'])
+
+                    if sgg_umd_conditions:
+                        officetel_query += f" AND ({' OR '.join(sgg_umd_conditions)})"
+                elif sgg_codes and len(sgg_codes) > 0:
+                    # 여러 시군구 선택 시
+                    placeholders = ','.join(['%s'] * len(sgg_codes))
+                    officetel_query += f" AND sggcd IN ({placeholders})"
+                    officetel_params.extend(sgg_codes)
+                elif sido_code:
+                    # 시도만 선택했을 때 - 해당 시도의 모든 시군구 포함
+                    sido_sgg_codes = [code for code, data in REGIONS['sigungu'].items() if data['sido_code'] == sido_code]
+                    if sido_sgg_codes:
+                        placeholders = ','.join(['%s'] * len(sido_sgg_codes))
+                        officetel_query += f" AND sggcd IN ({placeholders})"
+                        officetel_params.extend(sido_sgg_codes)
+
+                # 보증금 필터
+                if deposit_min is not None:
+                    officetel_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) >= %s"
+                    officetel_params.append(deposit_min)
+                if deposit_max is not None:
+                    officetel_query += " AND CAST(REPLACE(deposit, ',', '') AS INTEGER) <= %s"
+                    officetel_params.append(deposit_max)
+
+                # 월세 필터
+                if monthly_min is not None:
+                    officetel_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) >= %s"
+                    officetel_params.append(monthly_min)
+                if monthly_max is not None:
+                    officetel_query += " AND CAST(REPLACE(monthlyrent, ',', '') AS INTEGER) <= %s"
+                    officetel_params.append(monthly_max)
+
+                # 건축년도 필터
+                if build_year_min is not None:
+                    officetel_query += " AND CAST(buildyear AS INTEGER) >= %s"
+                    officetel_params.append(build_year_min)
+                if build_year_max is not None:
+                    officetel_query += " AND CAST(buildyear AS INTEGER) <= %s"
+                    officetel_params.append(build_year_max)
+
+                officetel_query += " ORDER BY 계약년월 DESC, 계약일 DESC LIMIT %s OFFSET %s"
+                officetel_params.extend([page_size, offset])
+
+                cursor.execute(officetel_query, officetel_params)
+                officetel_results = cursor.fetchall()
+                for result in officetel_results:
+                    result['source_type'] = 'officetel'
+                all_results.extend(officetel_results)
 
         # 지역명 추가 및 데이터 포맷팅
         for row in all_results:
@@ -999,7 +1426,8 @@ def get_transactions():
         all_results.sort(key=lambda x: (x.get('계약년월', ''), x.get('계약일', '')), reverse=True)
 
         # LH 정보 추가
-        add_lh_info_to_results(all_results, cursor)
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            add_lh_info_to_results(all_results, cursor)
 
         print(f"[DEBUG] LH 필터링 전: 총 {len(all_results)}건", flush=True)
 
@@ -1041,102 +1469,97 @@ def get_building_transactions_old(building_name):
             })
 
         all_results = []
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # 아파트 조회
-        apt_query = """
-            SELECT
-                sggcd,
-                umdnm,
-                jibun,
-                aptnm,
-                excluusear as 계약면적,
-                dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
-                dealday as 계약일,
-                deposit as 보증금,
-                monthlyrent as 월세금,
-                floor as 층,
-                buildyear as 건축년도,
-                contracttype as 계약구분,
-                contractterm as 계약기간,
-                predeposit as 종전계약보증금,
-                premonthlyrent as 종전계약월세,
-                userrright as 갱신요구권사용
-            FROM apt_rent_transactions
-            WHERE sggcd = %s AND umdnm = %s AND aptnm = %s
-            ORDER BY 계약년월 DESC, 계약일 DESC
-        """
-
-        cursor.execute(apt_query, [sgg_code, umd_name, building_name])
-        apt_results = cursor.fetchall()
-        for result in apt_results:
-            result['source_type'] = 'apt'
-        all_results.extend(apt_results)
-
-        # 연립다세대 조회
-        villa_query = """
-            SELECT
-                sggcd,
-                umdnm,
-                jibun,
-                mhousenm as aptnm,
-                excluusear as 계약면적,
-                dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
-                dealday as 계약일,
-                deposit as 보증금,
-                monthlyrent as 월세금,
-                floor as 층,
-                buildyear as 건축년도,
-                contracttype as 계약구분,
-                contractterm as 계약기간,
-                predeposit as 종전계약보증금,
-                premonthlyrent as 종전계약월세,
-                userrright as 갱신요구권사용
-            FROM villa_rent_transactions
-            WHERE sggcd = %s AND umdnm = %s AND mhousenm = %s
-            ORDER BY 계약년월 DESC, 계약일 DESC
-        """
-
-        cursor.execute(villa_query, [sgg_code, umd_name, building_name])
-        villa_results = cursor.fetchall()
-        for result in villa_results:
-            result['source_type'] = 'villa'
-        all_results.extend(villa_results)
-
-        # 오피스텔 조회
-        officetel_query = """
-            SELECT
-                sggcd,
-                umdnm,
-                jibun,
-                offinm as aptnm,
-                excluusear as 계약면적,
-                dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
-                dealday as 계약일,
-                deposit as 보증금,
-                monthlyrent as 월세금,
-                floor as 층,
-                buildyear as 건축년도,
-                contracttype as 계약구분,
-                contractterm as 계약기간,
-                predeposit as 종전계약보증금,
-                premonthlyrent as 종전계약월세,
-                userrright as 갱신요구권사용
-            FROM officetel_rent_transactions
-            WHERE sggcd = %s AND umdnm = %s AND offinm = %s
-            ORDER BY 계약년월 DESC, 계약일 DESC
-        """
-
-        cursor.execute(officetel_query, [sgg_code, umd_name, building_name])
-        officetel_results = cursor.fetchall()
-        for result in officetel_results:
-            result['source_type'] = 'officetel'
-        all_results.extend(officetel_results)
-
-        cursor.close()
-        conn.close()
-
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            # 아파트 조회
+            apt_query = """
+                SELECT
+                    sggcd,
+                    umdnm,
+                    jibun,
+                    aptnm,
+                    excluusear as 계약면적,
+                    dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
+                    dealday as 계약일,
+                    deposit as 보증금,
+                    monthlyrent as 월세금,
+                    floor as 층,
+                    buildyear as 건축년도,
+                    contracttype as 계약구분,
+                    contractterm as 계약기간,
+                    predeposit as 종전계약보증금,
+                    premonthlyrent as 종전계약월세,
+                    userrright as 갱신요구권사용
+                FROM apt_rent_transactions
+                WHERE sggcd = %s AND umdnm = %s AND aptnm = %s
+                ORDER BY 계약년월 DESC, 계약일 DESC
+            """
+
+            cursor.execute(apt_query, [sgg_code, umd_name, building_name])
+            apt_results = cursor.fetchall()
+            for result in apt_results:
+                result['source_type'] = 'apt'
+            all_results.extend(apt_results)
+
+            # 연립다세대 조회
+            villa_query = """
+                SELECT
+                    sggcd,
+                    umdnm,
+                    jibun,
+                    mhousenm as aptnm,
+                    excluusear as 계약면적,
+                    dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
+                    dealday as 계약일,
+                    deposit as 보증금,
+                    monthlyrent as 월세금,
+                    floor as 층,
+                    buildyear as 건축년도,
+                    contracttype as 계약구분,
+                    contractterm as 계약기간,
+                    predeposit as 종전계약보증금,
+                    premonthlyrent as 종전계약월세,
+                    userrright as 갱신요구권사용
+                FROM villa_rent_transactions
+                WHERE sggcd = %s AND umdnm = %s AND mhousenm = %s
+                ORDER BY 계약년월 DESC, 계약일 DESC
+            """
+
+            cursor.execute(villa_query, [sgg_code, umd_name, building_name])
+            villa_results = cursor.fetchall()
+            for result in villa_results:
+                result['source_type'] = 'villa'
+            all_results.extend(villa_results)
+
+            # 오피스텔 조회
+            officetel_query = """
+                SELECT
+                    sggcd,
+                    umdnm,
+                    jibun,
+                    offinm as aptnm,
+                    excluusear as 계약면적,
+                    dealyear || LPAD(dealmonth, 2, '0') as 계약년월,
+                    dealday as 계약일,
+                    deposit as 보증금,
+                    monthlyrent as 월세금,
+                    floor as 층,
+                    buildyear as 건축년도,
+                    contracttype as 계약구분,
+                    contractterm as 계약기간,
+                    predeposit as 종전계약보증금,
+                    premonthlyrent as 종전계약월세,
+                    userrright as 갱신요구권사용
+                FROM officetel_rent_transactions
+                WHERE sggcd = %s AND umdnm = %s AND offinm = %s
+                ORDER BY 계약년월 DESC, 계약일 DESC
+            """
+
+            cursor.execute(officetel_query, [sgg_code, umd_name, building_name])
+            officetel_results = cursor.fetchall()
+            for result in officetel_results:
+                result['source_type'] = 'officetel'
+            all_results.extend(officetel_results)
+
         # 지역명 추가 및 데이터 포맷팅
         for row in all_results:
             sggcd = row['sggcd']
@@ -1314,21 +1737,419 @@ def api_umd():
         })
 
 
-def fetch_officetel_standard_prices_batch(cursor, sggcd, rows):
+# 공동주택가격/오피스텔 기준시가 프로세스 캐시
+# - 고시 가격은 연 1회 정도만 바뀌므로 검색/모달 페이지마다 다시 조회하지 않음
+# - 지역(공동주택가격: 법정동코드 10자리, 기준시가: 시군구코드) 첫 조회 시 지역 전체를 한 번에 적재 →
+#   이후 같은 지역은 키가 없어도(가격 없음) DB 조회 없이 응답
+# - 지역 행 수가 PRICE_CACHE_REGION_MAX_ROWS를 넘으면 키 단위로 조회 결과(없음 포함)만 보관
+# - 전체 키 수가 PRICE_CACHE_MAX_ENTRIES를 넘으면 가장 오래 사용하지 않은 지역부터 제거 (LRU)
+PRICE_CACHE_ENABLED = os.getenv('PRICE_CACHE_ENABLED', '1') == '1'
+PRICE_CACHE_MAX_ENTRIES = int(os.getenv('PRICE_CACHE_MAX_ENTRIES', '500000'))
+PRICE_CACHE_REGION_MAX_ROWS = int(os.getenv('PRICE_CACHE_REGION_MAX_ROWS', '50000'))
+PRICE_CACHE_TTL = float(os.getenv('PRICE_CACHE_TTL', '86400'))  # 지역 유효 시간 (초)
+_price_cache = OrderedDict()  # (종류, 지역코드) -> {'complete': 지역 전체 적재 여부, 'entries': {키: 값 또는 None}, 'expires_at': ...}
+_price_cache_lock = threading.Lock()
+_price_cache_state = {'entries': 0}
+_price_cache_stats = {'hits': 0, 'misses': 0, 'region_loads': 0, 'key_queries': 0, 'evictions': 0, 'expirations': 0}
+
+# 공시가격 정규화 테이블 (create_price_norm_tables.py로 생성)
+# 정수 번지/호/층, 0.01 단위 numeric 면적, 시군구코드(sgg5) 컬럼 + 조회 키 순서의 PK로 변환/정규식 없이 인덱스 조회
+# 테이블이 없거나 PRICE_USE_NORM_TABLES=0이면 원본 테이블(bldg_apartment_price, officetel_standard_price) 조회
+PRICE_USE_NORM_TABLES = os.getenv('PRICE_USE_NORM_TABLES', '1') == '1'
+APARTMENT_PRICE_NORM_TABLE = 'apartment_price_norm'
+OFFICETEL_PRICE_NORM_TABLE = 'officetel_price_norm'
+PRICE_NORM_CHECK_INTERVAL = 300  # 테이블 존재 여부 재확인 주기 (초)
+_price_norm_table_state = {}  # 테이블명 -> {'available': ..., 'checked_at': ...}
+
+
+def price_cache_lookup(kind, wanted, load_regions, query_keys):
+    """가격 캐시 조회 (read-through, 여러 지역을 한 번에)
+
+    kind: 'apt' / 'officetel'
+    wanted: {(지역코드, 결과 키): 조회 조건}
+    load_regions(regions, limit): 처음 조회하는 지역들을 한 쿼리로 적재 → {지역코드: {결과 키: 값}}
+                                 (행 수가 limit 초과인 지역은 결과에서 제외)
+    query_keys(conditions): 나머지 조건을 한 쿼리로 조회 → {(지역코드, 결과 키): 값}
+    Returns: {(지역코드, 결과 키): 값} (가격이 있는 키만)
     """
-    여러 행의 오피스텔 기준시가를 일괄 조회
-    Returns: dict mapping (지번, 층, 면적) -> {'unit_price': ..., 'exclusive_area': ..., 'shared_area': ...}
+    now = time.time()
+    result = {}
+    missing = []
+    new_regions = set()
+
+    with _price_cache_lock:
+        for region in {region for region, _ in wanted}:
+            cache_key = (kind, region)
+            entry = _price_cache.get(cache_key)
+            if entry is not None and entry['expires_at'] < now:
+                del _price_cache[cache_key]
+                _price_cache_state['entries'] -= len(entry['entries'])
+                _price_cache_stats['expirations'] += 1
+            elif entry is not None:
+                _price_cache.move_to_end(cache_key)
+                continue
+            new_regions.add(region)
+
+        for wanted_key in wanted:
+            region, key = wanted_key
+            if region in new_regions:
+                _price_cache_stats['misses'] += 1
+                continue
+            entry = _price_cache[(kind, region)]
+            if entry['complete'] or key in entry['entries']:
+                _price_cache_stats['hits'] += 1
+                if entry['entries'].get(key) is not None:
+                    result[wanted_key] = entry['entries'][key]
+            else:
+                _price_cache_stats['misses'] += 1
+                missing.append(wanted_key)
+
+    if new_regions:
+        # 처음 조회하는 지역: 지역 전체 적재 (가격이 없는 키도 이후 DB 조회 없이 응답)
+        loaded = load_regions(sorted(new_regions), PRICE_CACHE_REGION_MAX_ROWS)
+        for region, region_map in loaded.items():
+            price_cache_store((kind, region), region_map, complete=True)
+        for wanted_key in wanted:
+            region, key = wanted_key
+            if region not in new_regions:
+                continue
+            if region in loaded:
+                if key in loaded[region]:
+                    result[wanted_key] = loaded[region][key]
+            else:
+                missing.append(wanted_key)
+
+    if missing:
+        # 지역이 커서 전체 적재하지 않은 경우: 없는 키만 조회, 결과 없음(None)도 저장
+        found = query_keys([wanted[wanted_key] for wanted_key in missing])
+        by_region = defaultdict(dict)
+        for wanted_key in missing:
+            region, key = wanted_key
+            by_region[region][key] = found.get(wanted_key)
+        for region, values in by_region.items():
+            price_cache_store((kind, region), values, complete=False)
+        result.update({wanted_key: value for wanted_key, value in found.items() if wanted_key in wanted})
+
+    return result
+
+
+def price_cache_store(cache_key, values, complete):
+    """지역 적재 결과 저장 (complete) 또는 키 단위 결과 추가 후 상한 초과분 LRU 제거"""
+    with _price_cache_lock:
+        if complete:
+            _price_cache_stats['region_loads'] += 1
+            previous = _price_cache.pop(cache_key, None)
+            if previous is not None:
+                _price_cache_state['entries'] -= len(previous['entries'])
+            _price_cache[cache_key] = {
+                'complete': True, 'entries': values, 'expires_at': time.time() + PRICE_CACHE_TTL
+            }
+            _price_cache_state['entries'] += len(values)
+        else:
+            _price_cache_stats['key_queries'] += 1
+            entry = _price_cache.get(cache_key)
+            if entry is None:
+                entry = {'complete': False, 'entries': {}, 'expires_at': time.time() + PRICE_CACHE_TTL}
+                _price_cache[cache_key] = entry
+            before = len(entry['entries'])
+            entry['entries'].update(values)
+            _price_cache_state['entries'] += len(entry['entries']) - before
+            _price_cache.move_to_end(cache_key)
+
+        while _price_cache_state['entries'] > PRICE_CACHE_MAX_ENTRIES and len(_price_cache) > 1:
+            _, evicted = _price_cache.popitem(last=False)
+            _price_cache_state['entries'] -= len(evicted['entries'])
+            _price_cache_stats['evictions'] += 1
+
+
+def get_price_cache_stats():
+    """가격 캐시 통계 (키 단위 적중률)"""
+    with _price_cache_lock:
+        lookups = _price_cache_stats['hits'] + _price_cache_stats['misses']
+        return {
+            'enabled': PRICE_CACHE_ENABLED,
+            **_price_cache_stats,
+            'hit_rate': round(_price_cache_stats['hits'] / lookups, 4) if lookups else None,
+            'regions': len(_price_cache),
+            'complete_regions': sum(1 for entry in _price_cache.values() if entry['complete']),
+            'entries': _price_cache_state['entries'],
+            'max_entries': PRICE_CACHE_MAX_ENTRIES,
+            'region_max_rows': PRICE_CACHE_REGION_MAX_ROWS,
+            'ttl': PRICE_CACHE_TTL,
+        }
+
+
+def find_umd_code(sgg_code, umd_name):
+    """(시군구코드, 읍면동명) → 법정동코드 10자리 (REGIONS['umd_by_name'] 역인덱스, 없으면 None)"""
+    return REGIONS['umd_by_name'].get((sgg_code, umd_name))
+
+
+def price_norm_table_available(table_name):
+    """공시가격 정규화 테이블 사용 가능 여부 (PRICE_NORM_CHECK_INTERVAL 동안 캐시)"""
+    if not PRICE_USE_NORM_TABLES:
+        return False
+
+    now = time.time()
+    state = _price_norm_table_state.get(table_name)
+    if state is not None and now - state['checked_at'] < PRICE_NORM_CHECK_INTERVAL:
+        return state['available']
+
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL as available", (table_name,))
+            available = bool(cursor.fetchone()['available'])
+    except Exception as e:
+        print(f"[WARNING] 공시가격 정규화 테이블 확인 실패: {str(e)}")
+        available = False
+
+    if state is None or available != state['available']:
+        print(f"[INFO] 공시가격 조회: {table_name} {'정규화 테이블 사용' if available else '없음 (원본 테이블 사용)'}")
+    _price_norm_table_state[table_name] = {'available': available, 'checked_at': now}
+    return available
+
+
+def officetel_price_key(bunji, ho, floor_int, area_float):
+    """오피스텔 기준시가 결과 키 (지번, 층, 면적) - 번지/호는 0-padding 제거"""
+    bunji = str(int(bunji))
+    ho = str(int(ho))
+    jibun_key = bunji if ho == '0' else f"{bunji}-{ho}"
+    return (jibun_key, floor_int, area_float)
+
+
+def build_officetel_price_map(db_results):
+    """기준시가 조회 결과 → {(지번, 층, 면적): 기준시가 정보}"""
+    price_map = {}
+    for db_row in db_results:
+        # 층 복원
+        floor_code = db_row['건물층구분코드']
+        floor_num = int(db_row['상가건물층주소'])
+        floor_key = -floor_num if floor_code == '지하층' else floor_num
+
+        # 원래 지번 형태로 복원 (0-padding 제거), 면적은 2자리
+        key = officetel_price_key(db_row['번지'], db_row['호'], floor_key, round(float(db_row['전용면적']), 2))
+
+        if key not in price_map:
+            price_map[key] = []
+
+        try:
+            unit_price = float(db_row['고시가격'])
+            exclusive_area = float(db_row['전용면적'])
+            shared_area = float(db_row['공유면적'])
+            price_map[key].append({
+                'unit_price': unit_price,
+                'exclusive_area': exclusive_area,
+                'shared_area': shared_area
+            })
+        except:
+            continue
+
+    # 평균 계산 및 결과 맵 생성
+    result_map = {}
+    for key, prices in price_map.items():
+        if prices:
+            # 첫 번째 값 사용 (DISTINCT로 중복 제거되어 있음)
+            data = prices[0]
+            total_area = data['exclusive_area'] + data['shared_area']
+            standard_price = data['unit_price'] * total_area
+            threshold_126 = standard_price * 1.26
+
+            result_map[key] = {
+                'unit_price': data['unit_price'],
+                'exclusive_area': data['exclusive_area'],
+                'shared_area': data['shared_area'],
+                'total_area': total_area,
+                'standard_price': int(standard_price),
+                'threshold_126': int(threshold_126)
+            }
+    return result_map
+
+
+def build_officetel_price_norm_map(db_results):
+    """officetel_price_norm 조회 결과 → {(지번, 층, 면적): 기준시가 정보} (면적계/기준시가/126% 계산 완료)"""
+    result_map = {}
+    for db_row in db_results:
+        key = officetel_price_key(db_row['bunji'], db_row['ho'], db_row['floor'], float(db_row['area']))
+        result_map[key] = {
+            'unit_price': float(db_row['unit_price']),
+            'exclusive_area': float(db_row['exclusive_area']),
+            'shared_area': float(db_row['shared_area']),
+            'total_area': float(db_row['total_area']),
+            'standard_price': db_row['standard_price'],
+            'threshold_126': db_row['threshold_126']
+        }
+    return result_map
+
+
+def group_rows_by_region(db_results, region_col):
+    """조회 결과 행을 지역코드별로 분리"""
+    grouped = defaultdict(list)
+    for db_row in db_results:
+        grouped[db_row[region_col]].append(db_row)
+    return grouped
+
+
+def load_officetel_prices_regions(cursor, sgg_codes, limit):
+    """여러 시군구의 오피스텔 기준시가를 한 쿼리로 적재 → {시군구코드: 결과 맵} (행 수가 limit 초과인 시군구 제외)"""
+    norm = price_norm_table_available(OFFICETEL_PRICE_NORM_TABLE)
+    if norm:
+        execute_prepared(cursor, f"""
+            SELECT * FROM (
+                SELECT p.sgg5, p.bunji, p.ho, p.floor, p.area, p.unit_price, p.exclusive_area, p.shared_area,
+                       p.total_area, p.standard_price, p.threshold_126,
+                       row_number() OVER (PARTITION BY p.sgg5) as rn
+                FROM {OFFICETEL_PRICE_NORM_TABLE} p
+                WHERE p.sgg5 = ANY(%s)
+            ) w
+            WHERE w.rn <= %s
+        """, [sgg_codes, limit + 1])
+    else:
+        execute_prepared(cursor, """
+            SELECT * FROM (
+                SELECT d.*, row_number() OVER (PARTITION BY d.sgg5) as rn
+                FROM (
+                    SELECT DISTINCT
+                        LEFT(p."법정동코드", 5) as sgg5,
+                        p."번지", p."호", p."상가건물층주소", p."건물층구분코드", p."전용면적"::FLOAT as 전용면적,
+                        p."공유면적"::FLOAT as 공유면적, p."고시가격"::FLOAT as 고시가격
+                    FROM officetel_standard_price p
+                    WHERE LEFT(p."법정동코드", 5) = ANY(%s)
+                      AND p."건물층구분코드" IN ('지상층', '지하층')
+                      AND p."번지" ~ '^[0-9]+$' AND p."호" ~ '^[0-9]+$' AND p."상가건물층주소" ~ '^[0-9]+$'
+                ) d
+            ) w
+            WHERE w.rn <= %s
+        """, [sgg_codes, limit + 1])
+    grouped = group_rows_by_region(cursor.fetchall(), 'sgg5')
+
+    loaded = {}
+    for sgg5 in sgg_codes:
+        db_results = grouped.get(sgg5, [])
+        if len(db_results) > limit:
+            print(f"[INFO] 기준시가 캐시: 시군구 {sgg5} 행 수가 {limit}건 초과, 키 단위 캐시 사용")
+            continue
+        loaded[sgg5] = build_officetel_price_norm_map(db_results) if norm else build_officetel_price_map(db_results)
+    print(f"[INFO] 기준시가 캐시: 시군구 {len(loaded)}/{len(sgg_codes)}개 적재")
+    return loaded
+
+
+def query_officetel_prices_norm(cursor, conditions):
+    """officetel_price_norm에서 조회 - PK (sgg5, bunji, ho, floor, area) 조인"""
+    keys = [
+        (cond['region'], int(cond['bunji']), int(cond['ho']), cond['floor_int'], cond['area_float'])
+        for cond in conditions
+    ]
+    key_table = unnest_keys_sql([
+        ('sgg5', 'text'), ('bunji', 'integer'), ('ho', 'integer'), ('floor', 'integer'), ('area', 'numeric')
+    ])
+    query = f"""
+        SELECT p.sgg5, p.bunji, p.ho, p.floor, p.area, p.unit_price, p.exclusive_area, p.shared_area,
+               p.total_area, p.standard_price, p.threshold_126
+        FROM {key_table}
+        JOIN {OFFICETEL_PRICE_NORM_TABLE} p ON
+            p.sgg5 = k.sgg5
+            AND p.bunji = k.bunji
+            AND p.ho = k.ho
+            AND p.floor = k.floor
+            AND p.area = k.area
     """
-    print(f"[DEBUG 오피스텔일괄] 시작: {len(rows)}건, sggcd={sggcd}")
+    params = unnest_keys_params(keys, 5)
 
-    if not rows:
-        print("[DEBUG 오피스텔일괄] rows가 비어있음")
-        return {}
+    execute_prepared(cursor, query, params)
+    db_results = cursor.fetchall()
+    print(f"[DEBUG 오피스텔일괄] 정규화 테이블 조회: {len(keys)}개 키 → {len(db_results)}건")
+    return {
+        (sgg5, key): value
+        for sgg5, rows in group_rows_by_region(db_results, 'sgg5').items()
+        for key, value in build_officetel_price_norm_map(rows).items()
+    }
+
+
+def query_officetel_prices(cursor, conditions):
+    """조건 목록(여러 시군구)의 오피스텔 기준시가를 unnest 조인 한 번으로 조회 → {(시군구코드, 결과 키): 값}"""
+    if price_norm_table_available(OFFICETEL_PRICE_NORM_TABLE):
+        return query_officetel_prices_norm(cursor, conditions)
+
+    # 조회 키: 시군구코드, 번지(int), 호(int), 층구분(지하층/지상층), 층 번호(int), 면적(float) - unnest 후 기준시가 테이블과 조인
+    keys = [
+        (
+            cond['region'],
+            int(cond['bunji']),
+            int(cond['ho']),
+            '지하층' if cond['floor_int'] < 0 else '지상층',
+            abs(cond['floor_int']),
+            cond['area_float'],
+        )
+        for cond in conditions
+    ]
+    key_table = unnest_keys_sql([
+        ('sgg5', 'text'), ('bunji', 'integer'), ('ho', 'integer'), ('floor_code', 'text'), ('floor_num', 'integer'),
+        ('area', 'float8')
+    ])
+
+    # 숫자가 아닌 번지/호/층주소는 CASE로 NULL 처리 (캐스팅 오류 방지, 매칭 제외)
+    query = f"""
+        SELECT DISTINCT
+            k.sgg5, p."번지", p."호", p."상가건물층주소", p."건물층구분코드", p."전용면적"::FLOAT as 전용면적,
+            p."공유면적"::FLOAT as 공유면적, p."고시가격"::FLOAT as 고시가격
+        FROM {key_table}
+        JOIN officetel_standard_price p ON
+            LEFT(p."법정동코드", 5) = k.sgg5
+            AND CASE WHEN p."번지" ~ '^[0-9]+$' THEN p."번지"::INTEGER END = k.bunji
+            AND CASE WHEN p."호" ~ '^[0-9]+$' THEN p."호"::INTEGER END = k.ho
+            AND p."건물층구분코드" = k.floor_code
+            AND CASE WHEN p."상가건물층주소" ~ '^[0-9]+$' THEN p."상가건물층주소"::INTEGER END = k.floor_num
+            AND p."전용면적"::FLOAT = k.area
+    """
+    params = unnest_keys_params(keys, 6)
+
+    print(f"[DEBUG 오피스텔일괄] 쿼리 실행: {len(keys)}개 키")
+    print(f"[DEBUG 오피스텔일괄] 첫 3개 키 샘플: {keys[:3]}")
+
+    execute_prepared(cursor, query, params)
+    db_results = cursor.fetchall()
+    print(f"[DEBUG 오피스텔일괄] DB 결과: {len(db_results)}건")
+
+    sgg5 = conditions[0]['region']
+    if len(db_results) > 0:
+        print(f"[DEBUG 오피스텔일괄] DB 샘플 결과: 번지={db_results[0]['번지']}, 호={db_results[0]['호']}, 층구분={db_results[0]['건물층구분코드']}, 층주소={db_results[0]['상가건물층주소']}, 전용면적={db_results[0]['전용면적']}")
+    else:
+        # 0건인 경우 디버깅: 해당 법정동코드에 데이터가 있는지 확인
+        test_query = """
+            SELECT COUNT(*) as cnt,
+                   MIN("번지") as min_bunji, MAX("번지") as max_bunji,
+                   MIN("호") as min_ho, MAX("호") as max_ho
+            FROM officetel_standard_price
+            WHERE LEFT("법정동코드", 5) = %s
+        """
+        cursor.execute(test_query, [sgg5])
+        test_result = cursor.fetchone()
+        print(f"[DEBUG 오피스텔일괄] 해당 법정동코드({sgg5}) 총 데이터: {test_result['cnt']}건, 번지범위: {test_result['min_bunji']}~{test_result['max_bunji']}, 호범위: {test_result['min_ho']}~{test_result['max_ho']}")
+
+        # 첫 번째 조건으로 샘플 검색
+        if conditions:
+            first_cond = conditions[0]
+            sample_query = """
+                SELECT "번지", "호", "건물층구분코드", "상가건물층주소", "전용면적"::FLOAT as 전용면적
+                FROM officetel_standard_price
+                WHERE LEFT("법정동코드", 5) = %s
+                  AND "번지" = %s
+                LIMIT 5
+            """
+            cursor.execute(sample_query, [sgg5, first_cond['bunji']])
+            samples = cursor.fetchall()
+            print(f"[DEBUG 오피스텔일괄] 첫 조건 번지({first_cond['bunji']}) 샘플: {len(samples)}건")
+            for s in samples[:3]:
+                print(f"  - 번지={s['번지']}(타입:{type(s['번지']).__name__}), 호={s['호']}(타입:{type(s['호']).__name__}), 층={s['상가건물층주소']}(타입:{type(s['상가건물층주소']).__name__}), 면적={s['전용면적']}")
+
+    return {
+        (sgg5, key): value
+        for sgg5, rows in group_rows_by_region(db_results, 'sgg5').items()
+        for key, value in build_officetel_price_map(rows).items()
+    }
 
-    # 법정동코드 5자리 사용
-    bjdcd_5 = sggcd
-    print(f"[DEBUG 오피스텔일괄] 법정동코드 5자리: {bjdcd_5}")
 
+def officetel_price_conditions(sggcd, rows):
+    """시군구 하나의 행 목록 → 기준시가 조회 조건 목록 (번지/호/층/면적 변환 실패 행 제외)"""
     # 모든 row의 조건 수집
     conditions = []
     for idx, row in enumerate(rows):
@@ -1379,177 +2200,223 @@ def fetch_officetel_standard_prices_batch(cursor, sggcd, rows):
             'bunji': bunji,
             'ho': ho,
             'floor_int': floor_int,
-            'area_float': area_float
+            'area_float': area_float,
+            'region': sggcd
         })
 
         # 처음 3개 조건만 로그 출력
         if idx < 3:
             print(f"[DEBUG 오피스텔일괄] 조건{idx}: 지번={jibun}, bunji={bunji}, ho={ho}, floor_int={floor_int}, area={area_float}")
 
-    if not conditions:
-        print("[DEBUG 오피스텔일괄] 조건이 하나도 없음")
-        return {}
+    return conditions
 
-    print(f"[DEBUG 오피스텔일괄] 총 {len(conditions)}개 조건 생성")
 
-    # WHERE 절 생성 (OR로 연결)
-    where_parts = []
-    params = [bjdcd_5]
+def fetch_officetel_prices_multi(cursor, region_rows):
+    """
+    여러 시군구의 오피스텔 기준시가를 일괄 조회 (시군구 수와 관계없이 조회 쿼리 1회)
+    region_rows: {시군구코드: 행 목록}
+    Returns: {시군구코드: {(지번, 층, 면적): {'unit_price': ..., 'exclusive_area': ..., 'shared_area': ...}}}
+    PRICE_CACHE_ENABLED면 시군구 단위 프로세스 캐시를 거쳐 조회
+    """
+    conditions = []
+    for sggcd, rows in region_rows.items():
+        conditions.extend(officetel_price_conditions(sggcd, rows))
 
-    for cond in conditions:
-        # 층 구분 조건 (파라미터는 나중에 추가)
-        if cond['floor_int'] < 0:
-            # 지하층
-            floor_condition = '("건물층구분코드" = \'지하층\' AND "상가건물층주소" ~ \'^[0-9]+$\' AND "상가건물층주소"::INTEGER = %s)'
-            floor_param = abs(cond['floor_int'])
-        else:
-            # 지상층
-            floor_condition = '("건물층구분코드" = \'지상층\' AND "상가건물층주소" ~ \'^[0-9]+$\' AND "상가건물층주소"::INTEGER = %s)'
-            floor_param = cond['floor_int']
+    print(f"[DEBUG 오피스텔일괄] 시군구 {len(region_rows)}개, 총 {len(conditions)}개 조건 생성")
+    if not conditions:
+        return {}
 
-        where_parts.append(
-            f'("번지" ~ \'^[0-9]+$\' AND "번지"::INTEGER = %s AND "호" ~ \'^[0-9]+$\' AND "호"::INTEGER = %s AND {floor_condition} AND "전용면적"::FLOAT = %s)'
+    if PRICE_CACHE_ENABLED:
+        wanted = {
+            (cond['region'], officetel_price_key(cond['bunji'], cond['ho'], cond['floor_int'], cond['area_float'])): cond
+            for cond in conditions
+        }
+        found = price_cache_lookup(
+            'officetel', wanted,
+            lambda regions, limit: load_officetel_prices_regions(cursor, regions, limit),
+            lambda missing: query_officetel_prices(cursor, missing)
         )
-        # WHERE 절의 순서대로 파라미터 추가: 번지(int), 호(int), 층(int), 면적(float)
-        params.extend([int(cond['bunji']), int(cond['ho']), floor_param, cond['area_float']])
+    else:
+        found = query_officetel_prices(cursor, conditions)
 
-    query = f"""
-        SELECT DISTINCT
-            "번지", "호", "상가건물층주소", "건물층구분코드", "전용면적"::FLOAT as 전용면적,
-            "공유면적"::FLOAT as 공유면적, "고시가격"::FLOAT as 고시가격
-        FROM officetel_standard_price
-        WHERE LEFT("법정동코드", 5) = %s
-          AND ({' OR '.join(where_parts)})
-    """
+    price_maps = defaultdict(dict)
+    for (sggcd, key), value in found.items():
+        price_maps[sggcd][key] = value
+    print(f"[DEBUG 오피스텔일괄] 매핑 완료: {len(found)}건")
+    return price_maps
 
-    print(f"[DEBUG 오피스텔일괄] 쿼리 실행: {len(conditions)}개 조건")
-    print(f"[DEBUG 오피스텔일괄] 법정동코드 파라미터: {params[0]}")
-    print(f"[DEBUG 오피스텔일괄] 첫 3개 조건 파라미터 샘플: {params[1:min(13, len(params))]}")  # 첫 3개 조건 = 12개 파라미터
 
-    # 실제 쿼리 출력 (첫 1000자만)
-    try:
-        formatted_query = query % tuple(f"'{p}'" if isinstance(p, str) else str(p) for p in params)
-        print(f"[DEBUG 오피스텔일괄] 실제 쿼리 샘플:\n{formatted_query[:1000]}")
-    except:
-        pass
+def fetch_officetel_standard_prices_batch(cursor, sggcd, rows):
+    """
+    시군구 하나의 오피스텔 기준시가를 일괄 조회 (모달 등 단일 시군구용)
+    Returns: dict mapping (지번, 층, 면적) -> {'unit_price': ..., 'exclusive_area': ..., 'shared_area': ...}
+    """
+    if not rows:
+        return {}
+    return fetch_officetel_prices_multi(cursor, {sggcd: rows}).get(sggcd, {})
 
-    cursor.execute(query, params)
-    db_results = cursor.fetchall()
-    print(f"[DEBUG 오피스텔일괄] DB 결과: {len(db_results)}건")
 
-    if len(db_results) > 0:
-        print(f"[DEBUG 오피스텔일괄] DB 샘플 결과: 번지={db_results[0]['번지']}, 호={db_results[0]['호']}, 층구분={db_results[0]['건물층구분코드']}, 층주소={db_results[0]['상가건물층주소']}, 전용면적={db_results[0]['전용면적']}")
-    else:
-        # 0건인 경우 디버깅: 해당 법정동코드에 데이터가 있는지 확인
-        test_query = """
-            SELECT COUNT(*) as cnt,
-                   MIN("번지") as min_bunji, MAX("번지") as max_bunji,
-                   MIN("호") as min_ho, MAX("호") as max_ho
-            FROM officetel_standard_price
-            WHERE LEFT("법정동코드", 5) = %s
-        """
-        cursor.execute(test_query, [bjdcd_5])
-        test_result = cursor.fetchone()
-        print(f"[DEBUG 오피스텔일괄] 해당 법정동코드({bjdcd_5}) 총 데이터: {test_result['cnt']}건, 번지범위: {test_result['min_bunji']}~{test_result['max_bunji']}, 호범위: {test_result['min_ho']}~{test_result['max_ho']}")
+def apartment_price_key(bon, bu, floor_int, area_float):
+    """공동주택가격 결과 키 (지번, 층, 면적) - 본번/부번은 공백 제거"""
+    bon = str(bon).strip()
+    bu = str(bu).strip()
+    jibun_key = bon if bu == '0' else f"{bon}-{bu}"
+    return (jibun_key, floor_int, area_float)
 
-        # 첫 번째 조건으로 샘플 검색
-        if conditions:
-            first_cond = conditions[0]
-            sample_query = """
-                SELECT "번지", "호", "건물층구분코드", "상가건물층주소", "전용면적"::FLOAT as 전용면적
-                FROM officetel_standard_price
-                WHERE LEFT("법정동코드", 5) = %s
-                  AND "번지" = %s
-                LIMIT 5
-            """
-            cursor.execute(sample_query, [bjdcd_5, first_cond['bunji']])
-            samples = cursor.fetchall()
-            print(f"[DEBUG 오피스텔일괄] 첫 조건 번지({first_cond['bunji']}) 샘플: {len(samples)}건")
-            for s in samples[:3]:
-                print(f"  - 번지={s['번지']}(타입:{type(s['번지']).__name__}), 호={s['호']}(타입:{type(s['호']).__name__}), 층={s['상가건물층주소']}(타입:{type(s['상가건물층주소']).__name__}), 면적={s['전용면적']}")
 
-    # 결과를 딕셔너리로 매핑
+def build_apartment_price_map(db_results):
+    """공동주택가격 조회 결과 → {(지번, 층, 면적): {'price': 평균 공시가격, 'threshold_126': ...}}"""
     price_map = {}
     for db_row in db_results:
-        # 원래 지번 형태로 복원 (0-padding 제거를 위해 int 변환 후 다시 str)
-        bunji = str(int(db_row['번지']))
-        ho = str(int(db_row['호']))
-        jibun_key = bunji if ho == '0' else f"{bunji}-{ho}"
-
-        # 층 복원
-        floor_code = db_row['건물층구분코드']
-        floor_num = int(db_row['상가건물층주소'])
-        floor_key = -floor_num if floor_code == '지하층' else floor_num
-
-        # 면적
-        area_key = round(float(db_row['전용면적']), 2)
-
-        key = (jibun_key, floor_key, area_key)
+        # 면적을 2자리로 반올림 (쿼리 시와 동일하게)
+        try:
+            key = apartment_price_key(db_row['본번'], db_row['부번'], int(db_row['층번호']), round(float(db_row['면적']), 2))
+        except (TypeError, ValueError):
+            continue
 
         if key not in price_map:
             price_map[key] = []
 
         try:
-            unit_price = float(db_row['고시가격'])
-            exclusive_area = float(db_row['전용면적'])
-            shared_area = float(db_row['공유면적'])
-            price_map[key].append({
-                'unit_price': unit_price,
-                'exclusive_area': exclusive_area,
-                'shared_area': shared_area
-            })
+            price = float(db_row['공시가격'])
+            price_map[key].append(price)
         except:
             continue
 
-    # 평균 계산 및 결과 맵 생성
+    # 평균 계산 및 126% 임계값
     result_map = {}
     for key, prices in price_map.items():
         if prices:
-            # 첫 번째 값 사용 (DISTINCT로 중복 제거되어 있음)
-            data = prices[0]
-            total_area = data['exclusive_area'] + data['shared_area']
-            standard_price = data['unit_price'] * total_area
-            threshold_126 = standard_price * 1.26
-
+            avg_price = sum(prices) / len(prices)
             result_map[key] = {
-                'unit_price': data['unit_price'],
-                'exclusive_area': data['exclusive_area'],
-                'shared_area': data['shared_area'],
-                'total_area': total_area,
-                'standard_price': int(standard_price),
-                'threshold_126': int(threshold_126)
+                'price': int(avg_price),
+                'threshold_126': int(avg_price * 1.26)
             }
+    return result_map
 
-    print(f"[DEBUG 오피스텔일괄] 매핑 완료: {len(result_map)}건")
-    if result_map:
-        sample_key = list(result_map.keys())[0]
-        print(f"[DEBUG 오피스텔일괄] 샘플 키: {sample_key}")
 
-    return result_map
+def build_apartment_price_norm_map(db_results):
+    """apartment_price_norm 조회 결과 → {(지번, 층, 면적): {'price': ..., 'threshold_126': ...}} (평균/126% 계산 완료)"""
+    return {
+        apartment_price_key(db_row['bon'], db_row['bu'], db_row['floor'], float(db_row['area'])): {
+            'price': db_row['price'],
+            'threshold_126': db_row['threshold_126']
+        }
+        for db_row in db_results
+    }
 
 
-def fetch_apartment_prices_batch(cursor, sggcd, umdnm, rows):
+def load_apartment_prices_regions(cursor, bjdcd_codes, limit):
+    """여러 법정동의 공동주택가격을 한 쿼리로 적재 → {법정동코드: 결과 맵} (행 수가 limit 초과인 법정동 제외)"""
+    norm = price_norm_table_available(APARTMENT_PRICE_NORM_TABLE)
+    if norm:
+        execute_prepared(cursor, f"""
+            SELECT * FROM (
+                SELECT p.bjdcd, p.bon, p.bu, p.floor, p.area, p.price, p.threshold_126,
+                       row_number() OVER (PARTITION BY p.bjdcd) as rn
+                FROM {APARTMENT_PRICE_NORM_TABLE} p
+                WHERE p.bjdcd = ANY(%s)
+            ) w
+            WHERE w.rn <= %s
+        """, [bjdcd_codes, limit + 1])
+    else:
+        execute_prepared(cursor, """
+            SELECT * FROM (
+                SELECT d.*, row_number() OVER (PARTITION BY d.bjdcd) as rn
+                FROM (
+                    SELECT DISTINCT
+                        p."법정동코드" as bjdcd,
+                        p."본번", p."부번", p."층번호", p."공동주택전유면적"::FLOAT as 면적, p."공시가격"
+                    FROM bldg_apartment_price p
+                    WHERE p."법정동코드" = ANY(%s)
+                ) d
+            ) w
+            WHERE w.rn <= %s
+        """, [bjdcd_codes, limit + 1])
+    grouped = group_rows_by_region(cursor.fetchall(), 'bjdcd')
+
+    loaded = {}
+    for bjdcd_10 in bjdcd_codes:
+        db_results = grouped.get(bjdcd_10, [])
+        if len(db_results) > limit:
+            print(f"[INFO] 공동주택가격 캐시: 법정동 {bjdcd_10} 행 수가 {limit}건 초과, 키 단위 캐시 사용")
+            continue
+        loaded[bjdcd_10] = build_apartment_price_norm_map(db_results) if norm else build_apartment_price_map(db_results)
+    print(f"[INFO] 공동주택가격 캐시: 법정동 {len(loaded)}/{len(bjdcd_codes)}개 적재")
+    return loaded
+
+
+def query_apartment_prices_norm(cursor, conditions):
+    """apartment_price_norm에서 조회 - PK (bjdcd, bon, bu, floor, area) 조인 (본번/부번이 숫자가 아니면 제외)"""
+    keys = [
+        (cond['region'], int(cond['bon']), int(cond['bu']), int(cond['floor_str']), cond['area_float'])
+        for cond in conditions
+        if cond['bon'].isdigit() and cond['bu'].isdigit()
+    ]
+    if not keys:
+        return {}
+    key_table = unnest_keys_sql([
+        ('bjdcd', 'text'), ('bon', 'integer'), ('bu', 'integer'), ('floor', 'integer'), ('area', 'numeric')
+    ])
+    query = f"""
+        SELECT p.bjdcd, p.bon, p.bu, p.floor, p.area, p.price, p.threshold_126
+        FROM {key_table}
+        JOIN {APARTMENT_PRICE_NORM_TABLE} p ON
+            p.bjdcd = k.bjdcd
+            AND p.bon = k.bon
+            AND p.bu = k.bu
+            AND p.floor = k.floor
+            AND p.area = k.area
     """
-    여러 행의 공동주택가격을 일괄 조회 (N+1 쿼리 문제 해결)
-    Returns: dict mapping (지번, 층, 면적) -> {'price': ..., 'threshold_126': ...}
+    params = unnest_keys_params(keys, 5)
+
+    execute_prepared(cursor, query, params)
+    db_results = cursor.fetchall()
+    print(f"[DEBUG 일괄조회] 정규화 테이블 조회: {len(keys)}개 키 → {len(db_results)}건")
+    return {
+        (bjdcd_10, key): value
+        for bjdcd_10, rows in group_rows_by_region(db_results, 'bjdcd').items()
+        for key, value in build_apartment_price_norm_map(rows).items()
+    }
+
+
+def query_apartment_prices(cursor, conditions):
+    """조건 목록(여러 법정동)의 공동주택가격을 unnest 조인 한 번으로 조회 → {(법정동코드, 결과 키): 값}"""
+    if price_norm_table_available(APARTMENT_PRICE_NORM_TABLE):
+        return query_apartment_prices_norm(cursor, conditions)
+
+    # 조회 키: 법정동코드, 본번, 부번, 층번호, 면적 - unnest 후 공동주택가격 테이블과 조인
+    keys = [(cond['region'], cond['bon'], cond['bu'], cond['floor_str'], cond['area_float']) for cond in conditions]
+    key_table = unnest_keys_sql([('bjdcd', 'text'), ('bon', 'text'), ('bu', 'text'), ('floor', 'text'), ('area', 'float8')])
+
+    query = f"""
+        SELECT DISTINCT
+            k.bjdcd, p."본번", p."부번", p."층번호", p."공동주택전유면적"::FLOAT as 면적, p."공시가격"
+        FROM {key_table}
+        JOIN bldg_apartment_price p ON
+            p."법정동코드" = k.bjdcd
+            AND p."본번" = k.bon
+            AND p."부번" = k.bu
+            AND p."층번호" = k.floor
+            AND p."공동주택전유면적"::FLOAT = k.area
     """
-    print(f"[DEBUG 일괄조회] 시작: {len(rows)}건, sggcd={sggcd}, umdnm={umdnm}")
+    params = unnest_keys_params(keys, 5)
 
-    if not rows:
-        print("[DEBUG 일괄조회] rows가 비어있음")
-        return {}
+    print(f"[DEBUG 일괄조회] 쿼리 실행: {len(keys)}개 키")
 
-    # 법정동코드 10자리 찾기
-    bjdcd_10 = None
-    for code, info in REGIONS['umd'].items():
-        if info['sgg_code'] == sggcd and info['umd_name'] == umdnm:
-            bjdcd_10 = code
-            break
+    execute_prepared(cursor, query, params)
+    db_results = cursor.fetchall()
+    print(f"[DEBUG 일괄조회] DB 결과: {len(db_results)}건")
+
+    return {
+        (bjdcd_10, key): value
+        for bjdcd_10, rows in group_rows_by_region(db_results, 'bjdcd').items()
+        for key, value in build_apartment_price_map(rows).items()
+    }
 
-    if not bjdcd_10:
-        print(f"[DEBUG 일괄조회] 법정동코드 찾기 실패")
-        return {}
 
+def apartment_price_conditions(bjdcd_10, rows):
+    """법정동 하나의 행 목록 → 공동주택가격 조회 조건 목록 (층/면적 변환 실패 행 제외)"""
     # 모든 row의 조건 수집
     conditions = []
     for row in rows:
@@ -1585,74 +2452,61 @@ def fetch_apartment_prices_batch(cursor, sggcd, umdnm, rows):
             'bon': bon,
             'bu': bu,
             'floor_str': floor_str,
-            'area_float': area_float
+            'area_float': area_float,
+            'region': bjdcd_10
         })
 
-    if not conditions:
-        return {}
-
-    # WHERE 절 생성 (OR로 연결)
-    where_parts = []
-    params = [bjdcd_10]
+    return conditions
 
-    for cond in conditions:
-        where_parts.append(
-            '("본번" = %s AND "부번" = %s AND "층번호" = %s AND "공동주택전유면적"::FLOAT = %s)'
-        )
-        params.extend([cond['bon'], cond['bu'], cond['floor_str'], cond['area_float']])
 
-    query = f"""
-        SELECT DISTINCT
-            "본번", "부번", "층번호", "공동주택전유면적"::FLOAT as 면적, "공시가격"
-        FROM bldg_apartment_price
-        WHERE "법정동코드" = %s
-          AND ({' OR '.join(where_parts)})
+def fetch_apartment_prices_multi(cursor, region_rows):
     """
+    여러 법정동의 공동주택가격을 일괄 조회 (법정동 수와 관계없이 조회 쿼리 1회)
+    region_rows: {법정동코드 10자리: 행 목록}
+    Returns: {법정동코드: {(지번, 층, 면적): {'price': ..., 'threshold_126': ...}}}
+    PRICE_CACHE_ENABLED면 법정동 단위 프로세스 캐시를 거쳐 조회
+    """
+    conditions = []
+    for bjdcd_10, rows in region_rows.items():
+        conditions.extend(apartment_price_conditions(bjdcd_10, rows))
 
-    print(f"[DEBUG 일괄조회] 쿼리 실행: {len(conditions)}개 조건")
-
-    cursor.execute(query, params)
-    db_results = cursor.fetchall()
-    print(f"[DEBUG 일괄조회] DB 결과: {len(db_results)}건")
-
-    # 결과를 딕셔너리로 매핑
-    price_map = {}
-    for db_row in db_results:
-        # 원래 지번 형태로 복원 (공백 제거)
-        bon = str(db_row['본번']).strip()
-        bu = str(db_row['부번']).strip()
-        jibun_key = bon if bu == '0' else f"{bon}-{bu}"
-        floor_key = int(db_row['층번호'])
-        # 면적을 2자리로 반올림 (쿼리 시와 동일하게)
-        area_key = round(float(db_row['면적']), 2)
-
-        key = (jibun_key, floor_key, area_key)
+    print(f"[DEBUG 일괄조회] 법정동 {len(region_rows)}개, 총 {len(conditions)}개 조건 생성")
+    if not conditions:
+        return {}
 
-        if key not in price_map:
-            price_map[key] = []
+    if PRICE_CACHE_ENABLED:
+        wanted = {
+            (cond['region'], apartment_price_key(cond['bon'], cond['bu'], int(cond['floor_str']), cond['area_float'])): cond
+            for cond in conditions
+        }
+        found = price_cache_lookup(
+            'apt', wanted,
+            lambda regions, limit: load_apartment_prices_regions(cursor, regions, limit),
+            lambda missing: query_apartment_prices(cursor, missing)
+        )
+    else:
+        found = query_apartment_prices(cursor, conditions)
 
-        try:
-            price = float(db_row['공시가격'])
-            price_map[key].append(price)
-        except:
-            continue
+    price_maps = defaultdict(dict)
+    for (bjdcd_10, key), value in found.items():
+        price_maps[bjdcd_10][key] = value
+    print(f"[DEBUG 일괄조회] 매핑 완료: {len(found)}건")
+    return price_maps
 
-    # 평균 계산 및 126% 임계값
-    result_map = {}
-    for key, prices in price_map.items():
-        if prices:
-            avg_price = sum(prices) / len(prices)
-            result_map[key] = {
-                'price': int(avg_price),
-                'threshold_126': int(avg_price * 1.26)
-            }
 
-    print(f"[DEBUG 일괄조회] 매핑 완료: {len(result_map)}건")
-    if result_map:
-        sample_key = list(result_map.keys())[0]
-        print(f"[DEBUG 일괄조회] 샘플 키: {sample_key}")
+def fetch_apartment_prices_batch(cursor, sggcd, umdnm, rows):
+    """
+    읍면동 하나의 공동주택가격을 일괄 조회 (모달 등 단일 읍면동용)
+    Returns: dict mapping (지번, 층, 면적) -> {'price': ..., 'threshold_126': ...}
+    """
+    if not rows:
+        return {}
 
-    return result_map
+    bjdcd_10 = find_umd_code(sggcd, umdnm)
+    if not bjdcd_10:
+        print(f"[DEBUG 일괄조회] 법정동코드 찾기 실패: sggcd={sggcd}, umdnm={umdnm}")
+        return {}
+    return fetch_apartment_prices_multi(cursor, {bjdcd_10: rows}).get(bjdcd_10, {})
 
 
 def fetch_apartment_price_for_row(cursor, sggcd, umdnm, jibun, floor, excluusear, dong_no=None):
@@ -1667,11 +2521,7 @@ def fetch_apartment_price_for_row(cursor, sggcd, umdnm, jibun, floor, excluusear
             return None
 
         # 법정동코드 10자리 찾기 (시군구코드 5자리 + 법정동코드 5자리)
-        bjdcd_10 = None
-        for code, info in REGIONS['umd'].items():
-            if info['sgg_code'] == sggcd and info['umd_name'] == umdnm:
-                bjdcd_10 = code  # 전체 10자리
-                break
+        bjdcd_10 = find_umd_code(sggcd, umdnm)
 
         if not bjdcd_10:
             print(f"[DEBUG 공동주택] 법정동코드 찾기 실패: sggcd={sggcd}, umdnm={umdnm}")
@@ -1745,977 +2595,1795 @@ def fetch_apartment_price_for_row(cursor, sggcd, umdnm, jibun, floor, excluusear
         return None
 
 
-def fetch_unit_info_for_row(cursor, sggcd, umdnm, jibun, floor, excluusear):
-    """
-    단일 행의 호실 정보를 조회하는 헬퍼 함수
-    Returns: dict with 'unit', 'all_units', 'has_more' keys
-    """
+# 여러 행의 호실 조회를 쿼리 1회로 처리 (키 배열 unnest → 키마다 LATERAL로 전유부 호실 조회, 키당 LIMIT 100)
+# 같은 키는 unnest 단계에서 한 번만 조회, 키 컬럼은 build_unit_info_params 순서
+UNIT_INFO_KEY_COLUMNS = ['sggcd', 'bjdcd', 'bon', 'bu', 'floor_code', 'floor_num', 'area']
+UNIT_INFO_BATCH_QUERY = f"""
+    SELECT {', '.join(f'k.{name}' for name in UNIT_INFO_KEY_COLUMNS)}, u."동_명", u."호_명"
+    FROM {unnest_keys_sql([(name, 'text') for name in UNIT_INFO_KEY_COLUMNS])}
+    CROSS JOIN LATERAL (
+        SELECT DISTINCT b."동_명", b."호_명"
+        FROM bldg_exclusive_area b
+        WHERE b."전유_공용_구분_코드" = '1'
+          AND b."시군구_코드" = k.sggcd
+          AND b."법정동_코드" = k.bjdcd
+          AND b."번" = k.bon
+          AND b."지" = k.bu
+          AND b."층_구분_코드" = k.floor_code
+          AND b."층_번호" = k.floor_num
+          AND b."면적(㎡)" = k.area
+        LIMIT 100
+    ) u
+"""
+
+# 호실 일괄 조회 API 요청 1회당 최대 항목 수
+UNIT_INFO_BATCH_MAX_ITEMS = int(os.getenv('UNIT_INFO_BATCH_MAX_ITEMS', '200'))
+
+# 호실 목록 테이블 (create_unit_directory_table.py로 생성/갱신)
+# (PNU, 층구분, 층번호, numeric 면적) PK별 정렬된 "동 호" 목록 → 키마다 PK 조회 1번
+# 테이블이 없거나 UNIT_USE_DIRECTORY=0이면 bldg_exclusive_area 직접 조회 (UNIT_INFO_BATCH_QUERY)
+UNIT_USE_DIRECTORY = os.getenv('UNIT_USE_DIRECTORY', '1') == '1'
+UNIT_DIRECTORY_TABLE = 'unit_directory'
+UNIT_DIRECTORY_CHECK_INTERVAL = 300  # 테이블 존재 여부 재확인 주기 (초)
+_unit_directory_state = {'available': None, 'checked_at': 0.0}
+
+UNIT_DIRECTORY_KEY_COLUMNS = [('pnu', 'text'), ('floor_code', 'text'), ('floor_num', 'integer'), ('area', 'numeric')]
+UNIT_DIRECTORY_BATCH_QUERY = f"""
+    SELECT k.pnu, k.floor_code, k.floor_num, k.area, d.units, d.unit_count
+    FROM {unnest_keys_sql(UNIT_DIRECTORY_KEY_COLUMNS)}
+    JOIN {UNIT_DIRECTORY_TABLE} d ON
+        d.pnu = k.pnu
+        AND d.floor_code = k.floor_code
+        AND d.floor_num = k.floor_num
+        AND d.area = k.area
+"""
+
+EMPTY_UNIT_INFO = {'unit': '-', 'all_units': [], 'has_more': False}
+
+# 호실 조회 캐시 (워커별 메모리, read-through)
+# - 키: build_unit_info_params 결과 (시군구, 법정동 5자리, 번, 지, 층구분, 층번호, 면적) - 정규화된 값이라 같은 호실은 같은 키
+# - 호실 없음도 저장 (UNIT_CACHE_NEGATIVE_TTL 동안 같은 행 "호실 확인"이 다시 DB를 조회하지 않음), 조회 실패는 저장 안 함
+# - 항목 수가 UNIT_CACHE_MAX_ENTRIES를 넘으면 가장 오래 사용하지 않은 키부터 제거 (LRU)
+# - 모달, 호실 확인 버튼(/api/fetch-unit-info, /api/unit-info, /api/unit-info/batch), 지연 보강이 모두 공유
+UNIT_CACHE_ENABLED = os.getenv('UNIT_CACHE_ENABLED', '1') == '1'
+UNIT_CACHE_MAX_ENTRIES = int(os.getenv('UNIT_CACHE_MAX_ENTRIES', '200000'))
+UNIT_CACHE_TTL = float(os.getenv('UNIT_CACHE_TTL', '86400'))  # 호실이 있는 항목 유효 시간 (초)
+UNIT_CACHE_NEGATIVE_TTL = float(os.getenv('UNIT_CACHE_NEGATIVE_TTL', '3600'))  # 호실 없음 항목 유효 시간 (초)
+_unit_cache = OrderedDict()  # 키 → (만료 시각, 호실 정보)
+_unit_cache_lock = threading.Lock()
+_unit_cache_stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+
+def build_unit_info_params(sggcd, umdnm, jibun, floor, excluusear):
+    """호실 조회 파라미터 (시군구, 법정동 5자리, 번, 지, 층구분, 층번호, 면적) - 조회 불가 행이면 None"""
+    # 필수 파라미터 확인
+    if not all([sggcd, umdnm, jibun, floor is not None, excluusear]):
+        return None
+
+    # 법정동코드 5자리 찾기 (뒤 5자리가 법정동코드)
+    umd_code = find_umd_code(sggcd, umdnm)
+    bjdcd = umd_code[5:] if umd_code else None
+
+    if not bjdcd:
+        return None
+
+    # 지번 파싱
+    jibun_parts = str(jibun).split('-')
+    bon = jibun_parts[0].strip().zfill(4)
+    bu = jibun_parts[1].strip().zfill(4) if len(jibun_parts) > 1 else '0000'
+
+    # 층 처리
     try:
-        # 필수 파라미터 확인
-        if not all([sggcd, umdnm, jibun, floor is not None, excluusear]):
-            return {'unit': '-', 'all_units': [], 'has_more': False}
+        floor_int = int(float(floor))
+    except (ValueError, TypeError):
+        return None
 
-        # 법정동코드 5자리 찾기
-        bjdcd = None
-        for code, info in REGIONS['umd'].items():
-            if info['sgg_code'] == sggcd and info['umd_name'] == umdnm:
-                bjdcd = code[5:]  # 뒤 5자리가 법정동코드
-                break
+    if floor_int < 0:
+        floor_code = '10'  # 지하
+        floor_num = str(abs(floor_int))
+    else:
+        floor_code = '20'  # 지상
+        floor_num = str(floor_int)
 
-        if not bjdcd:
-            return {'unit': '-', 'all_units': [], 'has_more': False}
+    # 면적 처리
+    try:
+        area = str(float(excluusear))
+    except (ValueError, TypeError):
+        return None
 
-        # 지번 파싱
-        jibun_parts = str(jibun).split('-')
-        bon = jibun_parts[0].strip().zfill(4)
-        bu = jibun_parts[1].strip().zfill(4) if len(jibun_parts) > 1 else '0000'
+    return (sggcd, bjdcd, bon, bu, floor_code, floor_num, area)
 
-        # 층 처리
-        try:
-            floor_int = int(float(floor))
-        except (ValueError, TypeError):
-            return {'unit': '-', 'all_units': [], 'has_more': False}
 
-        if floor_int < 0:
-            floor_code = '10'  # 지하
-            floor_num = str(abs(floor_int))
-        else:
-            floor_code = '20'  # 지상
-            floor_num = str(floor_int)
+def unit_directory_key(params):
+    """호실 조회 파라미터 → 호실 목록 테이블 키 (PNU, 층구분, 정수 층번호, numeric 면적)"""
+    sggcd, bjdcd, bon, bu, floor_code, floor_num, area = params
+    return (f"{sggcd}{bjdcd}1{bon}{bu}", floor_code, int(floor_num), Decimal(area))
 
-        # 면적 처리
-        try:
-            area = str(float(excluusear))
-        except (ValueError, TypeError):
-            return {'unit': '-', 'all_units': [], 'has_more': False}
 
-        # DB 쿼리
-        query = """
-        SELECT DISTINCT "동_명", "호_명"
-        FROM bldg_exclusive_area
-        WHERE "전유_공용_구분_코드" = '1'
-          AND "시군구_코드" = %s
-          AND "법정동_코드" = %s
-          AND "번" = %s
-          AND "지" = %s
-          AND "층_구분_코드" = %s
-          AND "층_번호" = %s
-          AND "면적(㎡)" = %s
-        LIMIT 100
-        """
+def unit_directory_available():
+    """호실 목록 테이블 사용 가능 여부 (UNIT_DIRECTORY_CHECK_INTERVAL 동안 캐시)"""
+    if not UNIT_USE_DIRECTORY:
+        return False
 
-        cursor.execute(query, (sggcd, bjdcd, bon, bu, floor_code, floor_num, area))
-        results = cursor.fetchall()
+    now = time.time()
+    if _unit_directory_state['available'] is not None and now - _unit_directory_state['checked_at'] < UNIT_DIRECTORY_CHECK_INTERVAL:
+        return _unit_directory_state['available']
 
-        # 결과 처리
-        if not results:
-            return {'unit': '-', 'all_units': [], 'has_more': False}
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL as available", (UNIT_DIRECTORY_TABLE,))
+            available = bool(cursor.fetchone()['available'])
+    except Exception as e:
+        print(f"[WARNING] 호실 목록 테이블 확인 실패: {str(e)}")
+        available = False
 
-        # 모든 고유한 동명+호명 조합 수집
-        unique_units = set()
-        for r in results:
-            dong = (r.get('동_명', '').strip() if r.get('동_명') else '')
-            ho = (r.get('호_명', '').strip() if r.get('호_명') else '')
-            if dong and ho:
-                unique_units.add(f"{dong} {ho}")
-            elif ho:  # 동명 없이 호명만 있는 경우
-                unique_units.add(ho)
+    if available != _unit_directory_state['available']:
+        print(f"[INFO] 호실 조회: {UNIT_DIRECTORY_TABLE + ' PK 조회' if available else 'bldg_exclusive_area 직접 조회'}")
+    _unit_directory_state['available'] = available
+    _unit_directory_state['checked_at'] = now
+    return available
 
-        if not unique_units:
-            return {'unit': '-', 'all_units': [], 'has_more': False}
 
-        # 전체 목록 (정렬)
-        all_unit_list = sorted(list(unique_units))
+def format_unit_labels(all_unit_list):
+    """정렬된 호실 표시명 목록 → {'unit': 표시 문자열(최대 10개), 'all_units': 전체 목록, 'has_more': 10개 초과 여부}"""
+    if not all_unit_list:
+        return dict(EMPTY_UNIT_INFO)
 
-        # 표시용: 최대 10개까지만
-        display_list = all_unit_list[:10]
-        unit_str = ', '.join(display_list)
+    # 표시용: 최대 10개까지만
+    display_list = all_unit_list[:10]
+    unit_str = ', '.join(display_list)
 
-        if len(unique_units) > 10:
-            unit_str += f" 외 {len(unique_units) - 10}개"
+    if len(all_unit_list) > 10:
+        unit_str += f" 외 {len(all_unit_list) - 10}개"
 
-        return {
-            'unit': unit_str,
-            'all_units': all_unit_list,
-            'has_more': len(unique_units) > 10
-        }
+    return {
+        'unit': unit_str,
+        'all_units': all_unit_list,
+        'has_more': len(all_unit_list) > 10
+    }
 
-    except Exception as e:
-        print(f"[ERROR] 호실 조회 오류: {str(e)}")
-        return {'unit': '-', 'all_units': [], 'has_more': False}
 
+def format_unit_info(results):
+    """호실 조회 결과 → {'unit': 표시 문자열, 'all_units': 전체 목록, 'has_more': 10개 초과 여부}"""
+    if not results:
+        return dict(EMPTY_UNIT_INFO)
 
-@app.route('/api/search', methods=['POST'])
-def api_search():
-    """실거래가 검색 API (이름 기반)"""
-    try:
-        # JSON 파싱 시 인코딩 에러 처리
-        try:
-            filters = request.get_json(force=True)
-        except:
-            # 인코딩 에러 시 request.data를 직접 디코딩
-            import json
-            filters = json.loads(request.data.decode('utf-8', errors='ignore'))
-        print(f"[DEBUG] 받은 필터: {filters}")
+    # 모든 고유한 동명+호명 조합 수집
+    unique_units = set()
+    for r in results:
+        dong = (r.get('동_명', '').strip() if r.get('동_명') else '')
+        ho = (r.get('호_명', '').strip() if r.get('호_명') else '')
+        if dong and ho:
+            unique_units.add(f"{dong} {ho}")
+        elif ho:  # 동명 없이 호명만 있는 경우
+            unique_units.add(ho)
 
-        # 필터 파라미터
-        include_apt = filters.get('include_apt', True)
-        include_villa = filters.get('include_villa', True)
-        include_dagagu = filters.get('include_dagagu', True)
-        include_officetel = filters.get('include_officetel', True)
-        lh_only = filters.get('lh_only', False)
-        contract_end = filters.get('contract_end', '').strip()
-        sido_name = filters.get('sido')
-        sigungu_names = filters.get('sigungu', [])
-        umd_names = filters.get('umd', [])
+    # 전체 목록 (정렬)
+    return format_unit_labels(sorted(unique_units))
 
-        # 숫자 필터 파라미터 - 검증 및 변환
-        def parse_numeric_filter(value, data_type=float):
-            """숫자 필터를 안전하게 파싱"""
-            if value is None:
-                return None
-            if isinstance(value, (int, float)):
-                return data_type(value)
-            if isinstance(value, str):
-                value = value.strip()
-                if not value:
-                    return None
-                try:
-                    return data_type(value)
-                except (ValueError, TypeError):
-                    return None
-            return None
 
-        area_min = parse_numeric_filter(filters.get('area_min'), float)
-        area_max = parse_numeric_filter(filters.get('area_max'), float)
-        deposit_min = parse_numeric_filter(filters.get('deposit_min'), int)
-        deposit_max = parse_numeric_filter(filters.get('deposit_max'), int)
-        rent_min = parse_numeric_filter(filters.get('rent_min'), int)
-        rent_max = parse_numeric_filter(filters.get('rent_max'), int)
-        build_year_min = parse_numeric_filter(filters.get('build_year_min'), int)
-        build_year_max = parse_numeric_filter(filters.get('build_year_max'), int)
+def unit_cache_get_many(keys):
+    """호실 캐시에서 유효한 항목 조회 → {키: 호실 정보} (적중 항목은 LRU 순서 갱신)"""
+    if not UNIT_CACHE_ENABLED:
+        return {}
 
-        page = filters.get('page', 1)
-        page_size = filters.get('page_size', 5)  # 성능 최적화: 초기 로딩 5건
+    now = time.time()
+    found = {}
+    with _unit_cache_lock:
+        for key in keys:
+            entry = _unit_cache.get(key)
+            if entry is None:
+                _unit_cache_stats['misses'] += 1
+                continue
+            expires_at, unit_info = entry
+            if expires_at < now:
+                del _unit_cache[key]
+                _unit_cache_stats['expirations'] += 1
+                _unit_cache_stats['misses'] += 1
+                continue
+            _unit_cache.move_to_end(key)
+            _unit_cache_stats['hits'] += 1
+            if not unit_info['all_units']:
+                _unit_cache_stats['negative_hits'] += 1
+            found[key] = unit_info
+    return found
+
+
+def unit_cache_put_many(unit_infos):
+    """조회 결과 저장 (호실 없음은 UNIT_CACHE_NEGATIVE_TTL) 후 상한 초과분 LRU 제거"""
+    if not UNIT_CACHE_ENABLED:
+        return
+
+    now = time.time()
+    with _unit_cache_lock:
+        for key, unit_info in unit_infos.items():
+            ttl = UNIT_CACHE_TTL if unit_info['all_units'] else UNIT_CACHE_NEGATIVE_TTL
+            _unit_cache[key] = (now + ttl, unit_info)
+            _unit_cache.move_to_end(key)
+
+        while len(_unit_cache) > UNIT_CACHE_MAX_ENTRIES:
+            _unit_cache.popitem(last=False)
+            _unit_cache_stats['evictions'] += 1
+
+
+def get_unit_cache_stats():
+    """호실 캐시 통계"""
+    with _unit_cache_lock:
+        lookups = _unit_cache_stats['hits'] + _unit_cache_stats['misses']
+        return {
+            'enabled': UNIT_CACHE_ENABLED,
+            **_unit_cache_stats,
+            'hit_rate': round(_unit_cache_stats['hits'] / lookups, 4) if lookups else None,
+            'entries': len(_unit_cache),
+            'max_entries': UNIT_CACHE_MAX_ENTRIES,
+            'ttl': UNIT_CACHE_TTL,
+            'negative_ttl': UNIT_CACHE_NEGATIVE_TTL,
+        }
 
-        # LH 필터 활성화 시 모든 데이터를 조회해야 함 (필터링 후 페이지네이션)
-        if lh_only:
-            # LH 필터링 시에는 SQL에서 페이지네이션 하지 않음
-            use_sql_pagination = False
-            offset = 0
+
+def fetch_unit_info_multi(cursor, unit_params, raise_errors=False):
+    """
+    호실 조회 파라미터 목록 → 파라미터 순서와 같은 호실 정보 목록 (read-through 캐시)
+    unit_params: build_unit_info_params 결과 목록 (None이면 조회하지 않음)
+    캐시에 없는 키만 쿼리 1회로 조회 (호실 목록 테이블 또는 bldg_exclusive_area)
+    raise_errors: True면 조회 오류(QueryCanceled 등)를 그대로 전달 (호실 조회 API용),
+                  False면 호실 정보 없이 반환 (검색 결과 보강처럼 실패해도 응답해야 하는 경우)
+    """
+    keys = list(dict.fromkeys(params for params in unit_params if params is not None))
+    unit_infos = unit_cache_get_many(keys)
+
+    missing = [key for key in keys if key not in unit_infos]
+    if missing:
+        try:
+            if unit_directory_available():
+                fetched = query_unit_infos_from_directory(cursor, missing)
+            else:
+                fetched = query_unit_infos(cursor, missing)
+        except Exception as e:
+            # 조회 실패 결과는 캐시하지 않음 - 호출 측이 처리하거나, 트랜잭션을 정리하고 호실 정보 없이 반환
+            if raise_errors:
+                raise
+            print(f"[ERROR] 호실 일괄 조회 오류: {str(e)}")
+            cursor.connection.rollback()
+            fetched = {}
         else:
-            # 일반 검색 시에는 SQL에서 페이지네이션
-            use_sql_pagination = True
-            offset = (page - 1) * page_size
+            unit_cache_put_many(fetched)
+        unit_infos.update(fetched)
 
-        # 필수값 검증: 계약만기시기 및 시군구
-        if not contract_end:
-            return jsonify({
-                'success': False,
-                'error': '계약만기시기를 선택해주세요.'
-            })
+    return [
+        dict(unit_infos.get(params, EMPTY_UNIT_INFO)) if params is not None else dict(EMPTY_UNIT_INFO)
+        for params in unit_params
+    ]
 
-        if not (sigungu_names and len(sigungu_names) > 0):
-            return jsonify({
-                'success': False,
-                'error': '최소 1개 이상의 시군구를 선택해주세요.'
-            })
 
-        all_results = []
-        result_counts = []  # 각 주택 유형별 조회 건수 추적
-        conn = get_db_connection()
-        cursor = conn.cursor()
+def query_unit_infos(cursor, keys):
+    """bldg_exclusive_area에서 키 목록을 쿼리 1회로 조회 (UNIT_INFO_BATCH_QUERY) → {키: 호실 정보} (호실 없음 포함)"""
+    execute_prepared(cursor, UNIT_INFO_BATCH_QUERY, unnest_keys_params(keys, len(UNIT_INFO_KEY_COLUMNS)))
+    results_by_key = defaultdict(list)
+    for r in cursor.fetchall():
+        results_by_key[tuple(r[name] for name in UNIT_INFO_KEY_COLUMNS)].append(r)
+    return {key: format_unit_info(results_by_key.get(key)) for key in keys}
 
-        # 시군구 이름을 코드로 변환 (모든 주택 유형에서 공통 사용)
-        # 시도와 시군구를 함께 확인하여 정확한 지역만 선택
-        sgg_codes = []
-        if sigungu_names and len(sigungu_names) > 0:
-            for name in sigungu_names:
-                for code, data in REGIONS['sigungu'].items():
-                    # 시도와 시군구 이름이 모두 일치하는 경우만 선택
-                    if data['name'] == name and (sido_name is None or data['sido'] == sido_name):
-                        sgg_codes.append(code)
 
-        # 아파트 조회
-        if include_apt:
-            import time
-            start_time = time.time()
-            print(f"[DEBUG] ========== 아파트 조회 시작 ==========")
-            print(f"[DEBUG] 계약만기시기: {contract_end}")
-            print(f"[DEBUG] 시군구 코드: {sgg_codes}")
-            print(f"[DEBUG] 읍면동: {umd_names}")
-            print(f"[DEBUG] LH 필터: {lh_only}")
-
-            # LH 필터 활성화 시 JOIN 쿼리 사용
-            if lh_only:
-                OTHER_TYPES = ['기숙사및특수사회시설', '기타', '비거주용건물내주택', '점포주택등복합용도주택']
-                apt_housing_types = ['아파트'] + OTHER_TYPES
-                housing_types_str = "', '".join(apt_housing_types)
+def query_unit_infos_from_directory(cursor, keys):
+    """호실 목록 테이블에서 키마다 PK 조회 (쿼리 1회) → {키: 호실 정보} (호실 없음 포함)"""
+    directory_keys = {key: unit_directory_key(key) for key in keys}
+    execute_prepared(cursor, UNIT_DIRECTORY_BATCH_QUERY, unnest_keys_params(
+        list(dict.fromkeys(directory_keys.values())), len(UNIT_DIRECTORY_KEY_COLUMNS)
+    ))
 
-                query = f"""
-                    SELECT
-                        '아파트' as 구분,
-                        a.sggcd as 시군구코드,
-                        a.umdnm as 읍면동리,
-                        a.jibun as 지번,
-                        a.aptnm as 단지명,
-                        a.excluusear as 면적,
-                        a.dealyear || LPAD(a.dealmonth::text, 2, '0') as 계약년월,
-                        a.dealday as 계약일,
-                        a.deposit as 보증금,
-                        a.monthlyrent as 월세,
-                        a.floor as 층,
-                        a.buildyear as 건축년도,
-                        a.contracttype as 계약구분,
-                        a.contractterm as 계약기간,
-                        a.predeposit as 종전계약보증금,
-                        a.premonthlyrent as 종전계약월세,
-                        a.userrright as 갱신요구권사용,
-                        lh.room_count as lh_room_count,
-                        lh.jeonse_support_amount as lh_support_amount,
-                        lh.housing_type as lh_housing_type,
-                        true as is_lh
-                    FROM apt_rent_transactions a
-                    INNER JOIN lh_rent_transactions lh ON
-                        lh.sggcd = a.sggcd
-                        AND lh.exclusive_area::numeric = a.excluusear::numeric
-                        AND lh.dealyear::text = a.dealyear::text
-                        AND lh.dealmonth::text = a.dealmonth::text
-                        AND lh.dealday::text = a.dealday::text
-                        AND ROUND(lh.jeonse_amount) = (CAST(REPLACE(REPLACE(a.deposit, ',', ''), ' ', '') AS INTEGER) * 10000)
-                    WHERE (lh.house_subtype IN ('{housing_types_str}') OR lh.house_subtype IS NULL)
-                """
-            else:
-                query = """
-                    SELECT
-                        '아파트' as 구분,
-                        sggcd as 시군구코드,
-                        umdnm as 읍면동리,
-                        jibun as 지번,
-                        aptnm as 단지명,
-                        excluusear as 면적,
-                        dealyear || LPAD(dealmonth::text, 2, '0') as 계약년월,
-                        dealday as 계약일,
-                        deposit as 보증금,
-                        monthlyrent as 월세,
-                        floor as 층,
-                        buildyear as 건축년도,
-                        contracttype as 계약구분,
-                        contractterm as 계약기간,
-                        predeposit as 종전계약보증금,
-                        premonthlyrent as 종전계약월세,
-                        userrright as 갱신요구권사용
-                    FROM apt_rent_transactions
-                    WHERE 1=1
-                """
-            params = []
-
-            # LH 필터일 때는 테이블 alias 사용
-            table_prefix = "a." if lh_only else ""
-
-            # 1. 지역 필터를 먼저 적용 (인덱스 활용, 성능 최적화)
-            if sgg_codes:
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                query += f" AND {table_prefix}sggcd IN ({placeholders})"
-                params.extend(sgg_codes)
-
-            # 2. 읍면동 필터 추가
-            if umd_names and len(umd_names) > 0:
-                placeholders = ','.join(['%s'] * len(umd_names))
-                query += f" AND {table_prefix}umdnm IN ({placeholders})"
-                params.extend(umd_names)
-
-            # 3. 계약만기시기 필터 (SPLIT_PART 사용)
-            if contract_end:
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 202512 -> 25.12
-                    query += f" AND SPLIT_PART({table_prefix}contractterm, '~', 2) = %s"
-                    params.append(short_format)
-                else:
-                    query += f" AND SPLIT_PART({table_prefix}contractterm, '~', 2) = %s"
-                    params.append(contract_end)
-
-            # 4. 면적 필터
-            if area_min:
-                query += f" AND CAST({table_prefix}excluusear AS FLOAT) >= %s"
-                params.append(area_min)
-            if area_max:
-                query += f" AND CAST({table_prefix}excluusear AS FLOAT) <= %s"
-                params.append(area_max)
-
-            # 5. 보증금 필터
-            if deposit_min:
-                query += f" AND CAST(REPLACE({table_prefix}deposit, ',', '') AS INTEGER) >= %s"
-                params.append(deposit_min)
-            if deposit_max:
-                query += f" AND CAST(REPLACE({table_prefix}deposit, ',', '') AS INTEGER) <= %s"
-                params.append(deposit_max)
-
-            # 6. 월세 필터
-            if rent_min:
-                query += f" AND CAST(REPLACE({table_prefix}monthlyrent, ',', '') AS INTEGER) >= %s"
-                params.append(rent_min)
-            if rent_max:
-                query += f" AND CAST(REPLACE({table_prefix}monthlyrent, ',', '') AS INTEGER) <= %s"
-                params.append(rent_max)
-
-            # 7. 건축년도 필터
-            if build_year_min:
-                query += f" AND CAST({table_prefix}buildyear AS INTEGER) >= %s"
-                params.append(build_year_min)
-            if build_year_max:
-                query += f" AND CAST({table_prefix}buildyear AS INTEGER) <= %s"
-                params.append(build_year_max)
-
-            query += " ORDER BY 계약년월 DESC, 계약일 DESC"
-
-            # LH 필터 시에는 페이지네이션 하지 않고 모든 데이터 조회
-            if use_sql_pagination:
-                query += " LIMIT %s OFFSET %s"
-                params.extend([page_size, offset])
+    # numeric 면적은 Decimal 값 비교 (84.97 == 84.970)
+    units_by_key = {(r['pnu'], r['floor_code'], r['floor_num'], r['area']): r['units'] for r in cursor.fetchall()}
+    return {key: format_unit_labels(units_by_key.get(directory_key)) for key, directory_key in directory_keys.items()}
 
-            print(f"[DEBUG] 쿼리 실행 중...")
-            print(f"[DEBUG] 파라미터 개수: {len(params)}")
-            query_start = time.time()
-            cursor.execute(query, params)
-            query_end = time.time()
-            print(f"[DEBUG] 쿼리 실행 완료: {query_end - query_start:.2f}초")
 
-            results = cursor.fetchall()
-            print(f"[DEBUG] 아파트 결과: {len(results)}건")
-            result_counts.append(len(results))  # 건수 추적
+def fetch_unit_info_for_row(cursor, sggcd, umdnm, jibun, floor, excluusear):
+    """
+    단일 행의 호실 정보를 조회하는 헬퍼 함수
+    Returns: dict with 'unit', 'all_units', 'has_more' keys
+    """
+    params = build_unit_info_params(sggcd, umdnm, jibun, floor, excluusear)
+    return fetch_unit_info_multi(cursor, [params])[0]
 
-            # 시도/시군구명 추가
-            for row in results:
-                sgg_code = row.get('시군구코드')
-                if sgg_code and sgg_code in REGIONS['sigungu']:
-                    sido_full = REGIONS['sigungu'][sgg_code]['sido']
-                    row['시도'] = SIDO_ABBR.get(sido_full, sido_full)  # 축약형 사용
-                    row['시군구'] = REGIONS['sigungu'][sgg_code]['name']
-                else:
-                    row['시도'] = ''
-                    row['시군구'] = ''
 
-            # 공동주택가격 일괄 조회 (N+1 쿼리 문제 해결)
-            # 시군구별로 그룹화하여 일괄 조회
-            from collections import defaultdict
-            sgg_groups = defaultdict(lambda: defaultdict(list))
-            for row in results:
-                sgg_code = row.get('시군구코드')
-                umd_name = row.get('읍면동리')
-                if sgg_code and umd_name:
-                    sgg_groups[sgg_code][umd_name].append(row)
-
-            # 각 그룹별로 일괄 조회
-            for sgg_code, umd_dict in sgg_groups.items():
-                for umd_name, rows in umd_dict.items():
-                    price_map = fetch_apartment_prices_batch(cursor, sgg_code, umd_name, rows)
-
-                    # 결과 매핑
-                    for row in rows:
-                        jibun = row.get('지번')
-                        floor = row.get('층')
-                        area = row.get('면적')
-
-                        if jibun and floor is not None and area:
-                            try:
-                                # 면적을 2자리로 반올림하여 키 생성 (batch 함수와 동일하게)
-                                area_rounded = round(float(area), 2)
-                                key = (jibun, int(floor), area_rounded)
-                                if key in price_map:
-                                    row['공동주택가격'] = price_map[key]['price']
-                                    row['공동주택가격_126퍼센트'] = price_map[key]['threshold_126']
-                            except:
-                                pass
-
-            # 호실 정보 조회 (메인 검색에서는 생략 - 성능 최적화)
-            # 호실 정보는 사용자가 "호실 확인" 버튼을 클릭할 때만 조회
-            for row in results:
-                row['동호명'] = None  # 초기값
-                row['동호명_전체목록'] = []
-                row['동호명_더보기'] = False
-
-            all_results.extend(results)
-            total_time = time.time() - start_time
-            print(f"[DEBUG] 아파트 조회 총 소요시간: {total_time:.2f}초")
-
-        # 연립다세대 조회
-        if include_villa:
-            # LH 필터 활성화 시 JOIN 쿼리 사용
-            if lh_only:
-                OTHER_TYPES = ['기숙사및특수사회시설', '기타', '비거주용건물내주택', '점포주택등복합용도주택']
-                villa_housing_types = ['연립주택', '다세대주택', '도시형생활주택'] + OTHER_TYPES
-                housing_types_str = "', '".join(villa_housing_types)
+def fetch_unit_info_for_rows(cursor, sggcd, umdnm, rows):
+    """
+    같은 시군구/읍면동 여러 행의 호실 정보를 쿼리 1회로 조회 (행마다 왕복하지 않음)
+    Returns: 행 순서와 같은 호실 정보 목록
+    """
+    return fetch_unit_info_multi(cursor, [
+        build_unit_info_params(sggcd, umdnm, row.get('지번'), row.get('층'), row.get('면적'))
+        for row in rows
+    ])
+
+
+# 검색 병렬 처리 설정
+SEARCH_MAX_WORKERS = int(os.getenv('SEARCH_MAX_WORKERS', '4'))  # 동시에 실행할 유형/샤드 쿼리 수 (워커당)
+SEARCH_SHARD_SIZE = int(os.getenv('SEARCH_SHARD_SIZE', '5'))  # 시군구가 이 개수를 넘으면 샤드로 분할
+
+# LH 매칭 시 4개 카테고리에 속하지 않는 house_type들 (모든 유형에서 함께 검색)
+LH_OTHER_HOUSE_TYPES = ['기숙사및특수사회시설', '기타', '비거주용건물내주택', '점포주택등복합용도주택']
+
+# 검색 대상 주택 유형별 설정 (아파트/연립다세대/오피스텔은 컬럼 구조가 같아 공통 쿼리 사용)
+SEARCH_TYPE_SPECS = {
+    'apt': {
+        'label': '아파트',
+        'table': 'apt_rent_transactions',
+        'alias': 'a',
+        'lh_house_types': ['아파트'] + LH_OTHER_HOUSE_TYPES,
+    },
+    'villa': {
+        'label': '연립다세대',
+        'table': 'villa_rent_transactions',
+        'alias': 'v',
+        'lh_house_types': ['연립주택', '다세대주택', '도시형생활주택'] + LH_OTHER_HOUSE_TYPES,
+    },
+    'officetel': {
+        'label': '오피스텔',
+        'table': 'officetel_rent_transactions',
+        'alias': 'o',
+        'lh_house_types': ['오피스텔'] + LH_OTHER_HOUSE_TYPES,
+    },
+    'dagagu': {
+        'label': '단독다가구',
+        'table': 'dagagu_rent_transactions',
+        'alias': 'd',
+        'lh_house_types': ['다가구용단독주택', '다중주택', '단독주택'] + LH_OTHER_HOUSE_TYPES,
+    },
+}
 
-                query = f"""
-                    SELECT
-                        '연립다세대' as 구분,
-                        v.sggcd as 시군구코드,
-                        v.umdnm as 읍면동리,
-                        v.jibun as 지번,
-                        v.mhousenm as 단지명,
-                        v.excluusear as 면적,
-                        v.dealyear || LPAD(v.dealmonth::text, 2, '0') as 계약년월,
-                        v.dealday as 계약일,
-                        v.deposit as 보증금,
-                        v.monthlyrent as 월세,
-                        v.floor as 층,
-                        v.buildyear as 건축년도,
-                        v.contracttype as 계약구분,
-                        v.contractterm as 계약기간,
-                        v.predeposit as 종전계약보증금,
-                        v.premonthlyrent as 종전계약월세,
-                        v.userrright as 갱신요구권사용,
-                        lh.room_count as lh_room_count,
-                        lh.jeonse_support_amount as lh_support_amount,
-                        lh.housing_type as lh_housing_type,
-                        true as is_lh
-                    FROM villa_rent_transactions v
-                    INNER JOIN lh_rent_transactions lh ON
-                        lh.sggcd = v.sggcd
-                        AND lh.exclusive_area::numeric = v.excluusear::numeric
-                        AND lh.dealyear::text = v.dealyear::text
-                        AND lh.dealmonth::text = v.dealmonth::text
-                        AND lh.dealday::text = v.dealday::text
-                        AND ROUND(lh.jeonse_amount) = (CAST(REPLACE(REPLACE(v.deposit, ',', ''), ' ', '') AS INTEGER) * 10000)
-                    WHERE (lh.house_subtype IN ('{housing_types_str}') OR lh.house_subtype IS NULL)
-                """
-            else:
-                query = """
-                    SELECT
-                        '연립다세대' as 구분,
-                        sggcd as 시군구코드,
-                        umdnm as 읍면동리,
-                        jibun as 지번,
-                        mhousenm as 단지명,
-                        excluusear as 면적,
-                        dealyear || LPAD(dealmonth::text, 2, '0') as 계약년월,
-                        dealday as 계약일,
-                        deposit as 보증금,
-                        monthlyrent as 월세,
-                        floor as 층,
-                        buildyear as 건축년도,
-                        contracttype as 계약구분,
-                        contractterm as 계약기간,
-                        predeposit as 종전계약보증금,
-                        premonthlyrent as 종전계약월세,
-                        userrright as 갱신요구권사용
-                    FROM villa_rent_transactions
-                    WHERE 1=1
-                """
-            params = []
-
-            # LH 필터일 때는 테이블 alias 사용
-            table_prefix = "v." if lh_only else ""
-
-            # 1. 지역 필터를 먼저 적용 (인덱스 활용)
-            if sgg_codes:
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                query += f" AND {table_prefix}sggcd IN ({placeholders})"
-                params.extend(sgg_codes)
-
-            # 2. 읍면동 필터 추가
-            if umd_names and len(umd_names) > 0:
-                placeholders = ','.join(['%s'] * len(umd_names))
-                query += f" AND {table_prefix}umdnm IN ({placeholders})"
-                params.extend(umd_names)
-
-            # 3. 계약만기시기 필터
-            if contract_end:
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 202508 -> 25.08
-                    query += f" AND SPLIT_PART({table_prefix}contractterm, '~', 2) = %s"
-                    params.append(short_format)
-                else:
-                    query += f" AND SPLIT_PART({table_prefix}contractterm, '~', 2) = %s"
-                    params.append(contract_end)
-
-            if area_min:
-                query += f" AND CAST({table_prefix}excluusear AS FLOAT) >= %s"
-                params.append(area_min)
-            if area_max:
-                query += f" AND CAST({table_prefix}excluusear AS FLOAT) <= %s"
-                params.append(area_max)
-
-            if deposit_min:
-                query += f" AND CAST(REPLACE({table_prefix}deposit, ',', '') AS INTEGER) >= %s"
-                params.append(deposit_min)
-            if deposit_max:
-                query += f" AND CAST(REPLACE({table_prefix}deposit, ',', '') AS INTEGER) <= %s"
-                params.append(deposit_max)
-
-            if rent_min:
-                query += f" AND CAST(REPLACE({table_prefix}monthlyrent, ',', '') AS INTEGER) >= %s"
-                params.append(rent_min)
-            if rent_max:
-                query += f" AND CAST(REPLACE({table_prefix}monthlyrent, ',', '') AS INTEGER) <= %s"
-                params.append(rent_max)
-
-            if build_year_min:
-                query += f" AND CAST({table_prefix}buildyear AS INTEGER) >= %s"
-                params.append(build_year_min)
-            if build_year_max:
-                query += f" AND CAST({table_prefix}buildyear AS INTEGER) <= %s"
-                params.append(build_year_max)
-
-            query += " ORDER BY 계약년월 DESC, 계약일 DESC"
-
-            # LH 필터 시에는 페이지네이션 하지 않고 모든 데이터 조회
-            if use_sql_pagination:
-                query += " LIMIT %s OFFSET %s"
-                params.extend([page_size, offset])
+# 응답에 담기는 유형 순서
+SEARCH_TYPE_ORDER = ['apt', 'villa', 'officetel', 'dagagu']
+
+# 검색 엔진 모드 (요청의 search_mode로 개별 지정 가능)
+# - per_type: 유형별로 page_size건씩 조회 (기본, 유형 순서로 표시)
+# - union: 4개 테이블을 UNION ALL 한 쿼리로 묶어 전체 계약일 순으로 정확히 page_size건 조회
+SEARCH_ENGINE_MODE = os.getenv('SEARCH_ENGINE_MODE', 'per_type')
+SEARCH_ENGINE_MODES = ('per_type', 'union')
+
+# union 모드 공통 컬럼 (모든 유형을 같은 순서/텍스트 타입으로 맞춤)
+SEARCH_UNION_COLUMNS = [
+    '구분', '시군구코드', '읍면동리', '지번', '단지명', '면적', '계약년월', '계약일',
+    '보증금', '월세', '층', '건축년도', '계약구분', '계약기간',
+    '종전계약보증금', '종전계약월세', '갱신요구권사용',
+]
+
+# union 모드 다음 페이지 토큰의 키 (유형 구분 없이 전체 마지막 행 1개)
+SEARCH_UNION_CURSOR_KEY = 'union'
+
+# 통합 정규화 테이블 (create_norm_table.py로 생성/갱신)
+# 타입 지정 컬럼(정수 보증금/월세, numeric 면적, YYYYMM 계약만기 등)이라 검색 필터가 인덱스를 그대로 사용
+# 테이블이 없거나 SEARCH_USE_NORM_TABLE=0이면 원본 4개 테이블로 조회
+SEARCH_USE_NORM_TABLE = os.getenv('SEARCH_USE_NORM_TABLE', '1') == '1'
+SEARCH_NORM_TABLE = 'rent_transactions_norm'
+SEARCH_NORM_CHECK_INTERVAL = 300  # 테이블 존재 여부 재확인 주기 (초)
+_norm_table_state = {'available': None, 'checked_at': 0.0}
+
+# LH 매칭 결과 테이블 (create_lh_match_table.py로 생성/갱신)
+# LH 필터 검색이 LH 테이블과의 표현식 JOIN 대신 (유형, 원본 키)로 조인하고 일반 검색처럼 키셋 페이지네이션 사용
+# 테이블이 없거나 SEARCH_USE_LH_MATCH_TABLE=0이면 기존 JOIN 쿼리로 전체 조회
+SEARCH_USE_LH_MATCH_TABLE = os.getenv('SEARCH_USE_LH_MATCH_TABLE', '1') == '1'
+LH_MATCH_TABLE = 'lh_rent_matches'
+_lh_match_table_state = {'available': None, 'checked_at': 0.0}
+
+# 원본 테이블의 계약만기 생성 컬럼 (create_transaction_indexes.py로 추가)
+CONTRACT_END_COLUMN = 'contract_end_ym'
+RENT_TABLES = [spec['table'] for spec in SEARCH_TYPE_SPECS.values()]
+_contract_end_column_state = {'tables': None, 'checked_at': 0.0}
+
+# 검색 결과 캐시 (워커별 메모리, 직렬화된 JSON 응답 저장)
+# - 키: 정규화된 필터(정렬된 시군구/읍면동, 숫자 필터, 페이지/토큰, 검색 모드)
+# - 메모리 상한(SEARCH_CACHE_MAX_BYTES) 초과 시 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+# - SEARCH_CACHE_TTL 지난 항목은 만료, 데이터 적재 워터마크가 바뀌면 전체 무효화
+SEARCH_CACHE_ENABLED = os.getenv('SEARCH_CACHE_ENABLED', '1') == '1'
+SEARCH_CACHE_MAX_BYTES = int(os.getenv('SEARCH_CACHE_MAX_MB', '64')) * 1024 * 1024
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', '600'))  # 항목 유효 시간 (초)
+SEARCH_CACHE_WATERMARK_INTERVAL = float(os.getenv('SEARCH_CACHE_WATERMARK_INTERVAL', '60'))  # 워터마크 확인 주기 (초)
+# 변경 시 검색 결과가 달라지는 테이블 (원본/정규화 테이블, LH 매칭(원본 + 매칭 결과 테이블), 가격 보강)
+# - LH 필터 검색은 lh_rent_matches를 읽으므로 LH 적재 후 매칭 테이블 갱신 시에도 다시 무효화해야 함
+SEARCH_CACHE_WATCH_TABLES = RENT_TABLES + [
+    SEARCH_NORM_TABLE, 'lh_rent_transactions', LH_MATCH_TABLE, 'bldg_apartment_price', 'officetel_standard_price'
+]
+_search_cache = OrderedDict()  # 키 → (만료 시각, JSON 문자열)
+_search_cache_lock = threading.Lock()
+_search_cache_state = {'bytes': 0, 'watermark': None, 'checked_at': 0.0}
+_search_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+# 스트리밍 검색 (LH 필터 + stream 요청) 배치 크기 - 서버 측 커서에서 한 번에 읽고 보강/전송하는 행 수
+SEARCH_STREAM_BATCH_SIZE = int(os.getenv('SEARCH_STREAM_BATCH_SIZE', '200'))
+
+# 지연 보강 (defer_enrich 요청): 검색은 기본 행 + row_key만 바로 응답하고
+# 공동주택가격/기준시가, LH, 동호명은 /api/search/enrich가 여러 행을 한 번에 조회
+SEARCH_ENRICH_MAX_KEYS = int(os.getenv('SEARCH_ENRICH_MAX_KEYS', '500'))  # 요청 1회당 최대 row_key 수
+SEARCH_ENRICH_FIELDS = [
+    '공동주택가격', '공동주택가격_126퍼센트',
+    '기준시가_면적당가격', '기준시가_전용면적', '기준시가_공유면적', '기준시가_면적계', '기준시가_총액', '기준시가_126퍼센트',
+    'is_lh', 'lh_room_count', 'lh_support_amount', 'lh_housing_type',
+    '동호명', '동호명_전체목록', '동호명_더보기',
+]
+
+# 워커(프로세스)별 검색 스레드 풀
+_search_executor = None
+_search_executor_pid = None
+_search_executor_lock = threading.Lock()
+
+def get_search_executor():
+    """현재 워커의 검색용 스레드 풀 반환 (fork된 프로세스면 새로 생성)"""
+    global _search_executor, _search_executor_pid
+    if _search_executor is not None and _search_executor_pid == os.getpid():
+        return _search_executor
+
+    with _search_executor_lock:
+        if _search_executor is None or _search_executor_pid != os.getpid():
+            _search_executor = ThreadPoolExecutor(
+                max_workers=max(1, SEARCH_MAX_WORKERS),
+                thread_name_prefix='search'
+            )
+            _search_executor_pid = os.getpid()
+    return _search_executor
+
+
+def shard_sgg_codes(sgg_codes):
+    """시군구 코드 목록을 SEARCH_SHARD_SIZE 단위 샤드로 분할 (적으면 샤드 1개)"""
+    if not sgg_codes or len(sgg_codes) <= SEARCH_SHARD_SIZE:
+        return [sgg_codes]
+    return [sgg_codes[i:i + SEARCH_SHARD_SIZE] for i in range(0, len(sgg_codes), SEARCH_SHARD_SIZE)]
+
+
+def search_sort_exprs(source_type):
+    """검색 정렬 키 SQL 표현식 (계약년월, 계약일(숫자), 고유키)
+
+    - 계약일은 텍스트라 '9' > '10'으로 정렬되므로 정수로 변환
+    - 고유키(unique_key, 단독다가구는 id)를 마지막 기준으로 두어 페이지 간 순서 고정
+    - COLLATE "C": 샤드 병합 시 Python 문자열 비교와 같은 순서 보장
+    """
+    c = rent_column_refs(source_type, SEARCH_TYPE_SPECS[source_type]['alias'])
+    if source_type == 'dagagu':
+        ym = f"COALESCE({c['deal_ym']}::text, '') COLLATE \"C\""
+    else:
+        ym = f"COALESCE({c['deal_year']}::text || LPAD({c['deal_month']}::text, 2, '0'), '') COLLATE \"C\""
+    day = f"COALESCE(NULLIF({c['deal_day']}::text, '')::integer, 0)"
+    key = f"COALESCE({c['key']}::text, '') COLLATE \"C\""
+    return ym, day, key
 
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            result_counts.append(len(results))  # 건수 추적
 
-            # 시도/시군구명 추가
-            for row in results:
-                sgg_code = row.get('시군구코드')
-                if sgg_code and sgg_code in REGIONS['sigungu']:
-                    sido_full = REGIONS['sigungu'][sgg_code]['sido']
-                    row['시도'] = SIDO_ABBR.get(sido_full, sido_full)  # 축약형 사용
-                    row['시군구'] = REGIONS['sigungu'][sgg_code]['name']
-                else:
-                    row['시도'] = ''
-                    row['시군구'] = ''
+def norm_table_available():
+    """정규화 테이블 사용 가능 여부 (SEARCH_NORM_CHECK_INTERVAL 동안 캐시)"""
+    if not SEARCH_USE_NORM_TABLE:
+        return False
 
-            # 공동주택가격 일괄 조회 (N+1 쿼리 문제 해결)
-            from collections import defaultdict
-            sgg_groups = defaultdict(lambda: defaultdict(list))
-            for row in results:
-                sgg_code = row.get('시군구코드')
-                umd_name = row.get('읍면동리')
-                if sgg_code and umd_name:
-                    sgg_groups[sgg_code][umd_name].append(row)
-
-            # 각 그룹별로 일괄 조회
-            for sgg_code, umd_dict in sgg_groups.items():
-                for umd_name, rows in umd_dict.items():
-                    price_map = fetch_apartment_prices_batch(cursor, sgg_code, umd_name, rows)
-
-                    # 결과 매핑
-                    for row in rows:
-                        jibun = row.get('지번')
-                        floor = row.get('층')
-                        area = row.get('면적')
-
-                        if jibun and floor is not None and area:
-                            try:
-                                # 면적을 2자리로 반올림하여 키 생성 (batch 함수와 동일하게)
-                                area_rounded = round(float(area), 2)
-                                key = (jibun, int(floor), area_rounded)
-                                if key in price_map:
-                                    row['공동주택가격'] = price_map[key]['price']
-                                    row['공동주택가격_126퍼센트'] = price_map[key]['threshold_126']
-                            except:
-                                pass
-
-            # 호실 정보 조회 (메인 검색에서는 생략 - 성능 최적화)
-            # 호실 정보는 사용자가 "호실 확인" 버튼을 클릭할 때만 조회
-            for row in results:
-                row['동호명'] = None  # 초기값
-                row['동호명_전체목록'] = []
-                row['동호명_더보기'] = False
+    now = time.time()
+    if _norm_table_state['available'] is not None and now - _norm_table_state['checked_at'] < SEARCH_NORM_CHECK_INTERVAL:
+        return _norm_table_state['available']
 
-            all_results.extend(results)
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL as available", (SEARCH_NORM_TABLE,))
+            available = bool(cursor.fetchone()['available'])
+    except Exception as e:
+        print(f"[WARNING] 정규화 테이블 확인 실패: {str(e)}")
+        available = False
 
-        # 오피스텔 조회
-        if include_officetel:
-            # LH 필터 활성화 시 JOIN 쿼리 사용
-            if lh_only:
-                OTHER_TYPES = ['기숙사및특수사회시설', '기타', '비거주용건물내주택', '점포주택등복합용도주택']
-                officetel_housing_types = ['오피스텔'] + OTHER_TYPES
-                housing_types_str = "', '".join(officetel_housing_types)
+    if available != _norm_table_state['available']:
+        print(f"[INFO] 검색 대상: {'정규화 테이블(' + SEARCH_NORM_TABLE + ')' if available else '원본 4개 테이블'}")
+    _norm_table_state['available'] = available
+    _norm_table_state['checked_at'] = now
+    return available
 
-                query = f"""
-                    SELECT
-                        '오피스텔' as 구분,
-                        o.sggcd as 시군구코드,
-                        o.umdnm as 읍면동리,
-                        o.jibun as 지번,
-                        o.offinm as 단지명,
-                        o.excluusear as 면적,
-                        o.dealyear || LPAD(o.dealmonth::text, 2, '0') as 계약년월,
-                        o.dealday as 계약일,
-                        o.deposit as 보증금,
-                        o.monthlyrent as 월세,
-                        o.floor as 층,
-                        o.buildyear as 건축년도,
-                        o.contracttype as 계약구분,
-                        o.contractterm as 계약기간,
-                        o.predeposit as 종전계약보증금,
-                        o.premonthlyrent as 종전계약월세,
-                        o.userrright as 갱신요구권사용,
-                        lh.room_count as lh_room_count,
-                        lh.jeonse_support_amount as lh_support_amount,
-                        lh.housing_type as lh_housing_type,
-                        true as is_lh
-                    FROM officetel_rent_transactions o
-                    INNER JOIN lh_rent_transactions lh ON
-                        lh.sggcd = o.sggcd
-                        AND lh.exclusive_area::numeric = o.excluusear::numeric
-                        AND lh.dealyear::text = o.dealyear::text
-                        AND lh.dealmonth::text = o.dealmonth::text
-                        AND lh.dealday::text = o.dealday::text
-                        AND ROUND(lh.jeonse_amount) = (CAST(REPLACE(REPLACE(o.deposit, ',', ''), ' ', '') AS INTEGER) * 10000)
-                    WHERE (lh.house_subtype IN ('{housing_types_str}') OR lh.house_subtype IS NULL)
-                """
-            else:
-                query = """
-                    SELECT
-                        '오피스텔' as 구분,
-                        sggcd as 시군구코드,
-                        umdnm as 읍면동리,
-                        jibun as 지번,
-                        offinm as 단지명,
-                        excluusear as 면적,
-                        dealyear || LPAD(dealmonth::text, 2, '0') as 계약년월,
-                        dealday as 계약일,
-                        deposit as 보증금,
-                        monthlyrent as 월세,
-                        floor as 층,
-                        buildyear as 건축년도,
-                        contracttype as 계약구분,
-                        contractterm as 계약기간,
-                        predeposit as 종전계약보증금,
-                        premonthlyrent as 종전계약월세,
-                        userrright as 갱신요구권사용
-                    FROM officetel_rent_transactions
-                    WHERE 1=1
-                """
-            params = []
-
-            # LH 필터일 때는 테이블 alias 사용
-            table_prefix = "o." if lh_only else ""
-
-            # 1. 지역 필터를 먼저 적용 (인덱스 활용)
-            if sgg_codes:
-                placeholders = ','.join(['%s'] * len(sgg_codes))
-                query += f" AND {table_prefix}sggcd IN ({placeholders})"
-                params.extend(sgg_codes)
-
-            # 2. 읍면동 필터 추가
-            if umd_names and len(umd_names) > 0:
-                placeholders = ','.join(['%s'] * len(umd_names))
-                query += f" AND {table_prefix}umdnm IN ({placeholders})"
-                params.extend(umd_names)
-
-            # 3. 계약만기시기 필터
-            if contract_end:
-                if len(contract_end) == 6:  # YYYYMM 형식
-                    short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 202508 -> 25.08
-                    query += f" AND SPLIT_PART({table_prefix}contractterm, '~', 2) = %s"
-                    params.append(short_format)
-                else:
-                    query += f" AND SPLIT_PART({table_prefix}contractterm, '~', 2) = %s"
-                    params.append(contract_end)
-
-            if area_min:
-                query += f" AND CAST({table_prefix}excluusear AS FLOAT) >= %s"
-                params.append(area_min)
-            if area_max:
-                query += f" AND CAST({table_prefix}excluusear AS FLOAT) <= %s"
-                params.append(area_max)
-
-            if deposit_min:
-                query += f" AND CAST(REPLACE({table_prefix}deposit, ',', '') AS INTEGER) >= %s"
-                params.append(deposit_min)
-            if deposit_max:
-                query += f" AND CAST(REPLACE({table_prefix}deposit, ',', '') AS INTEGER) <= %s"
-                params.append(deposit_max)
-
-            if rent_min:
-                query += f" AND CAST(REPLACE({table_prefix}monthlyrent, ',', '') AS INTEGER) >= %s"
-                params.append(rent_min)
-            if rent_max:
-                query += f" AND CAST(REPLACE({table_prefix}monthlyrent, ',', '') AS INTEGER) <= %s"
-                params.append(rent_max)
-
-            if build_year_min:
-                query += f" AND CAST({table_prefix}buildyear AS INTEGER) >= %s"
-                params.append(build_year_min)
-            if build_year_max:
-                query += f" AND CAST({table_prefix}buildyear AS INTEGER) <= %s"
-                params.append(build_year_max)
-
-            query += " ORDER BY 계약년월 DESC, 계약일 DESC"
-
-            # LH 필터 시에는 페이지네이션 하지 않고 모든 데이터 조회
-            if use_sql_pagination:
-                query += " LIMIT %s OFFSET %s"
-                params.extend([page_size, offset])
 
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            result_counts.append(len(results))  # 건수 추적
+def lh_match_table_available():
+    """LH 매칭 결과 테이블 사용 가능 여부 (SEARCH_NORM_CHECK_INTERVAL 동안 캐시)"""
+    if not SEARCH_USE_LH_MATCH_TABLE:
+        return False
 
-            # 시도/시군구명 추가
-            for row in results:
-                sgg_code = row.get('시군구코드')
-                if sgg_code and sgg_code in REGIONS['sigungu']:
-                    sido_full = REGIONS['sigungu'][sgg_code]['sido']
-                    row['시도'] = SIDO_ABBR.get(sido_full, sido_full)
-                    row['시군구'] = REGIONS['sigungu'][sgg_code]['name']
-                else:
-                    row['시도'] = ''
-                    row['시군구'] = ''
+    now = time.time()
+    if _lh_match_table_state['available'] is not None and now - _lh_match_table_state['checked_at'] < SEARCH_NORM_CHECK_INTERVAL:
+        return _lh_match_table_state['available']
 
-            # 오피스텔 기준시가 일괄 조회
-            # 시군구별로 그룹화
-            from collections import defaultdict
-            sgg_groups_off = defaultdict(list)
-            for row in results:
-                sgg_code = row.get('시군구코드')
-                if sgg_code:
-                    sgg_groups_off[sgg_code].append(row)
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL as available", (LH_MATCH_TABLE,))
+            available = bool(cursor.fetchone()['available'])
+    except Exception as e:
+        print(f"[WARNING] LH 매칭 테이블 확인 실패: {str(e)}")
+        available = False
 
-            # 각 시군구별로 일괄 조회
-            for sgg_code, rows in sgg_groups_off.items():
-                price_map = fetch_officetel_standard_prices_batch(cursor, sgg_code, rows)
+    if available != _lh_match_table_state['available']:
+        print(f"[INFO] LH 필터 검색: {'매칭 테이블(' + LH_MATCH_TABLE + ') + 키셋 페이지네이션' if available else 'LH 테이블 JOIN 전체 조회'}")
+    _lh_match_table_state['available'] = available
+    _lh_match_table_state['checked_at'] = now
+    return available
 
-                # 결과 매핑
-                for row in rows:
-                    jibun = row.get('지번')
-                    floor = row.get('층')
-                    area = row.get('면적')
 
-                    if jibun and floor is not None and area:
-                        try:
-                            # 면적을 2자리로 반올림하여 키 생성
-                            area_rounded = round(float(area), 2)
-                            key = (jibun, int(floor), area_rounded)
-                            if key in price_map:
-                                data = price_map[key]
-                                row['기준시가_면적당가격'] = data['unit_price']
-                                row['기준시가_전용면적'] = data['exclusive_area']
-                                row['기준시가_공유면적'] = data['shared_area']
-                                row['기준시가_면적계'] = data['total_area']
-                                row['기준시가_총액'] = data['standard_price']
-                                row['기준시가_126퍼센트'] = data['threshold_126']
-                        except:
-                            pass
+def get_contract_end_tables():
+    """contract_end_ym 생성 컬럼이 추가된 원본 테이블 목록 (SEARCH_NORM_CHECK_INTERVAL 동안 캐시)"""
+    now = time.time()
+    if _contract_end_column_state['tables'] is not None and now - _contract_end_column_state['checked_at'] < SEARCH_NORM_CHECK_INTERVAL:
+        return _contract_end_column_state['tables']
 
-            # 호실 정보 조회 (메인 검색에서는 생략 - 성능 최적화)
-            # 호실 정보는 사용자가 "호실 확인" 버튼을 클릭할 때만 조회
-            for row in results:
-                row['동호명'] = None  # 초기값
-                row['동호명_전체목록'] = []
-                row['동호명_더보기'] = False
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT table_name
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND column_name = %s
+                  AND table_name = ANY(%s)
+            """, (CONTRACT_END_COLUMN, RENT_TABLES))
+            tables = frozenset(row['table_name'] for row in cursor.fetchall())
+    except Exception as e:
+        print(f"[WARNING] contract_end_ym 컬럼 확인 실패: {str(e)}")
+        tables = frozenset()
 
-            all_results.extend(results)
+    _contract_end_column_state['tables'] = tables
+    _contract_end_column_state['checked_at'] = now
+    return tables
 
-        # 단독다가구 조회 (컬럼명이 한글일 수 있음)
-        if include_dagagu:
-            try:
-                # 먼저 테이블 구조를 확인
-                cursor.execute("SELECT * FROM dagagu_rent_transactions LIMIT 0")
-                col_names = [desc[0] for desc in cursor.description]
-
-                # 컬럼명 매핑 (실제 테이블 구조에 맞춘 올바른 인덱스)
-                # 8:전용면적, 10:계약년, 11:계약일, 12:보증금, 13:월세, 14:건축년도, 15:도로명
-                # 16:계약기간, 17:계약구분, 18:갱신요구권사용, 19:종전계약보증금, 20:종전계약월세, 21:층정보(주택유형)
-
-                # LH 필터 활성화 시 JOIN 쿼리 사용
-                if lh_only:
-                    OTHER_TYPES = ['기숙사및특수사회시설', '기타', '비거주용건물내주택', '점포주택등복합용도주택']
-                    dagagu_housing_types = ['다가구용단독주택', '다중주택', '단독주택'] + OTHER_TYPES
-                    housing_types_str = "', '".join(dagagu_housing_types)
-
-                    query = f"""
-                        SELECT
-                            '단독다가구' as 구분,
-                            d.sggcd as 시군구코드,
-                            d.umdnm as 읍면동리,
-                            d.jibun as 지번,
-                            d."{col_names[15]}" as 단지명,
-                            '-' as 층,
-                            d."{col_names[8]}" as 면적,
-                            d."{col_names[12]}" as 보증금,
-                            d."{col_names[13]}" as 월세,
-                            d."{col_names[10]}" as 계약년월,
-                            d."{col_names[11]}" as 계약일,
-                            CASE
-                                WHEN d."{col_names[14]}" IS NULL OR d."{col_names[14]}" = '' THEN NULL
-                                WHEN CAST(d."{col_names[14]}" AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN
-                                    CASE
-                                        WHEN CAST(d."{col_names[14]}" AS FLOAT) BETWEEN 1800 AND 2200 THEN CAST(CAST(d."{col_names[14]}" AS FLOAT) AS INTEGER)
-                                        ELSE NULL
-                                    END
-                                ELSE NULL
-                            END as 건축년도,
-                            d."{col_names[17]}" as 계약구분,
-                            d."{col_names[16]}" as 계약기간,
-                            d."{col_names[19]}" as 종전계약보증금,
-                            d."{col_names[20]}" as 종전계약월세,
-                            d."{col_names[18]}" as 갱신요구권사용,
-                            lh.room_count as lh_room_count,
-                            lh.jeonse_support_amount as lh_support_amount,
-                            lh.housing_type as lh_housing_type,
-                            true as is_lh
-                        FROM dagagu_rent_transactions d
-                        INNER JOIN lh_rent_transactions lh ON
-                            lh.sggcd = d.sggcd
-                            AND lh.exclusive_area::numeric = d."{col_names[8]}"::numeric
-                            AND lh.dealyear::text = SPLIT_PART(d."{col_names[10]}", '.', 1)
-                            AND lh.dealmonth::text = SPLIT_PART(d."{col_names[10]}", '.', 2)
-                            AND lh.dealday::text = d."{col_names[11]}"
-                            AND ROUND(lh.jeonse_amount) = (CAST(REPLACE(REPLACE(d."{col_names[12]}", ',', ''), ' ', '') AS INTEGER) * 10000)
-                        WHERE (lh.house_subtype IN ('{housing_types_str}') OR lh.house_subtype IS NULL)
-                    """
-                else:
-                    query = f"""
-                        SELECT
-                            '단독다가구' as 구분,
-                            sggcd as 시군구코드,
-                            umdnm as 읍면동리,
-                            jibun as 지번,
-                            "{col_names[15]}" as 단지명,
-                            '-' as 층,
-                            "{col_names[8]}" as 면적,
-                            "{col_names[12]}" as 보증금,
-                            "{col_names[13]}" as 월세,
-                            "{col_names[10]}" as 계약년월,
-                            "{col_names[11]}" as 계약일,
-                            CASE
-                                WHEN "{col_names[14]}" IS NULL OR "{col_names[14]}" = '' THEN NULL
-                                WHEN CAST("{col_names[14]}" AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN
-                                    CASE
-                                        WHEN CAST("{col_names[14]}" AS FLOAT) BETWEEN 1800 AND 2200 THEN CAST(CAST("{col_names[14]}" AS FLOAT) AS INTEGER)
-                                        ELSE NULL
-                                    END
-                                ELSE NULL
-                            END as 건축년도,
-                            "{col_names[17]}" as 계약구분,
-                            "{col_names[16]}" as 계약기간,
-                            "{col_names[19]}" as 종전계약보증금,
-                            "{col_names[20]}" as 종전계약월세,
-                            "{col_names[18]}" as 갱신요구권사용
-                        FROM dagagu_rent_transactions
-                        WHERE 1=1
-                    """
-                params = []
-
-                # LH 필터일 때는 테이블 alias 사용
-                table_prefix = "d." if lh_only else ""
-
-                # 1. 지역 필터를 먼저 적용 (인덱스 활용)
-                if sgg_codes:
-                    placeholders = ','.join(['%s'] * len(sgg_codes))
-                    query += f" AND {table_prefix}sggcd IN ({placeholders})"
-                    params.extend(sgg_codes)
 
-                # 2. 읍면동 필터 추가
-                if umd_names and len(umd_names) > 0:
-                    placeholders = ','.join(['%s'] * len(umd_names))
-                    query += f" AND {table_prefix}umdnm IN ({placeholders})"
-                    params.extend(umd_names)
+def parse_contract_end_ym(contract_end):
+    """계약만기시기 → YYYYMM 정수 (202512, 25.12 형식 지원, 그 외 None)"""
+    value = str(contract_end or '').strip()
+    if re.fullmatch(r'\d{6}', value):
+        return int(value)
+    match = re.fullmatch(r'(\d{2})\.(\d{2})', value)
+    if match:
+        return 200000 + int(match.group(1)) * 100 + int(match.group(2))
+    return None
 
-                # 3. 계약만기시기 필터 (col_names[16]: 계약기간)
-                if contract_end:
-                    if len(contract_end) == 6:  # YYYYMM 형식
-                        # 단독다가구는 YYYYMM 형식을 그대로 사용 (202508~202608 형태)
-                        query += f' AND SPLIT_PART({table_prefix}"{col_names[16]}", \'~\', 2) = %s'
-                        params.append(contract_end)  # ~202512로 끝나는 것만
-                    else:
-                        query += f' AND SPLIT_PART({table_prefix}"{col_names[16]}", \'~\', 2) = %s'
-                        params.append(contract_end)
-
-                if area_min:
-                    query += f' AND CAST({table_prefix}"{col_names[8]}" AS FLOAT) >= %s'
-                    params.append(area_min)
-                if area_max:
-                    query += f' AND CAST({table_prefix}"{col_names[8]}" AS FLOAT) <= %s'
-                    params.append(area_max)
-
-                if deposit_min:
-                    query += f' AND CAST(REPLACE({table_prefix}"{col_names[12]}", \',\', \'\') AS INTEGER) >= %s'
-                    params.append(deposit_min)
-                if deposit_max:
-                    query += f' AND CAST(REPLACE({table_prefix}"{col_names[12]}", \',\', \'\') AS INTEGER) <= %s'
-                    params.append(deposit_max)
-
-                if rent_min:
-                    query += f' AND CAST(REPLACE({table_prefix}"{col_names[13]}", \',\', \'\') AS INTEGER) >= %s'
-                    params.append(rent_min)
-                if rent_max:
-                    query += f' AND CAST(REPLACE({table_prefix}"{col_names[13]}", \',\', \'\') AS INTEGER) <= %s'
-                    params.append(rent_max)
-
-                if build_year_min:
-                    query += f''' AND CASE
-                        WHEN {table_prefix}"{col_names[14]}" IS NULL OR {table_prefix}"{col_names[14]}" = '' THEN FALSE
-                        WHEN CAST({table_prefix}"{col_names[14]}" AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN CAST(CAST({table_prefix}"{col_names[14]}" AS FLOAT) AS INTEGER) >= %s
-                        ELSE FALSE
-                    END'''
-                    params.append(build_year_min)
-                if build_year_max:
-                    query += f''' AND CASE
-                        WHEN {table_prefix}"{col_names[14]}" IS NULL OR {table_prefix}"{col_names[14]}" = '' THEN FALSE
-                        WHEN CAST({table_prefix}"{col_names[14]}" AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN CAST(CAST({table_prefix}"{col_names[14]}" AS FLOAT) AS INTEGER) <= %s
-                        ELSE FALSE
-                    END'''
-                    params.append(build_year_max)
-
-                query += " ORDER BY 계약년월 DESC, 계약일 DESC"
-
-                # LH 필터 시에는 페이지네이션 하지 않고 모든 데이터 조회
+
+def search_cache_key(params):
+    """정규화된 검색 조건 → 캐시 키 (목록은 정렬, 같은 조건이면 입력 순서와 무관하게 같은 키)"""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def get_search_data_watermark():
+    """데이터 적재 워터마크 - 감시 테이블의 누적 INSERT/UPDATE/DELETE 건수 합 (적재 후 값이 바뀜)"""
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT COALESCE(SUM(n_tup_ins + n_tup_upd + n_tup_del), 0)::bigint as watermark
+            FROM pg_stat_user_tables
+            WHERE relname = ANY(%s)
+        """, (SEARCH_CACHE_WATCH_TABLES,))
+        return cursor.fetchone()['watermark']
+
+
+def check_search_cache_watermark():
+    """SEARCH_CACHE_WATERMARK_INTERVAL마다 워터마크 확인, 바뀌었으면 캐시 전체 무효화"""
+    now = time.time()
+    if now - _search_cache_state['checked_at'] < SEARCH_CACHE_WATERMARK_INTERVAL:
+        return
+    _search_cache_state['checked_at'] = now
+
+    try:
+        watermark = get_search_data_watermark()
+    except Exception as e:
+        print(f"[WARNING] 검색 캐시 워터마크 확인 실패: {str(e)}")
+        return
+
+    with _search_cache_lock:
+        previous = _search_cache_state['watermark']
+        _search_cache_state['watermark'] = watermark
+        if previous is not None and previous != watermark and _search_cache:
+            print(f"[INFO] 데이터 변경 감지 (워터마크 {previous} → {watermark}), 검색 캐시 {len(_search_cache)}건 무효화")
+            _search_cache.clear()
+            _search_cache_state['bytes'] = 0
+            _search_cache_stats['invalidations'] += 1
+
+
+def search_cache_get(key):
+    """캐시된 JSON 응답 반환 (없거나 만료면 None)"""
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    check_search_cache_watermark()
+
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is None:
+            _search_cache_stats['misses'] += 1
+            return None
+        expires_at, body = entry
+        if expires_at < time.time():
+            del _search_cache[key]
+            _search_cache_state['bytes'] -= len(body)
+            _search_cache_stats['expirations'] += 1
+            _search_cache_stats['misses'] += 1
+            return None
+        _search_cache.move_to_end(key)
+        _search_cache_stats['hits'] += 1
+        return body
+
+
+def search_cache_put(key, body):
+    """JSON 응답 저장 (메모리 상한을 넘으면 LRU 순서로 제거, 상한의 1/4보다 큰 응답은 저장 안 함)"""
+    if not SEARCH_CACHE_ENABLED or len(body) > SEARCH_CACHE_MAX_BYTES // 4:
+        return
+
+    with _search_cache_lock:
+        previous = _search_cache.pop(key, None)
+        if previous is not None:
+            _search_cache_state['bytes'] -= len(previous[1])
+        _search_cache[key] = (time.time() + SEARCH_CACHE_TTL, body)
+        _search_cache_state['bytes'] += len(body)
+        while _search_cache_state['bytes'] > SEARCH_CACHE_MAX_BYTES and _search_cache:
+            _, (_, evicted) = _search_cache.popitem(last=False)
+            _search_cache_state['bytes'] -= len(evicted)
+            _search_cache_stats['evictions'] += 1
+
+
+def get_search_cache_stats():
+    """검색 캐시 통계 (적중률 확인용)"""
+    with _search_cache_lock:
+        lookups = _search_cache_stats['hits'] + _search_cache_stats['misses']
+        return {
+            'enabled': SEARCH_CACHE_ENABLED,
+            **_search_cache_stats,
+            'hit_rate': round(_search_cache_stats['hits'] / lookups, 4) if lookups else None,
+            'entries': len(_search_cache),
+            'bytes': _search_cache_state['bytes'],
+            'max_bytes': SEARCH_CACHE_MAX_BYTES,
+            'ttl': SEARCH_CACHE_TTL,
+            'watermark': _search_cache_state['watermark'],
+        }
+
+
+# LH 매칭 테이블 조인 시 추가되는 컬럼 (LH 테이블 JOIN 쿼리와 같은 이름)
+LH_MATCH_SELECT_COLUMNS = """lm.room_count as lh_room_count,
+            lm.jeonse_support_amount as lh_support_amount,
+            lm.housing_type as lh_housing_type,
+            true as is_lh"""
+
+
+def build_norm_search_query(source_types, sgg_codes, criteria, after=None):
+    """정규화 테이블 검색 쿼리 생성 (유형 1개 또는 union 모드의 여러 유형)
+
+    원본 테이블 쿼리와 같은 컬럼명으로 반환하되 보증금/월세/면적/건축년도는 숫자 타입
+    """
+    label_case = "CASE n.property_type " + " ".join(
+        f"WHEN '{t}' THEN '{SEARCH_TYPE_SPECS[t]['label']}'" for t in SEARCH_TYPE_ORDER
+    ) + " END"
+
+    # LH 필터는 LH 매칭 테이블이 있을 때만 정규화 테이블로 처리 (유형 + 원본 키로 조인)
+    lh_select, lh_join = '', ''
+    if criteria['lh_only']:
+        lh_select = f""",
+            {LH_MATCH_SELECT_COLUMNS}"""
+        lh_join = f"""
+        INNER JOIN {LH_MATCH_TABLE} lm ON lm.property_type = n.property_type AND lm.source_key = n.source_key"""
+
+    query = f"""
+        SELECT
+            {label_case} as 구분,
+            n.sggcd as 시군구코드,
+            n.umdnm as 읍면동리,
+            n.jibun as 지번,
+            n.building_name as 단지명,
+            n.exclusive_area as 면적,
+            LPAD(n.deal_ym::text, 6, '0') as 계약년월,
+            n.deal_day::text as 계약일,
+            n.deposit as 보증금,
+            n.monthly_rent as 월세,
+            n.floor as 층,
+            n.build_year as 건축년도,
+            n.contract_type as 계약구분,
+            n.contract_term as 계약기간,
+            n.pre_deposit as 종전계약보증금,
+            n.pre_monthly_rent as 종전계약월세,
+            n.renewal_right as 갱신요구권사용,
+            n.deal_ym as _sort_ym,
+            n.deal_day as _sort_day,
+            n.source_key as _sort_key,
+            ({label_case})::text COLLATE "C" as _sort_type{lh_select}
+        FROM {SEARCH_NORM_TABLE} n{lh_join}
+        WHERE n.contract_end_ym = %s
+    """
+    params = [criteria['contract_end_ym']]
+
+    # 1. 유형 필터
+    query += " AND n.property_type = ANY(%s)"
+    params.append(list(source_types))
+
+    # 2. 지역 필터
+    if sgg_codes:
+        query += " AND n.sggcd = ANY(%s)"
+        params.append(list(sgg_codes))
+    umd_names = criteria['umd_names']
+    if umd_names:
+        query += " AND n.umdnm = ANY(%s)"
+        params.append(list(umd_names))
+
+    # 3. 범위 필터 (타입 지정 컬럼이라 CAST 없이 비교)
+    range_filters = [
+        ('n.exclusive_area', criteria['area_min'], criteria['area_max']),
+        ('n.deposit', criteria['deposit_min'], criteria['deposit_max']),
+        ('n.monthly_rent', criteria['rent_min'], criteria['rent_max']),
+        ('n.build_year', criteria['build_year_min'], criteria['build_year_max']),
+    ]
+    for column, min_value, max_value in range_filters:
+        if min_value:
+            query += f" AND {column} >= %s"
+            params.append(min_value)
+        if max_value:
+            query += f" AND {column} <= %s"
+            params.append(max_value)
+
+    # 4. 키셋 페이지네이션 (union 모드 토큰은 구분까지 비교)
+    if after:
+        if len(after) == 4:
+            query += f""" AND (n.deal_ym, n.deal_day, n.source_key, ({label_case})::text COLLATE "C") < (%s::integer, %s, %s, %s)"""
+        else:
+            query += " AND (n.deal_ym, n.deal_day, n.source_key) < (%s::integer, %s, %s)"
+        params.extend(after)
+
+    query += " ORDER BY _sort_ym DESC, _sort_day DESC, _sort_key DESC, _sort_type DESC"
+    return query, params
+
+
+def search_keyset_condition(label, sort_exprs, after):
+    """키셋 조건절 생성 - after가 4개 값이면 통합(UNION ALL) 모드로 구분(유형)까지 비교"""
+    sort_ym, sort_day, sort_key = sort_exprs
+    if len(after) == 4:
+        return f" AND ({sort_ym}, {sort_day}, {sort_key}, '{label}'::text COLLATE \"C\") < (%s, %s, %s, %s)"
+    return f" AND ({sort_ym}, {sort_day}, {sort_key}) < (%s, %s, %s)"
+
+
+def search_sort_key(row):
+    """결과 행의 정렬 키 (SQL의 _sort_ym, _sort_day, _sort_key와 동일)"""
+    return (row.get('_sort_ym', ''), row.get('_sort_day', 0), row.get('_sort_key', ''))
+
+
+def sort_search_rows(rows):
+    """SQL과 같은 기준(계약년월 DESC, 계약일 DESC, 고유키 DESC)으로 정렬 - 샤드 결과 병합용"""
+    rows.sort(key=search_sort_key, reverse=True)
+    return rows
+
+
+def encode_search_cursor(last_keys):
+    """유형별 마지막 정렬 키를 불투명한 다음 페이지 토큰으로 변환 (더 없으면 None)"""
+    if not last_keys:
+        return None
+    payload = json.dumps({'v': 1, 'k': last_keys}, ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_search_cursor(token):
+    """다음 페이지 토큰 → {유형: (계약년월, 계약일, 고유키)} (형식이 잘못되면 ValueError)
+
+    union 모드 토큰은 {'union': (계약년월, 계약일, 고유키, 구분)}
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        if payload.get('v') != 1:
+            raise ValueError('지원하지 않는 토큰 버전')
+        after_keys = {}
+        for source_type, key in payload['k'].items():
+            if source_type == SEARCH_UNION_CURSOR_KEY and len(key) == 4:
+                after_keys[source_type] = (str(key[0]), int(key[1]), str(key[2]), str(key[3]))
+                continue
+            if source_type not in SEARCH_TYPE_SPECS or len(key) != 3:
+                raise ValueError(f'잘못된 유형 키: {source_type}')
+            after_keys[source_type] = (str(key[0]), int(key[1]), str(key[2]))
+        return after_keys
+    except (TypeError, KeyError, AttributeError, UnicodeError, binascii.Error, json.JSONDecodeError) as e:
+        raise ValueError(f'잘못된 페이지 토큰: {e}')
+
+
+def build_search_query(source_type, sgg_codes, criteria, after=None):
+    """아파트/연립다세대/오피스텔 검색 쿼리 생성 (LH 필터 시 lh_rent_transactions JOIN)
+
+    after: 이전 페이지 마지막 행의 정렬 키 (키셋 페이지네이션)
+    """
+    spec = SEARCH_TYPE_SPECS[source_type]
+    p = f"{spec['alias']}."
+    c = rent_column_refs(source_type, spec['alias'])  # 논리 필드 → 물리 컬럼 (스키마 레지스트리)
+    sort_ym, sort_day, sort_key = search_sort_exprs(source_type)
+
+    select_clause = f"""
+        SELECT
+            '{spec['label']}' as 구분,
+            {c['sggcd']} as 시군구코드,
+            {c['umdnm']} as 읍면동리,
+            {c['jibun']} as 지번,
+            {c['building_name']} as 단지명,
+            {c['area']} as 면적,
+            {c['deal_year']} || LPAD({c['deal_month']}::text, 2, '0') as 계약년월,
+            {c['deal_day']} as 계약일,
+            {c['deposit']} as 보증금,
+            {c['monthly_rent']} as 월세,
+            {c['floor']} as 층,
+            {c['build_year']} as 건축년도,
+            {c['contract_type']} as 계약구분,
+            {c['contract_term']} as 계약기간,
+            {c['pre_deposit']} as 종전계약보증금,
+            {c['pre_monthly_rent']} as 종전계약월세,
+            {c['renewal_right']} as 갱신요구권사용,
+            {sort_ym} as _sort_ym,
+            {sort_day} as _sort_day,
+            {sort_key} as _sort_key"""
+
+    if criteria['lh_only'] and criteria.get('lh_match'):
+        # LH 매칭 테이블로 조인 (매칭은 create_lh_match_table.py에서 미리 계산)
+        query = select_clause + f""",
+            {LH_MATCH_SELECT_COLUMNS}
+        FROM {spec['table']} {spec['alias']}
+        INNER JOIN {LH_MATCH_TABLE} lm ON lm.property_type = '{source_type}' AND lm.source_key = {c['key']}::text
+        WHERE 1=1
+        """
+    elif criteria['lh_only']:
+        housing_types_str = "', '".join(spec['lh_house_types'])
+        query = select_clause + f""",
+            lh.room_count as lh_room_count,
+            lh.jeonse_support_amount as lh_support_amount,
+            lh.housing_type as lh_housing_type,
+            true as is_lh
+        FROM {spec['table']} {spec['alias']}
+        INNER JOIN lh_rent_transactions lh ON
+            lh.sggcd = {c['sggcd']}
+            AND lh.exclusive_area::numeric = {c['area']}::numeric
+            AND lh.dealyear::text = {c['deal_year']}::text
+            AND lh.dealmonth::text = {c['deal_month']}::text
+            AND lh.dealday::text = {c['deal_day']}::text
+            AND ROUND(lh.jeonse_amount) = (CAST(REPLACE(REPLACE({c['deposit']}, ',', ''), ' ', '') AS INTEGER) * 10000)
+        WHERE (lh.house_subtype IN ('{housing_types_str}') OR lh.house_subtype IS NULL)
+        """
+    else:
+        query = select_clause + f"""
+        FROM {spec['table']} {spec['alias']}
+        WHERE 1=1
+        """
+    params = []
+
+    # 1. 지역 필터를 먼저 적용 (인덱스 활용, 성능 최적화)
+    if sgg_codes:
+        query += f" AND {c['sggcd']} = ANY(%s)"
+        params.append(list(sgg_codes))
+
+    # 2. 읍면동 필터 추가
+    umd_names = criteria['umd_names']
+    if umd_names:
+        query += f" AND {c['umdnm']} = ANY(%s)"
+        params.append(list(umd_names))
+
+    # 3. 계약만기시기 필터 (contract_end_ym 생성 컬럼이 있으면 인덱스 사용, 없으면 SPLIT_PART)
+    contract_end = criteria['contract_end']
+    if contract_end:
+        if criteria.get('contract_end_ym') is not None and spec['table'] in criteria.get('contract_end_tables', ()):
+            query += f" AND {p}contract_end_ym = %s"
+            params.append(criteria['contract_end_ym'])
+        elif len(contract_end) == 6:  # YYYYMM 형식
+            short_format = contract_end[2:4] + '.' + contract_end[4:6]  # 202512 -> 25.12
+            query += f" AND SPLIT_PART({c['contract_term']}, '~', 2) = %s"
+            params.append(short_format)
+        else:
+            query += f" AND SPLIT_PART({c['contract_term']}, '~', 2) = %s"
+            params.append(contract_end)
+
+    # 4. 면적 필터
+    if criteria['area_min']:
+        query += f" AND CAST({c['area']} AS FLOAT) >= %s"
+        params.append(criteria['area_min'])
+    if criteria['area_max']:
+        query += f" AND CAST({c['area']} AS FLOAT) <= %s"
+        params.append(criteria['area_max'])
+
+    # 5. 보증금 필터
+    if criteria['deposit_min']:
+        query += f" AND CAST(REPLACE({c['deposit']}, ',', '') AS INTEGER) >= %s"
+        params.append(criteria['deposit_min'])
+    if criteria['deposit_max']:
+        query += f" AND CAST(REPLACE({c['deposit']}, ',', '') AS INTEGER) <= %s"
+        params.append(criteria['deposit_max'])
+
+    # 6. 월세 필터
+    if criteria['rent_min']:
+        query += f" AND CAST(REPLACE({c['monthly_rent']}, ',', '') AS INTEGER) >= %s"
+        params.append(criteria['rent_min'])
+    if criteria['rent_max']:
+        query += f" AND CAST(REPLACE({c['monthly_rent']}, ',', '') AS INTEGER) <= %s"
+        params.append(criteria['rent_max'])
+
+    # 7. 건축년도 필터
+    if criteria['build_year_min']:
+        query += f" AND CAST({c['build_year']} AS INTEGER) >= %s"
+        params.append(criteria['build_year_min'])
+    if criteria['build_year_max']:
+        query += f" AND CAST({c['build_year']} AS INTEGER) <= %s"
+        params.append(criteria['build_year_max'])
+
+    # 8. 키셋 페이지네이션: 이전 페이지 마지막 행보다 뒤에 오는 행만 (OFFSET 없이 인덱스 탐색)
+    if after:
+        query += search_keyset_condition(spec['label'], (sort_ym, sort_day, sort_key), after)
+        params.extend(after)
+
+    query += " ORDER BY _sort_ym DESC, _sort_day DESC, _sort_key DESC"
+    return query, params
+
+
+def build_dagagu_search_query(sgg_codes, criteria, after=None):
+    """단독다가구 검색 쿼리 생성 (한글 컬럼명은 스키마 레지스트리로 해석)"""
+    spec = SEARCH_TYPE_SPECS['dagagu']
+    p = f"{spec['alias']}."
+    c = rent_column_refs('dagagu', spec['alias'])  # 논리 필드 → 물리 컬럼 (스키마 레지스트리)
+    sort_ym, sort_day, sort_key = search_sort_exprs('dagagu')
+
+    # 층정보 컬럼에는 주택유형이 저장되어 있어 '-'로 표시
+    select_clause = f"""
+        SELECT
+            '단독다가구' as 구분,
+            {c['sggcd']} as 시군구코드,
+            {c['umdnm']} as 읍면동리,
+            {c['jibun']} as 지번,
+            {c['building_name']} as 단지명,
+            '-' as 층,
+            {c['area']} as 면적,
+            {c['deposit']} as 보증금,
+            {c['monthly_rent']} as 월세,
+            {c['deal_ym']} as 계약년월,
+            {c['deal_day']} as 계약일,
+            CASE
+                WHEN {c['build_year']} IS NULL OR {c['build_year']} = '' THEN NULL
+                WHEN CAST({c['build_year']} AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN
+                    CASE
+                        WHEN CAST({c['build_year']} AS FLOAT) BETWEEN 1800 AND 2200 THEN CAST(CAST({c['build_year']} AS FLOAT) AS INTEGER)
+                        ELSE NULL
+                    END
+                ELSE NULL
+            END as 건축년도,
+            {c['contract_type']} as 계약구분,
+            {c['contract_term']} as 계약기간,
+            {c['pre_deposit']} as 종전계약보증금,
+            {c['pre_monthly_rent']} as 종전계약월세,
+            {c['renewal_right']} as 갱신요구권사용,
+            {sort_ym} as _sort_ym,
+            {sort_day} as _sort_day,
+            {sort_key} as _sort_key"""
+
+    if criteria['lh_only'] and criteria.get('lh_match'):
+        # LH 매칭 테이블로 조인 (매칭은 create_lh_match_table.py에서 미리 계산)
+        query = select_clause + f""",
+            {LH_MATCH_SELECT_COLUMNS}
+        FROM {spec['table']} {spec['alias']}
+        INNER JOIN {LH_MATCH_TABLE} lm ON lm.property_type = 'dagagu' AND lm.source_key = {c['key']}::text
+        WHERE 1=1
+        """
+    elif criteria['lh_only']:
+        housing_types_str = "', '".join(spec['lh_house_types'])
+        query = select_clause + f""",
+            lh.room_count as lh_room_count,
+            lh.jeonse_support_amount as lh_support_amount,
+            lh.housing_type as lh_housing_type,
+            true as is_lh
+        FROM {spec['table']} {spec['alias']}
+        INNER JOIN lh_rent_transactions lh ON
+            lh.sggcd = {c['sggcd']}
+            AND lh.exclusive_area::numeric = {c['area']}::numeric
+            AND lh.dealyear::text = SPLIT_PART({c['deal_ym']}, '.', 1)
+            AND lh.dealmonth::text = SPLIT_PART({c['deal_ym']}, '.', 2)
+            AND lh.dealday::text = {c['deal_day']}
+            AND ROUND(lh.jeonse_amount) = (CAST(REPLACE(REPLACE({c['deposit']}, ',', ''), ' ', '') AS INTEGER) * 10000)
+        WHERE (lh.house_subtype IN ('{housing_types_str}') OR lh.house_subtype IS NULL)
+        """
+    else:
+        query = select_clause + f"""
+        FROM {spec['table']} {spec['alias']}
+        WHERE 1=1
+        """
+    params = []
+
+    # 1. 지역 필터를 먼저 적용 (인덱스 활용)
+    if sgg_codes:
+        query += f" AND {c['sggcd']} = ANY(%s)"
+        params.append(list(sgg_codes))
+
+    # 2. 읍면동 필터 추가
+    umd_names = criteria['umd_names']
+    if umd_names:
+        query += f" AND {c['umdnm']} = ANY(%s)"
+        params.append(list(umd_names))
+
+    # 3. 계약만기시기 필터 (contract_end_ym 생성 컬럼 우선, 없으면 계약기간 YYYYMM~YYYYMM 형식 그대로 사용)
+    contract_end = criteria['contract_end']
+    if contract_end:
+        if criteria.get('contract_end_ym') is not None and spec['table'] in criteria.get('contract_end_tables', ()):
+            query += f" AND {p}contract_end_ym = %s"
+            params.append(criteria['contract_end_ym'])
+        else:
+            query += f" AND SPLIT_PART({c['contract_term']}, '~', 2) = %s"
+            params.append(contract_end)  # ~202512로 끝나는 것만
+
+    if criteria['area_min']:
+        query += f" AND CAST({c['area']} AS FLOAT) >= %s"
+        params.append(criteria['area_min'])
+    if criteria['area_max']:
+        query += f" AND CAST({c['area']} AS FLOAT) <= %s"
+        params.append(criteria['area_max'])
+
+    if criteria['deposit_min']:
+        query += f" AND CAST(REPLACE({c['deposit']}, ',', '') AS INTEGER) >= %s"
+        params.append(criteria['deposit_min'])
+    if criteria['deposit_max']:
+        query += f" AND CAST(REPLACE({c['deposit']}, ',', '') AS INTEGER) <= %s"
+        params.append(criteria['deposit_max'])
+
+    if criteria['rent_min']:
+        query += f" AND CAST(REPLACE({c['monthly_rent']}, ',', '') AS INTEGER) >= %s"
+        params.append(criteria['rent_min'])
+    if criteria['rent_max']:
+        query += f" AND CAST(REPLACE({c['monthly_rent']}, ',', '') AS INTEGER) <= %s"
+        params.append(criteria['rent_max'])
+
+    if criteria['build_year_min']:
+        query += f''' AND CASE
+            WHEN {c['build_year']} IS NULL OR {c['build_year']} = '' THEN FALSE
+            WHEN CAST({c['build_year']} AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN CAST(CAST({c['build_year']} AS FLOAT) AS INTEGER) >= %s
+            ELSE FALSE
+        END'''
+        params.append(criteria['build_year_min'])
+    if criteria['build_year_max']:
+        query += f''' AND CASE
+            WHEN {c['build_year']} IS NULL OR {c['build_year']} = '' THEN FALSE
+            WHEN CAST({c['build_year']} AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN CAST(CAST({c['build_year']} AS FLOAT) AS INTEGER) <= %s
+            ELSE FALSE
+        END'''
+        params.append(criteria['build_year_max'])
+
+    # 8. 키셋 페이지네이션: 이전 페이지 마지막 행보다 뒤에 오는 행만 (OFFSET 없이 인덱스 탐색)
+    if after:
+        query += search_keyset_condition(spec['label'], (sort_ym, sort_day, sort_key), after)
+        params.extend(after)
+
+    query += " ORDER BY _sort_ym DESC, _sort_day DESC, _sort_key DESC"
+    return query, params
+
+
+def build_type_search_query(source_type, sgg_codes, criteria, after=None):
+    """주택 유형 하나의 검색 쿼리 (정규화 테이블 / 단독다가구 / 그 외 원본 테이블)"""
+    if criteria.get('use_norm'):
+        return build_norm_search_query([source_type], sgg_codes, criteria, after)
+    if source_type == 'dagagu':
+        return build_dagagu_search_query(sgg_codes, criteria, after)
+    return build_search_query(source_type, sgg_codes, criteria, after)
+
+
+def fetch_search_rows(cursor, source_type, sgg_codes, criteria, limit=None, offset=0, after=None):
+    """주택 유형 하나(또는 시군구 샤드 하나)의 검색 결과 조회"""
+    query, params = build_type_search_query(source_type, sgg_codes, criteria, after)
+
+    # LH 필터 시에는 페이지네이션 하지 않고 모든 데이터 조회
+    if limit is not None:
+        query += " LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+
+    query_start = time.time()
+    execute_prepared(cursor, query, params)
+    results = cursor.fetchall()
+    print(f"[DEBUG] {SEARCH_TYPE_SPECS[source_type]['label']} 조회: 시군구 {len(sgg_codes)}개, {len(results)}건, {time.time() - query_start:.2f}초")
+    return results
+
+
+def fetch_search_rows_union(cursor, source_types, sgg_codes, criteria, page_size, after=None):
+    """union 모드: 포함된 유형을 UNION ALL 한 쿼리 하나로 조회 (전체 ORDER BY/LIMIT)
+
+    - 각 유형 쿼리는 자체 ORDER BY + LIMIT page_size + 1로 상위 N건만 뽑고 (인덱스 탐색)
+    - 바깥에서 한 번 더 정렬해 page_size + 1건 반환 → 1건 더 있으면 has_more
+    - 같은 정렬 키는 구분(유형)으로 순서 고정 (_sort_type)
+    - 정규화 테이블 사용 시에는 UNION 없이 유형 IN 조건 쿼리 하나로 처리
+    """
+    if criteria.get('use_norm'):
+        query, params = build_norm_search_query(source_types, sgg_codes, criteria, after)
+        query += " LIMIT %s"
+        params.append(page_size + 1)
+        query_start = time.time()
+        execute_prepared(cursor, query, params)
+        results = cursor.fetchall()
+        print(f"[DEBUG] 통합(정규화 테이블) 조회: 유형 {len(source_types)}개, {len(results)}건, {time.time() - query_start:.2f}초")
+        return results
+
+    union_parts = []
+    params = []
+
+    for source_type in source_types:
+        spec = SEARCH_TYPE_SPECS[source_type]
+        if source_type == 'dagagu':
+            query, branch_params = build_dagagu_search_query(sgg_codes, criteria, after)
+        else:
+            query, branch_params = build_search_query(source_type, sgg_codes, criteria, after)
+
+        projected = ', '.join(f't."{col}"::text as "{col}"' for col in SEARCH_UNION_COLUMNS)
+        union_parts.append(f"""
+            SELECT {projected},
+                t._sort_ym, t._sort_day, t._sort_key,
+                '{spec['label']}'::text COLLATE "C" as _sort_type
+            FROM ({query} LIMIT %s) t""")
+        params.extend(branch_params)
+        params.append(page_size + 1)
+
+    query = (
+        "SELECT * FROM (" + " UNION ALL ".join(union_parts) + ") u"
+        " ORDER BY _sort_ym DESC, _sort_day DESC, _sort_key DESC, _sort_type DESC"
+        " LIMIT %s"
+    )
+    params.append(page_size + 1)
+
+    query_start = time.time()
+    execute_prepared(cursor, query, params)
+    results = cursor.fetchall()
+    print(f"[DEBUG] 통합(UNION ALL) 조회: 유형 {len(source_types)}개, {len(results)}건, {time.time() - query_start:.2f}초")
+    return results
+
+
+def execute_search_union(source_types, sgg_codes, criteria, page_size, after=None):
+    """union 모드 검색: 쿼리 1회 후 유형별 보강을 병렬 실행, 전체 정렬 순서 유지
+
+    반환: (결과 목록, has_more, 마지막 행 정렬 키)
+    """
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        rows = fetch_search_rows_union(cursor, source_types, sgg_codes, criteria, page_size, after)
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    last_key = None
+    if has_more and rows:
+        last_key = list(search_sort_key(rows[-1])) + [rows[-1]['_sort_type']]
+
+    # 보강은 유형별로 묶어 병렬 실행 (행 객체를 그대로 수정하므로 순서 유지)
+    label_to_type = {SEARCH_TYPE_SPECS[t]['label']: t for t in source_types}
+    rows_by_type = defaultdict(list)
+    for row in rows:
+        rows_by_type[label_to_type[row['구분']]].append(row)
+
+    executor = get_search_executor()
+    futures = [
+        executor.submit(run_enrich_task, source_type, type_rows, criteria['lh_only'], criteria.get('defer_enrich', False))
+        for source_type, type_rows in rows_by_type.items()
+    ]
+    for future in futures:
+        future.result()
+
+    for row in rows:
+        row.pop('_sort_type', None)
+    return rows, has_more, last_key
+
+
+def add_price_info_to_results(cursor, source_type, results):
+    """검색 결과에 공동주택가격(아파트/연립다세대) 또는 기준시가(오피스텔) 추가 (페이지 전체 일괄 조회)"""
+    if source_type in ('apt', 'villa'):
+        # 공동주택가격 일괄 조회 (N+1 쿼리 문제 해결)
+        # 법정동코드(역인덱스)별로 그룹화 → 페이지 전체를 한 번에 조회 (법정동 수와 관계없이 쿼리 1회)
+        umd_groups = defaultdict(list)
+        for row in results:
+            bjdcd_10 = find_umd_code(row.get('시군구코드'), row.get('읍면동리'))
+            if bjdcd_10:
+                umd_groups[bjdcd_10].append(row)
+
+        price_maps = fetch_apartment_prices_multi(cursor, umd_groups) if umd_groups else {}
+
+        # 결과 매핑
+        for bjdcd_10, rows in umd_groups.items():
+            price_map = price_maps.get(bjdcd_10, {})
+            for row in rows:
+                jibun = row.get('지번')
+                floor = row.get('층')
+                area = row.get('면적')
+
+                if jibun and floor is not None and area:
+                    try:
+                        # 면적을 2자리로 반올림하여 키 생성 (batch 함수와 동일하게)
+                        area_rounded = round(float(area), 2)
+                        key = (jibun, int(floor), area_rounded)
+                        if key in price_map:
+                            row['공동주택가격'] = price_map[key]['price']
+                            row['공동주택가격_126퍼센트'] = price_map[key]['threshold_126']
+                    except:
+                        pass
+
+    elif source_type == 'officetel':
+        # 오피스텔 기준시가 일괄 조회 (시군구별로 그룹화 → 페이지 전체를 한 번에 조회)
+        sgg_groups_off = defaultdict(list)
+        for row in results:
+            sgg_code = row.get('시군구코드')
+            if sgg_code:
+                sgg_groups_off[sgg_code].append(row)
+
+        price_maps = fetch_officetel_prices_multi(cursor, sgg_groups_off) if sgg_groups_off else {}
+
+        # 결과 매핑
+        for sgg_code, rows in sgg_groups_off.items():
+            price_map = price_maps.get(sgg_code, {})
+            for row in rows:
+                jibun = row.get('지번')
+                floor = row.get('층')
+                area = row.get('면적')
+
+                if jibun and floor is not None and area:
+                    try:
+                        # 면적을 2자리로 반올림하여 키 생성
+                        area_rounded = round(float(area), 2)
+                        key = (jibun, int(floor), area_rounded)
+                        if key in price_map:
+                            data = price_map[key]
+                            row['기준시가_면적당가격'] = data['unit_price']
+                            row['기준시가_전용면적'] = data['exclusive_area']
+                            row['기준시가_공유면적'] = data['shared_area']
+                            row['기준시가_면적계'] = data['total_area']
+                            row['기준시가_총액'] = data['standard_price']
+                            row['기준시가_126퍼센트'] = data['threshold_126']
+                    except:
+                        pass
+
+    return results
+
+
+def enrich_search_rows(cursor, source_type, results, lh_only, deferred=False):
+    """검색 결과에 시도/시군구명, 공동주택가격/기준시가, 호실 초기값, LH 정보 추가
+
+    deferred: 지연 보강 모드 - DB 조회가 필요한 가격/LH 정보는 건너뛰고 기본 행만 구성
+              (클라이언트가 row_key로 /api/search/enrich를 따로 호출)
+    """
+    # 시도/시군구명 추가
+    for row in results:
+        sgg_code = row.get('시군구코드')
+        if sgg_code and sgg_code in REGIONS['sigungu']:
+            sido_full = REGIONS['sigungu'][sgg_code]['sido']
+            row['시도'] = SIDO_ABBR.get(sido_full, sido_full)  # 축약형 사용
+            row['시군구'] = REGIONS['sigungu'][sgg_code]['name']
+        else:
+            row['시도'] = ''
+            row['시군구'] = ''
+
+    if not deferred:
+        add_price_info_to_results(cursor, source_type, results)
+
+    # 호실 정보 조회 (메인 검색에서는 생략 - 성능 최적화)
+    # 호실 정보는 사용자가 "호실 확인" 버튼을 클릭하거나 지연 보강 API에서 조회, 단독다가구는 호실 정보 없음
+    for row in results:
+        row['동호명'] = '-' if source_type == 'dagagu' else None
+        row['동호명_전체목록'] = []
+        row['동호명_더보기'] = False
+
+    # LH 정보 추가 (LH 필터가 아닐 때만)
+    # LH 필터 활성화 시에는 JOIN 쿼리에서 이미 LH 정보가 포함되어 있음
+    if not lh_only and not deferred:
+        add_lh_info_to_results(results, cursor)
+
+    return results
+
+
+def run_search_task(source_type, sgg_codes, criteria, limit, offset, after, enrich):
+    """스레드 풀 작업: 풀에서 별도 연결을 대여해 조회 (+ 보강)"""
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            results = fetch_search_rows(cursor, source_type, sgg_codes, criteria, limit, offset, after)
+            if enrich:
+                enrich_search_rows(cursor, source_type, results, criteria['lh_only'], criteria.get('defer_enrich', False))
+            return results
+    except Exception as e:
+        if source_type != 'dagagu':
+            raise
+        # 단독다가구는 조회 실패 시에도 나머지 유형 결과는 반환
+        print(f"[WARNING] 단독다가구 조회 오류: {str(e)}")
+        return []
+
+
+def run_enrich_task(source_type, results, lh_only, deferred=False):
+    """스레드 풀 작업: 샤드 병합 후 결과 보강"""
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        return enrich_search_rows(cursor, source_type, results, lh_only, deferred)
+
+
+def execute_search_fan_out(source_types, sgg_codes, criteria, page_size, offset, use_sql_pagination, after_keys=None):
+    """주택 유형(및 시군구 샤드)별 쿼리와 보강 단계를 병렬 실행 후 유형별 결과 반환
+
+    after_keys: {유형: 이전 페이지 마지막 정렬 키} - 키셋 페이지네이션 시 offset은 0
+
+    - 샤드가 1개인 유형: 조회 + 보강을 한 작업에서 처리
+    - 샤드가 여러 개인 유형: 샤드별 조회 → 병합/정렬/페이지 자르기 → 보강 작업 추가 제출
+    """
+    executor = get_search_executor()
+    shards = shard_sgg_codes(sgg_codes)
+
+    # 샤드 병합 시 페이지 경계를 맞추기 위해 각 샤드는 offset + page_size건을 처음부터 조회
+    if use_sql_pagination and len(shards) > 1:
+        shard_limit, shard_offset = offset + page_size, 0
+    elif use_sql_pagination:
+        shard_limit, shard_offset = page_size, offset
+    else:
+        shard_limit, shard_offset = None, 0
+
+    futures = {}
+    shard_results = {source_type: [] for source_type in source_types}
+    pending_shards = {source_type: len(shards) for source_type in source_types}
+    results_by_type = {}
+
+    for source_type in source_types:
+        enrich = len(shards) == 1
+        for shard in shards:
+            after = (after_keys or {}).get(source_type)
+            future = executor.submit(run_search_task, source_type, shard, criteria, shard_limit, shard_offset, after, enrich)
+            futures[future] = (source_type, 'fetch' if not enrich else 'done')
+
+    while futures:
+        done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+        for future in done:
+            source_type, stage = futures.pop(future)
+            rows = future.result()
+
+            if stage == 'done':
+                results_by_type[source_type] = rows
+                continue
+
+            if stage == 'fetch':
+                shard_results[source_type].extend(rows)
+                pending_shards[source_type] -= 1
+                if pending_shards[source_type] > 0:
+                    continue
+
+                merged = sort_search_rows(shard_results[source_type])
                 if use_sql_pagination:
-                    query += " LIMIT %s OFFSET %s"
-                    params.extend([page_size, offset])
+                    merged = merged[offset:offset + page_size]
+                enrich_future = executor.submit(run_enrich_task, source_type, merged, criteria['lh_only'], criteria.get('defer_enrich', False))
+                futures[enrich_future] = (source_type, 'done')
 
-                cursor.execute(query, params)
-                results = cursor.fetchall()
-                result_counts.append(len(results))  # 건수 추적
+    return results_by_type
 
-                for row in results:
-                    sgg_code = row.get('시군구코드')
-                    if sgg_code and sgg_code in REGIONS['sigungu']:
-                        sido_full = REGIONS['sigungu'][sgg_code]['sido']
-                        row['시도'] = SIDO_ABBR.get(sido_full, sido_full)  # 축약형 사용
-                        row['시군구'] = REGIONS['sigungu'][sgg_code]['name']
-                    else:
-                        row['시도'] = ''
-                        row['시군구'] = ''
 
-                    # 단독다가구는 호실 정보 없음
-                    row['동호명'] = '-'
-                    row['동호명_전체목록'] = []
-                    row['동호명_더보기'] = False
+def assign_search_row_keys(rows):
+    """행마다 지연 보강 조회용 고유 키 추가 (row_key = 유형:원본 키) - 정렬 키 제거 전에 호출"""
+    label_to_type = {spec['label']: source_type for source_type, spec in SEARCH_TYPE_SPECS.items()}
+    for row in rows:
+        row['row_key'] = f"{label_to_type[row['구분']]}:{row['_sort_key']}"
 
-                all_results.extend(results)
-            except Exception as e:
-                print(f"[WARNING] 단독다가구 조회 오류: {str(e)}")
 
-        cursor.close()
-        conn.close()
+def strip_search_sort_keys(rows):
+    """정렬 키 컬럼은 응답에서 제외"""
+    for row in rows:
+        row.pop('_sort_ym', None)
+        row.pop('_sort_day', None)
+        row.pop('_sort_key', None)
+        row.pop('_sort_type', None)
 
-        # LH 정보 추가 (LH 필터가 아닐 때만)
-        # LH 필터 활성화 시에는 JOIN 쿼리에서 이미 LH 정보가 포함되어 있음
-        if not lh_only:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            add_lh_info_to_results(all_results, cursor)
-            cursor.close()
-            conn.close()
 
-        print(f"[DEBUG api_search] 총 {len(all_results)}건, lh_only={lh_only}", flush=True)
+def stream_search_rows(source_types, sgg_codes, criteria):
+    """스트리밍 검색 (NDJSON): 유형별 서버 측 커서로 SEARCH_STREAM_BATCH_SIZE건씩 읽어 보강 후 바로 전송
+
+    전체 결과를 메모리에 모으지 않으므로 결과 건수와 관계없이 워커 메모리가 일정
+    줄 형식: {"type": "start"} → {"type": "rows", "data": [...]} 반복 → {"type": "end", "count": N}
+    오류 시 {"type": "error", "error": "..."} 후 종료 (단독다가구 오류는 건너뛰고 계속)
+    """
+    def line(payload):
+        return app.json.dumps(payload) + '\n'
+
+    yield line({'type': 'start', 'search_mode': 'stream'})
+
+    start_time = time.time()
+    total = 0
+    for source_type in source_types:
+        label = SEARCH_TYPE_SPECS[source_type]['label']
+        try:
+            query, params = build_type_search_query(source_type, sgg_codes, criteria)
+            with get_db_connection() as conn:
+                with conn.cursor(name=f'search_stream_{source_type}') as stream_cursor, conn.cursor() as cursor:
+                    stream_cursor.itersize = SEARCH_STREAM_BATCH_SIZE
+                    stream_cursor.execute(query, params)
+                    while True:
+                        rows = stream_cursor.fetchmany(SEARCH_STREAM_BATCH_SIZE)
+                        if not rows:
+                            break
+                        enrich_search_rows(cursor, source_type, rows, criteria['lh_only'])
+                        assign_search_row_keys(rows)
+                        strip_search_sort_keys(rows)
+                        total += len(rows)
+                        yield line({'type': 'rows', 'data': rows})
+        except Exception as e:
+            if source_type != 'dagagu':
+                print(f"[ERROR] 스트리밍 검색 오류 ({label}): {str(e)}")
+                yield line({'type': 'error', 'error': f'검색 중 오류가 발생했습니다: {str(e)}'})
+                return
+            # 단독다가구는 조회 실패 시에도 나머지 유형 결과는 계속 전송
+            print(f"[WARNING] 단독다가구 스트리밍 조회 오류: {str(e)}")
+
+    print(f"[DEBUG api_search] 스트리밍 총 {total}건, 소요시간: {time.time() - start_time:.2f}초", flush=True)
+    yield line({'type': 'end', 'count': total})
+
+
+SQL_INTEGER_TYPES = frozenset({'int2', 'int4', 'int8'})
+
+
+def build_search_rows_by_keys_query(source_type, source_keys):
+    """원본 키로 보강에 필요한 컬럼만 조회하는 쿼리 (지연 보강 API용)
+
+    정규화 테이블이 있으면 (property_type, source_key) PK로, 없으면 원본 테이블 키 컬럼으로 조회
+    컬럼 형식은 검색 쿼리와 같게 맞춤 (같은 보강 함수 사용)
+    """
+    spec = SEARCH_TYPE_SPECS[source_type]
+    if norm_table_available():
+        query = f"""
+            SELECT
+                '{spec['label']}' as 구분,
+                n.source_key as _sort_key,
+                n.sggcd as 시군구코드,
+                n.umdnm as 읍면동리,
+                n.jibun as 지번,
+                n.exclusive_area as 면적,
+                n.floor as 층,
+                LPAD(n.deal_ym::text, 6, '0') as 계약년월,
+                n.deal_day::text as 계약일,
+                n.deposit as 보증금
+            FROM {SEARCH_NORM_TABLE} n
+            WHERE n.property_type = %s AND n.source_key = ANY(%s)
+        """
+        return query, [source_type, list(source_keys)]
+
+    # 원본 테이블 키 컬럼은 캐스팅하지 않고 파라미터를 컬럼 타입 배열로 캐스팅 (키 인덱스 사용)
+    # 정수/숫자 키는 형식이 맞지 않는 키를 미리 제외 (캐스팅 오류 방지 - 어차피 일치하는 행이 없음)
+    key_type = get_rent_column_type(source_type, 'key')
+    if key_type in SQL_INTEGER_TYPES:
+        source_keys = [key for key in source_keys if re.fullmatch(r'-?\d+', str(key))]
+    elif key_type == 'numeric':
+        source_keys = [key for key in source_keys if re.fullmatch(r'-?\d+(\.\d+)?', str(key))]
+
+    c = rent_column_refs(source_type, spec['alias'])
+    if source_type == 'dagagu':
+        floor, deal_ym = "'-'", c['deal_ym']
+    else:
+        floor, deal_ym = c['floor'], f"{c['deal_year']} || LPAD({c['deal_month']}::text, 2, '0')"
+    query = f"""
+        SELECT
+            '{spec['label']}' as 구분,
+            {c['key']}::text as _sort_key,
+            {c['sggcd']} as 시군구코드,
+            {c['umdnm']} as 읍면동리,
+            {c['jibun']} as 지번,
+            {c['area']} as 면적,
+            {floor} as 층,
+            {deal_ym} as 계약년월,
+            {c['deal_day']} as 계약일,
+            {c['deposit']} as 보증금
+        FROM {spec['table']} {spec['alias']}
+        WHERE {c['key']} = ANY(%s::"{key_type}"[])
+    """
+    return query, [list(source_keys)]
+
+
+def run_deferred_enrich_task(source_type, source_keys, include_lh, include_units):
+    """스레드 풀 작업: 원본 키로 행 조회 → 가격/LH/동호명 보강 → {row_key: 보강 필드}"""
+    with get_db_connection() as conn, conn.cursor() as cursor:
+        query, params = build_search_rows_by_keys_query(source_type, source_keys)
+        execute_prepared(cursor, query, params)
+        rows = cursor.fetchall()
+
+        add_price_info_to_results(cursor, source_type, rows)
+        if include_lh:
+            add_lh_info_to_results(rows, cursor)
+
+        # 동호명: 지역과 관계없이 전체 행을 쿼리 1회로 조회 (단독다가구는 호실 정보 없음)
+        if include_units and source_type != 'dagagu':
+            unit_infos = fetch_unit_info_multi(cursor, [
+                build_unit_info_params(row.get('시군구코드'), row.get('읍면동리'), row.get('지번'), row.get('층'), row.get('면적'))
+                for row in rows
+            ])
+            for row, unit_info in zip(rows, unit_infos):
+                row['동호명'] = unit_info['unit']
+                row['동호명_전체목록'] = unit_info['all_units']
+                row['동호명_더보기'] = unit_info['has_more']
+
+    return {
+        f"{source_type}:{row['_sort_key']}": {field: row[field] for field in SEARCH_ENRICH_FIELDS if field in row}
+        for row in rows
+    }
+
+
+@app.route('/api/search/enrich', methods=['POST'])
+def api_search_enrich():
+    """지연 보강 API: 검색 응답(defer_enrich)의 row_key 목록 → 행별 공동주택가격/기준시가, LH, 동호명
+
+    요청: {"keys": ["apt:<unique_key>", ...], "lh": true, "units": true}
+    응답: {"success": true, "data": {row_key: {보강 필드}}} - 원본 행이 없거나 값이 없는 필드는 생략
+    유형별 조회/보강은 검색 스레드 풀에서 병렬 실행
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        keys = data.get('keys') or []
+        include_lh = bool(data.get('lh', True))
+        include_units = bool(data.get('units', False))
+
+        if not isinstance(keys, list):
+            return jsonify({'success': False, 'error': 'keys는 목록이어야 합니다.'}), 400
+        if len(keys) > SEARCH_ENRICH_MAX_KEYS:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {SEARCH_ENRICH_MAX_KEYS}건까지 조회할 수 있습니다.'
+            }), 400
+
+        # row_key → 유형별 원본 키 (형식이 맞지 않는 키는 무시)
+        keys_by_type = defaultdict(list)
+        for key in keys:
+            source_type, sep, source_key = str(key).partition(':')
+            if sep and source_type in SEARCH_TYPE_SPECS:
+                keys_by_type[source_type].append(source_key)
+
+        start_time = time.time()
+        executor = get_search_executor()
+        futures = [
+            executor.submit(run_deferred_enrich_task, source_type, source_keys, include_lh, include_units)
+            for source_type, source_keys in keys_by_type.items()
+        ]
+        payloads = {}
+        for future in futures:
+            payloads.update(future.result())
+
+        print(f"[DEBUG] 지연 보강: {len(keys)}건 요청, {len(payloads)}건 응답, 소요시간: {time.time() - start_time:.2f}초")
+        return jsonify({'success': True, 'data': payloads})
+
+    except Exception as e:
+        print(f"[ERROR] 지연 보강 오류: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': f'보강 정보 조회 중 오류가 발생했습니다: {str(e)}'
+        }), 500
+
+
+@app.route('/api/search', methods=['POST'])
+def api_search():
+    """실거래가 검색 API (이름 기반)"""
+    try:
+        # JSON 파싱 시 인코딩 에러 처리
+        try:
+            filters = request.get_json(force=True)
+        except:
+            # 인코딩 에러 시 request.data를 직접 디코딩
+            import json
+            filters = json.loads(request.data.decode('utf-8', errors='ignore'))
+        print(f"[DEBUG] 받은 필터: {filters}")
+
+        # 필터 파라미터
+        include_apt = filters.get('include_apt', True)
+        include_villa = filters.get('include_villa', True)
+        include_dagagu = filters.get('include_dagagu', True)
+        include_officetel = filters.get('include_officetel', True)
+        lh_only = filters.get('lh_only', False)
+        contract_end = filters.get('contract_end', '').strip()
+        sido_name = filters.get('sido')
+        sigungu_names = filters.get('sigungu', [])
+        umd_names = filters.get('umd', [])
+
+        # 숫자 필터 파라미터 - 검증 및 변환
+        def parse_numeric_filter(value, data_type=float):
+            """숫자 필터를 안전하게 파싱"""
+            if value is None:
+                return None
+            if isinstance(value, (int, float)):
+                return data_type(value)
+            if isinstance(value, str):
+                value = value.strip()
+                if not value:
+                    return None
+                try:
+                    return data_type(value)
+                except (ValueError, TypeError):
+                    return None
+            return None
+
+        area_min = parse_numeric_filter(filters.get('area_min'), float)
+        area_max = parse_numeric_filter(filters.get('area_max'), float)
+        deposit_min = parse_numeric_filter(filters.get('deposit_min'), int)
+        deposit_max = parse_numeric_filter(filters.get('deposit_max'), int)
+        rent_min = parse_numeric_filter(filters.get('rent_min'), int)
+        rent_max = parse_numeric_filter(filters.get('rent_max'), int)
+        build_year_min = parse_numeric_filter(filters.get('build_year_min'), int)
+        build_year_max = parse_numeric_filter(filters.get('build_year_max'), int)
+
+        page = filters.get('page', 1)
+        page_size = filters.get('page_size', 5)  # 성능 최적화: 초기 로딩 5건
+        cursor_token = filters.get('cursor')  # 무한 스크롤 다음 페이지 토큰 (응답의 next_cursor)
+        defer_enrich = bool(filters.get('defer_enrich'))  # 기본 행 먼저 응답, 가격/LH/동호명은 /api/search/enrich
+        search_mode = filters.get('search_mode') or SEARCH_ENGINE_MODE
+        if search_mode not in SEARCH_ENGINE_MODES:
+            search_mode = 'per_type'
+
+        # 다음 페이지 토큰 해석 (유형별 마지막 정렬 키)
+        after_keys = None
+        if cursor_token:
+            try:
+                after_keys = decode_search_cursor(cursor_token)
+            except ValueError as e:
+                print(f"[WARNING] {str(e)}")
+                return jsonify({
+                    'success': False,
+                    'error': '잘못된 페이지 토큰입니다. 다시 검색해주세요.'
+                })
+
+        # LH 매칭 테이블이 있으면 LH 필터도 일반 검색처럼 페이지네이션
+        # 없으면 LH 테이블 JOIN으로 모든 데이터를 조회해야 함 (lh_full_scan)
+        lh_match = lh_only and lh_match_table_available()
+        lh_full_scan = lh_only and not lh_match
+        if lh_full_scan:
+            # LH 필터링 시에는 SQL에서 페이지네이션 하지 않음
+            use_sql_pagination = False
+            offset = 0
+        elif after_keys is not None:
+            # 토큰을 만든 모드로 이어서 조회 (union 토큰 ↔ 유형별 토큰은 서로 해석할 수 없음)
+            search_mode = 'union' if SEARCH_UNION_CURSOR_KEY in after_keys else 'per_type'
+            # 키셋 페이지네이션: 토큰의 정렬 키 이후부터 조회 (OFFSET 없음)
+            use_sql_pagination = True
+            offset = 0
+        else:
+            # 첫 페이지 (토큰 없이 page를 보내는 이전 클라이언트는 OFFSET으로 처리)
+            use_sql_pagination = True
+            offset = (page - 1) * page_size
+
+        # 필수값 검증: 계약만기시기 및 시군구
+        if not contract_end:
+            return jsonify({
+                'success': False,
+                'error': '계약만기시기를 선택해주세요.'
+            })
+
+        if not (sigungu_names and len(sigungu_names) > 0):
+            return jsonify({
+                'success': False,
+                'error': '최소 1개 이상의 시군구를 선택해주세요.'
+            })
+
+        # 시군구 이름을 코드로 변환 (모든 주택 유형에서 공통 사용)
+        # 시도와 시군구를 함께 확인하여 정확한 지역만 선택
+        sgg_codes = []
+        if sigungu_names and len(sigungu_names) > 0:
+            for name in sigungu_names:
+                for code, data in REGIONS['sigungu'].items():
+                    # 시도와 시군구 이름이 모두 일치하는 경우만 선택
+                    if data['name'] == name and (sido_name is None or data['sido'] == sido_name):
+                        sgg_codes.append(code)
+
+        # 정규화 테이블 사용 여부 (LH 필터는 LH 매칭 테이블이 있을 때만, 없으면 원본 테이블 JOIN 쿼리 유지)
+        contract_end_ym = parse_contract_end_ym(contract_end)
+        use_norm = (not lh_only or lh_match) and contract_end_ym is not None and norm_table_available()
+
+        # 유형별 쿼리에 공통으로 전달할 검색 조건
+        criteria = {
+            'lh_only': lh_only,
+            'lh_match': lh_match,
+            'use_norm': use_norm,
+            'defer_enrich': defer_enrich,
+            'contract_end': contract_end,
+            'contract_end_ym': contract_end_ym,
+            'contract_end_tables': get_contract_end_tables() if contract_end_ym is not None and not use_norm else frozenset(),
+            'umd_names': umd_names or [],
+            'area_min': area_min,
+            'area_max': area_max,
+            'deposit_min': deposit_min,
+            'deposit_max': deposit_max,
+            'rent_min': rent_min,
+            'rent_max': rent_max,
+            'build_year_min': build_year_min,
+            'build_year_max': build_year_max,
+        }
+
+        include_flags = {
+            'apt': include_apt,
+            'villa': include_villa,
+            'officetel': include_officetel,
+            'dagagu': include_dagagu,
+        }
+        source_types = [t for t in SEARCH_TYPE_ORDER if include_flags[t]]
+
+        # union 모드는 LH 필터(LH 컬럼이 union 공통 컬럼에 없음)와 OFFSET 방식(page만 보낸 요청)에는 사용하지 않음
+        use_union = search_mode == 'union' and not lh_only and use_sql_pagination and offset == 0
+        if after_keys is not None and (SEARCH_UNION_CURSOR_KEY in after_keys) != use_union:
+            # 예: union 토큰에 LH 필터 → 유형별 키가 없어 모든 유형이 빠진 빈 페이지가 되므로 오류로 응답
+            print(f"[WARNING] 페이지 토큰 모드 불일치 (union 토큰: {not use_union}, lh_only: {lh_only})")
+            return jsonify({
+                'success': False,
+                'error': '잘못된 페이지 토큰입니다. 다시 검색해주세요.'
+            })
+        if after_keys is not None and not lh_full_scan and not use_union:
+            # 토큰에 없는 유형은 이전 페이지에서 이미 끝까지 조회됨
+            source_types = [t for t in source_types if t in after_keys]
+
+        # 스트리밍 모드 (LH 필터 전체 조회 전용): 결과를 모으지 않고 NDJSON으로 배치마다 전송 (캐시 사용 안 함)
+        # LH 매칭 테이블로 페이지네이션 가능하면 일반 JSON 응답 (클라이언트는 next_cursor로 다음 페이지 요청)
+        if filters.get('stream') and lh_full_scan:
+            print(f"[DEBUG] ========== 스트리밍 검색 시작 ({'norm' if use_norm else 'raw'}) ==========")
+            response = app.response_class(
+                stream_with_context(stream_search_rows(source_types, sgg_codes, criteria)),
+                mimetype='application/x-ndjson'
+            )
+            response.headers['X-Accel-Buffering'] = 'no'  # 프록시(nginx) 버퍼링 없이 바로 전달
+            return response
+
+        # 같은 조건의 반복 검색은 캐시된 응답 반환 (목록 정렬/숫자 정규화로 입력 순서와 무관한 키)
+        cache_key = search_cache_key({
+            'types': source_types,
+            'sgg': sorted(set(sgg_codes)),
+            'umd': sorted(set(umd_names or [])),
+            'lh_only': bool(lh_only),
+            'lh_match': lh_match,
+            'contract_end': contract_end_ym if contract_end_ym is not None else contract_end,
+            'use_norm': use_norm,
+            'area': [area_min, area_max],
+            'deposit': [deposit_min, deposit_max],
+            'rent': [rent_min, rent_max],
+            'build_year': [build_year_min, build_year_max],
+            'page_size': page_size,
+            'offset': offset,
+            'after': after_keys,
+            'mode': 'union' if use_union else 'per_type',
+            'deferred': defer_enrich,
+        })
+        cached_body = search_cache_get(cache_key)
+        if cached_body is not None:
+            print(f"[DEBUG] 검색 캐시 적중: {cache_key[:12]}")
+            response = app.response_class(cached_body, mimetype=app.json.mimetype)
+            response.headers['X-Search-Cache'] = 'HIT'
+            return response
+
+        start_time = time.time()
+        print(f"[DEBUG] ========== 검색 시작 ({'union' if use_union else 'per_type'}, {'norm' if use_norm else 'raw'}) ==========")
+        print(f"[DEBUG] 계약만기시기: {contract_end}, 시군구 코드: {sgg_codes}, 읍면동: {umd_names}, LH 필터: {lh_only}")
+
+        last_keys = {}
+        union_has_more = False
+        if use_union:
+            # 4개 테이블 UNION ALL 한 번으로 전체 계약일 순 page_size건 조회
+            union_after = (after_keys or {}).get(SEARCH_UNION_CURSOR_KEY)
+            all_results, union_has_more, union_last_key = execute_search_union(
+                source_types, sgg_codes, criteria, page_size, union_after
+            ) if source_types else ([], False, None)
+            if union_last_key:
+                last_keys[SEARCH_UNION_CURSOR_KEY] = union_last_key
+        else:
+            # 유형별(+시군구 샤드별) 쿼리와 보강을 풀 연결로 병렬 실행
+            results_by_type = execute_search_fan_out(
+                source_types, sgg_codes, criteria, page_size, offset, use_sql_pagination, after_keys
+            )
+
+            all_results = []
+            result_counts = []  # 각 주택 유형별 조회 건수 추적
+            for source_type in source_types:
+                rows = results_by_type.get(source_type, [])
+                result_counts.append(len(rows))
+                all_results.extend(rows)
+
+            # 다음 페이지 토큰: page_size만큼 채워진 유형만 마지막 행의 정렬 키를 담음
+            if use_sql_pagination:
+                for source_type in source_types:
+                    rows = results_by_type.get(source_type, [])
+                    if rows and len(rows) == page_size:
+                        last_keys[source_type] = list(search_sort_key(rows[-1]))
+
+        # 지연 보강용 row_key 추가 후 정렬 키 컬럼은 응답에서 제외
+        assign_search_row_keys(all_results)
+        strip_search_sort_keys(all_results)
+
+        print(f"[DEBUG api_search] 총 {len(all_results)}건, lh_only={lh_only}, 소요시간: {time.time() - start_time:.2f}초", flush=True)
 
         # LH 필터링 시에는 이미 LH 매칭된 결과만 조회되었으므로 추가 필터링 불필요
         # has_more 판단
-        if lh_only:
+        if lh_full_scan:
             # LH 매칭 결과는 적으므로 페이지네이션 없이 모두 반환
             has_more = False
+        elif use_union:
+            # union 모드: page_size + 1건을 조회했으므로 정확한 값
+            has_more = union_has_more
         else:
             # 일반 검색: has_more 판단 (어떤 유형이라도 page_size만큼 조회되었다면 더 있을 가능성이 있음)
             has_more = any(count == page_size for count in result_counts)
 
-        return jsonify({
+        response = jsonify({
             'success': True,
             'data': all_results,
             'count': len(all_results),
-            'has_more': has_more
+            'has_more': has_more,
+            'next_cursor': encode_search_cursor(last_keys) if has_more else None,
+            'search_mode': 'union' if use_union else 'per_type',
+            'deferred': defer_enrich
         })
+        search_cache_put(cache_key, response.get_data())
+        response.headers['X-Search-Cache'] = 'MISS'
+        return response
 
     except Exception as e:
         print(f"[ERROR] 검색 오류: {str(e)}")
@@ -2763,324 +4431,261 @@ def get_building_transactions():
                 'error': '주택유형, 시군구코드, 읍면동은 필수입니다.'
             })
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        results = []
-
-        # 주택 유형에 따라 테이블 선택
-        table_map = {
-            '아파트': 'apt_rent_transactions',
-            '연립다세대': 'villa_rent_transactions',
-            '오피스텔': 'officetel_rent_transactions',
-            '단독다가구': 'dagagu_rent_transactions'
-        }
-
-        table_name = table_map.get(property_type)
-        if not table_name:
-            return jsonify({
-                'success': False,
-                'error': '잘못된 주택 유형입니다.'
-            })
-
-        # 컬럼명 가져오기
-        cursor.execute(f'SELECT * FROM {table_name} LIMIT 0')
-        col_names = [desc[0] for desc in cursor.description]
+        with get_db_connection() as conn, conn.cursor() as cursor:
 
-        # 쿼리 작성 - 각 테이블 구조에 맞게 필터링
-        params = [sigungu_code, umd_name]
+            results = []
 
-        if property_type == '단독다가구':
-            # 단독다가구: sggcd(1), umdnm(3), jibun(4), 도로명(15)
-            where_clause = f'"{col_names[1]}" = %s AND "{col_names[3]}" = %s'
-            if jibun:
-                where_clause += f' AND "{col_names[4]}" = %s'
-                params.append(jibun)
-            if building_name:
-                where_clause += f' AND "{col_names[15]}" = %s'
-                params.append(building_name)
+            # 주택 유형에 따라 테이블 선택
+            source_map = {
+                '아파트': 'apt',
+                '연립다세대': 'villa',
+                '오피스텔': 'officetel',
+                '단독다가구': 'dagagu'
+            }
 
-        elif property_type == '연립다세대':
-            # 연립다세대: sggcd(1), umdnm(2), mhousenm(3), jibun(4)
-            where_clause = f'"{col_names[1]}" = %s AND "{col_names[2]}" = %s'
-            if jibun:
-                where_clause += f' AND "{col_names[4]}" = %s'
-                params.append(jibun)
-            if building_name:
-                where_clause += f' AND "{col_names[3]}" = %s'
-                params.append(building_name)
+            source_type = source_map.get(property_type)
+            if not source_type:
+                return jsonify({
+                    'success': False,
+                    'error': '잘못된 주택 유형입니다.'
+                })
+            table_name = RENT_TABLE_SCHEMAS[source_type]['table']
 
-        elif property_type == '오피스텔':
-            # 오피스텔: sggcd(1), umdnm(3), jibun(4), offinm(5)
-            where_clause = f'"{col_names[1]}" = %s AND "{col_names[3]}" = %s'
-            if jibun:
-                where_clause += f' AND "{col_names[4]}" = %s'
-                params.append(jibun)
-            if building_name:
-                where_clause += f' AND "{col_names[5]}" = %s'
-                params.append(building_name)
+            # 논리 필드 → 물리 컬럼 (스키마 레지스트리, 요청마다 LIMIT 0 조회 불필요)
+            c = rent_column_refs(source_type)
 
-        else:  # 아파트
-            # 아파트: sggcd(1), umdnm(2), jibun(3), aptnm(4)
-            where_clause = f'"{col_names[1]}" = %s AND "{col_names[2]}" = %s'
+            # 쿼리 작성 - 시군구/읍면동 + 선택적 지번/건물명 필터
+            params = [sigungu_code, umd_name]
+            where_clause = f"{c['sggcd']} = %s AND {c['umdnm']} = %s"
             if jibun:
-                where_clause += f' AND "{col_names[3]}" = %s'
+                where_clause += f" AND {c['jibun']} = %s"
                 params.append(jibun)
             if building_name:
-                where_clause += f' AND "{col_names[4]}" = %s'
+                where_clause += f" AND {c['building_name']} = %s"
                 params.append(building_name)
 
-        print(f"[DEBUG] WHERE 절: {where_clause}")
-        print(f"[DEBUG] 파라미터: {params}")
-
-        if property_type == '단독다가구':
-            # 단독다가구: jibun(4), 계약면적(8), 계약년월(10), 계약일(11), 보증금(12), 월세(13),
-            # 건축년도(14), 도로명(15), 계약기간(16), 계약구분(17), 갱신요구권사용(18),
-            # 종전계약보증금(19), 종전계약월세(20)
-            query = f'''
-                SELECT
-                    "{col_names[1]}" as 시군구코드,
-                    "{col_names[3]}" as 읍면동리,
-                    COALESCE(NULLIF("{col_names[4]}", ''), '') as 지번,
-                    '-' as 층,
-                    COALESCE(CAST("{col_names[8]}" AS TEXT), '') as 면적,
-                    COALESCE(NULLIF("{col_names[12]}", ''), '') as 보증금,
-                    COALESCE(NULLIF("{col_names[13]}", ''), '') as 월세,
-                    COALESCE(NULLIF("{col_names[10]}", ''), '') as 계약년월,
-                    COALESCE(NULLIF("{col_names[11]}", ''), '') as 계약일,
-                    CASE
-                        WHEN "{col_names[14]}" IS NULL OR "{col_names[14]}" = '' THEN NULL
-                        WHEN CAST("{col_names[14]}" AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN
-                            CASE
-                                WHEN CAST("{col_names[14]}" AS FLOAT) BETWEEN 1800 AND 2200 THEN CAST(CAST("{col_names[14]}" AS FLOAT) AS INTEGER)
-                                ELSE NULL
-                            END
-                        ELSE NULL
-                    END as 건축년도,
-                    COALESCE(NULLIF("{col_names[17]}", ''), '') as 계약구분,
-                    COALESCE(NULLIF("{col_names[16]}", ''), '') as 계약기간,
-                    COALESCE(NULLIF("{col_names[19]}", ''), '') as 종전계약보증금,
-                    COALESCE(NULLIF("{col_names[20]}", ''), '') as 종전계약월세,
-                    COALESCE(NULLIF("{col_names[18]}", ''), '') as 갱신요구권사용
-                FROM {table_name}
-                WHERE {where_clause}
-                ORDER BY "{col_names[10]}" DESC, CAST(NULLIF("{col_names[11]}", '') AS INTEGER) DESC NULLS LAST
-                LIMIT %s OFFSET %s
-            '''
-        elif property_type == '연립다세대':
-            # 연립다세대: sggcd(1), umdnm(2), mhousenm(3), jibun(4), buildyear(5), excluusear(6),
-            # dealyear(7), dealmonth(8), dealday(9), deposit(10), monthlyrent(11), floor(12),
-            # contractterm(13), contracttype(14), userrright(15), predeposit(16), premonthlyrent(17), housetype(18)
-            query = f'''
-                SELECT
-                    "{col_names[1]}" as 시군구코드,
-                    "{col_names[2]}" as 읍면동리,
-                    COALESCE(NULLIF("{col_names[4]}", ''), '') as 지번,
-                    COALESCE(CAST("{col_names[12]}" AS TEXT), '') as 층,
-                    COALESCE(CAST("{col_names[6]}" AS TEXT), '') as 면적,
-                    COALESCE(CAST("{col_names[10]}" AS TEXT), '') as 보증금,
-                    COALESCE(CAST("{col_names[11]}" AS TEXT), '') as 월세,
-                    CONCAT(
-                        LPAD(CAST(COALESCE(NULLIF("{col_names[7]}", ''), '0') AS TEXT), 4, '0'),
-                        LPAD(CAST(COALESCE(NULLIF("{col_names[8]}", ''), '0') AS TEXT), 2, '0')
-                    ) as 계약년월,
-                    COALESCE(NULLIF("{col_names[9]}", ''), '') as 계약일,
-                    COALESCE(CAST("{col_names[5]}" AS TEXT), '') as 건축년도,
-                    COALESCE(NULLIF("{col_names[14]}", ''), '') as 계약구분,
-                    COALESCE(NULLIF("{col_names[13]}", ''), '') as 계약기간,
-                    COALESCE(CAST("{col_names[16]}" AS TEXT), '') as 종전계약보증금,
-                    COALESCE(CAST("{col_names[17]}" AS TEXT), '') as 종전계약월세,
-                    COALESCE(NULLIF("{col_names[15]}", ''), '') as 갱신요구권사용
-                FROM {table_name}
-                WHERE {where_clause}
-                ORDER BY CONCAT(
-                    LPAD(CAST(COALESCE(NULLIF("{col_names[7]}", ''), '0') AS TEXT), 4, '0'),
-                    LPAD(CAST(COALESCE(NULLIF("{col_names[8]}", ''), '0') AS TEXT), 2, '0')
-                ) DESC, CAST(NULLIF("{col_names[9]}", '') AS INTEGER) DESC NULLS LAST
-                LIMIT %s OFFSET %s
-            '''
-        elif property_type == '오피스텔':
-            # 오피스텔: sggcd(1), sggnm(2), umdnm(3), jibun(4), offinm(5), excluusear(6),
-            # dealyear(7), dealmonth(8), dealday(9), deposit(10), monthlyrent(11), floor(12),
-            # buildyear(13), contractterm(14), contracttype(15), userrright(16), predeposit(17), premonthlyrent(18)
-            # 성능 최적화: LEFT JOIN 제거, batch fetch로 기준시가 조회
-            query = f'''
-                SELECT
-                    COALESCE(NULLIF("{col_names[4]}", ''), '') as 지번,
-                    COALESCE(CAST("{col_names[12]}" AS TEXT), '') as 층,
-                    COALESCE(CAST("{col_names[6]}" AS TEXT), '') as 면적,
-                    COALESCE(CAST("{col_names[10]}" AS TEXT), '') as 보증금,
-                    COALESCE(CAST("{col_names[11]}" AS TEXT), '') as 월세,
-                    CONCAT(
-                        LPAD(CAST(COALESCE(NULLIF("{col_names[7]}", ''), '0') AS TEXT), 4, '0'),
-                        LPAD(CAST(COALESCE(NULLIF("{col_names[8]}", ''), '0') AS TEXT), 2, '0')
-                    ) as 계약년월,
-                    COALESCE(NULLIF("{col_names[9]}", ''), '') as 계약일,
-                    COALESCE(CAST("{col_names[13]}" AS TEXT), '') as 건축년도,
-                    COALESCE(NULLIF("{col_names[15]}", ''), '') as 계약구분,
-                    COALESCE(NULLIF("{col_names[14]}", ''), '') as 계약기간,
-                    COALESCE(CAST("{col_names[17]}" AS TEXT), '') as 종전계약보증금,
-                    COALESCE(CAST("{col_names[18]}" AS TEXT), '') as 종전계약월세,
-                    COALESCE(NULLIF("{col_names[16]}", ''), '') as 갱신요구권사용
-                FROM {table_name}
-                WHERE {where_clause}
-                ORDER BY CONCAT(
-                    LPAD(CAST(COALESCE(NULLIF("{col_names[7]}", ''), '0') AS TEXT), 4, '0'),
-                    LPAD(CAST(COALESCE(NULLIF("{col_names[8]}", ''), '0') AS TEXT), 2, '0')
-                ) DESC, CAST(NULLIF("{col_names[9]}", '') AS INTEGER) DESC NULLS LAST
-                LIMIT %s OFFSET %s
-            '''
-        else:  # 아파트
-            # 아파트: sggcd(1), umdnm(2), aptnm(3), jibun(4), excluusear(5),
-            # dealyear(6), dealmonth(7), dealday(8), deposit(9), monthlyrent(10), floor(11),
-            # buildyear(12), contractterm(13), contracttype(14), userrright(15), predeposit(16), premonthlyrent(17)
-            query = f'''
-                SELECT
-                    COALESCE(NULLIF("{col_names[4]}", ''), '') as 지번,
-                    COALESCE(CAST("{col_names[11]}" AS TEXT), '') as 층,
-                    COALESCE(CAST("{col_names[5]}" AS TEXT), '') as 면적,
-                    COALESCE(CAST("{col_names[9]}" AS TEXT), '') as 보증금,
-                    COALESCE(CAST("{col_names[10]}" AS TEXT), '') as 월세,
-                    CONCAT(
-                        LPAD(CAST(COALESCE(NULLIF("{col_names[6]}", ''), '0') AS TEXT), 4, '0'),
-                        LPAD(CAST(COALESCE(NULLIF("{col_names[7]}", ''), '0') AS TEXT), 2, '0')
-                    ) as 계약년월,
-                    COALESCE(NULLIF("{col_names[8]}", ''), '') as 계약일,
-                    COALESCE(CAST("{col_names[12]}" AS TEXT), '') as 건축년도,
-                    COALESCE(NULLIF("{col_names[14]}", ''), '') as 계약구분,
-                    COALESCE(NULLIF("{col_names[13]}", ''), '') as 계약기간,
-                    COALESCE(CAST("{col_names[16]}" AS TEXT), '') as 종전계약보증금,
-                    COALESCE(CAST("{col_names[17]}" AS TEXT), '') as 종전계약월세,
-                    COALESCE(NULLIF("{col_names[15]}", ''), '') as 갱신요구권사용
-                FROM {table_name}
-                WHERE {where_clause}
-                ORDER BY CONCAT(
-                    LPAD(CAST(COALESCE(NULLIF("{col_names[6]}", ''), '0') AS TEXT), 4, '0'),
-                    LPAD(CAST(COALESCE(NULLIF("{col_names[7]}", ''), '0') AS TEXT), 2, '0')
-                ) DESC, CAST(NULLIF("{col_names[8]}", '') AS INTEGER) DESC NULLS LAST
-                LIMIT %s OFFSET %s
-            '''
-
-        # Add pagination parameters to query params
-        params.extend([page_size, offset])
-
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-
-        print(f"[DEBUG] 조회 결과 건수: {len(results)}")
-        if len(results) > 0:
-            print(f"[DEBUG] 첫 번째 결과: {results[0]}")
+            print(f"[DEBUG] WHERE 절: {where_clause}")
+            print(f"[DEBUG] 파라미터: {params}")
 
-        # 오피스텔의 경우 기준시가 일괄 조회
-        if table_name == 'officetel_rent_transactions':
-            print(f"[DEBUG 모달오피스텔] 오피스텔 기준시가 일괄 조회 시작")
-            price_map = fetch_officetel_standard_prices_batch(cursor, sigungu_code, results)
+            if property_type == '단독다가구':
+                query = f'''
+                    SELECT
+                        {c["sggcd"]} as 시군구코드,
+                        {c["umdnm"]} as 읍면동리,
+                        COALESCE(NULLIF({c["jibun"]}, ''), '') as 지번,
+                        '-' as 층,
+                        COALESCE(CAST({c["area"]} AS TEXT), '') as 면적,
+                        COALESCE(NULLIF({c["deposit"]}, ''), '') as 보증금,
+                        COALESCE(NULLIF({c["monthly_rent"]}, ''), '') as 월세,
+                        COALESCE(NULLIF({c["deal_ym"]}, ''), '') as 계약년월,
+                        COALESCE(NULLIF({c["deal_day"]}, ''), '') as 계약일,
+                        CASE
+                            WHEN {c["build_year"]} IS NULL OR {c["build_year"]} = '' THEN NULL
+                            WHEN CAST({c["build_year"]} AS TEXT) ~ '^[0-9]+\\.?[0-9]*$' THEN
+                                CASE
+                                    WHEN CAST({c["build_year"]} AS FLOAT) BETWEEN 1800 AND 2200 THEN CAST(CAST({c["build_year"]} AS FLOAT) AS INTEGER)
+                                    ELSE NULL
+                                END
+                            ELSE NULL
+                        END as 건축년도,
+                        COALESCE(NULLIF({c["contract_type"]}, ''), '') as 계약구분,
+                        COALESCE(NULLIF({c["contract_term"]}, ''), '') as 계약기간,
+                        COALESCE(NULLIF({c["pre_deposit"]}, ''), '') as 종전계약보증금,
+                        COALESCE(NULLIF({c["pre_monthly_rent"]}, ''), '') as 종전계약월세,
+                        COALESCE(NULLIF({c["renewal_right"]}, ''), '') as 갱신요구권사용
+                    FROM {table_name}
+                    WHERE {where_clause}
+                    ORDER BY {c["deal_ym"]} DESC, CAST(NULLIF({c["deal_day"]}, '') AS INTEGER) DESC NULLS LAST
+                    LIMIT %s OFFSET %s
+                '''
+            elif property_type == '연립다세대':
+                query = f'''
+                    SELECT
+                        {c["sggcd"]} as 시군구코드,
+                        {c["umdnm"]} as 읍면동리,
+                        COALESCE(NULLIF({c["jibun"]}, ''), '') as 지번,
+                        COALESCE(CAST({c["floor"]} AS TEXT), '') as 층,
+                        COALESCE(CAST({c["area"]} AS TEXT), '') as 면적,
+                        COALESCE(CAST({c["deposit"]} AS TEXT), '') as 보증금,
+                        COALESCE(CAST({c["monthly_rent"]} AS TEXT), '') as 월세,
+                        CONCAT(
+                            LPAD(CAST(COALESCE(NULLIF({c["deal_year"]}, ''), '0') AS TEXT), 4, '0'),
+                            LPAD(CAST(COALESCE(NULLIF({c["deal_month"]}, ''), '0') AS TEXT), 2, '0')
+                        ) as 계약년월,
+                        COALESCE(NULLIF({c["deal_day"]}, ''), '') as 계약일,
+                        COALESCE(CAST({c["build_year"]} AS TEXT), '') as 건축년도,
+                        COALESCE(NULLIF({c["contract_type"]}, ''), '') as 계약구분,
+                        COALESCE(NULLIF({c["contract_term"]}, ''), '') as 계약기간,
+                        COALESCE(CAST({c["pre_deposit"]} AS TEXT), '') as 종전계약보증금,
+                        COALESCE(CAST({c["pre_monthly_rent"]} AS TEXT), '') as 종전계약월세,
+                        COALESCE(NULLIF({c["renewal_right"]}, ''), '') as 갱신요구권사용
+                    FROM {table_name}
+                    WHERE {where_clause}
+                    ORDER BY CONCAT(
+                        LPAD(CAST(COALESCE(NULLIF({c["deal_year"]}, ''), '0') AS TEXT), 4, '0'),
+                        LPAD(CAST(COALESCE(NULLIF({c["deal_month"]}, ''), '0') AS TEXT), 2, '0')
+                    ) DESC, CAST(NULLIF({c["deal_day"]}, '') AS INTEGER) DESC NULLS LAST
+                    LIMIT %s OFFSET %s
+                '''
+            elif property_type == '오피스텔':
+                # 성능 최적화: LEFT JOIN 제거, batch fetch로 기준시가 조회
+                query = f'''
+                    SELECT
+                        COALESCE(NULLIF({c["jibun"]}, ''), '') as 지번,
+                        COALESCE(CAST({c["floor"]} AS TEXT), '') as 층,
+                        COALESCE(CAST({c["area"]} AS TEXT), '') as 면적,
+                        COALESCE(CAST({c["deposit"]} AS TEXT), '') as 보증금,
+                        COALESCE(CAST({c["monthly_rent"]} AS TEXT), '') as 월세,
+                        CONCAT(
+                            LPAD(CAST(COALESCE(NULLIF({c["deal_year"]}, ''), '0') AS TEXT), 4, '0'),
+                            LPAD(CAST(COALESCE(NULLIF({c["deal_month"]}, ''), '0') AS TEXT), 2, '0')
+                        ) as 계약년월,
+                        COALESCE(NULLIF({c["deal_day"]}, ''), '') as 계약일,
+                        COALESCE(CAST({c["build_year"]} AS TEXT), '') as 건축년도,
+                        COALESCE(NULLIF({c["contract_type"]}, ''), '') as 계약구분,
+                        COALESCE(NULLIF({c["contract_term"]}, ''), '') as 계약기간,
+                        COALESCE(CAST({c["pre_deposit"]} AS TEXT), '') as 종전계약보증금,
+                        COALESCE(CAST({c["pre_monthly_rent"]} AS TEXT), '') as 종전계약월세,
+                        COALESCE(NULLIF({c["renewal_right"]}, ''), '') as 갱신요구권사용
+                    FROM {table_name}
+                    WHERE {where_clause}
+                    ORDER BY CONCAT(
+                        LPAD(CAST(COALESCE(NULLIF({c["deal_year"]}, ''), '0') AS TEXT), 4, '0'),
+                        LPAD(CAST(COALESCE(NULLIF({c["deal_month"]}, ''), '0') AS TEXT), 2, '0')
+                    ) DESC, CAST(NULLIF({c["deal_day"]}, '') AS INTEGER) DESC NULLS LAST
+                    LIMIT %s OFFSET %s
+                '''
+            else:  # 아파트
+                query = f'''
+                    SELECT
+                        COALESCE(NULLIF({c["jibun"]}, ''), '') as 지번,
+                        COALESCE(CAST({c["floor"]} AS TEXT), '') as 층,
+                        COALESCE(CAST({c["area"]} AS TEXT), '') as 면적,
+                        COALESCE(CAST({c["deposit"]} AS TEXT), '') as 보증금,
+                        COALESCE(CAST({c["monthly_rent"]} AS TEXT), '') as 월세,
+                        CONCAT(
+                            LPAD(CAST(COALESCE(NULLIF({c["deal_year"]}, ''), '0') AS TEXT), 4, '0'),
+                            LPAD(CAST(COALESCE(NULLIF({c["deal_month"]}, ''), '0') AS TEXT), 2, '0')
+                        ) as 계약년월,
+                        COALESCE(NULLIF({c["deal_day"]}, ''), '') as 계약일,
+                        COALESCE(CAST({c["build_year"]} AS TEXT), '') as 건축년도,
+                        COALESCE(NULLIF({c["contract_type"]}, ''), '') as 계약구분,
+                        COALESCE(NULLIF({c["contract_term"]}, ''), '') as 계약기간,
+                        COALESCE(CAST({c["pre_deposit"]} AS TEXT), '') as 종전계약보증금,
+                        COALESCE(CAST({c["pre_monthly_rent"]} AS TEXT), '') as 종전계약월세,
+                        COALESCE(NULLIF({c["renewal_right"]}, ''), '') as 갱신요구권사용
+                    FROM {table_name}
+                    WHERE {where_clause}
+                    ORDER BY CONCAT(
+                        LPAD(CAST(COALESCE(NULLIF({c["deal_year"]}, ''), '0') AS TEXT), 4, '0'),
+                        LPAD(CAST(COALESCE(NULLIF({c["deal_month"]}, ''), '0') AS TEXT), 2, '0')
+                    ) DESC, CAST(NULLIF({c["deal_day"]}, '') AS INTEGER) DESC NULLS LAST
+                    LIMIT %s OFFSET %s
+                '''
+
+            # Add pagination parameters to query params
+            params.extend([page_size, offset])
+
+            execute_prepared(cursor, query, params)
+            results = cursor.fetchall()
 
-            print(f"[DEBUG 모달오피스텔] price_map 크기: {len(price_map)}건")
+            print(f"[DEBUG] 조회 결과 건수: {len(results)}")
+            if len(results) > 0:
+                print(f"[DEBUG] 첫 번째 결과: {results[0]}")
 
-            # 결과 매핑
-            matched_count = 0
-            for row in results:
-                jibun = row.get('지번')
-                floor = row.get('층')
-                area = row.get('면적')
+            # 오피스텔의 경우 기준시가 일괄 조회
+            if table_name == 'officetel_rent_transactions':
+                print(f"[DEBUG 모달오피스텔] 오피스텔 기준시가 일괄 조회 시작")
+                price_map = fetch_officetel_standard_prices_batch(cursor, sigungu_code, results)
 
-                if jibun and floor is not None and area:
-                    try:
-                        area_rounded = round(float(area), 2)
-                        key = (jibun, int(floor), area_rounded)
-                        if key in price_map:
-                            data = price_map[key]
-                            row['기준시가_면적당가격'] = data['unit_price']
-                            row['기준시가_전용면적'] = data['exclusive_area']
-                            row['기준시가_공유면적'] = data['shared_area']
-                            row['기준시가_면적계'] = data['total_area']
-                            row['기준시가_총액'] = data['standard_price']
-                            row['기준시가_126퍼센트'] = data['threshold_126']
-                            matched_count += 1
-                    except Exception as e:
-                        print(f"[DEBUG 모달오피스텔] 매핑 예외: {e}")
-                        pass
-
-            print(f"[DEBUG 모달오피스텔] 매칭 완료: {matched_count}/{len(results)}건")
+                print(f"[DEBUG 모달오피스텔] price_map 크기: {len(price_map)}건")
 
-        # 아파트/연립다세대의 경우 공동주택가격 조회 추가 (일괄 조회로 최적화)
-        if property_type in ['아파트', '연립다세대']:
-            conn_apt = get_db_connection()
-            cursor_apt = conn_apt.cursor()
+                # 결과 매핑
+                matched_count = 0
+                for row in results:
+                    jibun = row.get('지번')
+                    floor = row.get('층')
+                    area = row.get('면적')
 
-            # N+1 쿼리 문제 해결: 한 번의 쿼리로 모든 공동주택가격 조회
-            price_map = fetch_apartment_prices_batch(cursor_apt, sigungu_code, umd_name, results)
+                    if jibun and floor is not None and area:
+                        try:
+                            area_rounded = round(float(area), 2)
+                            key = (jibun, int(floor), area_rounded)
+                            if key in price_map:
+                                data = price_map[key]
+                                row['기준시가_면적당가격'] = data['unit_price']
+                                row['기준시가_전용면적'] = data['exclusive_area']
+                                row['기준시가_공유면적'] = data['shared_area']
+                                row['기준시가_면적계'] = data['total_area']
+                                row['기준시가_총액'] = data['standard_price']
+                                row['기준시가_126퍼센트'] = data['threshold_126']
+                                matched_count += 1
+                        except Exception as e:
+                            print(f"[DEBUG 모달오피스텔] 매핑 예외: {e}")
+                            pass
 
-            print(f"[DEBUG 모달매핑] price_map 크기: {len(price_map)}건")
-            if price_map:
-                sample_key = list(price_map.keys())[0]
-                print(f"[DEBUG 모달매핑] price_map 샘플 키: {sample_key}")
+                print(f"[DEBUG 모달오피스텔] 매칭 완료: {matched_count}/{len(results)}건")
 
-            # 결과 매핑
-            matched_count = 0
-            for row in results:
-                jibun = row.get('지번')
-                floor = row.get('층')
-                area = row.get('면적')
+            # 아파트/연립다세대의 경우 공동주택가격 조회 추가 (일괄 조회로 최적화)
+            if property_type in ['아파트', '연립다세대']:
+                # N+1 쿼리 문제 해결: 한 번의 쿼리로 모든 공동주택가격 조회 (같은 풀 연결 재사용)
+                price_map = fetch_apartment_prices_batch(cursor, sigungu_code, umd_name, results)
 
-                if jibun and floor is not None and area:
-                    try:
-                        # 면적을 2자리로 반올림하여 키 생성 (batch 함수와 동일하게)
-                        area_rounded = round(float(area), 2)
-                        key = (jibun, int(floor), area_rounded)
+                print(f"[DEBUG 모달매핑] price_map 크기: {len(price_map)}건")
+                if price_map:
+                    sample_key = list(price_map.keys())[0]
+                    print(f"[DEBUG 모달매핑] price_map 샘플 키: {sample_key}")
 
-                        if key in price_map:
-                            row['공동주택가격'] = price_map[key]['price']
-                            row['공동주택가격_126퍼센트'] = price_map[key]['threshold_126']
-                            matched_count += 1
-                        else:
-                            print(f"[DEBUG 모달매핑] 매칭 실패 - 키: {key}, 지번={jibun}, 층={floor}, 면적={area}")
-                    except Exception as e:
-                        print(f"[DEBUG 모달매핑] 예외 발생: {e}")
-                        pass
+                # 결과 매핑
+                matched_count = 0
+                for row in results:
+                    jibun = row.get('지번')
+                    floor = row.get('층')
+                    area = row.get('면적')
 
-            print(f"[DEBUG 모달매핑] 매칭 완료: {matched_count}/{len(results)}건")
+                    if jibun and floor is not None and area:
+                        try:
+                            # 면적을 2자리로 반올림하여 키 생성 (batch 함수와 동일하게)
+                            area_rounded = round(float(area), 2)
+                            key = (jibun, int(floor), area_rounded)
 
-            cursor_apt.close()
+                            if key in price_map:
+                                row['공동주택가격'] = price_map[key]['price']
+                                row['공동주택가격_126퍼센트'] = price_map[key]['threshold_126']
+                                matched_count += 1
+                            else:
+                                print(f"[DEBUG 모달매핑] 매칭 실패 - 키: {key}, 지번={jibun}, 층={floor}, 면적={area}")
+                        except Exception as e:
+                            print(f"[DEBUG 모달매핑] 예외 발생: {e}")
+                            pass
 
-        # 호실 정보 조회 (인덱스 최적화로 빠른 조회 가능)
-        if property_type in ['아파트', '연립다세대', '오피스텔']:
-            conn_unit = psycopg.connect(**DB_CONFIG, row_factory=dict_row)
-            cursor_unit = conn_unit.cursor()
+                print(f"[DEBUG 모달매핑] 매칭 완료: {matched_count}/{len(results)}건")
 
-            for row in results:
-                unit_info = fetch_unit_info_for_row(
-                    cursor_unit, sigungu_code, umd_name,
-                    row.get('지번'), row.get('층'), row.get('면적')
-                )
-                row['동호명'] = unit_info['unit']
-                row['동호명_전체목록'] = unit_info['all_units']
-                row['동호명_더보기'] = unit_info['has_more']
+            # 호실 정보 조회 (페이지 전체를 bldg_exclusive_area와 조인하는 쿼리 1회)
+            if property_type in ['아파트', '연립다세대', '오피스텔']:
+                unit_infos = fetch_unit_info_for_rows(cursor, sigungu_code, umd_name, results)
+                for row, unit_info in zip(results, unit_infos):
+                    row['동호명'] = unit_info['unit']
+                    row['동호명_전체목록'] = unit_info['all_units']
+                    row['동호명_더보기'] = unit_info['has_more']
+            else:
+                # 단독다가구는 호실 정보 없음
+                for row in results:
+                    row['동호명'] = '-'
+                    row['동호명_전체목록'] = []
+                    row['동호명_더보기'] = False
 
-            cursor_unit.close()
-            conn_unit.close()
-        else:
-            # 단독다가구는 호실 정보 없음
+            # LH 정보 추가를 위해 필요한 키 추가
+            print(f"[DEBUG 모달] LH 정보 추가 시작 - results 개수: {len(results)}, property_type: {property_type}", flush=True)
             for row in results:
-                row['동호명'] = '-'
-                row['동호명_전체목록'] = []
-                row['동호명_더보기'] = False
-
-        # LH 정보 추가를 위해 필요한 키 추가
-        print(f"[DEBUG 모달] LH 정보 추가 시작 - results 개수: {len(results)}, property_type: {property_type}", flush=True)
-        for row in results:
-            row['구분'] = property_type
-            if '시군구코드' not in row:
-                row['시군구코드'] = sigungu_code
-
-        # LH 정보 추가
-        print(f"[DEBUG 모달] add_lh_info_to_results 호출 직전", flush=True)
-        add_lh_info_to_results(results, cursor)
-        print(f"[DEBUG 모달] add_lh_info_to_results 호출 완료", flush=True)
+                row['구분'] = property_type
+                if '시군구코드' not in row:
+                    row['시군구코드'] = sigungu_code
 
-        cursor.close()
-        # 연결은 재사용을 위해 닫지 않음
+            # LH 정보 추가
+            print(f"[DEBUG 모달] add_lh_info_to_results 호출 직전", flush=True)
+            add_lh_info_to_results(results, cursor)
+            print(f"[DEBUG 모달] add_lh_info_to_results 호출 완료", flush=True)
 
         # has_more 판단: page_size만큼 조회되었다면 더 있을 가능성이 있음
         has_more = len(results) == page_size
@@ -3135,10 +4740,6 @@ def search_building():
         seen = set()  # 중복 제거용
         MAX_RESULTS = 12  # 최대 결과 수
 
-        # DB 연결
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         # 4개 테이블에서 검색
         tables = [
             ('apt_rent_transactions', 'aptnm', '아파트'),
@@ -3147,51 +4748,51 @@ def search_building():
             ('dagagu_rent_transactions', 'NULL', '단독다가구')
         ]
 
-        for table_name, building_col, property_type in tables:
-            if len(buildings) >= MAX_RESULTS:
-                break
-
-            # 읍면동과 지번으로 검색 (LIKE 사용)
-            query = f"""
-                SELECT DISTINCT sggcd, umdnm, jibun, {building_col} as building_name
-                FROM {table_name}
-                WHERE umdnm = %s AND jibun LIKE %s
-                LIMIT {MAX_RESULTS}
-            """
-            cursor.execute(query, (umd_name, f"{jibun_search}%"))
-
-            for row in cursor.fetchall():
+        # DB 연결 (풀에서 대여, 블록 종료 시 반납)
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            for table_name, building_col, property_type in tables:
                 if len(buildings) >= MAX_RESULTS:
                     break
 
-                sgg_code = row['sggcd']
-                jibun = row['jibun']
-                building_name = row['building_name']
-
-                key = (sgg_code, umd_name, jibun, building_name)
-                if key not in seen:
-                    seen.add(key)
-
-                    # 시도/시군구 정보 추출
-                    sido = ''
-                    sigungu = ''
-                    if sgg_code and sgg_code in REGIONS['sigungu']:
-                        sido_full = REGIONS['sigungu'][sgg_code]['sido']
-                        sido = SIDO_ABBR.get(sido_full, sido_full)
-                        sigungu = REGIONS['sigungu'][sgg_code]['name']
-
-                    buildings.append({
-                        'sgg_code': sgg_code,
-                        'umd_name': umd_name,
-                        'jibun': jibun,
-                        'building_name': building_name,
-                        'property_type': property_type,
-                        'sido': sido,
-                        'sigungu': sigungu,
-                        'full_address': f"{umd_name} {jibun} {building_name or ''}"
-                    })
-
-        cursor.close()
+                # 읍면동과 지번으로 검색 (LIKE 사용)
+                query = f"""
+                    SELECT DISTINCT sggcd, umdnm, jibun, {building_col} as building_name
+                    FROM {table_name}
+                    WHERE umdnm = %s AND jibun LIKE %s
+                    LIMIT {MAX_RESULTS}
+                """
+                cursor.execute(query, (umd_name, f"{jibun_search}%"))
+
+                for row in cursor.fetchall():
+                    if len(buildings) >= MAX_RESULTS:
+                        break
+
+                    sgg_code = row['sggcd']
+                    jibun = row['jibun']
+                    building_name = row['building_name']
+
+                    key = (sgg_code, umd_name, jibun, building_name)
+                    if key not in seen:
+                        seen.add(key)
+
+                        # 시도/시군구 정보 추출
+                        sido = ''
+                        sigungu = ''
+                        if sgg_code and sgg_code in REGIONS['sigungu']:
+                            sido_full = REGIONS['sigungu'][sgg_code]['sido']
+                            sido = SIDO_ABBR.get(sido_full, sido_full)
+                            sigungu = REGIONS['sigungu'][sgg_code]['name']
+
+                        buildings.append({
+                            'sgg_code': sgg_code,
+                            'umd_name': umd_name,
+                            'jibun': jibun,
+                            'building_name': building_name,
+                            'property_type': property_type,
+                            'sido': sido,
+                            'sigungu': sigungu,
+                            'full_address': f"{umd_name} {jibun} {building_name or ''}"
+                        })
 
         return jsonify({
             'success': True,
@@ -3226,12 +4827,9 @@ def get_unit_info():
             print(f"[DEBUG] 필수 파라미터 누락")
             return jsonify({'unit': '-', 'error': 'Missing parameters'})
 
-        # 법정동코드 5자리 찾기 (읍면동 부분)
-        bjdcd = None
-        for code, info in REGIONS['umd'].items():
-            if info['sgg_code'] == sggcd and info['umd_name'] == umdnm:
-                bjdcd = code[5:]  # 뒤 5자리가 법정동코드
-                break
+        # 법정동코드 5자리 찾기 (읍면동 부분, 뒤 5자리가 법정동코드)
+        umd_code = find_umd_code(sggcd, umdnm)
+        bjdcd = umd_code[5:] if umd_code else None
 
         if not bjdcd:
             print(f"[DEBUG] 법정동코드 찾기 실패 - sggcd:{sggcd}, umdnm:{umdnm}")
@@ -3264,84 +4862,32 @@ def get_unit_info():
         except (ValueError, TypeError):
             return jsonify({'unit': '-', 'error': 'Invalid area'})
 
-        # DB 쿼리 (최적화)
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # 쿼리 타임아웃 설정 (10초)
-        cursor.execute("SET statement_timeout = '10s'")
-
-        # 최적화된 쿼리:
-        # 1. 전유_공용_구분_코드를 먼저 필터 (가장 선택적)
-        # 2. 시군구_코드, 법정동_코드로 지역 좁히기
-        # 3. 번, 지로 지번 좁히기
-        # 4. 면적을 TEXT로 정확히 매칭 (데이터베이스 인덱스 없이는 numeric 변환이 느림)
-        # 5. 층 조건은 마지막
-        query = """
-        SELECT DISTINCT "동_명", "호_명"
-        FROM bldg_exclusive_area
-        WHERE "전유_공용_구분_코드" = '1'
-          AND "시군구_코드" = %s
-          AND "법정동_코드" = %s
-          AND "번" = %s
-          AND "지" = %s
-          AND "층_구분_코드" = %s
-          AND "층_번호" = %s
-          AND "면적(㎡)" = %s
-        LIMIT 100
-        """
-
+        params = (sggcd, bjdcd, bon, bu, floor_code, floor_num, area)
         print(f"[DEBUG] 쿼리 파라미터: sggcd={sggcd}, bjdcd={bjdcd}, 번={bon}, 지={bu}, 층구분={floor_code}, 층번호={floor_num}, 면적={area}")
-        import time
         start_time = time.time()
 
-        try:
-            cursor.execute(query, (sggcd, bjdcd, bon, bu, floor_code, floor_num, area))
-            results = cursor.fetchall()
-            elapsed = time.time() - start_time
-            print(f"[DEBUG] 쿼리 실행 시간: {elapsed:.2f}초, 결과 건수: {len(results)}건")
-        except psycopg.errors.QueryCanceled:
-            print(f"[DEBUG] 쿼리 타임아웃 (10초 초과)")
-            cursor.close()
-            conn.close()
-            return jsonify({'unit': '-', 'error': 'Query timeout'})
-
-        cursor.close()
-        conn.close()
+        # DB 쿼리 (풀에서 연결 대여) - 호실 목록 테이블이 있으면 PK 조회, 없으면 bldg_exclusive_area 조회
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            try:
+                # 쿼리 타임아웃 설정 (10초, 현재 트랜잭션에만 적용 - 풀 연결에 남지 않음)
+                cursor.execute("SET LOCAL statement_timeout = '10s'")
+                unit_info = fetch_unit_info_multi(cursor, [params], raise_errors=True)[0]
+                print(f"[DEBUG] 쿼리 실행 시간: {time.time() - start_time:.2f}초, 호실 {len(unit_info['all_units'])}개")
+            except psycopg.errors.QueryCanceled:
+                print(f"[DEBUG] 쿼리 타임아웃 (10초 초과)")
+                conn.rollback()
+                return jsonify({'unit': '-', 'error': 'Query timeout'})
 
         # 결과 처리
-        if not results:
-            return jsonify({'unit': '-'})
-
-        # 모든 고유한 동명+호명 조합 수집
-        unique_units = set()
-        for r in results:
-            dong = (r.get('동_명', '').strip() if r.get('동_명') else '')
-            ho = (r.get('호_명', '').strip() if r.get('호_명') else '')
-            if dong and ho:
-                unique_units.add(f"{dong} {ho}")
-            elif ho:  # 동명 없이 호명만 있는 경우
-                unique_units.add(ho)
-
-        if not unique_units:
+        if not unit_info['all_units']:
             print(f"[DEBUG] 호실 정보 없음")
             return jsonify({'unit': '-', 'all_units': []})
 
-        # 전체 목록 (정렬)
-        all_unit_list = sorted(list(unique_units))
-
-        # 표시용: 최대 10개까지만
-        display_list = all_unit_list[:10]
-        unit_str = ', '.join(display_list)
-
-        if len(unique_units) > 10:
-            unit_str += f" 외 {len(unique_units) - 10}개"
-
-        print(f"[DEBUG] 호실 특정: {len(unique_units)}개 - {unit_str}")
+        print(f"[DEBUG] 호실 특정: {len(unit_info['all_units'])}개 - {unit_info['unit']}")
         return jsonify({
-            'unit': unit_str,
-            'all_units': all_unit_list,  # 전체 목록 (툴팁용)
-            'has_more': len(unique_units) > 10
+            'unit': unit_info['unit'],
+            'all_units': unit_info['all_units'],  # 전체 목록 (툴팁용)
+            'has_more': unit_info['has_more']
         })
 
     except Exception as e:
@@ -3351,9 +4897,579 @@ def get_unit_info():
         return jsonify({'unit': '-', 'error': str(e)})
 
 
+@app.route('/api/unit-info/batch', methods=['POST'])
+def get_unit_info_batch():
+    """호실 정보 일괄 조회 - 여러 거래 건을 bldg_exclusive_area 쿼리 1회로 조회
+
+    요청: {"items": [{"sggcd", "umdnm", "jibun", "floor", "excluusear"}, ...]}
+    응답: {"success": true, "data": [{"unit", "all_units", "has_more"}, ...]} - items와 같은 순서
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('items') or []
+
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return jsonify({'success': False, 'error': 'items는 객체 목록이어야 합니다.'}), 400
+        if len(items) > UNIT_INFO_BATCH_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {UNIT_INFO_BATCH_MAX_ITEMS}건까지 조회할 수 있습니다.'
+            }), 400
+
+        unit_params = [
+            build_unit_info_params(item.get('sggcd'), item.get('umdnm'), item.get('jibun'), item.get('floor'), item.get('excluusear'))
+            for item in items
+        ]
+
+        start_time = time.time()
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            # 쿼리 타임아웃 설정 (10초, 현재 트랜잭션에만 적용 - 풀 연결에 남지 않음)
+            cursor.execute("SET LOCAL statement_timeout = '10s'")
+            unit_infos = fetch_unit_info_multi(cursor, unit_params, raise_errors=True)
+
+        print(f"[DEBUG] 호실 일괄 조회: {len(items)}건, 소요시간: {time.time() - start_time:.2f}초")
+        return jsonify({'success': True, 'data': unit_infos})
+
+    except psycopg.errors.QueryCanceled:
+        print(f"[DEBUG] 호실 일괄 조회 타임아웃 (10초 초과)")
+        return jsonify({'success': False, 'error': 'Query timeout'}), 504
+
+    except Exception as e:
+        print(f"[ERROR] 호실 일괄 조회 오류: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': f'호실 정보 조회 실패: {str(e)}'
+        }), 500
+
+
+# VWorld API 클라이언트 (vworld_client.py) - 워커(프로세스)별 연결 풀 재사용
+# - 시도마다 connect/read 타임아웃, 호출 전체는 VWORLD_TOTAL_TIMEOUT 안에서만 재시도 (지수 백오프 + jitter)
+# - 연속 VWORLD_CIRCUIT_FAILURES회 실패 시 VWORLD_CIRCUIT_RESET_SECONDS 동안 호출 없이 즉시 503
+# - 워커당 동시 호출 VWORLD_MAX_CONCURRENCY개까지 (초과 요청은 잠시 대기 후 503)
+# - VWORLD_API_BASE_URL: 로컬 가짜 서버 등으로 바꿔 동작 확인 가능 (프록시 URL 사용 시에는 무관)
+VWORLD_API_BASE_URL = os.getenv('VWORLD_API_BASE_URL', 'https://api.vworld.kr').rstrip('/')
+VWORLD_CONNECT_TIMEOUT = float(os.getenv('VWORLD_CONNECT_TIMEOUT', '5'))
+VWORLD_READ_TIMEOUT = float(os.getenv('VWORLD_READ_TIMEOUT', '8'))
+VWORLD_TOTAL_TIMEOUT = float(os.getenv('VWORLD_TOTAL_TIMEOUT', '15'))
+VWORLD_MAX_ATTEMPTS = int(os.getenv('VWORLD_MAX_ATTEMPTS', '3'))
+VWORLD_MAX_CONCURRENCY = int(os.getenv('VWORLD_MAX_CONCURRENCY', '8'))
+VWORLD_CIRCUIT_FAILURES = int(os.getenv('VWORLD_CIRCUIT_FAILURES', '5'))
+VWORLD_CIRCUIT_RESET_SECONDS = float(os.getenv('VWORLD_CIRCUIT_RESET_SECONDS', '30'))
+_vworld_client = None
+_vworld_client_pid = None
+_vworld_client_lock = threading.Lock()
+
+
+# 소유자 정보 캐시 (DB 테이블, create_owner_info_cache_table.py로 생성)
+# - PNU별로 파싱/그룹화된 응답을 저장 → 같은 필지 재조회는 VWorld 호출(재시도 포함 최대 20초 이상) 없이 PK 조회로 응답
+# - OWNER_CACHE_FRESH_SECONDS 이내: 그대로 응답
+# - OWNER_CACHE_STALE_SECONDS 이내: 저장된 응답을 바로 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+# - 그보다 오래됐으면 VWorld를 다시 호출 (실패하면 저장된 응답으로 대체)
+# - 행 수가 OWNER_CACHE_MAX_ENTRIES를 넘으면 가장 오래 조회하지 않은 PNU부터 삭제 (OWNER_CACHE_PRUNE_INTERVAL마다 확인)
+# - DB에 있으므로 워커/서버 재시작 후에도 유지, 테이블이 없거나 OWNER_CACHE_ENABLED=0이면 매번 VWorld 호출
+OWNER_CACHE_ENABLED = os.getenv('OWNER_CACHE_ENABLED', '1') == '1'
+OWNER_CACHE_TABLE = 'owner_info_cache'
+OWNER_CACHE_FRESH_SECONDS = float(os.getenv('OWNER_CACHE_FRESH_SECONDS', str(7 * 86400)))
+OWNER_CACHE_STALE_SECONDS = float(os.getenv('OWNER_CACHE_STALE_SECONDS', str(90 * 86400)))
+OWNER_CACHE_MAX_ENTRIES = int(os.getenv('OWNER_CACHE_MAX_ENTRIES', '200000'))
+OWNER_CACHE_PRUNE_INTERVAL = float(os.getenv('OWNER_CACHE_PRUNE_INTERVAL', '600'))  # 상한 초과 확인 주기 (초)
+OWNER_CACHE_CHECK_INTERVAL = 300  # 테이블 존재 여부 재확인 주기 (초)
+_owner_cache_state = {'available': None, 'checked_at': 0.0, 'pruned_at': 0.0}
+_owner_cache_stats = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_failures': 0, 'stale_fallbacks': 0, 'pruned': 0}
+_owner_cache_lock = threading.Lock()
+_owner_refresh_inflight = set()  # 백그라운드 갱신 중인 PNU (중복 호출 방지)
+
+# 워커(프로세스)별 소유자 정보 백그라운드 갱신 스레드 풀 (VWorld 호출이 검색 스레드 풀을 점유하지 않도록 분리)
+_owner_refresh_executor = None
+_owner_refresh_executor_pid = None
+
+# 소유자 정보 일괄 조회 (/api/owner-info/batch) - 캐시에 없는 PNU만 워커별 스레드 풀에서 동시에 VWorld 호출
+OWNER_BATCH_MAX_ITEMS = int(os.getenv('OWNER_BATCH_MAX_ITEMS', '200'))  # 요청 1회당 최대 주소 수
+OWNER_BATCH_MAX_WORKERS = int(os.getenv('OWNER_BATCH_MAX_WORKERS', '4'))  # 워커당 동시 VWorld 호출 수 (VWORLD_MAX_CONCURRENCY 이하 권장)
+# Lambda 프록시 다건 호출 (pnus=) - 프록시는 묶음 전체가 끝나야 응답하므로 묶음 크기와 타임아웃을 함께 맞춤
+# - 제약: OWNER_PROXY_BATCH_SIZE <= OWNER_PROXY_LAMBDA_WORKERS (= Lambda BATCH_MAX_WORKERS) 이면 한 번(1 wave)에 끝남
+#   넘으면 ceil(크기 / 워커 수) wave만큼 걸리므로 읽기 타임아웃도 그만큼 늘림
+# - OWNER_PROXY_PNU_TIMEOUT은 Lambda BATCH_PNU_TIMEOUT과 같게 설정
+# - 다건 호출은 재시도하지 않음 (일부 PNU만 느려도 묶음 전체를 다시 호출하게 되므로, 실패 PNU는 개별 오류로 전달)
+OWNER_PROXY_BATCH_SIZE = int(os.getenv('OWNER_PROXY_BATCH_SIZE', '8'))  # 호출 1회에 묶을 PNU 수 (1이면 PNU별 호출)
+OWNER_PROXY_LAMBDA_WORKERS = int(os.getenv('OWNER_PROXY_LAMBDA_WORKERS', '8'))  # Lambda BATCH_MAX_WORKERS와 같게
+OWNER_PROXY_PNU_TIMEOUT = float(os.getenv('OWNER_PROXY_PNU_TIMEOUT', '8'))  # Lambda BATCH_PNU_TIMEOUT과 같게
+OWNER_PROXY_WAVES = -(-OWNER_PROXY_BATCH_SIZE // max(1, OWNER_PROXY_LAMBDA_WORKERS))
+OWNER_PROXY_READ_TIMEOUT = OWNER_PROXY_PNU_TIMEOUT * OWNER_PROXY_WAVES + 4  # Lambda 기동/파싱/전송 여유 4초
+_owner_batch_executor = None
+_owner_batch_executor_pid = None
+
+
+def owner_cache_available():
+    """소유자 정보 캐시 테이블 사용 가능 여부 (OWNER_CACHE_CHECK_INTERVAL 동안 캐시)"""
+    if not OWNER_CACHE_ENABLED:
+        return False
+
+    now = time.time()
+    if _owner_cache_state['available'] is not None and now - _owner_cache_state['checked_at'] < OWNER_CACHE_CHECK_INTERVAL:
+        return _owner_cache_state['available']
+
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL as available", (OWNER_CACHE_TABLE,))
+            available = bool(cursor.fetchone()['available'])
+    except Exception as e:
+        print(f"[WARNING] 소유자 정보 캐시 테이블 확인 실패: {str(e)}")
+        available = False
+
+    if available != _owner_cache_state['available']:
+        print(f"[INFO] 소유자 정보: {OWNER_CACHE_TABLE + ' 캐시 사용' if available else '캐시 없음 (매번 VWorld 호출)'}")
+    _owner_cache_state['available'] = available
+    _owner_cache_state['checked_at'] = now
+    return available
+
+
+def owner_cache_get(pnu):
+    """저장된 응답과 경과 시간(초) 조회 (조회 시각 갱신) → (payload, age) 또는 None"""
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            execute_prepared(cursor, f"""
+                UPDATE {OWNER_CACHE_TABLE} SET accessed_at = now()
+                WHERE pnu = %s
+                RETURNING payload, EXTRACT(EPOCH FROM now() - fetched_at)::float8 as age
+            """, (pnu,))
+            row = cursor.fetchone()
+    except Exception as e:
+        print(f"[WARNING] 소유자 정보 캐시 조회 실패: {str(e)}")
+        return None
+    return (row['payload'], row['age']) if row else None
+
+
+def owner_cache_get_many(pnus):
+    """여러 PNU의 저장된 응답을 쿼리 1회로 조회 (조회 시각 갱신) → {pnu: (payload, age)} (없는 PNU는 제외)"""
+    if not pnus:
+        return {}
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            execute_prepared(cursor, f"""
+                UPDATE {OWNER_CACHE_TABLE} SET accessed_at = now()
+                WHERE pnu = ANY(%s)
+                RETURNING pnu, payload, EXTRACT(EPOCH FROM now() - fetched_at)::float8 as age
+            """, (list(pnus),))
+            rows = cursor.fetchall()
+    except Exception as e:
+        print(f"[WARNING] 소유자 정보 캐시 일괄 조회 실패: {str(e)}")
+        return {}
+    return {row['pnu']: (row['payload'], row['age']) for row in rows}
+
+
+def owner_cache_put(pnu, payload):
+    """VWorld 응답 저장 (같은 PNU는 덮어씀) 후 주기적으로 상한 초과분 삭제"""
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            execute_prepared(cursor, f"""
+                INSERT INTO {OWNER_CACHE_TABLE} (pnu, payload, fetched_at, accessed_at)
+                VALUES (%s, %s, now(), now())
+                ON CONFLICT (pnu) DO UPDATE SET
+                    payload = EXCLUDED.payload,
+                    fetched_at = EXCLUDED.fetched_at,
+                    accessed_at = EXCLUDED.accessed_at
+            """, (pnu, Jsonb(payload)))
+    except Exception as e:
+        print(f"[WARNING] 소유자 정보 캐시 저장 실패: {str(e)}")
+        return
+
+    now = time.time()
+    with _owner_cache_lock:
+        if now - _owner_cache_state['pruned_at'] < OWNER_CACHE_PRUNE_INTERVAL:
+            return
+        _owner_cache_state['pruned_at'] = now
+    owner_cache_prune()
+
+
+def owner_cache_prune():
+    """행 수가 OWNER_CACHE_MAX_ENTRIES를 넘으면 가장 오래 조회하지 않은 PNU부터 삭제"""
+    try:
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(f"""
+                DELETE FROM {OWNER_CACHE_TABLE}
+                WHERE pnu IN (
+                    SELECT pnu FROM {OWNER_CACHE_TABLE}
+                    ORDER BY accessed_at DESC
+                    OFFSET %s
+                )
+            """, (OWNER_CACHE_MAX_ENTRIES,))
+            deleted = cursor.rowcount
+    except Exception as e:
+        print(f"[WARNING] 소유자 정보 캐시 정리 실패: {str(e)}")
+        return
+
+    if deleted:
+        print(f"[INFO] 소유자 정보 캐시 정리: {deleted}건 삭제")
+        with _owner_cache_lock:
+            _owner_cache_stats['pruned'] += deleted
+
+
+def get_owner_refresh_executor():
+    """현재 워커의 소유자 정보 갱신용 스레드 풀 반환 (fork된 프로세스면 새로 생성)"""
+    global _owner_refresh_executor, _owner_refresh_executor_pid
+    with _owner_cache_lock:
+        if _owner_refresh_executor is None or _owner_refresh_executor_pid != os.getpid():
+            _owner_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='owner-refresh')
+            _owner_refresh_executor_pid = os.getpid()
+    return _owner_refresh_executor
+
+
+def get_owner_batch_executor():
+    """현재 워커의 소유자 정보 일괄 조회용 스레드 풀 반환 (fork된 프로세스면 새로 생성)"""
+    global _owner_batch_executor, _owner_batch_executor_pid
+    with _owner_cache_lock:
+        if _owner_batch_executor is None or _owner_batch_executor_pid != os.getpid():
+            _owner_batch_executor = ThreadPoolExecutor(max_workers=OWNER_BATCH_MAX_WORKERS, thread_name_prefix='owner-batch')
+            _owner_batch_executor_pid = os.getpid()
+    return _owner_batch_executor
+
+
+def refresh_owner_info(pnu):
+    """백그라운드 작업: VWorld 재호출 후 성공하면 캐시 갱신 (실패 시 기존 응답 유지)"""
+    try:
+        body, status = fetch_owner_info_from_vworld(pnu)
+        if status == 200:
+            owner_cache_put(pnu, body)
+            with _owner_cache_lock:
+                _owner_cache_stats['refreshes'] += 1
+        else:
+            print(f"[WARNING] 소유자 정보 백그라운드 갱신 실패 - PNU: {pnu}, 상태: {status}")
+            with _owner_cache_lock:
+                _owner_cache_stats['refresh_failures'] += 1
+    finally:
+        with _owner_cache_lock:
+            _owner_refresh_inflight.discard(pnu)
+
+
+def schedule_owner_info_refresh(pnu):
+    """같은 PNU의 갱신이 진행 중이 아니면 백그라운드 갱신 제출"""
+    with _owner_cache_lock:
+        if pnu in _owner_refresh_inflight:
+            return
+        _owner_refresh_inflight.add(pnu)
+    get_owner_refresh_executor().submit(refresh_owner_info, pnu)
+
+
+def get_owner_cache_stats():
+    """소유자 정보 캐시 통계"""
+    with _owner_cache_lock:
+        return {
+            'enabled': OWNER_CACHE_ENABLED,
+            'available': _owner_cache_state['available'],
+            **_owner_cache_stats,
+            'refreshing': len(_owner_refresh_inflight),
+            'fresh_seconds': OWNER_CACHE_FRESH_SECONDS,
+            'stale_seconds': OWNER_CACHE_STALE_SECONDS,
+            'max_entries': OWNER_CACHE_MAX_ENTRIES,
+        }
+
+
+def get_vworld_client():
+    """현재 워커의 VWorld 클라이언트 반환 (fork된 프로세스면 새로 생성 - Session 연결을 공유하지 않음)"""
+    global _vworld_client, _vworld_client_pid
+    with _vworld_client_lock:
+        if _vworld_client is None or _vworld_client_pid != os.getpid():
+            _vworld_client = VWorldClient(
+                connect_timeout=VWORLD_CONNECT_TIMEOUT,
+                read_timeout=VWORLD_READ_TIMEOUT,
+                total_timeout=VWORLD_TOTAL_TIMEOUT,
+                max_attempts=VWORLD_MAX_ATTEMPTS,
+                max_concurrency=VWORLD_MAX_CONCURRENCY,
+                failure_threshold=VWORLD_CIRCUIT_FAILURES,
+                reset_timeout=VWORLD_CIRCUIT_RESET_SECONDS,
+            )
+            _vworld_client_pid = os.getpid()
+        return _vworld_client
+
+
+def get_vworld_stats():
+    """VWorld 호출 지표 (현재 워커, 아직 호출 전이면 설정값만)"""
+    with _vworld_client_lock:
+        client = _vworld_client if _vworld_client_pid == os.getpid() else None
+    if client is None:
+        return {'calls': 0, 'max_concurrency': VWORLD_MAX_CONCURRENCY}
+    return client.get_stats()
+
+
+def parse_owner_info_xml(content):
+    """VWorld getPossessionAttr XML 응답 → 동·호별로 그룹화한 소유 정보 (field 태그가 없으면 빈 dict)"""
+    root = ET.fromstring(content)
+
+    # VWorld API는 <fields><field> 구조로 응답
+    # possessions가 아니라 field 태그를 찾아야 함
+    fields = root.findall('.//field')
+
+    print(f"[DEBUG] field 태그 개수: {len(fields)}")
+
+    # 결과 파싱
+    results = []
+    for field in fields:
+        item = {}
+        for child in field:
+            tag = child.tag
+            value = child.text or ''
+            item[tag] = value
+        results.append(item)
+
+    # 동·호별로 그룹화
+    grouped_data = {}
+    for item in results:
+        dong_nm = item.get('buldDongNm', '')
+        ho_nm = item.get('buldHoNm', '')
+
+        # 0000이나 빈 값은 무시
+        dong_nm = dong_nm if dong_nm and dong_nm != '0000' else ''
+        ho_nm = ho_nm if ho_nm and ho_nm != '0000' else ''
+
+        # 집합건물인 경우에만 동·호 그룹화, 아니면 전체를 하나의 그룹으로
+        if dong_nm and ho_nm:
+            key = f"{dong_nm}동 {ho_nm}호"
+        elif dong_nm:
+            key = f"{dong_nm}동"
+        elif ho_nm:
+            key = f"{ho_nm}호"
+        else:
+            key = "토지"
+
+        if key not in grouped_data:
+            grouped_data[key] = []
+
+        grouped_data[key].append({
+            'posesnSeCodeNm': item.get('posesnSeCodeNm', '-'),
+            'resdncSeCodeNm': item.get('resdncSeCodeNm', '-'),
+            'ownshipChgDe': item.get('ownshipChgDe', '-'),
+            'ownshipChgCauseCodeNm': item.get('ownshipChgCauseCodeNm', '-'),
+            'cnrsPsnCo': item.get('cnrsPsnCo', '0'),
+            'buldDongNm': dong_nm,
+            'buldHoNm': ho_nm
+        })
+
+    print(f"[DEBUG] 소유자 정보 {len(results)}건 조회 완료")
+    return grouped_data
+
+
+def get_vworld_settings():
+    """환경에 따른 VWorld 호출 설정 → (API key, domain 파라미터, Lambda 프록시 URL 또는 None, 환경 이름)"""
+    is_production = os.getenv('VERCEL_ENV') == 'production' or os.getenv('ENVIRONMENT') == 'production'
+
+    if is_production:
+        # 배포 환경: 프로덕션 API 키와 도메인 사용
+        api_key = os.getenv('VWORLD_API_KEY_PROD')
+        domain_param = 'http://127.0.0.1'
+    else:
+        # 로컬 환경: 로컬 API 키와 localhost 사용
+        api_key = os.getenv('VWORLD_API_KEY_LOCAL')
+        domain_param = 'http://127.0.0.1'
+
+    # 프로덕션 환경에서 프록시 URL이 설정되어 있으면 프록시 사용
+    proxy_url = os.getenv('VWORLD_PROXY_URL') if is_production else None
+    return api_key, domain_param, proxy_url or None, '프로덕션' if is_production else '로컬'
+
+
+def owner_proxy_batch_enabled():
+    """일괄 조회를 Lambda 프록시 다건 호출(pnus=)로 묶을지 여부"""
+    return OWNER_PROXY_BATCH_SIZE > 1 and get_vworld_settings()[2] is not None
+
+
+def vworld_status_body(status_code, text):
+    """VWorld(또는 프록시) 비정상 HTTP 응답 → (응답 본문, HTTP 상태)"""
+    print(f"[ERROR] VWorld API 호출 실패: {status_code}")
+    print(f"[ERROR] 응답 내용: {text[:500]}")
+    return {'error': f'API 호출 실패 (상태코드: {status_code})'}, 502
+
+
+def vworld_error_body(error):
+    """VWorldClient 예외 → (응답 본문, HTTP 상태)"""
+    if isinstance(error, VWorldConnectionError):
+        print(f"[ERROR] VWorld API 연결 오류: {str(error)}")
+        # Vercel 환경에서 VWorld API 접근 불가 - 기능 비활성화
+        return {
+            'error': '소유자 정보를 불러올 수 없습니다.',
+            'message': '현재 서버 환경에서 VWorld API에 접근할 수 없습니다.'
+        }, 503
+    print(f"[ERROR] VWorld API 호출 실패: {str(error)}")
+    return {'error': str(error)}, error.status
+
+
+def owner_info_body(grouped_data):
+    """동·호별 소유 정보 → 성공 응답 본문 (소유자 정보가 없으면 빈 dict + message)"""
+    if not grouped_data:
+        print(f"[DEBUG] 소유자 정보 없음")
+        return {'data': {}, 'message': '소유자 정보가 없습니다.'}
+    return {'data': grouped_data}
+
+
+def fetch_owner_info_from_vworld(pnu):
+    """VWorld getPossessionAttr 호출 (VWorldClient 재시도 포함) → (응답 본문, HTTP 상태)
+
+    성공(200)이면 {'data': 동·호별 소유 정보} (소유자 정보가 없으면 빈 dict + message), 실패면 {'error': ...}
+    """
+    api_key, domain_param, proxy_url, env_type = get_vworld_settings()
+    if not api_key:
+        return {'error': f'VWorld API Key({env_type})가 설정되지 않았습니다.'}, 500
+
+    # VWorld API 호출 URL 결정
+    if proxy_url:
+        # AWS Lambda 프록시 사용 (Seoul 리전에서 호출)
+        api_url = f"{proxy_url}?pnu={pnu}&key={api_key}&domain={domain_param}"
+        print(f"[DEBUG] Using Lambda proxy: {proxy_url}")
+    else:
+        # VWorld API 직접 호출
+        # VWorld API는 domain 파라미터의 URL 인코딩을 허용하지 않음
+        # URL을 직접 생성하여 인코딩 방지
+        api_url = f"{VWORLD_API_BASE_URL}/ned/data/getPossessionAttr?pnu={pnu}&format=xml&numOfRows=1000&pageNo=1&key={api_key}&domain={domain_param}"
+        print(f"[DEBUG] Calling VWorld API directly")
+
+    print(f"[DEBUG] VWorld API 호출 시작 - PNU: {pnu}")
+    print(f"[DEBUG] 요청 URL: {api_url.replace(api_key, f'{api_key[:5]}***')}")
+
+    # 연결 풀/재시도/서킷 브레이커/동시 호출 상한은 VWorldClient가 처리
+    try:
+        response = get_vworld_client().get(api_url)
+    except VWorldError as e:
+        return vworld_error_body(e)
+
+    print(f"[DEBUG] VWorld API 응답 상태: {response.status_code}")
+
+    if response.status_code != 200:
+        return vworld_status_body(response.status_code, response.text)
+
+    # XML 파싱
+    try:
+        print(f"[DEBUG] 응답 내용 (처음 300자): {response.content[:300]}")
+        grouped_data = parse_owner_info_xml(response.content)
+    except ET.ParseError as e:
+        print(f"[ERROR] XML 파싱 오류: {str(e)}")
+        return {'error': 'API 응답 파싱 실패'}, 500
+
+    return owner_info_body(grouped_data), 200
+
+
+def fetch_owner_infos_from_proxy(pnus):
+    """Lambda 프록시 다건 호출 1회로 여러 PNU 조회 → {pnu: (응답 본문, HTTP 상태)}
+
+    프록시가 Seoul 리전에서 동시에 VWorld를 호출하고 파싱된 JSON을 gzip으로 응답 (requests가 자동 해제)
+    → PNU 수와 관계없이 리전 간 왕복 1회
+    """
+    api_key, domain_param, proxy_url, env_type = get_vworld_settings()
+    if not api_key:
+        body = {'error': f'VWorld API Key({env_type})가 설정되지 않았습니다.'}
+        return {pnu: (body, 500) for pnu in pnus}
+
+    api_url = f"{proxy_url}?pnus={','.join(pnus)}&key={api_key}&domain={domain_param}"
+    print(f"[DEBUG] Lambda 프록시 일괄 호출 - {len(pnus)}건")
+
+    try:
+        response = get_vworld_client().get(
+            api_url,
+            read_timeout=OWNER_PROXY_READ_TIMEOUT,
+            total_timeout=OWNER_PROXY_READ_TIMEOUT + VWORLD_CONNECT_TIMEOUT,
+            max_attempts=1
+        )
+        if response.status_code != 200:
+            failed = vworld_status_body(response.status_code, response.text)
+            return {pnu: failed for pnu in pnus}
+        results = response.json().get('results') or {}
+    except VWorldError as e:
+        failed = vworld_error_body(e)
+        return {pnu: failed for pnu in pnus}
+    except ValueError as e:
+        print(f"[ERROR] Lambda 프록시 응답 파싱 오류: {str(e)}")
+        return {pnu: ({'error': 'API 응답 파싱 실패'}, 500) for pnu in pnus}
+
+    fetched = {}
+    for pnu in pnus:
+        result = results.get(pnu) or {'status': 502, 'error': '프록시 응답에 결과가 없습니다.'}
+        if result.get('status') == 200:
+            fetched[pnu] = (owner_info_body(result.get('data') or {}), 200)
+        else:
+            print(f"[ERROR] VWorld API 호출 실패 (PNU: {pnu}): {result.get('error')}")
+            fetched[pnu] = ({'error': f"API 호출 실패 (상태코드: {result.get('status')})"}, 502)
+    return fetched
+
+
+def build_owner_pnu(sgg_code, umd_name, jibun):
+    """(시군구코드, 읍면동명, 지번) → PNU 19자리 (법정동코드를 찾을 수 없으면 None)
+
+    PNU: 시군구코드(5) + 법정동코드(5) + 1 + 본번(4) + 부번(4), 지번 "119-3" → 본번 "0119", 부번 "0003"
+    """
+    full_code = find_umd_code(sgg_code, umd_name)
+    umd_code = full_code[5:] if full_code else None  # 뒤 5자리가 법정동코드
+    if not umd_code:
+        return None
+
+    jibun_parts = str(jibun).split('-')
+    bon = jibun_parts[0].strip().zfill(4)
+    bu = jibun_parts[1].strip().zfill(4) if len(jibun_parts) > 1 else '0000'
+    return f"{sgg_code}{umd_code}1{bon}{bu}"
+
+
+def owner_info_from_cache(pnu, cached):
+    """저장된 응답이 신선하면 그대로, 허용 기간 내면 백그라운드 갱신을 걸고 반환 (둘 다 아니면 None)"""
+    if cached is None:
+        return None
+    payload, age = cached
+    if age < OWNER_CACHE_FRESH_SECONDS:
+        with _owner_cache_lock:
+            _owner_cache_stats['fresh_hits'] += 1
+        print(f"[DEBUG] 소유자 정보 캐시 적중 - PNU: {pnu}, 경과 {age:.0f}초")
+        return {**payload, 'cache': 'fresh'}
+    if age < OWNER_CACHE_STALE_SECONDS:
+        with _owner_cache_lock:
+            _owner_cache_stats['stale_hits'] += 1
+        print(f"[DEBUG] 소유자 정보 캐시(만료) 응답 후 갱신 - PNU: {pnu}, 경과 {age:.0f}초")
+        schedule_owner_info_refresh(pnu)
+        return {**payload, 'cache': 'stale'}
+    return None
+
+
+def fetch_and_cache_owner_info(pnu, cached, use_cache):
+    """캐시로 응답할 수 없을 때: VWorld 호출 후 저장 → (응답 본문, HTTP 상태)
+
+    호출이 실패하면 허용 기간이 지난 저장된 응답이라도 있으면 그 응답으로 대체
+    """
+    if use_cache:
+        with _owner_cache_lock:
+            _owner_cache_stats['misses'] += 1
+
+    body, status = fetch_owner_info_from_vworld(pnu)
+    return store_owner_fetch_result(pnu, cached, use_cache, body, status)
+
+
+def fetch_and_cache_owner_infos(pnus, cached_by_pnu, use_cache):
+    """fetch_and_cache_owner_info의 다건 버전 (Lambda 프록시 호출 1회) → [(pnu, 응답 본문, HTTP 상태)]"""
+    if use_cache:
+        with _owner_cache_lock:
+            _owner_cache_stats['misses'] += len(pnus)
+
+    fetched = fetch_owner_infos_from_proxy(pnus)
+    return [
+        (pnu, *store_owner_fetch_result(pnu, cached_by_pnu.get(pnu), use_cache, *fetched[pnu]))
+        for pnu in pnus
+    ]
+
+
+def store_owner_fetch_result(pnu, cached, use_cache, body, status):
+    """VWorld 호출 결과 저장 (성공 시) 또는 저장된 응답으로 대체 (실패 시) → (응답 본문, HTTP 상태)"""
+    if status == 200:
+        if use_cache:
+            owner_cache_put(pnu, body)
+        return {**body, 'cache': 'miss'}, 200
+
+    if cached is not None:
+        with _owner_cache_lock:
+            _owner_cache_stats['stale_fallbacks'] += 1
+        print(f"[WARNING] VWorld 호출 실패 ({status}) - 저장된 소유자 정보로 응답 (PNU: {pnu})")
+        return {**cached[0], 'cache': 'stale'}, 200
+    return body, status
+
+
 @app.route('/api/owner-info', methods=['POST'])
 def get_owner_info():
-    """VWorld API를 통한 토지소유정보 조회"""
+    """VWorld API를 통한 토지소유정보 조회 (PNU별 캐시 우선)"""
     try:
         data = request.get_json()
         if not data:
@@ -3375,197 +5491,145 @@ def get_owner_info():
             print(f"[ERROR] REGIONS 캐시가 초기화되지 않았습니다.")
             return jsonify({'error': '지역 코드 정보를 불러올 수 없습니다.'}), 500
 
-        umd_code = None
-        for full_code, region_info in REGIONS['umd'].items():
-            if region_info.get('sgg_code') == sgg_code and region_info.get('umd_name') == umd_name:
-                umd_code = full_code[5:]  # 뒤 5자리가 법정동코드
-                break
-
-        if not umd_code:
+        pnu = build_owner_pnu(sgg_code, umd_name, jibun)
+        if not pnu:
             print(f"[ERROR] 법정동코드를 찾을 수 없습니다 - 시군구:{sgg_code}, 읍면동:{umd_name}")
             return jsonify({'error': '법정동코드를 찾을 수 없습니다.'}), 404
 
-        # 지번 파싱: "119-3" → 본번 "0119", 부번 "0003"
-        jibun_parts = str(jibun).split('-')
-        bon = jibun_parts[0].strip().zfill(4)
-        bu = jibun_parts[1].strip().zfill(4) if len(jibun_parts) > 1 else '0000'
-
-        # PNU 생성: 시군구코드(5) + 법정동코드(5) + 1 + 본번(4) + 부번(4)
-        pnu = f"{sgg_code}{umd_code}1{bon}{bu}"
-
-        print(f"[DEBUG] 법정동코드: {umd_code}, PNU: {pnu}")
-
-        # 환경에 따라 API key와 domain 파라미터 선택
-        is_production = os.getenv('VERCEL_ENV') == 'production' or os.getenv('ENVIRONMENT') == 'production'
-
-        if is_production:
-            # 배포 환경: 프로덕션 API 키와 도메인 사용
-            api_key = os.getenv('VWORLD_API_KEY_PROD')
-            domain_param = 'http://127.0.0.1'
-        else:
-            # 로컬 환경: 로컬 API 키와 localhost 사용
-            api_key = os.getenv('VWORLD_API_KEY_LOCAL')
-            domain_param = 'http://127.0.0.1'
-
-        if not api_key:
-            env_type = '프로덕션' if is_production else '로컬'
-            return jsonify({'error': f'VWorld API Key({env_type})가 설정되지 않았습니다.'}), 500
-
-        # VWorld API 호출 URL 결정
-        # 프로덕션 환경에서 프록시 URL이 설정되어 있으면 프록시 사용
-        proxy_url = os.getenv('VWORLD_PROXY_URL')
-
-        if is_production and proxy_url:
-            # AWS Lambda 프록시 사용 (Seoul 리전에서 호출)
-            api_url = f"{proxy_url}?pnu={pnu}&key={api_key}&domain={domain_param}"
-            print(f"[DEBUG] Using Lambda proxy: {proxy_url}")
-        else:
-            # VWorld API 직접 호출
-            # VWorld API는 domain 파라미터의 URL 인코딩을 허용하지 않음
-            # URL을 직접 생성하여 인코딩 방지
-            api_url = f"https://api.vworld.kr/ned/data/getPossessionAttr?pnu={pnu}&format=xml&numOfRows=1000&pageNo=1&key={api_key}&domain={domain_param}"
-            print(f"[DEBUG] Calling VWorld API directly")
-
-        # HTTP 헤더 설정 (최소화)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-
-        print(f"[DEBUG] VWorld API 호출 시작 - PNU: {pnu}")
-        print(f"[DEBUG] 요청 URL: {api_url.replace(api_key, f'{api_key[:5]}***')}")
+        print(f"[DEBUG] PNU: {pnu}")
 
-        # 재시도 로직 (최대 3회)
-        max_retries = 3
-        last_error = None
+        # 캐시 조회: 신선하면 그대로, 허용 기간 내면 바로 응답 후 백그라운드 갱신
+        use_cache = owner_cache_available()
+        cached = owner_cache_get(pnu) if use_cache else None
+        body = owner_info_from_cache(pnu, cached)
+        if body is not None:
+            return jsonify(body)
 
-        for attempt in range(max_retries):
-            try:
-                print(f"[DEBUG] VWorld API 시도 {attempt + 1}/{max_retries}")
-
-                # Vercel 10초 제한 내에서 충분한 타임아웃
-                # params를 사용하지 않고 URL을 직접 전달
-                response = requests.get(
-                    api_url,
-                    headers=headers,
-                    timeout=(5, 8)  # connect 5초, read 8초
-                )
+        body, status = fetch_and_cache_owner_info(pnu, cached, use_cache)
+        return jsonify(body), status
 
-                # 실제로 요청한 전체 URL 출력
-                print(f"[DEBUG] 실제 요청 URL: {response.url}")
-
-                # 성공하면 루프 탈출
-                print(f"[DEBUG] VWorld API 응답 성공 (시도 {attempt + 1})")
-                break
-
-            except requests.Timeout as e:
-                last_error = e
-                print(f"[ERROR] VWorld API 타임아웃 (시도 {attempt + 1}): {str(e)}")
-                if attempt == max_retries - 1:
-                    return jsonify({'error': 'VWorld API 응답 시간 초과'}), 504
-                # 재시도 전 대기
-                import time
-                time.sleep(0.5)
-
-            except requests.ConnectionError as e:
-                last_error = e
-                print(f"[ERROR] VWorld API 연결 오류 (시도 {attempt + 1}): {str(e)}")
-                if attempt == max_retries - 1:
-                    # Vercel 환경에서 VWorld API 접근 불가 - 기능 비활성화
-                    return jsonify({
-                        'error': '소유자 정보를 불러올 수 없습니다.',
-                        'message': '현재 서버 환경에서 VWorld API에 접근할 수 없습니다.'
-                    }), 503
-                # 재시도 전 대기
-                import time
-                time.sleep(0.5)
-
-            except requests.RequestException as e:
-                last_error = e
-                print(f"[ERROR] VWorld API 요청 실패 (시도 {attempt + 1}): {str(e)}")
-                if attempt == max_retries - 1:
-                    import traceback
-                    traceback.print_exc()
-                    return jsonify({'error': f'API 요청 실패: {str(e)}'}), 500
-
-        print(f"[DEBUG] VWorld API 응답 상태: {response.status_code}")
-
-        if response.status_code != 200:
-            print(f"[ERROR] VWorld API 호출 실패: {response.status_code}")
-            print(f"[ERROR] 응답 내용: {response.text[:500]}")
-            return jsonify({'error': f'API 호출 실패 (상태코드: {response.status_code})'}), 502
+    except Exception as e:
+        print(f"[ERROR] 소유자 정보 조회 오류: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'소유자 정보 조회 실패: {str(e)}'}), 500
 
-        # XML 파싱
-        try:
-            print(f"[DEBUG] 응답 내용 (처음 300자): {response.content[:300]}")
 
-            root = ET.fromstring(response.content)
+def stream_owner_info_batch(pnu_indexes, invalid_items):
+    """소유자 정보 일괄 조회 스트리밍 (NDJSON): 캐시 응답을 먼저 보내고 나머지는 VWorld 호출이 끝나는 순서대로 전송
 
-            # VWorld API는 <fields><field> 구조로 응답
-            # possessions가 아니라 field 태그를 찾아야 함
-            fields = root.findall('.//field')
+    줄 형식: {"type": "start", ...} → {"type": "result", "pnu", "indexes", "status", ...응답 본문} 반복
+             → {"type": "end", "count": N}
+    indexes: 같은 PNU로 변환된 요청 items의 위치 목록 (중복 주소는 한 번만 조회)
+    """
+    def line(payload):
+        return app.json.dumps(payload) + '\n'
+
+    def result_line(pnu, status, body):
+        return line({'type': 'result', 'pnu': pnu, 'indexes': pnu_indexes[pnu], 'status': status, **body})
+
+    start_time = time.time()
+    use_cache = owner_cache_available()
+    cached_by_pnu = owner_cache_get_many(list(pnu_indexes)) if use_cache else {}
+
+    # 캐시로 응답 가능한 PNU와 VWorld 호출이 필요한 PNU 분리
+    ready = {}
+    pending = []
+    for pnu in pnu_indexes:
+        body = owner_info_from_cache(pnu, cached_by_pnu.get(pnu))
+        if body is not None:
+            ready[pnu] = body
+        else:
+            pending.append(pnu)
+
+    yield line({
+        'type': 'start',
+        'count': len(pnu_indexes),
+        'cached': len(ready),
+        'fetching': len(pending),
+        'invalid': len(invalid_items),
+    })
+
+    for index, status, error in invalid_items:
+        yield line({'type': 'result', 'pnu': None, 'indexes': [index], 'status': status, 'error': error})
+    for pnu, body in ready.items():
+        yield result_line(pnu, 200, body)
+
+    # Lambda 프록시를 쓰면 OWNER_PROXY_BATCH_SIZE개씩 묶어 호출 1회로, 아니면 PNU별로 동시에 호출
+    executor = get_owner_batch_executor()
+    futures = {}
+    if owner_proxy_batch_enabled():
+        for i in range(0, len(pending), OWNER_PROXY_BATCH_SIZE):
+            chunk = pending[i:i + OWNER_PROXY_BATCH_SIZE]
+            futures[executor.submit(fetch_and_cache_owner_infos, chunk, cached_by_pnu, use_cache)] = chunk
+    else:
+        for pnu in pending:
+            future = executor.submit(fetch_and_cache_owner_info, pnu, cached_by_pnu.get(pnu), use_cache)
+            futures[future] = [pnu]
+    try:
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                pnus = futures.pop(future)
+                try:
+                    result = future.result()
+                    results = result if isinstance(result, list) else [(pnus[0], *result)]
+                except Exception as e:
+                    print(f"[ERROR] 소유자 정보 일괄 조회 오류 (PNU: {', '.join(pnus)}): {str(e)}")
+                    results = [(pnu, {'error': f'소유자 정보 조회 실패: {str(e)}'}, 500) for pnu in pnus]
+                for pnu, body, status in results:
+                    yield result_line(pnu, status, body)
+    finally:
+        # 클라이언트 연결이 끊기면 아직 시작하지 않은 호출은 취소
+        for future in futures:
+            future.cancel()
 
-            print(f"[DEBUG] field 태그 개수: {len(fields)}")
+    print(f"[DEBUG] 소유자 정보 일괄 조회: {len(pnu_indexes)}건 (캐시 {len(ready)}건, VWorld {len(pending)}건), "
+          f"소요시간: {time.time() - start_time:.2f}초")
+    yield line({'type': 'end', 'count': len(pnu_indexes) + len(invalid_items)})
 
-            if not fields:
-                print(f"[DEBUG] 소유자 정보 없음")
-                return jsonify({'data': {}, 'message': '소유자 정보가 없습니다.'})
 
-            # 결과 파싱
-            results = []
-            for field in fields:
-                item = {}
-                for child in field:
-                    tag = child.tag
-                    value = child.text or ''
-                    item[tag] = value
-                results.append(item)
-
-            print(f"[DEBUG] 소유자 정보 {len(results)}건 조회 완료")
-
-            # 동·호별로 그룹화
-            grouped_data = {}
-            for item in results:
-                dong_nm = item.get('buldDongNm', '')
-                ho_nm = item.get('buldHoNm', '')
-
-                # 0000이나 빈 값은 무시
-                dong_nm = dong_nm if dong_nm and dong_nm != '0000' else ''
-                ho_nm = ho_nm if ho_nm and ho_nm != '0000' else ''
-
-                # 집합건물인 경우에만 동·호 그룹화, 아니면 전체를 하나의 그룹으로
-                if dong_nm and ho_nm:
-                    key = f"{dong_nm}동 {ho_nm}호"
-                elif dong_nm:
-                    key = f"{dong_nm}동"
-                elif ho_nm:
-                    key = f"{ho_nm}호"
-                else:
-                    key = "토지"
-
-                if key not in grouped_data:
-                    grouped_data[key] = []
-
-                grouped_data[key].append({
-                    'posesnSeCodeNm': item.get('posesnSeCodeNm', '-'),
-                    'resdncSeCodeNm': item.get('resdncSeCodeNm', '-'),
-                    'ownshipChgDe': item.get('ownshipChgDe', '-'),
-                    'ownshipChgCauseCodeNm': item.get('ownshipChgCauseCodeNm', '-'),
-                    'cnrsPsnCo': item.get('cnrsPsnCo', '0'),
-                    'buldDongNm': dong_nm,
-                    'buldHoNm': ho_nm
-                })
+@app.route('/api/owner-info/batch', methods=['POST'])
+def get_owner_info_batch():
+    """소유자 정보 일괄 조회 - 여러 주소를 PNU로 변환/중복 제거 후 NDJSON 스트리밍
 
-            return jsonify({'data': grouped_data})
+    요청: {"items": [{"sgg_code", "umd_name", "jibun"}, ...]}
+    캐시에 있는 PNU는 바로, 나머지는 OWNER_BATCH_MAX_WORKERS개씩 동시에 VWorld 호출해 끝나는 순서대로 전송
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('items') or []
 
-        except ET.ParseError as e:
-            print(f"[ERROR] XML 파싱 오류: {str(e)}")
-            return jsonify({'error': 'API 응답 파싱 실패'}), 500
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return jsonify({'success': False, 'error': 'items는 객체 목록이어야 합니다.'}), 400
+    if len(items) > OWNER_BATCH_MAX_ITEMS:
+        return jsonify({
+            'success': False,
+            'error': f'한 번에 최대 {OWNER_BATCH_MAX_ITEMS}건까지 조회할 수 있습니다.'
+        }), 400
+    if not REGIONS or 'umd' not in REGIONS:
+        print(f"[ERROR] REGIONS 캐시가 초기화되지 않았습니다.")
+        return jsonify({'success': False, 'error': '지역 코드 정보를 불러올 수 없습니다.'}), 500
+
+    # PNU 변환 + 중복 제거 (같은 필지의 여러 거래는 한 번만 조회, 요청 위치는 indexes로 전달)
+    pnu_indexes = {}
+    invalid_items = []
+    for index, item in enumerate(items):
+        sgg_code, umd_name, jibun = item.get('sgg_code'), item.get('umd_name'), item.get('jibun')
+        if not all([sgg_code, umd_name, jibun]):
+            invalid_items.append((index, 400, '필수 파라미터가 누락되었습니다.'))
+            continue
+        pnu = build_owner_pnu(str(sgg_code), umd_name, jibun)
+        if not pnu:
+            invalid_items.append((index, 404, '법정동코드를 찾을 수 없습니다.'))
+            continue
+        pnu_indexes.setdefault(pnu, []).append(index)
 
-    except Exception as e:
-        print(f"[ERROR] 소유자 정보 조회 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': f'소유자 정보 조회 실패: {str(e)}'}), 500
+    response = app.response_class(
+        stream_with_context(stream_owner_info_batch(pnu_indexes, invalid_items)),
+        mimetype='application/x-ndjson'
+    )
+    response.headers['X-Accel-Buffering'] = 'no'  # 프록시(nginx) 버퍼링 없이 바로 전달
+    return response
 
 
 @app.route('/api/fetch-unit-info', methods=['POST'])
@@ -3585,20 +5649,15 @@ def api_fetch_unit_info():
                 'error': '필수 파라미터가 누락되었습니다.'
             }), 400
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        unit_info = fetch_unit_info_for_row(
-            cursor,
-            sgg_code,
-            umd_name,
-            jibun,
-            floor,
-            area
-        )
-
-        cursor.close()
-        conn.close()
+        with get_db_connection() as conn, conn.cursor() as cursor:
+            unit_info = fetch_unit_info_for_row(
+                cursor,
+                sgg_code,
+                umd_name,
+                jibun,
+                floor,
+                area
+            )
 
         return jsonify({
             'success': True,
@@ -3617,5 +5676,20 @@ def api_fetch_unit_info():
         }), 500
 
 
+@app.route('/api/stats', methods=['GET'])
+def api_stats():
+    """운영 지표 조회 (연결 풀, 검색 캐시, LH 인덱스, 가격/호실/소유자 정보 캐시, VWorld 호출 등)"""
+    return jsonify({
+        'success': True,
+        'db_pool': get_db_pool_stats(),
+        'search_cache': get_search_cache_stats(),
+        'lh_index': get_lh_index_stats(),
+        'price_cache': get_price_cache_stats(),
+        'unit_cache': get_unit_cache_stats(),
+        'owner_cache': get_owner_cache_stats(),
+        'vworld': get_vworld_stats()
+    })
+
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
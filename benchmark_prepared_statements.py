@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+검색/모달 쿼리 prepared statement 효과 측정 스크립트
+
+app.py의 실제 쿼리 빌더(build_search_query 등)로 만든 SQL을 같은 연결에서 반복 실행해
+- 일반 실행(매번 parse/plan) vs prepared 실행(첫 실행 후 plan 재사용) 평균 응답 시간
+- EXPLAIN (ANALYZE, SUMMARY)로 측정한 요청당 Planning Time
+- 시군구 개수별 SQL 템플릿 수 (= ANY(%s) 사용 시 1개)
+를 비교 출력
+
+사용법:
+  python benchmark_prepared_statements.py --contract-end 202612 --sgg 11680,11650
+  python benchmark_prepared_statements.py --contract-end 202612 --sgg 11680 --types apt,villa --iterations 100
+"""
+
+import argparse
+import statistics
+import time
+
+import psycopg
+from psycopg.rows import dict_row
+
+from app import (
+    DB_CONFIG,
+    SEARCH_TYPE_ORDER,
+    SEARCH_TYPE_SPECS,
+    build_dagagu_search_query,
+    build_search_query,
+    get_contract_end_tables,
+    parse_contract_end_ym,
+)
+
+
+def build_criteria(contract_end):
+    """api_search와 같은 형식의 검색 조건 (범위 필터 없음)"""
+    contract_end_ym = parse_contract_end_ym(contract_end)
+    return {
+        'lh_only': False,
+        'use_norm': False,
+        'contract_end': contract_end,
+        'contract_end_ym': contract_end_ym,
+        'contract_end_tables': get_contract_end_tables() if contract_end_ym is not None else frozenset(),
+        'umd_names': [],
+        'area_min': None,
+        'area_max': None,
+        'deposit_min': None,
+        'deposit_max': None,
+        'rent_min': None,
+        'rent_max': None,
+        'build_year_min': None,
+        'build_year_max': None,
+    }
+
+
+def build_page_query(source_type, sgg_codes, criteria, page_size):
+    """첫 페이지 검색 쿼리 (fetch_search_rows와 동일한 SQL)"""
+    if source_type == 'dagagu':
+        query, params = build_dagagu_search_query(sgg_codes, criteria)
+    else:
+        query, params = build_search_query(source_type, sgg_codes, criteria)
+    query += " LIMIT %s OFFSET %s"
+    params.extend([page_size, 0])
+    return query, params
+
+
+def time_executions(conn, query, params, iterations, prepare):
+    """같은 연결에서 반복 실행한 응답 시간 목록 (ms)"""
+    timings = []
+    with conn.cursor() as cursor:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            cursor.execute(query, params, prepare=prepare)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def planning_time(conn, query, params, iterations):
+    """EXPLAIN (ANALYZE, SUMMARY)의 Planning Time 평균 (ms) - prepare 없이 매번 계획하는 비용"""
+    samples = []
+    with conn.cursor() as cursor:
+        for _ in range(iterations):
+            cursor.execute(f"EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) {query}", params, prepare=False)
+            plan = cursor.fetchone()['QUERY PLAN'][0]
+            samples.append(plan['Planning Time'])
+    return statistics.mean(samples)
+
+
+def count_templates(source_type, sgg_codes, criteria, page_size):
+    """시군구 1~N개 선택 시 만들어지는 서로 다른 SQL 문자열 수"""
+    texts = set()
+    for n in range(1, len(sgg_codes) + 1):
+        query, _ = build_page_query(source_type, sgg_codes[:n], criteria, page_size)
+        texts.add(query)
+    return len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='검색 쿼리 prepared statement 벤치마크')
+    parser.add_argument('--contract-end', required=True, help='계약만기시기 (YYYYMM)')
+    parser.add_argument('--sgg', required=True, help='시군구코드 목록 (쉼표 구분)')
+    parser.add_argument('--types', default=','.join(SEARCH_TYPE_ORDER), help='주택 유형 (apt,villa,officetel,dagagu)')
+    parser.add_argument('--iterations', type=int, default=50, help='유형별 반복 횟수')
+    parser.add_argument('--page-size', type=int, default=50, help='페이지 크기')
+    args = parser.parse_args()
+
+    sgg_codes = [code.strip() for code in args.sgg.split(',') if code.strip()]
+    source_types = [t.strip() for t in args.types.split(',') if t.strip() in SEARCH_TYPE_SPECS]
+    criteria = build_criteria(args.contract_end)
+
+    print("=" * 70)
+    print(f"계약만기: {args.contract_end}, 시군구 {len(sgg_codes)}개, 반복 {args.iterations}회")
+    print("=" * 70)
+
+    with psycopg.connect(**DB_CONFIG, row_factory=dict_row, autocommit=True) as conn:
+        for source_type in source_types:
+            query, params = build_page_query(source_type, sgg_codes, criteria, args.page_size)
+
+            # 워밍업 (버퍼 캐시 영향 제거)
+            time_executions(conn, query, params, 3, prepare=False)
+
+            plain = time_executions(conn, query, params, args.iterations, prepare=False)
+            prepared = time_executions(conn, query, params, args.iterations, prepare=True)
+            plan_ms = planning_time(conn, query, params, min(args.iterations, 20))
+
+            plain_avg = statistics.mean(plain)
+            prepared_avg = statistics.mean(prepared[1:]) if len(prepared) > 1 else prepared[0]
+
+            print(f"\n[{SEARCH_TYPE_SPECS[source_type]['label']}]")
+            print(f"  SQL 템플릿 수 (시군구 1~{len(sgg_codes)}개): {count_templates(source_type, sgg_codes, criteria, args.page_size)}")
+            print(f"  Planning Time (EXPLAIN 평균): {plan_ms:.2f}ms")
+            print(f"  일반 실행   평균 {plain_avg:.2f}ms / 중앙값 {statistics.median(plain):.2f}ms")
+            print(f"  prepared   첫 실행 {prepared[0]:.2f}ms, 이후 평균 {prepared_avg:.2f}ms / 중앙값 {statistics.median(prepared[1:] or prepared):.2f}ms")
+            print(f"  요청당 절감: {plain_avg - prepared_avg:.2f}ms")
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
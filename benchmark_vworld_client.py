@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+VWorld 클라이언트(vworld_client.VWorldClient) 동작/효과 측정 스크립트
+
+로컬에 가짜 VWorld 서버(getPossessionAttr XML 응답, 지연/장애 주입)를 띄우고
+- 기존 방식 (시도마다 requests.get 새 연결, 고정 0.5초 대기 후 최대 3회 재시도)
+- VWorldClient (연결 풀 재사용, 지수 백오프 + jitter, 서킷 브레이커)
+를 같은 시나리오로 실행해 비교 출력
+
+시나리오:
+1. 정상: 순차 N회 호출 → 평균 응답 시간, 서버가 받은 TCP 연결 수 (keep-alive 재사용 확인)
+2. 장애: 서버가 응답 없이 연결을 끊음 → 호출당 소요 시간 (서킷이 열린 뒤 즉시 실패하는지)
+3. 복구: 장애 후 서버 정상화 → reset_timeout 경과 후 시험 호출로 서킷이 닫히는지
+4. (--proxy) Lambda 프록시(lambda/vworld_proxy.py): 같은 PNU N개를 pnu= 단건 N회 vs pnus= 다건 1회로
+   핸들러를 직접 호출해 소요 시간/응답 크기 비교, 다건 응답(gzip JSON)이 단건 XML 파싱 결과와 같은지 확인
+
+사용법:
+  python benchmark_vworld_client.py
+  python benchmark_vworld_client.py --calls 50 --latency-ms 20 --outage-calls 20 --reset-seconds 2
+  python benchmark_vworld_client.py --proxy --proxy-pnus 50
+"""
+
+import argparse
+import base64
+import gzip
+import importlib.util
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from vworld_client import VWorldClient, VWorldError, VWorldCircuitOpen
+
+FAKE_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<response><fields>
+<field><buldDongNm>101</buldDongNm><buldHoNm>501</buldHoNm><posesnSeCodeNm>\xea\xb0\x9c\xec\x9d\xb8</posesnSeCodeNm>
+<resdncSeCodeNm>-</resdncSeCodeNm><ownshipChgDe>2020-01-01</ownshipChgDe><ownshipChgCauseCodeNm>-</ownshipChgCauseCodeNm><cnrsPsnCo>1</cnrsPsnCo></field>
+</fields></response>"""
+
+
+# ============ 가짜 VWorld 서버 ============
+
+class FakeVWorldState:
+    """가짜 서버 설정/관측값 (핸들러 스레드 간 공유)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.drop = False  # True면 응답 없이 연결 종료 (VWorld 장애 재현)
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.requests = 0
+
+    def reset_counts(self):
+        with self.lock:
+            self.connections = set()
+            self.requests = 0
+
+
+def make_handler(state):
+    class FakeVWorldHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive 허용
+        disable_nagle_algorithm = True  # 헤더/본문 분리 전송 시 Nagle + delayed ACK 지연 방지
+
+        def do_GET(self):
+            with state.lock:
+                state.connections.add(self.client_address)
+                state.requests += 1
+            time.sleep(state.latency)
+
+            if state.drop:
+                self.close_connection = True
+                return
+
+            body = FAKE_XML
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/xml; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeVWorldHandler
+
+
+def start_fake_vworld(latency):
+    """127.0.0.1 임의 포트에서 가짜 VWorld 서버 시작 → (서버, 상태, base URL)"""
+    state = FakeVWorldState(latency)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ============ 비교 대상 ============
+
+def legacy_get(url):
+    """기존 app.py 방식: 시도마다 새 연결, 예외 시 0.5초 대기 후 최대 3회"""
+    for attempt in range(3):
+        try:
+            return requests.get(url, timeout=(5, 8))
+        except requests.RequestException:
+            if attempt == 2:
+                raise
+            time.sleep(0.5)
+
+
+def time_calls(func, url, calls):
+    """호출마다 소요 시간 (ms)과 실패 횟수"""
+    timings = []
+    failures = 0
+    for _ in range(calls):
+        start = time.perf_counter()
+        try:
+            response = func(url)
+            if response.status_code != 200:
+                failures += 1
+        except (requests.RequestException, VWorldError):
+            failures += 1
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, failures
+
+
+def print_result(label, timings, failures, state=None):
+    line = f"  {label:<14} 평균 {statistics.mean(timings):7.1f}ms / 중앙값 {statistics.median(timings):7.1f}ms / 실패 {failures}건"
+    if state is not None:
+        line += f" / 서버 요청 {state.requests}회, TCP 연결 {len(state.connections)}개"
+    print(line)
+
+
+def load_lambda_proxy(base_url):
+    """lambda/vworld_proxy.py를 가짜 VWorld 서버 주소로 로드 (lambda는 예약어라 패키지 import 불가)"""
+    os.environ['VWORLD_API_BASE_URL'] = base_url
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda', 'vworld_proxy.py')
+    spec = importlib.util.spec_from_file_location('vworld_proxy', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_proxy_scenario(base_url, pnu_count):
+    """Lambda 핸들러 단건 N회 vs 다건 1회 (리전 간 왕복 횟수 = 호출 횟수)"""
+    proxy = load_lambda_proxy(base_url)
+    pnus = [f"11680101001{i:04d}0000" for i in range(1, pnu_count + 1)]
+
+    start = time.perf_counter()
+    single_bytes = 0
+    single_results = {}
+    for pnu in pnus:
+        result = proxy.lambda_handler({'queryStringParameters': {'pnu': pnu, 'key': 'test', 'domain': 'http://127.0.0.1'}}, None)
+        single_bytes += len(result['body'].encode('utf-8'))
+        single_results[pnu] = proxy.parse_possession_xml(result['body'].encode('utf-8'))
+    single_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    result = proxy.lambda_handler({
+        'queryStringParameters': {'pnus': ','.join(pnus), 'key': 'test', 'domain': 'http://127.0.0.1'},
+        'headers': {'accept-encoding': 'gzip, deflate'},
+    }, None)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    if result.get('isBase64Encoded'):
+        batch_bytes = len(result['body'])
+        payload = json.loads(gzip.decompress(base64.b64decode(result['body'])))
+    else:
+        batch_bytes = len(result['body'].encode('utf-8'))
+        payload = json.loads(result['body'])
+    batch_results = {pnu: item['data'] for pnu, item in payload['results'].items() if item['status'] == 200}
+
+    print(f"  단건 {pnu_count}회     {single_ms:8.1f}ms / 응답 합계 {single_bytes:,} bytes (XML)")
+    print(f"  다건 1회       {batch_ms:8.1f}ms / 응답 {batch_bytes:,} bytes "
+          f"({result['headers'].get('Content-Encoding', '비압축')} JSON, base64 포함)")
+    print(f"  결과 일치: {batch_results == single_results} ({len(batch_results)}/{pnu_count}건 성공)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='VWorld 클라이언트 벤치마크 (로컬 가짜 VWorld 서버)')
+    parser.add_argument('--calls', type=int, default=30, help='정상 시나리오 호출 수')
+    parser.add_argument('--latency-ms', type=float, default=10, help='가짜 서버 응답 지연 (ms)')
+    parser.add_argument('--outage-calls', type=int, default=10, help='장애 시나리오 호출 수')
+    parser.add_argument('--reset-seconds', type=float, default=1.0, help='서킷 브레이커 reset_timeout (초)')
+    parser.add_argument('--proxy', action='store_true', help='Lambda 프록시 단건/다건 비교 시나리오 실행')
+    parser.add_argument('--proxy-pnus', type=int, default=30, help='Lambda 프록시 시나리오 PNU 수')
+    args = parser.parse_args()
+
+    server, state, base_url = start_fake_vworld(args.latency_ms / 1000)
+    url = f"{base_url}/ned/data/getPossessionAttr?pnu=1168010100101230004&format=xml&numOfRows=1000&pageNo=1&key=test&domain=http://127.0.0.1"
+    client = VWorldClient(failure_threshold=5, reset_timeout=args.reset_seconds, backoff_base=0.05, backoff_max=0.2)
+
+    print("=" * 78)
+    print(f"1. 정상 응답 {args.calls}회 (가짜 서버 지연 {args.latency_ms:.0f}ms)")
+    print("=" * 78)
+    state.reset_counts()
+    timings, failures = time_calls(legacy_get, url, args.calls)
+    print_result("기존 방식", timings, failures, state)
+    state.reset_counts()
+    timings, failures = time_calls(client.get, url, args.calls)
+    print_result("VWorldClient", timings, failures, state)
+
+    print("=" * 78)
+    print(f"2. 장애 (응답 없이 연결 종료) {args.outage_calls}회")
+    print("=" * 78)
+    state.drop = True
+    state.reset_counts()
+    timings, failures = time_calls(legacy_get, url, args.outage_calls)
+    print_result("기존 방식", timings, failures, state)
+    state.reset_counts()
+    timings, failures = time_calls(client.get, url, args.outage_calls)
+    print_result("VWorldClient", timings, failures, state)
+    print(f"  서킷 상태: {client.breaker.get_stats()['state']}, 즉시 실패 {client.get_stats()['rejected_open']}건")
+
+    print("=" * 78)
+    print(f"3. 복구 (서버 정상화, {args.reset_seconds:.1f}초 후 시험 호출)")
+    print("=" * 78)
+    state.drop = False
+    try:
+        client.get(url)
+        print("  reset_timeout 전 호출: 성공 (예상과 다름)")
+    except VWorldCircuitOpen as e:
+        print(f"  reset_timeout 전 호출: 즉시 실패 ({e})")
+    time.sleep(args.reset_seconds)
+    response = client.get(url)
+    print(f"  reset_timeout 후 호출: 상태 {response.status_code}, 서킷 {client.breaker.get_stats()['state']}")
+
+    stats = client.get_stats()
+    print("=" * 78)
+    print(f"VWorldClient 지표: 호출 {stats['calls']}, 성공 {stats['successes']}, 시도 {stats['attempts']}, "
+          f"재시도 {stats['retries']}, 연결 오류 {stats['connection_errors']}, 서킷 열림 {stats['circuit']['opens']}회")
+    print(f"  시도별 응답 시간: {stats['latency_ms']}")
+
+    if args.proxy:
+        print("=" * 78)
+        print(f"4. Lambda 프록시 PNU {args.proxy_pnus}개 (가짜 서버 지연 {args.latency_ms:.0f}ms)")
+        print("=" * 78)
+        run_proxy_scenario(base_url, args.proxy_pnus)
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
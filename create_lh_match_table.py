@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+LH 전세임대 ↔ 전월세 실거래 매칭 결과 테이블(lh_rent_matches) 생성/갱신 스크립트
+
+LH 필터 검색(lh_only)은 원본 테이블과 lh_rent_transactions를
+면적(::numeric)/계약일(::text)/보증금(CAST(REPLACE(...)) * 10000) 표현식으로 JOIN 해야 해서
+인덱스를 쓸 수 없고 페이지네이션도 할 수 없었음
+→ 매칭 결과(유형, 원본 키, 방 수/지원금/입주자 유형)를 미리 계산해 두고
+  검색은 (property_type, source_key) PK로 조인 + 일반 검색과 같은 키셋 페이지네이션 사용
+
+갱신 방식:
+- 유형별로 원본 테이블/LH 테이블의 변경 워터마크(pg_stat_user_tables 누적 변경 건수)를 저장
+- 어느 한쪽이라도 바뀐 유형만 매칭을 다시 계산해 차이만 반영 (삭제된 매칭 DELETE, 새/변경 매칭 UPSERT)
+- 갱신 중에도 테이블이 비지 않으므로 서비스 중 실행 가능
+
+사용법:
+  python create_lh_match_table.py          # 변경된 유형만 갱신
+  python create_lh_match_table.py --full   # 워터마크와 관계없이 모든 유형 다시 계산
+  python create_lh_match_table.py --yes    # 확인 없이 실행 (cron 등)
+"""
+
+import os
+import sys
+import argparse
+import psycopg
+from dotenv import load_dotenv
+import time
+
+# .env 파일 로드
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('PG_HOST'),
+    'dbname': os.getenv('PG_DB'),
+    'user': os.getenv('PG_USER'),
+    'password': os.getenv('PG_PASSWORD'),
+    'port': os.getenv('PG_PORT'),
+    'connect_timeout': 30
+}
+
+MATCH_TABLE = 'lh_rent_matches'
+META_TABLE = 'lh_rent_matches_meta'
+LH_TABLE = 'lh_rent_transactions'
+
+# LH 컬럼 타입은 lh_rent_transactions와 동일하게 유지 (빈 결과로 테이블 구조만 복사)
+CREATE_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {MATCH_TABLE} AS
+    SELECT
+        ''::text as property_type,                 -- apt / villa / officetel / dagagu
+        ''::text COLLATE "C" as source_key,        -- 원본 unique_key (단독다가구는 id)
+        lh.room_count,
+        lh.jeonse_support_amount,
+        lh.housing_type
+    FROM {LH_TABLE} lh
+    WITH NO DATA
+"""
+
+CREATE_META_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {META_TABLE} (
+        property_type   text PRIMARY KEY,
+        rent_watermark  bigint NOT NULL,
+        lh_watermark    bigint NOT NULL,
+        match_count     integer NOT NULL DEFAULT 0,
+        refreshed_at    timestamptz NOT NULL DEFAULT now()
+    )
+"""
+
+# 유형별 원본 테이블, 원본 키 컬럼
+SOURCE_TABLES = {
+    'apt': ('apt_rent_transactions', 'unique_key'),
+    'villa': ('villa_rent_transactions', 'unique_key'),
+    'officetel': ('officetel_rent_transactions', 'unique_key'),
+    'dagagu': ('dagagu_rent_transactions', 'id'),
+}
+
+# 유형별 LH house_subtype 목록 (app.py SEARCH_TYPE_SPECS의 lh_house_types와 동일, NULL은 모든 유형에 매칭)
+LH_OTHER_HOUSE_TYPES = ['기숙사및특수사회시설', '기타', '비거주용건물내주택', '점포주택등복합용도주택']
+LH_HOUSE_TYPES = {
+    'apt': ['아파트'] + LH_OTHER_HOUSE_TYPES,
+    'villa': ['연립주택', '다세대주택', '도시형생활주택'] + LH_OTHER_HOUSE_TYPES,
+    'officetel': ['오피스텔'] + LH_OTHER_HOUSE_TYPES,
+    'dagagu': ['다가구용단독주택', '다중주택', '단독주택'] + LH_OTHER_HOUSE_TYPES,
+}
+
+
+def sql_deposit_won(expr):
+    """보증금(만원, 쉼표/공백 포함 텍스트) → 원 단위 정수 (숫자가 없으면 NULL)"""
+    return f"NULLIF(REGEXP_REPLACE(({expr})::text, '[^0-9]', '', 'g'), '')::bigint * 10000"
+
+
+def build_match_select(property_type, col_names=None):
+    """유형 하나의 LH 매칭 SELECT (app.py의 LH 테이블 JOIN 조건과 동일, 원본 행당 1건)"""
+    table, key_col = SOURCE_TABLES[property_type]
+
+    if property_type == 'dagagu':
+        # 단독다가구는 컬럼명이 한글이라 인덱스로 접근 (8:전용면적, 10:계약년월, 11:계약일, 12:보증금)
+        c = lambda i: f'r."{col_names[i]}"'
+        join_condition = f"""
+            lh.sggcd = r.sggcd
+            AND lh.exclusive_area::numeric = {c(8)}::numeric
+            AND lh.dealyear::text = SPLIT_PART({c(10)}::text, '.', 1)
+            AND lh.dealmonth::text = SPLIT_PART({c(10)}::text, '.', 2)
+            AND lh.dealday::text = {c(11)}::text
+            AND ROUND(lh.jeonse_amount) = {sql_deposit_won(c(12))}"""
+    else:
+        join_condition = f"""
+            lh.sggcd = r.sggcd
+            AND lh.exclusive_area::numeric = r.excluusear::numeric
+            AND lh.dealyear::text = r.dealyear::text
+            AND lh.dealmonth::text = r.dealmonth::text
+            AND lh.dealday::text = r.dealday::text
+            AND ROUND(lh.jeonse_amount) = {sql_deposit_won('r.deposit')}"""
+
+    # 같은 원본 행에 LH 행이 여러 건 매칭되면 1건만 사용
+    return f"""
+        SELECT DISTINCT ON (r.{key_col}::text)
+            '{property_type}'::text as property_type,
+            r.{key_col}::text as source_key,
+            lh.room_count,
+            lh.jeonse_support_amount,
+            lh.housing_type
+        FROM {LH_TABLE} lh
+        JOIN {table} r ON {join_condition}
+        WHERE lh.house_subtype = ANY(%s) OR lh.house_subtype IS NULL
+        ORDER BY r.{key_col}::text
+    """
+
+
+def get_table_watermark(cursor, table):
+    """테이블 변경 워터마크 (누적 INSERT/UPDATE/DELETE 건수)"""
+    cursor.execute("""
+        SELECT COALESCE(SUM(n_tup_ins + n_tup_upd + n_tup_del), 0)::bigint
+        FROM pg_stat_user_tables
+        WHERE relname = %s
+    """, (table,))
+    return cursor.fetchone()[0]
+
+
+def refresh_property_type(cursor, property_type, lh_watermark, full=False):
+    """유형 하나 갱신: 워터마크가 바뀐 경우만 매칭을 다시 계산해 차이 반영"""
+    table, _ = SOURCE_TABLES[property_type]
+    rent_watermark = get_table_watermark(cursor, table)
+
+    cursor.execute(
+        f"SELECT rent_watermark, lh_watermark FROM {META_TABLE} WHERE property_type = %s",
+        (property_type,)
+    )
+    saved = cursor.fetchone()
+    if not full and saved == (rent_watermark, lh_watermark):
+        print("  [SKIP] 원본/LH 테이블 변경 없음")
+        return
+
+    col_names = None
+    if property_type == 'dagagu':
+        cursor.execute("SELECT * FROM dagagu_rent_transactions LIMIT 0")
+        col_names = [desc[0] for desc in cursor.description]
+
+    # 새 매칭 결과를 임시 테이블에 계산
+    cursor.execute("DROP TABLE IF EXISTS tmp_lh_matches")
+    cursor.execute(
+        f"CREATE TEMP TABLE tmp_lh_matches ON COMMIT DROP AS {build_match_select(property_type, col_names)}",
+        (LH_HOUSE_TYPES[property_type],)
+    )
+    cursor.execute("CREATE INDEX ON tmp_lh_matches (source_key)")
+    cursor.execute("ANALYZE tmp_lh_matches")
+
+    # 더 이상 매칭되지 않는 행 삭제
+    cursor.execute(f"""
+        DELETE FROM {MATCH_TABLE} m
+        WHERE m.property_type = %s
+          AND NOT EXISTS (SELECT 1 FROM tmp_lh_matches t WHERE t.source_key = m.source_key)
+    """, (property_type,))
+    print(f"  [OK] 매칭 해제 {cursor.rowcount:,}건 삭제")
+
+    # 새 매칭 추가 / LH 정보가 바뀐 매칭 갱신
+    cursor.execute(f"""
+        INSERT INTO {MATCH_TABLE} (property_type, source_key, room_count, jeonse_support_amount, housing_type)
+        SELECT property_type, source_key, room_count, jeonse_support_amount, housing_type
+        FROM tmp_lh_matches
+        ON CONFLICT (property_type, source_key) DO UPDATE SET
+            room_count = EXCLUDED.room_count,
+            jeonse_support_amount = EXCLUDED.jeonse_support_amount,
+            housing_type = EXCLUDED.housing_type
+        WHERE ({MATCH_TABLE}.room_count, {MATCH_TABLE}.jeonse_support_amount, {MATCH_TABLE}.housing_type)
+              IS DISTINCT FROM (EXCLUDED.room_count, EXCLUDED.jeonse_support_amount, EXCLUDED.housing_type)
+    """)
+    print(f"  [OK] 매칭 {cursor.rowcount:,}건 추가/갱신")
+
+    cursor.execute("SELECT COUNT(*) FROM tmp_lh_matches")
+    match_count = cursor.fetchone()[0]
+
+    cursor.execute(f"""
+        INSERT INTO {META_TABLE} (property_type, rent_watermark, lh_watermark, match_count, refreshed_at)
+        VALUES (%s, %s, %s, %s, now())
+        ON CONFLICT (property_type) DO UPDATE SET
+            rent_watermark = EXCLUDED.rent_watermark,
+            lh_watermark = EXCLUDED.lh_watermark,
+            match_count = EXCLUDED.match_count,
+            refreshed_at = EXCLUDED.refreshed_at
+    """, (property_type, rent_watermark, lh_watermark, match_count))
+    print(f"  현재 매칭: {match_count:,}건")
+
+
+def create_lh_match_table(full=False):
+    """매칭 테이블 생성 + 유형별 갱신 + 통계"""
+    print("데이터베이스 연결 중...")
+    conn = psycopg.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"SELECT to_regclass('{MATCH_TABLE}') IS NOT NULL")
+        exists = cursor.fetchone()[0]
+        if not exists:
+            cursor.execute(CREATE_TABLE_SQL)
+            cursor.execute(f"ALTER TABLE {MATCH_TABLE} ADD PRIMARY KEY (property_type, source_key)")
+        cursor.execute(CREATE_META_SQL)
+        conn.commit()
+        print(f"[OK] {MATCH_TABLE} 테이블 확인")
+
+        lh_watermark = get_table_watermark(cursor, LH_TABLE)
+
+        for property_type in SOURCE_TABLES:
+            print(f"\n{'='*60}")
+            print(f"유형: {property_type} ({SOURCE_TABLES[property_type][0]})")
+            print(f"{'='*60}")
+            start_time = time.time()
+            try:
+                # 유형별로 커밋 (중간 실패 시 이전 유형 결과는 유지)
+                refresh_property_type(cursor, property_type, lh_watermark, full=full)
+                conn.commit()
+                print(f"  소요 시간: {time.time() - start_time:.1f}초")
+            except Exception as e:
+                conn.rollback()
+                print(f"  [ERROR] 갱신 실패: {e}")
+
+        print(f"\n{MATCH_TABLE} 테이블 통계 업데이트 중...")
+        cursor.execute(f"ANALYZE {MATCH_TABLE}")
+        conn.commit()
+
+        cursor.execute(f"SELECT property_type, COUNT(*) FROM {MATCH_TABLE} GROUP BY property_type ORDER BY property_type")
+        print("\n유형별 매칭 건수:")
+        for property_type, count in cursor.fetchall():
+            print(f"  - {property_type}: {count:,}건")
+
+        print("\n" + "="*60)
+        print("LH 매칭 테이블 갱신이 완료되었습니다!")
+        print("="*60)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n오류 발생: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='LH 전세임대 매칭 결과 테이블 생성/갱신')
+    parser.add_argument('--full', action='store_true', help='변경 여부와 관계없이 모든 유형 다시 계산')
+    parser.add_argument('--yes', action='store_true', help='확인 없이 실행')
+    args = parser.parse_args()
+
+    print("="*60)
+    print(f"LH 매칭 결과 테이블 ({MATCH_TABLE}) {'전체 재계산' if args.full else '변경분 갱신'}")
+    print("="*60)
+    print(f"\nLH 테이블: {LH_TABLE}")
+    print("원본 테이블:")
+    print("  - apt_rent_transactions (아파트)")
+    print("  - villa_rent_transactions (연립다세대)")
+    print("  - officetel_rent_transactions (오피스텔)")
+    print("  - dagagu_rent_transactions (단독다가구)")
+    print("\n원본/LH 데이터 적재 후 실행해야 LH 필터 검색 결과에 반영됩니다.")
+
+    if not args.yes:
+        response = input("\n계속하시겠습니까? (y/n): ")
+        if response.lower() != 'y':
+            print("취소되었습니다.")
+            sys.exit(0)
+
+    print()
+    create_lh_match_table(full=args.full)
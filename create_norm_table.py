@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+통합 전월세 정규화 테이블(rent_transactions_norm) 생성/갱신 스크립트
+
+4개 원본 테이블(apt/villa/officetel/dagagu_rent_transactions)을 하나의 타입 지정 테이블로 통합
+- 보증금/월세: 정수(만원), 전용면적: numeric, 건축년도: 정수
+- 계약만기(contract_end_ym): YY.MM(아파트/연립다세대/오피스텔)과 YYYYMM(단독다가구) 형식을 YYYYMM 정수로 통합
+- 계약일(deal_date): 실제 date 타입
+→ /api/search 필터가 CAST/REPLACE/SPLIT_PART 없이 복합 B-tree 인덱스를 그대로 사용
+
+사용법:
+  python create_norm_table.py          # 증분 갱신 (새 원본 행 추가 + 값이 바뀐 원본 행 다시 정규화)
+  python create_norm_table.py --full   # 전체 재생성 (유형별 삭제 후 다시 적재)
+  python create_norm_table.py --prune  # 증분 갱신 + 원본에서 삭제된 행 정리
+  python create_norm_table.py --yes    # 확인 없이 실행 (cron 등)
+"""
+
+import os
+import sys
+import argparse
+import psycopg
+from dotenv import load_dotenv
+import time
+
+# .env 파일 로드
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('PG_HOST'),
+    'dbname': os.getenv('PG_DB'),
+    'user': os.getenv('PG_USER'),
+    'password': os.getenv('PG_PASSWORD'),
+    'port': os.getenv('PG_PORT'),
+    'connect_timeout': 30
+}
+
+NORM_TABLE = 'rent_transactions_norm'
+
+CREATE_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {NORM_TABLE} (
+        property_type    text NOT NULL,              -- apt / villa / officetel / dagagu
+        source_key       text COLLATE "C" NOT NULL,  -- 원본 unique_key (단독다가구는 id)
+        sggcd            text NOT NULL,
+        umdnm            text,
+        jibun            text,
+        building_name    text,
+        exclusive_area   numeric,
+        floor            text,                       -- 단독다가구는 '-'
+        build_year       integer,
+        deal_ym          integer NOT NULL DEFAULT 0, -- YYYYMM
+        deal_day         integer NOT NULL DEFAULT 0,
+        deal_date        date,
+        deposit          integer,                    -- 만원
+        monthly_rent     integer,                    -- 만원
+        contract_type    text,
+        contract_term    text,                       -- 원본 계약기간 문자열 (표시용)
+        contract_end_ym  integer,                    -- YYYYMM
+        renewal_right    text,
+        pre_deposit      text,
+        pre_monthly_rent text,
+        refreshed_at     timestamptz NOT NULL DEFAULT now(),
+        PRIMARY KEY (property_type, source_key)
+    )
+"""
+
+# 검색 쿼리용 인덱스 (이름, 컬럼, 설명)
+NORM_INDEXES = [
+    ('idx_rent_norm_search',
+     '(contract_end_ym, property_type, sggcd, deal_ym DESC, deal_day DESC, source_key DESC)',
+     '계약만기 + 유형 + 시군구 + 최신순 (검색/키셋 페이지네이션)'),
+    ('idx_rent_norm_umd',
+     '(contract_end_ym, sggcd, umdnm)',
+     '계약만기 + 시군구 + 읍면동 (읍면동 필터)'),
+    ('idx_rent_norm_deal_date',
+     '(sggcd, deal_date DESC)',
+     '시군구 + 계약일 (기간 조회)'),
+]
+
+
+# ============ 원본 텍스트 → 타입 변환 SQL ============
+
+def sql_int(expr):
+    """숫자 이외 문자(쉼표/공백 등) 제거 후 정수 변환 (빈 값은 NULL)"""
+    return f"NULLIF(REGEXP_REPLACE(({expr})::text, '[^0-9]', '', 'g'), '')::integer"
+
+
+def sql_numeric(expr):
+    """숫자 형식일 때만 numeric 변환"""
+    return f"""CASE WHEN TRIM(({expr})::text) ~ '^[0-9]+(\\.[0-9]+)?$' THEN TRIM(({expr})::text)::numeric END"""
+
+
+def sql_build_year(expr):
+    """건축년도 (소수점 제거, 1800~2200 범위만 인정 - 단독다가구 특수 처리와 동일)"""
+    return f"""CASE
+        WHEN TRIM(({expr})::text) ~ '^[0-9]+(\\.[0-9]+)?$'
+             AND TRIM(({expr})::text)::numeric BETWEEN 1800 AND 2200
+        THEN TRIM(({expr})::text)::numeric::integer
+    END"""
+
+
+def sql_contract_end_ym(expr):
+    """계약기간의 만기 부분 → YYYYMM 정수 (25.12 → 202512, 202512 → 202512)"""
+    end_part = f"TRIM(SPLIT_PART(({expr})::text, '~', 2))"
+    return f"""CASE
+        WHEN {end_part} ~ '^[0-9]{{2}}\\.[0-9]{{2}}$' THEN 200000 + REPLACE({end_part}, '.', '')::integer
+        WHEN {end_part} ~ '^[0-9]{{6}}$' THEN {end_part}::integer
+    END"""
+
+
+def sql_dagagu_deal_ym(expr):
+    """단독다가구 계약년월 → YYYYMM 정수 (YYYYMM, YYYY.MM 형식 모두 처리)"""
+    value = f"TRIM(({expr})::text)"
+    return f"""CASE
+        WHEN {value} ~ '^[0-9]{{6}}$' THEN {value}::integer
+        WHEN {value} ~ '^[0-9]{{4}}\\.[0-9]{{1,2}}$' THEN SPLIT_PART({value}, '.', 1)::integer * 100 + SPLIT_PART({value}, '.', 2)::integer
+    END"""
+
+
+def build_source_select(property_type, col_names=None):
+    """원본 테이블 → 정규화 컬럼 SELECT (deal_date 계산 전 단계)"""
+    if property_type == 'dagagu':
+        # 단독다가구는 컬럼명이 한글이라 인덱스로 접근 (README 컬럼 구조 참고)
+        # 8:전용면적, 10:계약년월, 11:계약일, 12:보증금, 13:월세, 14:건축년도, 15:건물명
+        # 16:계약기간, 17:계약구분, 18:갱신요구권사용, 19:종전계약보증금, 20:종전계약월세
+        c = lambda i: f'r."{col_names[i]}"'
+        return f"""
+            SELECT
+                'dagagu' as property_type,
+                r.id::text as source_key,
+                r.sggcd::text as sggcd,
+                r.umdnm as umdnm,
+                r.jibun::text as jibun,
+                {c(15)}::text as building_name,
+                {sql_numeric(c(8))} as exclusive_area,
+                '-' as floor,
+                {sql_build_year(c(14))} as build_year,
+                COALESCE({sql_dagagu_deal_ym(c(10))}, 0) as deal_ym,
+                COALESCE({sql_int(c(11))}, 0) as deal_day,
+                {sql_int(c(12))} as deposit,
+                {sql_int(c(13))} as monthly_rent,
+                {c(17)}::text as contract_type,
+                {c(16)}::text as contract_term,
+                {sql_contract_end_ym(c(16))} as contract_end_ym,
+                {c(18)}::text as renewal_right,
+                {c(19)}::text as pre_deposit,
+                {c(20)}::text as pre_monthly_rent
+            FROM dagagu_rent_transactions r
+        """
+
+    table, name_col = {
+        'apt': ('apt_rent_transactions', 'aptnm'),
+        'villa': ('villa_rent_transactions', 'mhousenm'),
+        'officetel': ('officetel_rent_transactions', 'offinm'),
+    }[property_type]
+    return f"""
+        SELECT
+            '{property_type}' as property_type,
+            r.unique_key::text as source_key,
+            r.sggcd::text as sggcd,
+            r.umdnm as umdnm,
+            r.jibun::text as jibun,
+            r.{name_col}::text as building_name,
+            {sql_numeric('r.excluusear')} as exclusive_area,
+            r.floor::text as floor,
+            {sql_build_year('r.buildyear')} as build_year,
+            COALESCE({sql_int('r.dealyear')} * 100 + {sql_int('r.dealmonth')}, 0) as deal_ym,
+            COALESCE({sql_int('r.dealday')}, 0) as deal_day,
+            {sql_int('r.deposit')} as deposit,
+            {sql_int('r.monthlyrent')} as monthly_rent,
+            r.contracttype::text as contract_type,
+            r.contractterm::text as contract_term,
+            {sql_contract_end_ym('r.contractterm')} as contract_end_ym,
+            r.userrright::text as renewal_right,
+            r.predeposit::text as pre_deposit,
+            r.premonthlyrent::text as pre_monthly_rent
+        FROM {table} r
+    """
+
+
+SOURCE_TABLES = {
+    'apt': ('apt_rent_transactions', 'unique_key'),
+    'villa': ('villa_rent_transactions', 'unique_key'),
+    'officetel': ('officetel_rent_transactions', 'unique_key'),
+    'dagagu': ('dagagu_rent_transactions', 'id'),
+}
+
+NORM_COLUMNS = [
+    'property_type', 'source_key', 'sggcd', 'umdnm', 'jibun', 'building_name',
+    'exclusive_area', 'floor', 'build_year', 'deal_ym', 'deal_day', 'deal_date',
+    'deposit', 'monthly_rent', 'contract_type', 'contract_term', 'contract_end_ym',
+    'renewal_right', 'pre_deposit', 'pre_monthly_rent',
+]
+
+
+def refresh_property_type(cursor, property_type, full=False, prune=False):
+    """유형 하나 갱신: 원본 전체를 정규화해 UPSERT (full이면 삭제 후 전체 적재)
+
+    - 새 원본 키는 INSERT, 이미 있는 키는 정규화 값이 달라진 행만 UPDATE (refreshed_at 갱신)
+      → 원본 행을 제자리에서 고친 경우(보증금/계약기간 정정, 해제 등)도 --full 없이 반영
+    - 값이 같은 행은 쓰지 않음 (ON CONFLICT ... WHERE IS DISTINCT FROM → 불필요한 UPDATE/WAL 없음)
+    """
+    table, key_col = SOURCE_TABLES[property_type]
+
+    col_names = None
+    if property_type == 'dagagu':
+        cursor.execute("SELECT * FROM dagagu_rent_transactions LIMIT 0")
+        col_names = [desc[0] for desc in cursor.description]
+
+    if full:
+        cursor.execute(f"DELETE FROM {NORM_TABLE} WHERE property_type = %s", (property_type,))
+        print(f"  기존 {cursor.rowcount:,}건 삭제")
+
+    source_select = build_source_select(property_type, col_names)
+
+    column_list = ', '.join(NORM_COLUMNS)
+    update_columns = [name for name in NORM_COLUMNS if name not in ('property_type', 'source_key')]
+    update_list = ',\n            '.join(f"{name} = EXCLUDED.{name}" for name in update_columns)
+    current_values = ', '.join(f"{NORM_TABLE}.{name}" for name in update_columns)
+    new_values = ', '.join(f"EXCLUDED.{name}" for name in update_columns)
+    upsert_sql = f"""
+        INSERT INTO {NORM_TABLE} ({column_list})
+        SELECT
+            s.property_type, s.source_key, s.sggcd, s.umdnm, s.jibun, s.building_name,
+            s.exclusive_area, s.floor, s.build_year, s.deal_ym, s.deal_day,
+            CASE
+                WHEN s.deal_ym / 100 BETWEEN 1900 AND 2999
+                     AND s.deal_ym % 100 BETWEEN 1 AND 12
+                     AND s.deal_day BETWEEN 1 AND 31
+                THEN make_date(s.deal_ym / 100, s.deal_ym % 100, 1) + (s.deal_day - 1)
+            END as deal_date,
+            s.deposit, s.monthly_rent, s.contract_type, s.contract_term, s.contract_end_ym,
+            s.renewal_right, s.pre_deposit, s.pre_monthly_rent
+        FROM ({source_select}) s
+        WHERE s.sggcd IS NOT NULL
+        ON CONFLICT (property_type, source_key) DO UPDATE SET
+            {update_list},
+            refreshed_at = now()
+        WHERE ({current_values})
+              IS DISTINCT FROM ({new_values})
+    """
+    cursor.execute(upsert_sql)
+    print(f"  [OK] {cursor.rowcount:,}건 추가/갱신")
+
+    if prune and not full:
+        # 원본에서 삭제된 행 정리
+        cursor.execute(f"""
+            DELETE FROM {NORM_TABLE} n
+            WHERE n.property_type = %s
+              AND NOT EXISTS (SELECT 1 FROM {table} r WHERE r.{key_col}::text = n.source_key)
+        """, (property_type,))
+        print(f"  [OK] 원본에 없는 {cursor.rowcount:,}건 삭제")
+
+
+def create_norm_table(full=False, prune=False):
+    """정규화 테이블 생성 + 유형별 갱신 + 인덱스/통계"""
+    print("데이터베이스 연결 중...")
+    conn = psycopg.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(CREATE_TABLE_SQL)
+        conn.commit()
+        print(f"[OK] {NORM_TABLE} 테이블 확인")
+
+        for property_type in SOURCE_TABLES:
+            print(f"\n{'='*60}")
+            print(f"유형: {property_type} ({SOURCE_TABLES[property_type][0]})")
+            print(f"{'='*60}")
+            start_time = time.time()
+            try:
+                # 유형별로 커밋 (중간 실패 시 이전 유형 결과는 유지)
+                refresh_property_type(cursor, property_type, full=full, prune=prune)
+                conn.commit()
+                print(f"  소요 시간: {time.time() - start_time:.1f}초")
+            except Exception as e:
+                conn.rollback()
+                print(f"  [ERROR] 갱신 실패: {e}")
+
+        # 인덱스는 autocommit이 필요한 CONCURRENTLY 대신 일반 CREATE INDEX (최초 1회만 생성됨)
+        for idx_name, columns, description in NORM_INDEXES:
+            print(f"\n인덱스 확인: {idx_name} - {description}")
+            start_time = time.time()
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {NORM_TABLE} {columns}")
+            conn.commit()
+            print(f"  [OK] ({time.time() - start_time:.1f}초)")
+
+        print(f"\n{NORM_TABLE} 테이블 통계 업데이트 중...")
+        cursor.execute(f"ANALYZE {NORM_TABLE}")
+        conn.commit()
+
+        cursor.execute(f"SELECT property_type, COUNT(*) FROM {NORM_TABLE} GROUP BY property_type ORDER BY property_type")
+        print("\n유형별 건수:")
+        for property_type, count in cursor.fetchall():
+            print(f"  - {property_type}: {count:,}건")
+
+        print("\n" + "="*60)
+        print("정규화 테이블 갱신이 완료되었습니다!")
+        print("="*60)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n오류 발생: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='통합 전월세 정규화 테이블 생성/갱신')
+    parser.add_argument('--full', action='store_true', help='유형별 전체 재생성')
+    parser.add_argument('--prune', action='store_true', help='원본에서 삭제된 행 정리')
+    parser.add_argument('--yes', action='store_true', help='확인 없이 실행')
+    args = parser.parse_args()
+
+    print("="*60)
+    print(f"통합 전월세 정규화 테이블 ({NORM_TABLE}) {'전체 재생성' if args.full else '증분 갱신'}")
+    print("="*60)
+    print("\n원본 테이블:")
+    print("  - apt_rent_transactions (아파트)")
+    print("  - villa_rent_transactions (연립다세대)")
+    print("  - officetel_rent_transactions (오피스텔)")
+    print("  - dagagu_rent_transactions (단독다가구)")
+    if args.full:
+        print("\n전체 재생성은 테이블 크기에 따라 10-40분 정도 걸릴 수 있습니다.")
+
+    if not args.yes:
+        response = input("\n계속하시겠습니까? (y/n): ")
+        if response.lower() != 'y':
+            print("취소되었습니다.")
+            sys.exit(0)
+
+    print()
+    create_norm_table(full=args.full, prune=args.prune)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+소유자 정보 캐시(owner_info_cache) 테이블 생성 스크립트
+- owner_info_cache: PNU별 VWorld 토지소유정보(getPossessionAttr) 응답 (파싱/동·호별 그룹화 완료 JSON)
+
+소유자 정보 조회는 클릭마다 VWorld를 호출 (최대 3회 시도, 시도마다 connect 5초/read 8초)
+→ 처음 조회한 필지의 응답을 DB에 저장해 재조회는 PK 조회로 응답, 워커/서버 재시작 후에도 유지
+  - 신선도/만료 허용 기간/행 수 상한은 app.py의 OWNER_CACHE_* 환경 변수로 설정
+  - fetched_at: VWorld에서 받은 시각 (신선도 판단), accessed_at: 마지막 조회 시각 (상한 초과 시 오래된 순 삭제)
+
+사용법:
+  python create_owner_info_cache_table.py          # 테이블이 없으면 생성 (이미 있으면 유지)
+  python create_owner_info_cache_table.py --clear  # 저장된 응답 전체 삭제 (다음 조회부터 VWorld 재호출)
+  python create_owner_info_cache_table.py --yes    # 확인 없이 실행
+"""
+
+import os
+import sys
+import argparse
+import psycopg
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('PG_HOST'),
+    'dbname': os.getenv('PG_DB'),
+    'user': os.getenv('PG_USER'),
+    'password': os.getenv('PG_PASSWORD'),
+    'port': os.getenv('PG_PORT'),
+    'connect_timeout': 30
+}
+
+TABLE_NAME = 'owner_info_cache'
+
+CREATE_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        pnu          text PRIMARY KEY,          -- 시군구(5) + 법정동(5) + 1 + 본번(4) + 부번(4)
+        payload      jsonb NOT NULL,            -- /api/owner-info 응답 본문 ({{"data": {{동·호: [소유 정보]}}}})
+        fetched_at   timestamptz NOT NULL DEFAULT now(),
+        accessed_at  timestamptz NOT NULL DEFAULT now()
+    )
+"""
+
+CREATE_INDEX_SQL = f"""
+    CREATE INDEX IF NOT EXISTS {TABLE_NAME}_accessed_at_idx ON {TABLE_NAME} (accessed_at)
+"""
+
+
+def create_owner_info_cache_table(clear=False):
+    """소유자 정보 캐시 테이블 생성 (+ 선택 시 전체 삭제)"""
+    print("데이터베이스 연결 중...")
+    conn = psycopg.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(CREATE_TABLE_SQL)
+        cursor.execute(CREATE_INDEX_SQL)
+        print(f"  [OK] {TABLE_NAME} 테이블/인덱스 확인")
+
+        if clear:
+            cursor.execute(f"TRUNCATE {TABLE_NAME}")
+            print("  [OK] 저장된 응답 전체 삭제")
+
+        conn.commit()
+
+        cursor.execute(f"""
+            SELECT count(*), min(fetched_at), max(fetched_at), pg_size_pretty(pg_total_relation_size('{TABLE_NAME}'))
+            FROM {TABLE_NAME}
+        """)
+        count, oldest, newest, size = cursor.fetchone()
+        print(f"\n저장된 PNU {count:,}개, 크기 {size}")
+        if count:
+            print(f"  가장 오래된 응답: {oldest}, 가장 최근 응답: {newest}")
+
+        print("\n" + "="*60)
+        print("소유자 정보 캐시 테이블 준비가 완료되었습니다!")
+        print("="*60)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n오류 발생: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='소유자 정보 캐시(owner_info_cache) 테이블 생성')
+    parser.add_argument('--clear', action='store_true', help='저장된 응답 전체 삭제')
+    parser.add_argument('--yes', action='store_true', help='확인 없이 실행')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("소유자 정보 캐시 테이블 생성")
+    print("="*60)
+    print(f"\n대상 테이블: {TABLE_NAME} (PNU별 VWorld 소유정보 응답)")
+    if args.clear:
+        print("저장된 응답을 모두 삭제합니다. 다음 조회부터 VWorld를 다시 호출합니다.")
+
+    if not args.yes:
+        response = input("\n계속하시겠습니까? (y/n): ")
+        if response.lower() != 'y':
+            print("취소되었습니다.")
+            sys.exit(0)
+
+    print()
+    create_owner_info_cache_table(clear=args.clear)
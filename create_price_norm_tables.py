@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+공시가격 정규화 조회 테이블 생성 스크립트
+- apartment_price_norm: bldg_apartment_price (공동주택가격) → 조회 키별 평균 공시가격
+- officetel_price_norm: officetel_standard_price (오피스텔 기준시가) → 조회 키별 기준시가
+
+원본 테이블은 모든 컬럼이 텍스트라 가격 보강 쿼리가 후보 행마다
+LEFT("법정동코드", 5), "번지" ~ '^[0-9]+$', ::INTEGER/::FLOAT 변환을 계산해야 하고
+create_bldg_indexes.py의 원본 컬럼 인덱스도 사용하지 못함
+→ 번지/호/층은 정수, 면적은 0.01 단위 numeric, 시군구코드(sgg5)는 별도 컬럼으로 미리 변환하고
+  면적계/기준시가/126% 금액도 미리 계산해 조회 키 그대로의 PK로 저장
+
+고시 가격은 연 1회 정도만 바뀌므로 매번 새 테이블을 만든 뒤 한 트랜잭션에서 교체 (조회 중단 없음)
+
+사용법:
+  python create_price_norm_tables.py        # 두 테이블 모두 재생성
+  python create_price_norm_tables.py --yes  # 확인 없이 실행 (공시가격 적재 후 cron 등)
+"""
+
+import os
+import sys
+import argparse
+import psycopg
+from dotenv import load_dotenv
+import time
+
+# .env 파일 로드
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('PG_HOST'),
+    'dbname': os.getenv('PG_DB'),
+    'user': os.getenv('PG_USER'),
+    'password': os.getenv('PG_PASSWORD'),
+    'port': os.getenv('PG_PORT'),
+    'connect_timeout': 30
+}
+
+
+# ============ 원본 텍스트 → 타입 변환 SQL ============
+
+def sql_int(expr):
+    """정수 형식(음수 포함)일 때만 integer 변환 (앞뒤 공백 제거, 0-padding은 정수로 정규화)"""
+    return f"""CASE WHEN TRIM(({expr})::text) ~ '^-?[0-9]+$' THEN TRIM(({expr})::text)::integer END"""
+
+
+def sql_numeric(expr):
+    """숫자 형식일 때만 numeric 변환"""
+    return f"""CASE WHEN TRIM(({expr})::text) ~ '^[0-9]+(\\.[0-9]+)?$' THEN TRIM(({expr})::text)::numeric END"""
+
+
+# 공동주택가격: (법정동코드, 본번, 부번, 층, 면적) 키별 평균 공시가격
+# fetch_apartment_prices_batch와 같은 계산 - 같은 키의 서로 다른 공시가격 평균 (정수 절사)
+APARTMENT_SELECT_SQL = f"""
+    SELECT
+        s.bjdcd,
+        LEFT(s.bjdcd, 5) as sgg5,
+        s.bon,
+        s.bu,
+        s.floor,
+        s.area,
+        FLOOR(AVG(DISTINCT s.price))::bigint as price,
+        FLOOR(AVG(DISTINCT s.price) * 1.26)::bigint as threshold_126
+    FROM (
+        SELECT
+            TRIM(p."법정동코드"::text) as bjdcd,
+            {sql_int('p."본번"')} as bon,
+            {sql_int('p."부번"')} as bu,
+            {sql_int('p."층번호"')} as floor,
+            ROUND({sql_numeric('p."공동주택전유면적"')}, 2) as area,
+            {sql_numeric('p."공시가격"')} as price
+        FROM bldg_apartment_price p
+    ) s
+    WHERE s.bjdcd ~ '^[0-9]{{10}}$'
+      AND s.bon IS NOT NULL AND s.bu IS NOT NULL AND s.floor IS NOT NULL
+      AND s.area IS NOT NULL AND s.price IS NOT NULL
+    GROUP BY s.bjdcd, s.bon, s.bu, s.floor, s.area
+"""
+
+# 오피스텔 기준시가: (시군구코드, 번지, 호, 층(지하층은 음수), 면적) 키별 1건
+# fetch_officetel_standard_prices_batch와 같은 계산 - 면적계 = 전용 + 공유, 기준시가 = 면적당가격 × 면적계
+OFFICETEL_SELECT_SQL = f"""
+    SELECT DISTINCT ON (s.sgg5, s.bunji, s.ho, s.floor, s.area)
+        s.sgg5,
+        s.bjdcd,
+        s.bunji,
+        s.ho,
+        s.floor,
+        s.area,
+        s.unit_price,
+        s.exclusive_area,
+        s.shared_area,
+        s.exclusive_area + s.shared_area as total_area,
+        FLOOR(s.unit_price * (s.exclusive_area + s.shared_area))::bigint as standard_price,
+        FLOOR(s.unit_price * (s.exclusive_area + s.shared_area) * 1.26)::bigint as threshold_126
+    FROM (
+        SELECT
+            LEFT(TRIM(p."법정동코드"::text), 5) as sgg5,
+            TRIM(p."법정동코드"::text) as bjdcd,
+            {sql_int('p."번지"')} as bunji,
+            {sql_int('p."호"')} as ho,
+            CASE WHEN p."건물층구분코드" = '지하층' THEN -1 ELSE 1 END * {sql_int('p."상가건물층주소"')} as floor,
+            ROUND({sql_numeric('p."전용면적"')}, 2) as area,
+            {sql_numeric('p."고시가격"')} as unit_price,
+            {sql_numeric('p."전용면적"')} as exclusive_area,
+            {sql_numeric('p."공유면적"')} as shared_area
+        FROM officetel_standard_price p
+        WHERE p."건물층구분코드" IN ('지상층', '지하층')
+    ) s
+    WHERE s.sgg5 ~ '^[0-9]{{5}}$'
+      AND s.bunji IS NOT NULL AND s.ho IS NOT NULL AND s.floor IS NOT NULL AND s.area IS NOT NULL
+      AND s.unit_price IS NOT NULL AND s.exclusive_area IS NOT NULL AND s.shared_area IS NOT NULL
+    ORDER BY s.sgg5, s.bunji, s.ho, s.floor, s.area, s.bjdcd
+"""
+
+# (테이블, 원본 테이블, SELECT, PK 컬럼 - 보강 쿼리의 조인 조건과 같은 순서, 설명)
+PRICE_NORM_TABLES = [
+    ('apartment_price_norm', 'bldg_apartment_price', APARTMENT_SELECT_SQL,
+     '(bjdcd, bon, bu, floor, area)',
+     '공동주택가격 (법정동코드 + 본번 + 부번 + 층 + 면적)'),
+    ('officetel_price_norm', 'officetel_standard_price', OFFICETEL_SELECT_SQL,
+     '(sgg5, bunji, ho, floor, area)',
+     '오피스텔 기준시가 (시군구코드 + 번지 + 호 + 층 + 면적)'),
+]
+
+
+def rebuild_table(cursor, table_name, select_sql, pk_columns):
+    """새 테이블(_new)에 적재 + PK/통계 → 기존 테이블과 교체 (호출 측에서 커밋)"""
+    new_table = f"{table_name}_new"
+    cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+
+    start_time = time.time()
+    cursor.execute(f"CREATE TABLE {new_table} AS {select_sql}")
+    print(f"  [OK] {cursor.rowcount:,}건 적재 ({time.time() - start_time:.1f}초)")
+
+    # PK = 보강 쿼리 조인 조건과 같은 복합 인덱스 (지역 전체 적재도 앞 컬럼으로 범위 스캔)
+    start_time = time.time()
+    cursor.execute(f"ALTER TABLE {new_table} ADD CONSTRAINT {new_table}_pkey PRIMARY KEY {pk_columns}")
+    print(f"  [OK] PK {pk_columns} 생성 ({time.time() - start_time:.1f}초)")
+    cursor.execute(f"ANALYZE {new_table}")
+
+    # 교체 (같은 트랜잭션 - 커밋 전까지 기존 테이블로 조회)
+    cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table_name}")
+    cursor.execute(f"ALTER INDEX {new_table}_pkey RENAME TO {table_name}_pkey")
+
+
+def create_price_norm_tables():
+    """공시가격 정규화 테이블 재생성"""
+    print("데이터베이스 연결 중...")
+    conn = psycopg.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+
+    try:
+        for table_name, source_table, select_sql, pk_columns, description in PRICE_NORM_TABLES:
+            print(f"\n{'='*60}")
+            print(f"테이블: {table_name} ← {source_table}")
+            print(f"  {description}")
+            print(f"{'='*60}")
+            start_time = time.time()
+            try:
+                # 테이블별로 커밋 (중간 실패 시 기존 테이블 유지)
+                rebuild_table(cursor, table_name, select_sql, pk_columns)
+                conn.commit()
+                print(f"  소요 시간: {time.time() - start_time:.1f}초")
+            except Exception as e:
+                conn.rollback()
+                print(f"  [ERROR] 생성 실패 (기존 테이블 유지): {e}")
+
+        print("\n테이블 크기:")
+        for table_name, *_ in PRICE_NORM_TABLES:
+            cursor.execute("""
+                SELECT
+                    CASE WHEN to_regclass(%s) IS NOT NULL
+                         THEN pg_size_pretty(pg_total_relation_size(to_regclass(%s))) END
+            """, (table_name, table_name))
+            size = cursor.fetchone()[0]
+            print(f"  - {table_name}: {size or '없음'}")
+
+        print("\n" + "="*60)
+        print("공시가격 정규화 테이블 생성이 완료되었습니다!")
+        print("="*60)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n오류 발생: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='공시가격 정규화 조회 테이블 생성')
+    parser.add_argument('--yes', action='store_true', help='확인 없이 실행')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("공시가격 정규화 조회 테이블 생성")
+    print("="*60)
+    print("\n생성 테이블:")
+    for table_name, source_table, _, _, description in PRICE_NORM_TABLES:
+        print(f"  - {table_name} ← {source_table}: {description}")
+    print("\n공시가격 데이터 적재 후 실행해야 검색 결과에 반영됩니다.")
+
+    if not args.yes:
+        response = input("\n계속하시겠습니까? (y/n): ")
+        if response.lower() != 'y':
+            print("취소되었습니다.")
+            sys.exit(0)
+
+    print()
+    create_price_norm_tables()
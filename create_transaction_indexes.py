@@ -3,6 +3,10 @@
 거래 데이터 테이블 인덱스 생성 스크립트
 apt_rent_transactions, villa_rent_transactions, officetel_rent_transactions, dagagu_rent_transactions
 테이블에 검색 최적화를 위한 인덱스 추가
+
+- contract_end_ym: 계약기간의 만기 부분을 YYYYMM 정수로 저장하는 생성 컬럼 (STORED)
+  (YY.MM~YY.MM, YYYYMM~YYYYMM 형식 모두 처리)
+- (contract_end_ym, sggcd, umdnm, 계약일자) 복합 인덱스 → 계약만기시기 검색이 인덱스 범위 스캔으로 처리됨
 """
 
 import os
@@ -22,6 +26,38 @@ DB_CONFIG = {
     'connect_timeout': 30
 }
 
+def contract_end_ym_expr(column):
+    """계약기간 컬럼 → 만기 YYYYMM 정수 SQL (25.12 → 202512, 202512 → 202512, 그 외 NULL)
+
+    생성 컬럼에 사용하므로 IMMUTABLE 함수만 사용
+    """
+    end_part = f"TRIM(SPLIT_PART(({column})::text, '~', 2))"
+    return f"""CASE
+        WHEN {end_part} ~ '^[0-9]{{2}}\\.[0-9]{{2}}$' THEN 200000 + REPLACE({end_part}, '.', '')::integer
+        WHEN {end_part} ~ '^[0-9]{{6}}$' THEN {end_part}::integer
+    END"""
+
+
+def add_contract_end_column(cursor, table_name, contract_term_col):
+    """contract_end_ym 생성 컬럼 추가 (이미 있으면 건너뜀, 추가 시 테이블 재작성)"""
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = %s AND column_name = 'contract_end_ym'
+    """, (table_name,))
+    if cursor.fetchone():
+        print("\n[OK] contract_end_ym 컬럼 이미 존재")
+        return
+
+    print("\ncontract_end_ym 생성 컬럼 추가 중 (테이블 크기에 따라 수 분 소요, 쓰기 잠금)...")
+    start_time = time.time()
+    cursor.execute(f"""
+        ALTER TABLE {table_name}
+        ADD COLUMN IF NOT EXISTS contract_end_ym integer
+        GENERATED ALWAYS AS ({contract_end_ym_expr(contract_term_col)}) STORED
+    """)
+    print(f"  [OK] 추가 완료! (소요 시간: {time.time() - start_time:.1f}초)")
+
+
 def create_transaction_indexes():
     """거래 테이블 검색 최적화를 위한 인덱스 생성"""
     print("데이터베이스 연결 중...")
@@ -55,6 +91,22 @@ def create_transaction_indexes():
             for idx_name, idx_def in existing_indexes:
                 print(f"  - {idx_name}")
 
+            # 계약기간/계약일자 컬럼 (단독다가구는 한글 컬럼명이라 인덱스로 확인)
+            if table_name == 'dagagu_rent_transactions':
+                cursor.execute(f"SELECT * FROM {table_name} LIMIT 0")
+                col_names = [desc[0] for desc in cursor.description]
+                contract_term_col = f'"{col_names[16]}"'  # 16: 계약기간 (YYYYMM~YYYYMM)
+                deal_date_cols = f'"{col_names[10]}" DESC, "{col_names[11]}" DESC'  # 10: 계약년월, 11: 계약일
+            else:
+                contract_term_col = 'contractterm'  # YY.MM~YY.MM
+                deal_date_cols = 'dealyear DESC, dealmonth DESC, dealday DESC'
+
+            # 계약만기 생성 컬럼 추가
+            try:
+                add_contract_end_column(cursor, table_name, contract_term_col)
+            except Exception as e:
+                print(f"  [ERROR] contract_end_ym 컬럼 추가 실패: {e}")
+
             # 생성할 인덱스들 (이름, SQL, 설명)
             indexes_to_create = [
                 (
@@ -73,6 +125,14 @@ def create_transaction_indexes():
                     """,
                     "계약기간 인덱스 (계약만기시기 필터링)"
                 ),
+                (
+                    f"idx_{table_name}_contract_end",
+                    f"""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table_name}_contract_end
+                    ON {table_name} (contract_end_ym, sggcd, umdnm, {deal_date_cols})
+                    """,
+                    "계약만기(YYYYMM)+시군구+읍면동+계약일자 복합 인덱스 (메인 검색)"
+                ),
                 (
                     f"idx_{table_name}_jibun",
                     f"""
@@ -143,12 +203,13 @@ if __name__ == "__main__":
     print("="*60)
     print("거래 데이터 테이블 인덱스 생성")
     print("="*60)
-    print("\n이 스크립트는 다음 테이블에 인덱스를 생성합니다:")
+    print("\n이 스크립트는 다음 테이블에 contract_end_ym 생성 컬럼과 인덱스를 생성합니다:")
     print("  - apt_rent_transactions (아파트)")
     print("  - villa_rent_transactions (연립다세대)")
     print("  - officetel_rent_transactions (오피스텔)")
     print("  - dagagu_rent_transactions (단독다가구)")
     print("\nCONCURRENTLY 옵션을 사용하여 서비스 중단 없이 생성됩니다.")
+    print("단, contract_end_ym 컬럼 최초 추가 시에는 테이블 재작성 동안 쓰기가 잠깁니다.")
     print("시간이 다소 걸릴 수 있습니다 (테이블 크기에 따라 5-30분).")
 
     response = input("\n계속하시겠습니까? (y/n): ")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+호실 목록(unit_directory) 테이블 생성 스크립트
+- unit_directory: bldg_exclusive_area (전유공용면적) → (PNU, 층구분, 층번호, 면적) 키별 정렬된 "동 호" 목록
+
+호실 조회는 bldg_exclusive_area에 8개 컬럼 조건 + SELECT DISTINCT "동_명", "호_명"을 실행하고
+면적은 Python str(float(...))로 만든 문자열과 텍스트 비교 ('84.970'과 84.97이 다른 값으로 취급)
+→ 전유 행만 미리 집계해 PK 조회 1번으로 완성된 목록을 반환
+  - pnu: 시군구코드(5) + 법정동코드(5) + '1' + 번(4) + 지(4) (소유정보 조회와 같은 형식, 대지 구분은 조회 조건에 없음)
+  - floor_num: 정수, area: numeric (앞뒤 0과 관계없이 숫자로 비교)
+  - units: "동 호" (동명이 없으면 호명만) 정렬 배열, unit_count: 호실 수
+
+건축물대장은 월 1회 정도만 바뀌므로 매번 새 테이블을 만든 뒤 한 트랜잭션에서 교체 (조회 중단 없음)
+
+사용법:
+  python create_unit_directory_table.py        # 재생성
+  python create_unit_directory_table.py --yes  # 확인 없이 실행 (건축물대장 적재 후 cron 등)
+"""
+
+import os
+import sys
+import argparse
+import psycopg
+from dotenv import load_dotenv
+import time
+
+# .env 파일 로드
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('PG_HOST'),
+    'dbname': os.getenv('PG_DB'),
+    'user': os.getenv('PG_USER'),
+    'password': os.getenv('PG_PASSWORD'),
+    'port': os.getenv('PG_PORT'),
+    'connect_timeout': 30
+}
+
+TABLE_NAME = 'unit_directory'
+SOURCE_TABLE = 'bldg_exclusive_area'
+
+# PK = 호실 조회 키 (app.py UNIT_DIRECTORY_BATCH_QUERY의 조인 조건과 같은 순서)
+PK_COLUMNS = '(pnu, floor_code, floor_num, area)'
+
+
+# ============ 원본 텍스트 → 타입 변환 SQL ============
+
+def sql_int(expr):
+    """정수 형식일 때만 integer 변환 (앞뒤 공백 제거, 0-padding은 정수로 정규화)"""
+    return f"""CASE WHEN TRIM(({expr})::text) ~ '^[0-9]+$' THEN TRIM(({expr})::text)::integer END"""
+
+
+def sql_numeric(expr):
+    """숫자 형식일 때만 numeric 변환"""
+    return f"""CASE WHEN TRIM(({expr})::text) ~ '^[0-9]+(\\.[0-9]+)?$' THEN TRIM(({expr})::text)::numeric END"""
+
+
+# 호실 표시명: 동명 + 호명이면 "동 호", 호명만 있으면 호명 (app.py format_unit_info와 같은 규칙)
+# 정렬은 COLLATE "C" (Python sorted()와 같은 코드포인트 순서)
+UNIT_DIRECTORY_SELECT_SQL = f"""
+    SELECT
+        s.pnu,
+        s.floor_code,
+        s.floor_num,
+        s.area,
+        array_agg(s.label ORDER BY s.label COLLATE "C") as units,
+        count(*)::integer as unit_count
+    FROM (
+        SELECT DISTINCT
+            TRIM(e."시군구_코드") || TRIM(e."법정동_코드") || '1'
+                || LPAD(TRIM(e."번"), 4, '0') || LPAD(TRIM(e."지"), 4, '0') as pnu,
+            TRIM(e."층_구분_코드") as floor_code,
+            {sql_int('e."층_번호"')} as floor_num,
+            {sql_numeric('e."면적(㎡)"')} as area,
+            CASE
+                WHEN NULLIF(TRIM(e."동_명"), '') IS NOT NULL AND NULLIF(TRIM(e."호_명"), '') IS NOT NULL
+                    THEN TRIM(e."동_명") || ' ' || TRIM(e."호_명")
+                ELSE NULLIF(TRIM(e."호_명"), '')
+            END as label
+        FROM {SOURCE_TABLE} e
+        WHERE e."전유_공용_구분_코드" = '1'
+    ) s
+    WHERE s.pnu ~ '^[0-9]{{19}}$'
+      AND s.floor_code IS NOT NULL AND s.floor_num IS NOT NULL AND s.area IS NOT NULL
+      AND s.label IS NOT NULL
+    GROUP BY s.pnu, s.floor_code, s.floor_num, s.area
+"""
+
+
+def rebuild_table(cursor):
+    """새 테이블(_new)에 적재 + PK/통계 → 기존 테이블과 교체 (호출 측에서 커밋)"""
+    new_table = f"{TABLE_NAME}_new"
+    cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+
+    start_time = time.time()
+    cursor.execute(f"CREATE TABLE {new_table} AS {UNIT_DIRECTORY_SELECT_SQL}")
+    print(f"  [OK] {cursor.rowcount:,}건 적재 ({time.time() - start_time:.1f}초)")
+
+    start_time = time.time()
+    cursor.execute(f"ALTER TABLE {new_table} ADD CONSTRAINT {new_table}_pkey PRIMARY KEY {PK_COLUMNS}")
+    print(f"  [OK] PK {PK_COLUMNS} 생성 ({time.time() - start_time:.1f}초)")
+    cursor.execute(f"ANALYZE {new_table}")
+
+    # 교체 (같은 트랜잭션 - 커밋 전까지 기존 테이블로 조회)
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE_NAME}")
+    cursor.execute(f"ALTER TABLE {new_table} RENAME TO {TABLE_NAME}")
+    cursor.execute(f"ALTER INDEX {new_table}_pkey RENAME TO {TABLE_NAME}_pkey")
+
+
+def create_unit_directory_table():
+    """호실 목록 테이블 재생성"""
+    print("데이터베이스 연결 중...")
+    conn = psycopg.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+
+    try:
+        print(f"\n{'='*60}")
+        print(f"테이블: {TABLE_NAME} ← {SOURCE_TABLE}")
+        print(f"{'='*60}")
+        start_time = time.time()
+        rebuild_table(cursor)
+        conn.commit()
+        print(f"  소요 시간: {time.time() - start_time:.1f}초")
+
+        cursor.execute(f"""
+            SELECT count(*), COALESCE(sum(unit_count), 0), pg_size_pretty(pg_total_relation_size('{TABLE_NAME}'))
+            FROM {TABLE_NAME}
+        """)
+        key_count, unit_count, size = cursor.fetchone()
+        print(f"\n조회 키 {key_count:,}개, 호실 {unit_count:,}개, 크기 {size}")
+
+        print("\n" + "="*60)
+        print("호실 목록 테이블 생성이 완료되었습니다!")
+        print("="*60)
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n오류 발생 (기존 테이블 유지): {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='호실 목록(unit_directory) 테이블 생성')
+    parser.add_argument('--yes', action='store_true', help='확인 없이 실행')
+    args = parser.parse_args()
+
+    print("="*60)
+    print("호실 목록 테이블 생성")
+    print("="*60)
+    print(f"\n생성 테이블: {TABLE_NAME} ← {SOURCE_TABLE}")
+    print("  (PNU + 층구분 + 층번호 + 면적) 키별 정렬된 \"동 호\" 목록과 호실 수")
+    print("\n건축물대장(전유공용면적) 적재 후 실행해야 호실 조회에 반영됩니다.")
+
+    if not args.yes:
+        response = input("\n계속하시겠습니까? (y/n): ")
+        if response.lower() != 'y':
+            print("취소되었습니다.")
+            sys.exit(0)
+
+    print()
+    create_unit_directory_table()
@@ -1,12 +1,130 @@
+import base64
+import gzip
 import json
+import os
 import urllib.request
 import urllib.parse
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from urllib.error import HTTPError, URLError
 
+# 로컬 가짜 VWorld 서버로 확인할 때만 변경 (benchmark_vworld_client.py --proxy)
+VWORLD_API_BASE_URL = os.getenv('VWORLD_API_BASE_URL', 'https://api.vworld.kr').rstrip('/')
+
+# 여러 PNU 일괄 조회 (pnus=쉼표 구분): 호출 1회 안에서 동시에 VWorld 호출 → 파싱된 JSON을 gzip 압축해 응답
+# 모든 PNU가 끝나야 응답하므로 응답 시간은 최대 BATCH_PNU_TIMEOUT × ceil(PNU 수 / BATCH_MAX_WORKERS)
+# → app.py OWNER_PROXY_BATCH_SIZE <= BATCH_MAX_WORKERS (1 wave)로 맞추고,
+#   OWNER_PROXY_LAMBDA_WORKERS/OWNER_PROXY_PNU_TIMEOUT을 아래 값과 같게 설정 (app 읽기 타임아웃 계산에 사용)
+BATCH_MAX_PNUS = int(os.getenv('BATCH_MAX_PNUS', '100'))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '8'))
+BATCH_PNU_TIMEOUT = float(os.getenv('BATCH_PNU_TIMEOUT', '8'))  # PNU별 VWorld 호출 타임아웃 (초)
+GZIP_MIN_BYTES = 1024  # 이보다 작은 응답은 압축하지 않음
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def build_vworld_url(pnu, api_key, domain):
+    """VWorld getPossessionAttr URL (domain 파라미터는 URL 인코딩하지 않음)"""
+    return f"{VWORLD_API_BASE_URL}/ned/data/getPossessionAttr?pnu={pnu}&format=xml&numOfRows=1000&pageNo=1&key={api_key}&domain={domain}"
+
+
+def parse_possession_xml(content):
+    """getPossessionAttr XML → 동·호별로 그룹화한 소유 정보 (app.py parse_owner_info_xml과 같은 형식)"""
+    grouped = {}
+    for field in ET.fromstring(content).findall('.//field'):
+        item = {child.tag: child.text or '' for child in field}
+
+        # 0000이나 빈 값은 무시
+        dong_nm = item.get('buldDongNm', '')
+        ho_nm = item.get('buldHoNm', '')
+        dong_nm = dong_nm if dong_nm and dong_nm != '0000' else ''
+        ho_nm = ho_nm if ho_nm and ho_nm != '0000' else ''
+
+        if dong_nm and ho_nm:
+            key = f"{dong_nm}동 {ho_nm}호"
+        elif dong_nm:
+            key = f"{dong_nm}동"
+        elif ho_nm:
+            key = f"{ho_nm}호"
+        else:
+            key = "토지"
+
+        grouped.setdefault(key, []).append({
+            'posesnSeCodeNm': item.get('posesnSeCodeNm', '-'),
+            'resdncSeCodeNm': item.get('resdncSeCodeNm', '-'),
+            'ownshipChgDe': item.get('ownshipChgDe', '-'),
+            'ownshipChgCauseCodeNm': item.get('ownshipChgCauseCodeNm', '-'),
+            'cnrsPsnCo': item.get('cnrsPsnCo', '0'),
+            'buldDongNm': dong_nm,
+            'buldHoNm': ho_nm
+        })
+    return grouped
+
+
+def fetch_possession(pnu, api_key, domain):
+    """PNU 1개 조회 → {"status": 200, "data": {...}} 또는 {"status": 4xx/5xx, "error": "..."}"""
+    req = urllib.request.Request(build_vworld_url(pnu, api_key, domain), headers={'User-Agent': USER_AGENT})
+    try:
+        with urllib.request.urlopen(req, timeout=BATCH_PNU_TIMEOUT) as response:
+            content = response.read()
+        return {'status': 200, 'data': parse_possession_xml(content)}
+    except HTTPError as e:
+        return {'status': e.code, 'error': f'VWorld API HTTPError: {e.code}'}
+    except ET.ParseError as e:
+        return {'status': 500, 'error': f'VWorld API 응답 파싱 실패: {str(e)}'}
+    except (URLError, OSError) as e:
+        # 타임아웃(socket.timeout)도 OSError
+        return {'status': 504 if 'timed out' in str(e) else 502, 'error': f'VWorld API connection failed: {str(e)}'}
+
+
+def accepts_gzip(event):
+    """요청 Accept-Encoding에 gzip 포함 여부 (HTTP API는 헤더 이름이 소문자)"""
+    for name, value in (event.get('headers') or {}).items():
+        if name.lower() == 'accept-encoding' and 'gzip' in (value or '').lower():
+            return True
+    return False
+
+
+def handle_batch(event, headers, pnus, api_key, domain):
+    """여러 PNU를 동시에 조회 → {"results": {pnu: {...}}, "count": N} (클라이언트가 허용하면 gzip)"""
+    pnus = list(dict.fromkeys(pnu.strip() for pnu in pnus if pnu.strip()))
+    if not pnus or len(pnus) > BATCH_MAX_PNUS:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': f'pnus must contain 1-{BATCH_MAX_PNUS} PNUs'})
+        }
+
+    print(f"[Lambda] Batch calling VWorld API: {len(pnus)} PNUs")
+    with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(pnus))) as executor:
+        results = dict(zip(pnus, executor.map(lambda pnu: fetch_possession(pnu, api_key, domain), pnus)))
+
+    failed = sum(1 for result in results.values() if result['status'] != 200)
+    print(f"[Lambda] Batch done: {len(pnus)} PNUs, {failed} failed")
+
+    # 공백 없는 JSON + gzip (리전 간 전송량 감소)
+    body = json.dumps({'results': results, 'count': len(pnus)}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if accepts_gzip(event) and len(body) >= GZIP_MIN_BYTES:
+        return {
+            'statusCode': 200,
+            'headers': {**headers, 'Content-Encoding': 'gzip'},
+            'body': base64.b64encode(gzip.compress(body)).decode('ascii'),
+            'isBase64Encoded': True
+        }
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': body.decode('utf-8')
+    }
+
+
 def lambda_handler(event, context):
     """
     VWorld API 프록시 Lambda 함수
     Seoul 리전에서 실행되어 VWorld API 호출
+
+    - pnu=...: PNU 1개, VWorld XML 그대로 응답
+    - pnus=...,...: 여러 PNU를 동시에 조회해 파싱된 JSON으로 응답 (Accept-Encoding: gzip이면 압축)
     """
 
     # CORS 헤더
@@ -27,23 +145,27 @@ def lambda_handler(event, context):
 
     try:
         # 쿼리 파라미터에서 필요한 값 추출
-        params = event.get('queryStringParameters', {})
+        params = event.get('queryStringParameters') or {}
 
         pnu = params.get('pnu')
+        pnus = params.get('pnus')
         api_key = params.get('key')
         domain = params.get('domain')
 
-        if not pnu or not api_key or not domain:
+        if not (pnu or pnus) or not api_key or not domain:
             return {
                 'statusCode': 400,
                 'headers': headers,
                 'body': json.dumps({
-                    'error': 'Missing required parameters: pnu, key, domain'
+                    'error': 'Missing required parameters: pnu (or pnus), key, domain'
                 })
             }
 
+        if pnus:
+            return handle_batch(event, headers, pnus.split(','), api_key, domain)
+
         # VWorld API URL 구성 (URL 인코딩 없이)
-        vworld_url = f"https://api.vworld.kr/ned/data/getPossessionAttr?pnu={pnu}&format=xml&numOfRows=1000&pageNo=1&key={api_key}&domain={domain}"
+        vworld_url = build_vworld_url(pnu, api_key, domain)
 
         print(f"[Lambda] Calling VWorld API: {vworld_url.replace(api_key, api_key[:5] + '***')}")
 
@@ -51,7 +173,7 @@ def lambda_handler(event, context):
         req = urllib.request.Request(
             vworld_url,
             headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                'User-Agent': USER_AGENT
             }
         )
 
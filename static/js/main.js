@@ -1,9 +1,12 @@
 // 무한 스크롤 + 성능 최적화 버전
 let currentPage = 1;
+let nextCursor = null; // 서버가 준 다음 페이지 토큰 (키셋 페이지네이션)
 let isLoading = false;
 let hasMoreData = true;
 let currentFilters = null;
 let totalCount = 0;
+let searchGeneration = 0; // 새 검색마다 증가 (이전 검색의 지연 보강 응답 무시용)
+const resultRowsByKey = new Map(); // row_key → 표시 중인 행 객체 (지연 보강 결과 병합용)
 
 // 모달 무한 스크롤 상태
 let modalCurrentPage = 1;
@@ -235,66 +238,90 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // 호실 확인 버튼 이벤트 리스너 (이벤트 위임)
+    // 누른 행과 아직 조회하지 않은 다른 행들을 /api/unit-info/batch 한 번으로 함께 조회
     const resultsTable = document.getElementById('results-table');
     if (resultsTable) {
-        resultsTable.addEventListener('click', async function(e) {
+        resultsTable.addEventListener('click', function(e) {
             const btn = e.target.closest('.unit-check-btn');
-            if (!btn) return;
-
-            const sggCode = btn.dataset.sggCode;
-            const umdName = btn.dataset.umdName;
-            const jibun = btn.dataset.jibun;
-            const floor = btn.dataset.floor;
-            const area = btn.dataset.area;
-
-            // 버튼 비활성화 및 로딩 표시
-            btn.disabled = true;
-            btn.textContent = '조회중...';
-
-            try {
-                const response = await fetch('/api/fetch-unit-info', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify({
-                        sgg_code: sggCode,
-                        umd_name: umdName,
-                        jibun: jibun,
-                        floor: floor,
-                        area: area
-                    })
-                });
+            if (!btn || btn.disabled) return;
 
-                const data = await response.json();
+            const pending = Array.from(resultsTable.querySelectorAll('.unit-check-btn'))
+                .filter(other => other !== btn && !other.disabled);
+            fetchUnitInfoBatch([btn, ...pending].slice(0, UNIT_BATCH_MAX_ITEMS));
+        });
+    }
+});
 
-                if (data.success) {
-                    // 호실 정보 표시
-                    const cell = btn.closest('td');
-                    if (data.all_units && data.all_units.length > 0) {
-                        const tooltipText = data.all_units.join(', ');
-                        cell.innerHTML = `<span class="unit-with-tooltip" title="${tooltipText}">${data.unit || '-'}</span>`;
-                    } else {
-                        cell.textContent = data.unit || '-';
-                    }
-                } else {
-                    btn.textContent = '조회 실패';
-                    setTimeout(() => {
-                        btn.textContent = '호실 확인';
-                        btn.disabled = false;
-                    }, 2000);
-                }
-            } catch (error) {
-                console.error('호실 정보 조회 오류:', error);
-                btn.textContent = '오류';
-                setTimeout(() => {
-                    btn.textContent = '호실 확인';
-                    btn.disabled = false;
-                }, 2000);
+// 호실 일괄 조회 요청 1회당 최대 건수 (서버 UNIT_INFO_BATCH_MAX_ITEMS 기본값)
+const UNIT_BATCH_MAX_ITEMS = 200;
+
+// "호실 확인" 버튼 여러 개의 호실 정보를 한 번에 조회해 각 셀에 표시
+async function fetchUnitInfoBatch(buttons) {
+    // 버튼 비활성화 및 로딩 표시
+    buttons.forEach(btn => {
+        btn.disabled = true;
+        btn.textContent = '조회중...';
+    });
+
+    const restoreButtons = (label) => {
+        buttons.forEach(btn => {
+            btn.textContent = label;
+            setTimeout(() => {
+                btn.textContent = '호실 확인';
+                btn.disabled = false;
+            }, 2000);
+        });
+    };
+
+    try {
+        const response = await fetch('/api/unit-info/batch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                items: buttons.map(btn => ({
+                    sggcd: btn.dataset.sggCode,
+                    umdnm: btn.dataset.umdName,
+                    jibun: btn.dataset.jibun,
+                    floor: btn.dataset.floor,
+                    excluusear: btn.dataset.area
+                }))
+            })
+        });
+
+        const data = await response.json();
+        if (!data.success) {
+            restoreButtons('조회 실패');
+            return;
+        }
+
+        buttons.forEach((btn, index) => {
+            const unitInfo = data.data[index];
+            const tr = btn.closest('tr');
+            const cell = btn.closest('td');
+
+            // 지연 보강 등으로 행을 다시 그려도 유지되도록 행 객체에도 반영
+            const row = tr && tr.dataset.rowKey ? resultRowsByKey.get(tr.dataset.rowKey) : null;
+            if (row) {
+                row.동호명 = unitInfo.unit;
+                row.동호명_전체목록 = unitInfo.all_units;
+                row.동호명_더보기 = unitInfo.has_more;
+            }
+
+            // 호실 정보 표시
+            if (unitInfo.all_units && unitInfo.all_units.length > 0) {
+                const tooltipText = unitInfo.all_units.join(', ');
+                cell.innerHTML = `<span class="unit-with-tooltip" title="${tooltipText}">${unitInfo.unit || '-'}</span>`;
+            } else {
+                cell.textContent = unitInfo.unit || '-';
             }
         });
+    } catch (error) {
+        console.error('호실 정보 조회 오류:', error);
+        restoreButtons('오류');
     }
-});
+}
 
 // 무한 스크롤 설정 (성능 최적화 4: debounce 적용)
 let scrollHandler = null;  // 전역 변수로 핸들러 저장
@@ -586,8 +613,10 @@ function searchTransactions(append = false) {
     // 새로운 검색인 경우 초기화
     if (!append) {
         currentPage = 1;
+        nextCursor = null;
         hasMoreData = true;
         totalCount = 0;
+        searchGeneration++;
     }
 
     isLoading = true;
@@ -611,8 +640,9 @@ function searchTransactions(append = false) {
         rent_max: cachedElements.rentMax.value,
         build_year_min: cachedElements.buildYearMin.value,
         build_year_max: cachedElements.buildYearMax.value,
-        page: currentPage,
-        page_size: 20
+        cursor: append ? nextCursor : null, // 다음 페이지는 page 대신 토큰으로 요청
+        page_size: 20,
+        defer_enrich: true // 기본 행 먼저 받고 가격/LH/동호명은 /api/search/enrich로 따로 조회
     };
 
     console.log('[DEBUG] LH 필터:', filters.lh_only);
@@ -629,6 +659,27 @@ function searchTransactions(append = false) {
     }
     // append 모드에서는 showLoadingIndicator()가 이미 호출됨
 
+    // LH 필터 검색은 결과 전체를 한 번에 받는 대신 스트리밍(NDJSON)으로 받아 도착하는 대로 표시
+    if (filters.lh_only && !append) {
+        streamSearchResults(filters)
+            .catch(error => {
+                console.error('Error:', error);
+                const loadingEl = document.getElementById('loading');
+                const errorEl = document.getElementById('error-message');
+                if (loadingEl) loadingEl.style.display = 'none';
+                if (errorEl) {
+                    errorEl.textContent = `오류: ${error.message}`;
+                    errorEl.style.display = 'block';
+                }
+            })
+            .finally(() => {
+                isLoading = false;
+                const loadingEl = document.getElementById('loading');
+                if (loadingEl) loadingEl.style.display = 'none';
+            });
+        return;
+    }
+
     fetch('/api/search', {
         method: 'POST',
         headers: {
@@ -647,9 +698,13 @@ function searchTransactions(append = false) {
 
         if (data.success) {
             displayResults(data, append);
+            if (data.deferred) {
+                loadDeferredEnrichment(data.data || [], filters.lh_only);
+            }
 
             // 페이지네이션 정보 업데이트
-            hasMoreData = data.has_more || false;
+            hasMoreData = (data.has_more && !!data.next_cursor) || false;
+            nextCursor = data.next_cursor || null;
             console.log('[무한스크롤] hasMoreData 업데이트:', hasMoreData);
 
             if (!append) {
@@ -692,6 +747,124 @@ function searchTransactions(append = false) {
     });
 }
 
+// 스트리밍 검색 (LH 필터): 서버가 보내는 NDJSON 줄을 읽어 배치마다 표에 추가
+async function streamSearchResults(filters) {
+    const response = await fetch('/api/search', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ ...filters, stream: true })
+    });
+
+    // 스트리밍 응답이 아니면 일반 JSON 응답으로 처리
+    // (검증 오류, 또는 서버에 LH 매칭 테이블이 있어 페이지 단위로 응답한 경우 → 무한 스크롤로 다음 페이지)
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!contentType.includes('application/x-ndjson')) {
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || '검색 중 오류가 발생했습니다.');
+        }
+        displayResults(data, false);
+        if (data.deferred) {
+            loadDeferredEnrichment(data.data || [], filters.lh_only);
+        }
+        hasMoreData = (data.has_more && !!data.next_cursor) || false;
+        nextCursor = data.next_cursor || null;
+        totalCount = data.count;
+        updateResultCount();
+        return;
+    }
+
+    // 스트리밍 중에는 무한 스크롤 추가 요청 없음 (전체 결과를 이 요청으로 받음)
+    hasMoreData = false;
+    nextCursor = null;
+    totalCount = 0;
+    let rendered = false;
+
+    const handleLine = (line) => {
+        if (!line.trim()) return;
+        const message = JSON.parse(line);
+        if (message.type === 'rows' && message.data.length > 0) {
+            // 첫 배치는 표를 새로 그리고, 이후 배치는 뒤에 추가
+            displayResults({ data: message.data }, rendered);
+            rendered = true;
+            totalCount += message.data.length;
+            hasMoreData = false;
+            updateResultCount();
+        } else if (message.type === 'error') {
+            throw new Error(message.error);
+        } else if (message.type === 'end') {
+            console.log('[스트리밍] 완료:', message.count);
+        }
+    };
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();  // 마지막 줄은 아직 덜 받았을 수 있음
+        lines.forEach(handleLine);
+    }
+    buffer += decoder.decode();
+    handleLine(buffer);
+
+    if (!rendered) {
+        displayResults({ data: [] }, false);
+    }
+    hasMoreData = false;
+    updateResultCount();
+}
+
+// 검색 결과 행의 셀 HTML (최초 표시와 지연 보강 후 다시 그릴 때 공통 사용)
+function renderResultRowCells(row) {
+    const badgeClass = getBadgeClass(row.구분);
+
+    // 보증금 포맷 선택: 오피스텔은 기준시가, 아파트/연립다세대는 공동주택가격
+    let depositHTML;
+    if (row.구분 === '오피스텔') {
+        depositHTML = formatDepositWithStandardPrice(row);
+    } else if (row.구분 === '아파트' || row.구분 === '연립다세대') {
+        depositHTML = formatDepositWithApartmentPrice(row);
+    } else {
+        depositHTML = formatPrice(row.보증금);
+    }
+
+    // LH 데이터 구성
+    const lhData = row.is_lh ? {
+        support_type: row.lh_housing_type,
+        room_count: row.lh_room_count,
+        support_amount: row.lh_support_amount
+    } : null;
+
+    return `
+        <td><span class="badge ${badgeClass}">${row.구분}</span></td>
+        <td>${row.시도 || ''}</td>
+        <td>${row.시군구 || ''}</td>
+        <td>${row.읍면동리 || ''}</td>
+        <td>${row.지번 || ''}</td>
+        <td class="unit-info-cell">${formatUnitInfo(row)}</td>
+        <td><span class="building-name-clickable" data-building-name="${row.단지명 || row.건물명 || ''}" data-property-type="${row.구분 || ''}" data-sigungu-code="${row.시군구코드 || ''}" data-umd-name="${row.읍면동리 || ''}" data-jibun="${row.지번 || ''}" data-sido="${row.시도 || ''}" data-sigungu="${row.시군구 || ''}">${row.단지명 || row.건물명 || ''}</span></td>
+        <td>${row.층 || ''}</td>
+        <td>${row.면적 || ''}</td>
+        <td>${getContractTypeBadge(row.월세, row.is_lh, lhData)}</td>
+        <td>${depositHTML}</td>
+        <td>${formatPrice(row.월세)}</td>
+        <td>${row.계약년월 || ''}</td>
+        <td>${row.계약일 || ''}</td>
+        <td>${row.건축년도 || ''}</td>
+        <td>${row.계약구분 || ''}</td>
+        <td>${getContractPeriodWithBadge(row.계약기간)}</td>
+        <td>${formatPrice(row.종전계약보증금)}</td>
+        <td>${formatPrice(row.종전계약월세)}</td>
+        <td>${row.갱신요구권사용 || ''}</td>
+    `;
+}
+
 // 결과 표시 (성능 최적화 5: DocumentFragment 사용)
 function displayResults(data, append = false) {
     // 로딩 숨기기
@@ -709,6 +882,14 @@ function displayResults(data, append = false) {
         return;
     }
 
+    // 지연 보강 결과를 합칠 수 있도록 row_key별 행 객체 보관
+    if (!append) {
+        resultRowsByKey.clear();
+    }
+    data.data.forEach(row => {
+        if (row.row_key) resultRowsByKey.set(row.row_key, row);
+    });
+
     // 데이터 행 추가 (성능 최적화 5: DocumentFragment 사용)
     const tbody = append ? document.querySelector('#results-table tbody') : null;
 
@@ -718,47 +899,8 @@ function displayResults(data, append = false) {
 
         data.data.forEach(row => {
             const tr = document.createElement('tr');
-            const badgeClass = getBadgeClass(row.구분);
-
-            // 보증금 포맷 선택: 오피스텔은 기준시가, 아파트/연립다세대는 공동주택가격
-            let depositHTML;
-            if (row.구분 === '오피스텔') {
-                depositHTML = formatDepositWithStandardPrice(row);
-            } else if (row.구분 === '아파트' || row.구분 === '연립다세대') {
-                depositHTML = formatDepositWithApartmentPrice(row);
-            } else {
-                depositHTML = formatPrice(row.보증금);
-            }
-
-            const lhData = row.is_lh ? {
-                support_type: row.lh_housing_type,
-                room_count: row.lh_room_count,
-                support_amount: row.lh_support_amount
-            } : null;
-
-            tr.innerHTML = `
-                <td><span class="badge ${badgeClass}">${row.구분}</span></td>
-                <td>${row.시도 || ''}</td>
-                <td>${row.시군구 || ''}</td>
-                <td>${row.읍면동리 || ''}</td>
-                <td>${row.지번 || ''}</td>
-                <td class="unit-info-cell">${formatUnitInfo(row)}</td>
-                <td><span class="building-name-clickable" data-building-name="${row.단지명 || row.건물명 || ''}" data-property-type="${row.구분 || ''}" data-sigungu-code="${row.시군구코드 || ''}" data-umd-name="${row.읍면동리 || ''}" data-jibun="${row.지번 || ''}" data-sido="${row.시도 || ''}" data-sigungu="${row.시군구 || ''}">${row.단지명 || row.건물명 || ''}</span></td>
-                <td>${row.층 || ''}</td>
-                <td>${row.면적 || ''}</td>
-                <td>${getContractTypeBadge(row.월세, row.is_lh, lhData)}</td>
-                <td>${depositHTML}</td>
-                <td>${formatPrice(row.월세)}</td>
-                <td>${row.계약년월 || ''}</td>
-                <td>${row.계약일 || ''}</td>
-                <td>${row.건축년도 || ''}</td>
-                <td>${row.계약구분 || ''}</td>
-                <td>${getContractPeriodWithBadge(row.계약기간)}</td>
-                <td>${formatPrice(row.종전계약보증금)}</td>
-                <td>${formatPrice(row.종전계약월세)}</td>
-                <td>${row.갱신요구권사용 || ''}</td>
-            `;
-
+            if (row.row_key) tr.dataset.rowKey = row.row_key;
+            tr.innerHTML = renderResultRowCells(row);
             fragment.appendChild(tr);
         });
 
@@ -770,47 +912,9 @@ function displayResults(data, append = false) {
             let rowsHTML = '';
 
             data.data.forEach(row => {
-                const badgeClass = getBadgeClass(row.구분);
-
-                // 보증금 포맷 선택: 오피스텔은 기준시가, 아파트/연립다세대는 공동주택가격
-                let depositHTML;
-                if (row.구분 === '오피스텔') {
-                    depositHTML = formatDepositWithStandardPrice(row);
-                } else if (row.구분 === '아파트' || row.구분 === '연립다세대') {
-                    depositHTML = formatDepositWithApartmentPrice(row);
-                } else {
-                    depositHTML = formatPrice(row.보증금);
-                }
-
-                // LH 데이터 구성
-                const lhData = row.is_lh ? {
-                    support_type: row.lh_housing_type,
-                    room_count: row.lh_room_count,
-                    support_amount: row.lh_support_amount
-                } : null;
-
                 rowsHTML += `
-                    <tr>
-                        <td><span class="badge ${badgeClass}">${row.구분}</span></td>
-                        <td>${row.시도 || ''}</td>
-                        <td>${row.시군구 || ''}</td>
-                        <td>${row.읍면동리 || ''}</td>
-                        <td>${row.지번 || ''}</td>
-                        <td class="unit-info-cell">${formatUnitInfo(row)}</td>
-                        <td><span class="building-name-clickable" data-building-name="${row.단지명 || row.건물명 || ''}" data-property-type="${row.구분 || ''}" data-sigungu-code="${row.시군구코드 || ''}" data-umd-name="${row.읍면동리 || ''}" data-jibun="${row.지번 || ''}" data-sido="${row.시도 || ''}" data-sigungu="${row.시군구 || ''}">${row.단지명 || row.건물명 || ''}</span></td>
-                        <td>${row.층 || ''}</td>
-                        <td>${row.면적 || ''}</td>
-                        <td>${getContractTypeBadge(row.월세, row.is_lh, lhData)}</td>
-                        <td>${depositHTML}</td>
-                        <td>${formatPrice(row.월세)}</td>
-                        <td>${row.계약년월 || ''}</td>
-                        <td>${row.계약일 || ''}</td>
-                        <td>${row.건축년도 || ''}</td>
-                        <td>${row.계약구분 || ''}</td>
-                        <td>${getContractPeriodWithBadge(row.계약기간)}</td>
-                        <td>${formatPrice(row.종전계약보증금)}</td>
-                        <td>${formatPrice(row.종전계약월세)}</td>
-                        <td>${row.갱신요구권사용 || ''}</td>
+                    <tr data-row-key="${row.row_key || ''}">
+                        ${renderResultRowCells(row)}
                     </tr>
                 `;
             });
@@ -823,6 +927,43 @@ function displayResults(data, append = false) {
     }
 }
 
+// 지연 보강: 기본 행을 먼저 표시한 뒤 가격/LH/동호명을 한 번에 받아 해당 행만 다시 그림
+async function loadDeferredEnrichment(rows, lhOnly) {
+    const generation = searchGeneration;
+    const keys = rows.map(row => row.row_key).filter(Boolean);
+    if (keys.length === 0) return;
+
+    try {
+        const response = await fetch('/api/search/enrich', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            // LH 필터 검색은 LH 정보가 이미 행에 포함되어 있음
+            body: JSON.stringify({ keys: keys, lh: !lhOnly, units: true })
+        });
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || '보강 정보 조회에 실패했습니다.');
+        }
+
+        // 그 사이 새 검색이 시작됐으면 이전 결과는 버림
+        if (generation !== searchGeneration) return;
+
+        Object.entries(data.data).forEach(([key, payload]) => {
+            const row = resultRowsByKey.get(key);
+            if (!row) return;
+            Object.assign(row, payload);
+            const tr = document.querySelector(`#results-table tr[data-row-key="${CSS.escape(key)}"]`);
+            if (tr) tr.innerHTML = renderResultRowCells(row);
+        });
+        console.log('[지연 보강] 완료:', Object.keys(data.data).length, '/', keys.length);
+    } catch (error) {
+        // 보강 실패 시에도 기본 행은 그대로 표시 (호실은 "호실 확인" 버튼으로 조회 가능)
+        console.error('[지연 보강] 오류:', error);
+    }
+}
+
 // 배지 클래스 결정
 function getBadgeClass(type) {
     switch(type) {
@@ -960,6 +1101,7 @@ function resetFilters() {
 
     // 페이지네이션 초기화
     currentPage = 1;
+    nextCursor = null;
     hasMoreData = true;
     currentFilters = null;
     totalCount = 0;
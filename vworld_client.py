@@ -0,0 +1,308 @@
+"""
+VWorld API 클라이언트
+- requests.Session 연결 풀 재사용 (요청마다 새 TCP/TLS 연결을 맺지 않고 keep-alive)
+- 재시도: 지수 백오프 + full jitter, 호출 전체 시간 예산(total_timeout) 안에서만
+- 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 VWorld를 호출하지 않고 즉시 실패
+  → VWorld 장애 중에도 Flask 워커가 재시도 예산 전체를 기다리며 묶이지 않음
+- 동시 호출 수 상한: 상한을 넘는 요청은 acquire_timeout만 기다린 뒤 즉시 실패
+- 지연 시간/오류 지표: get_stats()
+
+app.py에서 워커(프로세스)별로 인스턴스를 만들어 사용 (Session/락은 fork된 프로세스와 공유하지 않음)
+URL은 호출 측에서 만들어 전달 → 로컬 가짜 VWorld 서버로 동작 확인 가능 (benchmark_vworld_client.py)
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# 재시도 대상 HTTP 상태 (그 외 응답은 그대로 반환)
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+# ============ 예외 (status: app에서 응답할 HTTP 상태) ============
+
+class VWorldError(Exception):
+    """VWorld 호출 실패"""
+    status = 500
+
+
+class VWorldTimeout(VWorldError):
+    """응답 시간 초과 (시도마다 connect/read 타임아웃 또는 전체 시간 예산 소진)"""
+    status = 504
+
+
+class VWorldConnectionError(VWorldError):
+    """연결 실패 (DNS, 연결 거부, 연결 끊김 등)"""
+    status = 503
+
+
+class VWorldHTTPError(VWorldError):
+    """재시도 후에도 5xx/429 응답"""
+    status = 502
+
+    def __init__(self, message, http_status):
+        super().__init__(message)
+        self.http_status = http_status
+
+
+class VWorldCircuitOpen(VWorldError):
+    """서킷 브레이커 열림 (최근 연속 실패로 호출 중단 중)"""
+    status = 503
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class VWorldBusy(VWorldError):
+    """동시 호출 수 상한 초과"""
+    status = 503
+
+
+# ============ 서킷 브레이커 ============
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커
+
+    - closed: 정상 호출, 연속 실패가 failure_threshold에 도달하면 open
+    - open: reset_timeout 동안 호출하지 않고 즉시 실패
+    - half_open: reset_timeout이 지나면 시험 호출 1개만 허용 → 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_inflight = False
+        self._opens = 0
+
+    def allow(self):
+        """이번 시도를 VWorld로 보내도 되는지 (half_open이면 시험 호출 1개만 True)"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_inflight = False
+            if self._probe_inflight:
+                return False
+            self._probe_inflight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_inflight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._probe_inflight = False
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._opens += 1
+
+    def retry_after(self):
+        """open 상태에서 시험 호출까지 남은 시간 (초)"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'opens': self._opens,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+            }
+
+
+# ============ 클라이언트 ============
+
+class VWorldClient:
+    """연결 풀 + 재시도 + 서킷 브레이커 + 동시 호출 상한을 갖춘 VWorld GET 클라이언트"""
+
+    def __init__(self, connect_timeout=5.0, read_timeout=8.0, total_timeout=15.0,
+                 max_attempts=3, backoff_base=0.25, backoff_max=2.0,
+                 max_concurrency=8, acquire_timeout=2.0,
+                 failure_threshold=5, reset_timeout=30.0, latency_window=1000):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout = acquire_timeout
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        # 연결 풀: 동시 호출 상한만큼 호스트별 연결 유지 (재시도는 직접 처리하므로 urllib3 재시도 비활성화)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)  # 시도별 응답 시간 (ms, 최근 latency_window건)
+        self._stats = {
+            'calls': 0, 'successes': 0, 'attempts': 0, 'retries': 0,
+            'timeouts': 0, 'connection_errors': 0, 'http_errors': 0, 'other_errors': 0,
+            'rejected_open': 0, 'rejected_busy': 0,
+        }
+        self._in_flight = 0
+        self._last_error = None
+
+    def get(self, url, headers=None, read_timeout=None, total_timeout=None, max_attempts=None):
+        """GET 요청 → requests.Response (200 또는 재시도 대상이 아닌 상태)
+
+        read_timeout/total_timeout/max_attempts: 이 호출에만 적용할 값 (프록시 다건 호출처럼 응답이 오래 걸리는 요청용)
+        실패 시 VWorldError 하위 예외 (VWorldTimeout, VWorldConnectionError, VWorldHTTPError,
+        VWorldCircuitOpen, VWorldBusy)
+        """
+        self._count('calls')
+
+        # 서킷이 열려 있으면 동시 호출 슬롯을 기다리지 않고 바로 실패
+        if self.breaker.retry_after() > 0:
+            self._raise_circuit_open()
+
+        if not self._semaphore.acquire(timeout=self.acquire_timeout):
+            self._count('rejected_busy')
+            raise VWorldBusy(f'VWorld API 동시 호출 수 초과 ({self.max_concurrency}개)')
+
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            return self._get_with_retries(
+                url, headers,
+                deadline=time.monotonic() + (total_timeout or self.total_timeout),
+                read_timeout=read_timeout or self.read_timeout,
+                max_attempts=max(1, max_attempts or self.max_attempts),
+            )
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+            self._semaphore.release()
+
+    def _get_with_retries(self, url, headers, deadline, read_timeout, max_attempts):
+        last_error = None
+        for attempt in range(max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self.breaker.allow():
+                self._raise_circuit_open()
+
+            if attempt > 0:
+                self._count('retries')
+            self._count('attempts')
+
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url,
+                    headers=headers,
+                    timeout=(min(self.connect_timeout, remaining), min(read_timeout, remaining))
+                )
+            except requests.Timeout as e:
+                error, kind = VWorldTimeout('VWorld API 응답 시간 초과'), 'timeouts'
+                detail = str(e)
+            except requests.ConnectionError as e:
+                error, kind = VWorldConnectionError('VWorld API 연결 실패'), 'connection_errors'
+                detail = str(e)
+            except Exception as e:
+                error, kind = VWorldError(f'API 요청 실패: {str(e)}'), 'other_errors'
+                detail = str(e)
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    # 4xx 등도 VWorld가 응답한 것이므로 서킷 기준으로는 성공
+                    self.breaker.record_success()
+                    self._record_latency(start)
+                    self._count('successes')
+                    return response
+                error, kind = VWorldHTTPError(f'API 호출 실패 (상태코드: {response.status_code})', response.status_code), 'http_errors'
+                detail = response.text[:200]
+
+            self._record_latency(start)
+            self.breaker.record_failure()
+            with self._stats_lock:
+                self._stats[kind] += 1
+                self._last_error = {'type': kind, 'detail': detail, 'at': time.time()}
+            print(f"[WARNING] VWorld 호출 실패 (시도 {attempt + 1}/{max_attempts}): {error} - {detail[:200]}")
+            last_error = error
+
+            if attempt == max_attempts - 1:
+                break
+            # full jitter: 0 ~ min(backoff_max, base * 2^attempt) 사이 임의 대기, 예산을 넘기면 재시도하지 않음
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+
+        if last_error is None:
+            last_error = VWorldTimeout('VWorld API 응답 시간 초과')
+            self._count('timeouts')
+        raise last_error
+
+    def _raise_circuit_open(self):
+        self._count('rejected_open')
+        retry_after = self.breaker.retry_after()
+        raise VWorldCircuitOpen(f'VWorld API 일시 차단 중 (최근 연속 실패, {retry_after:.0f}초 후 재시도)', retry_after)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _record_latency(self, start):
+        with self._stats_lock:
+            self._latencies.append((time.perf_counter() - start) * 1000)
+
+    def get_stats(self):
+        """호출/오류 횟수, 시도별 응답 시간(ms), 서킷 상태"""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                **self._stats,
+                'in_flight': self._in_flight,
+                'max_concurrency': self.max_concurrency,
+                'last_error': self._last_error,
+            }
+
+        if latencies:
+            stats['latency_ms'] = {
+                'samples': len(latencies),
+                'avg': round(sum(latencies) / len(latencies), 1),
+                'p50': round(latencies[len(latencies) // 2], 1),
+                'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                'max': round(latencies[-1], 1),
+            }
+        else:
+            stats['latency_ms'] = {'samples': 0}
+        stats['circuit'] = {**self.breaker.get_stats(), 'retry_after': round(self.breaker.retry_after(), 1)}
+        return stats
+
+    def close(self):
+        self.session.close()